@@ -0,0 +1,151 @@
+-- ComplianceAI PostgreSQL Database Migration
+-- Version: 003
+-- Description: Partition performance metrics and SLA measurements by day and add metric rollup tables
+-- Date: 2026-10-18
+-- Author: ComplianceAI Development Team
+--
+-- The decision orchestration agent (PerformanceTracker, SLAMonitor) creates
+-- daily partitions ahead of time and enforces retention by dropping whole
+-- partitions. Existing unpartitioned tables are renamed to *_legacy and their
+-- rows are copied into the new partitioned tables.
+--
+-- Rollback:
+--   DROP TABLE performance_metrics, sla_measurements,
+--              performance_metrics_rollup_1m, performance_metrics_rollup_1h;
+--   ALTER TABLE performance_metrics_legacy RENAME TO performance_metrics;
+--   ALTER TABLE sla_measurements_legacy RENAME TO sla_measurements;
+
+-- Start transaction for atomic migration
+BEGIN;
+
+-- Insert migration record
+INSERT INTO regulatory.migrations (version, description, applied_by, success)
+VALUES ('003', 'Partition performance metrics and SLA measurements by day and add metric rollup tables', 'system', FALSE);
+
+-- Move unpartitioned tables out of the way
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'performance_metrics'
+               AND relkind = 'r' AND pg_table_is_visible(oid)) THEN
+        ALTER TABLE performance_metrics RENAME TO performance_metrics_legacy;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'sla_measurements'
+               AND relkind = 'r' AND pg_table_is_visible(oid)) THEN
+        ALTER TABLE sla_measurements RENAME TO sla_measurements_legacy;
+    END IF;
+END $$;
+
+-- Raw performance metric data points, one partition per UTC day
+CREATE TABLE IF NOT EXISTS performance_metrics (
+    metric_id VARCHAR(100) NOT NULL,
+    metric_name VARCHAR(255) NOT NULL,
+    value TEXT NOT NULL,
+    labels JSONB NOT NULL DEFAULT '{}',
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    metadata JSONB DEFAULT '{}',
+    PRIMARY KEY (metric_id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_name_time
+    ON performance_metrics (metric_name, timestamp);
+
+COMMENT ON TABLE performance_metrics IS 'Raw performance metrics partitioned by day (performance_metrics_pYYYYMMDD)';
+
+-- Raw SLA measurements, one partition per UTC day
+CREATE TABLE IF NOT EXISTS sla_measurements (
+    measurement_id VARCHAR(100) NOT NULL,
+    sla_id VARCHAR(100),
+    service_name VARCHAR(100) NOT NULL,
+    metric_type VARCHAR(50) NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    labels JSONB DEFAULT '{}',
+    metadata JSONB DEFAULT '{}',
+    PRIMARY KEY (measurement_id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_sla_measurements_service_metric_time
+    ON sla_measurements (service_name, metric_type, timestamp);
+
+COMMENT ON TABLE sla_measurements IS 'Raw SLA measurements partitioned by day (sla_measurements_pYYYYMMDD)';
+
+-- Continuous rollups maintained by PerformanceTracker
+CREATE TABLE IF NOT EXISTS performance_metrics_rollup_1m (
+    metric_name VARCHAR(255) NOT NULL,
+    labels JSONB NOT NULL DEFAULT '{}',
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    sample_count BIGINT NOT NULL,
+    value_sum DOUBLE PRECISION NOT NULL,
+    value_min DOUBLE PRECISION NOT NULL,
+    value_max DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (metric_name, bucket, labels)
+);
+
+CREATE TABLE IF NOT EXISTS performance_metrics_rollup_1h (
+    metric_name VARCHAR(255) NOT NULL,
+    labels JSONB NOT NULL DEFAULT '{}',
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    sample_count BIGINT NOT NULL,
+    value_sum DOUBLE PRECISION NOT NULL,
+    value_min DOUBLE PRECISION NOT NULL,
+    value_max DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (metric_name, bucket, labels)
+);
+
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_rollup_1m_bucket ON performance_metrics_rollup_1m (bucket);
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_rollup_1h_bucket ON performance_metrics_rollup_1h (bucket);
+
+COMMENT ON TABLE performance_metrics_rollup_1m IS '1-minute rollups of numeric performance metrics';
+COMMENT ON TABLE performance_metrics_rollup_1h IS '1-hour rollups of numeric performance metrics';
+
+-- Create partitions covering legacy data and the next few days, then copy legacy rows
+DO $$
+DECLARE
+    parent TEXT;
+    partition_day DATE;
+    first_day DATE;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['performance_metrics', 'sla_measurements'] LOOP
+        first_day := CURRENT_DATE - 1;
+
+        IF EXISTS (SELECT 1 FROM pg_class WHERE relname = parent || '_legacy' AND pg_table_is_visible(oid)) THEN
+            EXECUTE format('SELECT COALESCE(MIN(timestamp)::date, CURRENT_DATE - 1) FROM %I', parent || '_legacy')
+                INTO first_day;
+        END IF;
+
+        partition_day := first_day;
+        WHILE partition_day <= CURRENT_DATE + 3 LOOP
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                parent || '_p' || to_char(partition_day, 'YYYYMMDD'), parent,
+                partition_day::timestamptz, (partition_day + 1)::timestamptz
+            );
+            partition_day := partition_day + 1;
+        END LOOP;
+    END LOOP;
+
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'performance_metrics_legacy' AND pg_table_is_visible(oid)) THEN
+        INSERT INTO performance_metrics (metric_id, metric_name, value, labels, timestamp, metadata)
+        SELECT metric_id, metric_name, value::text, COALESCE(labels::jsonb, '{}'), timestamp, metadata::jsonb
+        FROM performance_metrics_legacy
+        WHERE timestamp IS NOT NULL
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'sla_measurements_legacy' AND pg_table_is_visible(oid)) THEN
+        INSERT INTO sla_measurements (measurement_id, sla_id, service_name, metric_type, value, timestamp, labels, metadata)
+        SELECT measurement_id, sla_id, service_name, metric_type, value, timestamp, labels::jsonb, metadata::jsonb
+        FROM sla_measurements_legacy
+        WHERE timestamp IS NOT NULL
+        ON CONFLICT DO NOTHING;
+    END IF;
+END $$;
+
+-- Update migration status
+UPDATE regulatory.migrations
+SET success = TRUE, checksum = 'partition-metrics-tables-checksum'
+WHERE version = '003';
+
+-- Commit transaction
+COMMIT;
@@ -0,0 +1,54 @@
+-- ComplianceAI PostgreSQL Database Migration
+-- Version: 004
+-- Description: Add hash-chained audit batches for range-verifiable audit integrity
+-- Date: 2026-10-18
+-- Author: ComplianceAI Development Team
+--
+-- The intelligence compliance agent (AuditLogger) seals every flush of audit
+-- events as one batch. Each batch root commits to the ordered event hashes and
+-- to the previous batch root, so AuditLogger.verify_range can check a whole
+-- time range by recomputing one chain. Rows written before this migration
+-- have no batch and are still verifiable per event.
+--
+-- Rollback:
+--   ALTER TABLE regulatory_audit_logs DROP COLUMN batch_id, DROP COLUMN batch_position;
+--   DROP TABLE regulatory_audit_batches;
+
+-- Start transaction for atomic migration
+BEGIN;
+
+-- Insert migration record
+INSERT INTO regulatory.migrations (version, description, applied_by, success)
+VALUES ('004', 'Add hash-chained audit batches for range-verifiable audit integrity', 'system', FALSE);
+
+-- One row per sealed batch, in chain order
+CREATE TABLE IF NOT EXISTS regulatory_audit_batches (
+    batch_sequence BIGSERIAL PRIMARY KEY,
+    batch_id VARCHAR(100) NOT NULL UNIQUE,
+    previous_root CHAR(64) NOT NULL,
+    root_hash CHAR(64) NOT NULL,
+    event_count INTEGER NOT NULL,
+    first_event_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_event_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_regulatory_audit_batches_event_range
+    ON regulatory_audit_batches (last_event_at, first_event_at);
+
+COMMENT ON TABLE regulatory_audit_batches IS 'Hash-chained roots of sealed audit event batches';
+
+-- Link audit events to their batch
+ALTER TABLE regulatory_audit_logs ADD COLUMN IF NOT EXISTS batch_id VARCHAR(100);
+ALTER TABLE regulatory_audit_logs ADD COLUMN IF NOT EXISTS batch_position INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_regulatory_audit_logs_batch
+    ON regulatory_audit_logs (batch_id, batch_position);
+
+-- Update migration status
+UPDATE regulatory.migrations
+SET success = TRUE, checksum = 'audit-hash-chain-checksum'
+WHERE version = '004';
+
+-- Commit transaction
+COMMIT;
@@ -0,0 +1,72 @@
+-- ComplianceAI PostgreSQL Database Migration
+-- Version: 005
+-- Description: Add COREP and DORA ICT source data tables
+-- Date: 2026-10-18
+-- Author: ComplianceAI Development Team
+--
+-- The decision orchestration agent (ComplianceReportGenerator) loads the
+-- latest row per (institution, reporting period) for a whole batch of
+-- report requests with one query per report type, as it already does for
+-- finrep_data. Periods without a row are reported with the generator's
+-- default figures.
+--
+-- Rollback:
+--   DROP TABLE corep_data, dora_ict_data;
+
+-- Start transaction for atomic migration
+BEGIN;
+
+-- Insert migration record
+INSERT INTO regulatory.migrations (version, description, applied_by, success)
+VALUES ('005', 'Add COREP and DORA ICT source data tables', 'system', FALSE);
+
+-- COREP capital adequacy data
+CREATE TABLE IF NOT EXISTS corep_data (
+    data_id VARCHAR(100) PRIMARY KEY,
+    institution_id VARCHAR(50) NOT NULL REFERENCES institutions(institution_id),
+    reporting_period VARCHAR(20) NOT NULL,
+    tier1_capital DECIMAL(18,2) NOT NULL,
+    tier2_capital DECIMAL(18,2) NOT NULL,
+    total_capital DECIMAL(18,2) NOT NULL,
+    risk_weighted_assets DECIMAL(18,2) NOT NULL,
+    capital_ratio DECIMAL(7,2),
+    leverage_ratio DECIMAL(7,2),
+    liquidity_coverage_ratio DECIMAL(7,2),
+    data_source VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- DORA ICT risk data
+CREATE TABLE IF NOT EXISTS dora_ict_data (
+    data_id VARCHAR(100) PRIMARY KEY,
+    institution_id VARCHAR(50) NOT NULL REFERENCES institutions(institution_id),
+    reporting_period VARCHAR(20) NOT NULL,
+    ict_incidents_count INTEGER NOT NULL DEFAULT 0,
+    major_incidents_count INTEGER NOT NULL DEFAULT 0,
+    third_party_providers_count INTEGER NOT NULL DEFAULT 0,
+    critical_services_count INTEGER NOT NULL DEFAULT 0,
+    recovery_time_objective DECIMAL(7,2),
+    recovery_point_objective DECIMAL(7,2),
+    business_continuity_tests INTEGER NOT NULL DEFAULT 0,
+    data_source VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Latest row per institution and period
+CREATE INDEX IF NOT EXISTS idx_corep_data_institution_period
+    ON corep_data (institution_id, reporting_period, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_dora_ict_data_institution_period
+    ON dora_ict_data (institution_id, reporting_period, created_at DESC);
+
+COMMENT ON TABLE corep_data IS 'COREP capital adequacy source data per institution and reporting period';
+COMMENT ON TABLE dora_ict_data IS 'DORA ICT risk source data per institution and reporting period';
+
+-- Update migration status
+UPDATE regulatory.migrations
+SET success = TRUE, checksum = 'corep-dora-data-checksum'
+WHERE version = '005';
+
+-- Commit transaction
+COMMIT;
@@ -0,0 +1,33 @@
+-- ComplianceAI PostgreSQL Database Migration
+-- Version: 006
+-- Description: Add detection fingerprints to customer jurisdictions
+-- Date: 2026-10-18
+-- Author: ComplianceAI Development Team
+--
+-- The intelligence compliance agent (JurisdictionHandler) stores a SHA-256
+-- fingerprint of each detection result and skips rewriting customers whose
+-- result is unchanged. Both the single-customer upsert and the batch
+-- COPY-and-merge path write this column. Existing rows have no fingerprint
+-- and are rewritten once on their next detection.
+--
+-- Rollback:
+--   ALTER TABLE customer_jurisdictions DROP COLUMN detection_fingerprint;
+
+-- Start transaction for atomic migration
+BEGIN;
+
+-- Insert migration record
+INSERT INTO regulatory.migrations (version, description, applied_by, success)
+VALUES ('006', 'Add detection fingerprints to customer jurisdictions', 'system', FALSE);
+
+ALTER TABLE customer_jurisdictions ADD COLUMN IF NOT EXISTS detection_fingerprint VARCHAR(64);
+
+COMMENT ON COLUMN customer_jurisdictions.detection_fingerprint IS 'SHA-256 of the detection result; unchanged results are not rewritten';
+
+-- Update migration status
+UPDATE regulatory.migrations
+SET success = TRUE, checksum = 'customer-jurisdiction-fingerprint-checksum'
+WHERE version = '006';
+
+-- Commit transaction
+COMMIT;
@@ -10,9 +10,10 @@ Key Features:
 - Pluggable report generator architecture
 - Multi-format output (XBRL, CSV, JSON)
 - EBA taxonomy compliance
-- Template-based generation
+- Template-based generation with compiled, cached template plans
 - Data validation and quality checks
 - Automated scheduling and delivery
+- Batch generation across institutions and templates with a process pool
 
 Supported Reports:
 - FINREP (Financial Reporting) - XBRL format
@@ -33,14 +34,17 @@ import os
 import json
 import asyncio
 import logging
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, FrozenSet, Pattern
 from enum import Enum
 from dataclasses import dataclass, asdict
+from decimal import Decimal
 from pathlib import Path
 import uuid
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 import csv
 import io
 import zipfile
@@ -54,7 +58,8 @@ from pydantic import BaseModel, Field, validator
 import jsonschema
 
 # Database and messaging
-import asyncpg
+from connection_hub import ConnectionHub, get_connection_hub
+from xbrl_writer import MINIDOM_XML_DECLARATION, XBRLStreamWriter, prerender
 import aiofiles
 import aiohttp
 
@@ -120,6 +125,134 @@ class ReportResult:
     error_message: Optional[str] = None
     created_at: datetime = None
 
+@dataclass
+class BatchReportResult:
+    """Batch report generation result"""
+    batch_id: str
+    results: List[ReportResult]  # One per request, in request order
+    total: int
+    succeeded: int
+    failed: int
+    elapsed_seconds: float
+    throughput: float  # Reports per second
+
+# FINREP columns read from finrep_data
+FINREP_DATA_COLUMNS = (
+    'cash_balances', 'financial_assets_hft', 'financial_assets_mandatorily_fvtpl',
+    'financial_assets_designated_fvtpl', 'financial_assets_fvoci', 'financial_assets_amortised_cost',
+    'derivatives_hedge_accounting', 'investments_subsidiaries', 'tangible_assets',
+    'intangible_assets', 'tax_assets', 'other_assets', 'total_assets',
+    'financial_liabilities_hft', 'financial_liabilities_designated_fvtpl',
+    'financial_liabilities_amortised_cost', 'derivatives_hedge_accounting_liab',
+    'provisions', 'tax_liabilities', 'other_liabilities', 'total_liabilities',
+    'capital', 'retained_earnings', 'accumulated_oci', 'other_reserves', 'total_equity',
+    'interest_income', 'interest_expenses', 'net_interest_income',
+    'fee_income', 'fee_expenses', 'net_fee_income', 'trading_income',
+    'other_operating_income', 'total_operating_income',
+    'staff_expenses', 'other_administrative_expenses', 'depreciation',
+    'total_operating_expenses', 'impairment_losses', 'profit_before_tax',
+    'tax_expense', 'net_profit'
+)
+
+# COREP capital adequacy figures used when corep_data has no row for a period
+COREP_DATA_DEFAULTS = {
+    'tier1_capital': 150000000.0,
+    'tier2_capital': 50000000.0,
+    'total_capital': 200000000.0,
+    'risk_weighted_assets': 1200000000.0,
+    'capital_ratio': 16.67,
+    'leverage_ratio': 8.5,
+    'liquidity_coverage_ratio': 125.0
+}
+
+# DORA ICT risk figures used when dora_ict_data has no row for a period
+DORA_DATA_DEFAULTS = {
+    'ict_incidents_count': 3,
+    'major_incidents_count': 0,
+    'third_party_providers_count': 15,
+    'critical_services_count': 8,
+    'recovery_time_objective': 4.0,  # hours
+    'recovery_point_objective': 1.0,  # hours
+    'business_continuity_tests': 12
+}
+
+# Per report type: source table, its data columns, and values used when no row exists
+REPORT_DATA_SOURCES = {
+    ReportType.FINREP: ('finrep_data', FINREP_DATA_COLUMNS, {column: 0.0 for column in FINREP_DATA_COLUMNS}),
+    ReportType.COREP: ('corep_data', tuple(COREP_DATA_DEFAULTS), COREP_DATA_DEFAULTS),
+    ReportType.DORA_ICT: ('dora_ict_data', tuple(DORA_DATA_DEFAULTS), DORA_DATA_DEFAULTS)
+}
+
+async def _render_items(items: List[Tuple[int, 'ReportTemplate', Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any], Optional[str], Optional[str], float]]:
+    """
+    Validate and render a chunk of reports
+    
+    Returns (index, validation_results, content, error, seconds) per item;
+    content is None when validation fails or rendering raises.
+    """
+    rendered = []
+    for index, template, data in items:
+        started = time.perf_counter()
+        try:
+            validation_results = await template.validate_data(data)
+            content = await template.generate_report(data) if validation_results['valid'] else None
+            rendered.append((index, validation_results, content, None, time.perf_counter() - started))
+        except Exception as e:
+            rendered.append((index, None, None, str(e), time.perf_counter() - started))
+    return rendered
+
+def _render_items_in_process(items: List[Tuple[int, 'ReportTemplate', Dict[str, Any]]]):
+    """Process pool entry point for _render_items"""
+    return asyncio.run(_render_items(items))
+
+# Compiled template plans, shared by every template instance with the same
+# (template class, path, version)
+_TEMPLATE_PLAN_CACHE: Dict[Tuple[str, str, str], Any] = {}
+
+def clear_template_plan_cache():
+    """Drop all compiled template plans (e.g. after templates are redeployed)"""
+    _TEMPLATE_PLAN_CACHE.clear()
+
+def _is_number(value: Any) -> bool:
+    """Numeric check shared by template validators (Decimal comes from NUMERIC columns)"""
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+def _format_csv_value(value: Any) -> str:
+    """CSV cell coercer"""
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    return str(value)
+
+@dataclass(frozen=True)
+class XBRLTemplatePlan:
+    """Immutable compiled form of an XBRL template"""
+    required_fields: Tuple[str, ...]
+    numeric_fields: FrozenSet[str]
+    string_fields: FrozenSet[str]
+    period_pattern: Pattern
+    concepts: Dict[str, str]  # Reportable field -> XBRL concept
+    namespaces: Tuple[Tuple[str, str], ...]
+    schema_reference: str
+    unit_fragment: str  # Prerendered xbrli:unit at document depth
+    template_root: Any = None
+    taxonomy_root: Any = None
+
+@dataclass(frozen=True)
+class CSVTemplatePlan:
+    """Immutable compiled form of a CSV template"""
+    headers: Tuple[str, ...]
+    columns: Tuple[str, ...]  # Data field per header
+    # (field, ((rule, argument), ...)) in validation order
+    rules: Tuple[Tuple[str, Tuple[Tuple[str, Any], ...]], ...]
+
+@dataclass(frozen=True)
+class JSONTemplatePlan:
+    """Immutable compiled form of a JSON template"""
+    schema: Dict[str, Any]
+    schema_version: str
+
 class ReportTemplate:
     """Base class for report templates"""
     
@@ -128,6 +261,12 @@ class ReportTemplate:
         self.version = version
         self.schema = None
         self.validation_rules = []
+        self.plan = None
+    
+    @property
+    def plan_key(self) -> Tuple[str, str, str]:
+        """Cache key for this template's compiled plan"""
+        return (self.__class__.__name__, self.template_path, self.version)
     
     async def load_template(self):
         """Load template from file"""
@@ -144,6 +283,14 @@ class ReportTemplate:
 class XBRLTemplate(ReportTemplate):
     """XBRL template for FINREP and COREP reports"""
     
+    # Field to XBRL concept mapping; facts are written in input data order
+    concept_mapping = {
+        'total_assets': 'eba:Assets',
+        'total_liabilities': 'eba:Liabilities',
+        'total_equity': 'eba:Equity',
+        'institution_name': 'eba:NameOfReportingAgent'
+    }
+    
     def __init__(self, template_path: str, version: str, taxonomy_path: str):
         super().__init__(template_path, version)
         self.taxonomy_path = taxonomy_path
@@ -155,19 +302,30 @@ class XBRLTemplate(ReportTemplate):
         }
     
     async def load_template(self):
-        """Load XBRL template and taxonomy"""
+        """Load XBRL template and taxonomy, compiling them once per path and version"""
         try:
-            async with aiofiles.open(self.template_path, 'r', encoding='utf-8') as f:
-                template_content = await f.read()
-            
-            # Parse XBRL template
-            self.template_root = ET.fromstring(template_content)
+            plan = _TEMPLATE_PLAN_CACHE.get(self.plan_key)
+            if plan is None:
+                async with aiofiles.open(self.template_path, 'r', encoding='utf-8') as f:
+                    template_content = await f.read()
+                
+                # Parse XBRL template
+                template_root = ET.fromstring(template_content)
+                
+                # Load taxonomy if available
+                taxonomy_root = None
+                if os.path.exists(self.taxonomy_path):
+                    async with aiofiles.open(self.taxonomy_path, 'r', encoding='utf-8') as f:
+                        taxonomy_content = await f.read()
+                    taxonomy_root = ET.fromstring(taxonomy_content)
+                
+                plan = self.compile(template_root, taxonomy_root)
+                _TEMPLATE_PLAN_CACHE[self.plan_key] = plan
             
-            # Load taxonomy if available
-            if os.path.exists(self.taxonomy_path):
-                async with aiofiles.open(self.taxonomy_path, 'r', encoding='utf-8') as f:
-                    taxonomy_content = await f.read()
-                self.taxonomy_root = ET.fromstring(taxonomy_content)
+            self.plan = plan
+            self.template_root = plan.template_root
+            if plan.taxonomy_root is not None:
+                self.taxonomy_root = plan.taxonomy_root
             
             logger.info(f"XBRL template loaded: {self.template_path}")
             
@@ -175,6 +333,30 @@ class XBRLTemplate(ReportTemplate):
             logger.error(f"Failed to load XBRL template: {e}")
             raise
     
+    def compile(self, template_root: ET.Element = None, taxonomy_root: ET.Element = None) -> XBRLTemplatePlan:
+        """Compile the template into an immutable plan"""
+        return XBRLTemplatePlan(
+            required_fields=tuple(self._get_required_fields()),
+            numeric_fields=frozenset({'total_assets', 'total_liabilities', 'total_equity'}),
+            string_fields=frozenset({'institution_name', 'institution_code'}),
+            # YYYY-MM or YYYY-QQ format
+            period_pattern=re.compile(r'^\d{4}-(0[1-9]|1[0-2]|Q[1-4])$'),
+            concepts={
+                field: concept for field, concept in self.concept_mapping.items()
+                if self._is_reportable_field(field)
+            },
+            namespaces=tuple(self.namespaces.items()),
+            schema_reference=self._get_schema_reference(),
+            unit_fragment=prerender(lambda writer: writer.unit('EUR', 'iso4217:EUR')),
+            template_root=template_root,
+            taxonomy_root=taxonomy_root
+        )
+    
+    def _get_plan(self) -> XBRLTemplatePlan:
+        if self.plan is None:
+            self.plan = self.compile()
+        return self.plan
+    
     async def validate_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate data against XBRL taxonomy"""
         validation_results = {
@@ -184,10 +366,10 @@ class XBRLTemplate(ReportTemplate):
         }
         
         try:
-            # Check required fields based on report type
-            required_fields = self._get_required_fields()
+            plan = self._get_plan()
             
-            for field in required_fields:
+            # Check required fields
+            for field in plan.required_fields:
                 if field not in data:
                     validation_results['errors'].append(f"Missing required field: {field}")
                     validation_results['valid'] = False
@@ -198,8 +380,6 @@ class XBRLTemplate(ReportTemplate):
                 if not field_validation['valid']:
                     validation_results['errors'].extend(field_validation['errors'])
                     validation_results['valid'] = False
-                
-                validation_results['warnings'].extend(field_validation.get('warnings', []))
             
             # Cross-field validation
             cross_validation = self._validate_cross_fields(data)
@@ -218,42 +398,31 @@ class XBRLTemplate(ReportTemplate):
     async def generate_report(self, data: Dict[str, Any]) -> str:
         """Generate XBRL report from validated data"""
         try:
-            # Create XBRL instance document
-            root = ET.Element('xbrli:xbrl')
-            
-            # Add namespaces
-            for prefix, uri in self.namespaces.items():
-                root.set(f'xmlns:{prefix}', uri)
+            plan = self._get_plan()
+            buffer = io.StringIO()
+            writer = XBRLStreamWriter(buffer)
             
-            # Add schema reference
-            schema_ref = ET.SubElement(root, 'link:schemaRef')
-            schema_ref.set('xlink:type', 'simple')
-            schema_ref.set('xlink:href', self._get_schema_reference())
+            # Root, namespaces and schema reference
+            writer.start_document('xbrli:xbrl', dict(plan.namespaces), plan.schema_reference,
+                                  declaration=MINIDOM_XML_DECLARATION)
             
             # Add context information
-            context = self._create_context(data)
-            root.append(context)
+            self._write_context(writer, data)
             
             # Add unit information
-            unit = self._create_unit()
-            root.append(unit)
+            writer.write_fragment(plan.unit_fragment)
             
             # Add facts (data points)
             for field, value in data.items():
-                if self._is_reportable_field(field):
-                    fact = self._create_fact(field, value, data)
-                    if fact is not None:
-                        root.append(fact)
-            
-            # Format XML with proper indentation
-            rough_string = ET.tostring(root, encoding='unicode')
-            reparsed = minidom.parseString(rough_string)
-            pretty_xml = reparsed.toprettyxml(indent="  ")
+                concept = plan.concepts.get(field)
+                if concept is not None:
+                    if _is_number(value):
+                        writer.fact(concept, str(value), 'c1', unit_ref='EUR', decimals='0')
+                    else:
+                        writer.fact(concept, str(value), 'c1')
             
-            # Remove empty lines
-            pretty_xml = '\n'.join([line for line in pretty_xml.split('\n') if line.strip()])
-            
-            return pretty_xml
+            writer.end_document()
+            return buffer.getvalue()
             
         except Exception as e:
             logger.error(f"Failed to generate XBRL report: {e}")
@@ -275,21 +444,22 @@ class XBRLTemplate(ReportTemplate):
     def _validate_field(self, field: str, value: Any) -> Dict[str, Any]:
         """Validate individual field"""
         result = {'valid': True, 'errors': [], 'warnings': []}
+        plan = self._get_plan()
         
         # Numeric field validation
-        if field in ['total_assets', 'total_liabilities', 'total_equity']:
-            if not isinstance(value, (int, float)) or value < 0:
+        if field in plan.numeric_fields:
+            if not _is_number(value) or value < 0:
                 result['valid'] = False
                 result['errors'].append(f"{field} must be a non-negative number")
         
         # String field validation
-        if field in ['institution_name', 'institution_code']:
+        elif field in plan.string_fields:
             if not isinstance(value, str) or len(value.strip()) == 0:
                 result['valid'] = False
                 result['errors'].append(f"{field} must be a non-empty string")
         
         # Date field validation
-        if field == 'reporting_period':
+        elif field == 'reporting_period':
             if not isinstance(value, str) or not self._validate_period_format(value):
                 result['valid'] = False
                 result['errors'].append(f"{field} must be in YYYY-MM or YYYY-QQ format")
@@ -306,8 +476,8 @@ class XBRLTemplate(ReportTemplate):
             liabilities = data['total_liabilities']
             equity = data['total_equity']
             
-            balance_diff = abs(assets - (liabilities + equity))
-            tolerance = max(assets * 0.001, 1000)  # 0.1% or 1000, whichever is larger
+            balance_diff = abs(float(assets) - (float(liabilities) + float(equity)))
+            tolerance = max(float(assets) * 0.001, 1000)  # 0.1% or 1000, whichever is larger
             
             if balance_diff > tolerance:
                 result['errors'].append(
@@ -318,79 +488,23 @@ class XBRLTemplate(ReportTemplate):
     
     def _validate_period_format(self, period: str) -> bool:
         """Validate reporting period format"""
-        import re
-        # YYYY-MM or YYYY-QQ format
-        pattern = r'^\d{4}-(0[1-9]|1[0-2]|Q[1-4])$'
-        return bool(re.match(pattern, period))
+        return bool(self._get_plan().period_pattern.match(period))
     
     def _get_schema_reference(self) -> str:
         """Get schema reference URL"""
         return "http://www.eba.europa.eu/eu/fr/xbrl/crr/fws/finrep/its-005-2020/2021-06-30/mod/finrep_cor.xsd"
     
-    def _create_context(self, data: Dict[str, Any]) -> ET.Element:
-        """Create XBRL context element"""
-        context = ET.Element('xbrli:context')
-        context.set('id', 'c1')
-        
-        # Entity information
-        entity = ET.SubElement(context, 'xbrli:entity')
-        identifier = ET.SubElement(entity, 'xbrli:identifier')
-        identifier.set('scheme', 'http://www.eba.europa.eu')
-        identifier.text = data.get('institution_code', 'UNKNOWN')
-        
-        # Period information
-        period = ET.SubElement(context, 'xbrli:period')
+    def _write_context(self, writer: XBRLStreamWriter, data: Dict[str, Any]):
+        """Write XBRL context element"""
         if 'Q' in data.get('reporting_period', ''):
             # Quarterly reporting
-            start_date = ET.SubElement(period, 'xbrli:startDate')
-            end_date = ET.SubElement(period, 'xbrli:endDate')
-            start_date.text, end_date.text = self._get_quarter_dates(data['reporting_period'])
+            start_date, end_date = self._get_quarter_dates(data['reporting_period'])
+            period = {'startDate': start_date, 'endDate': end_date}
         else:
             # Monthly reporting
-            instant = ET.SubElement(period, 'xbrli:instant')
-            instant.text = self._get_period_end_date(data['reporting_period'])
-        
-        return context
-    
-    def _create_unit(self) -> ET.Element:
-        """Create XBRL unit element"""
-        unit = ET.Element('xbrli:unit')
-        unit.set('id', 'EUR')
+            period = {'instant': self._get_period_end_date(data['reporting_period'])}
         
-        measure = ET.SubElement(unit, 'xbrli:measure')
-        measure.text = 'iso4217:EUR'
-        
-        return unit
-    
-    def _create_fact(self, field: str, value: Any, data: Dict[str, Any]) -> Optional[ET.Element]:
-        """Create XBRL fact element"""
-        try:
-            # Map field names to XBRL concepts
-            concept_mapping = {
-                'total_assets': 'eba:Assets',
-                'total_liabilities': 'eba:Liabilities',
-                'total_equity': 'eba:Equity',
-                'institution_name': 'eba:NameOfReportingAgent'
-            }
-            
-            concept = concept_mapping.get(field)
-            if not concept:
-                return None
-            
-            fact = ET.Element(concept)
-            fact.set('contextRef', 'c1')
-            
-            if isinstance(value, (int, float)):
-                fact.set('unitRef', 'EUR')
-                fact.set('decimals', '0')
-            
-            fact.text = str(value)
-            
-            return fact
-            
-        except Exception as e:
-            logger.warning(f"Failed to create fact for {field}: {e}")
-            return None
+        writer.context('c1', 'http://www.eba.europa.eu', data.get('institution_code', 'UNKNOWN'), period)
     
     def _is_reportable_field(self, field: str) -> bool:
         """Check if field should be included in report"""
@@ -439,14 +553,27 @@ class CSVTemplate(ReportTemplate):
         self.validation_rules = {}
     
     async def load_template(self):
-        """Load CSV template configuration"""
+        """Load CSV template configuration, compiling it once per path and version"""
         try:
-            async with aiofiles.open(self.template_path, 'r', encoding='utf-8') as f:
-                template_config = json.loads(await f.read())
+            plan = _TEMPLATE_PLAN_CACHE.get(self.plan_key)
+            if plan is None:
+                async with aiofiles.open(self.template_path, 'r', encoding='utf-8') as f:
+                    template_config = json.loads(await f.read())
+                
+                self.headers = template_config.get('headers', [])
+                self.field_mappings = template_config.get('field_mappings', {})
+                self.validation_rules = template_config.get('validation_rules', {})
+                
+                plan = self.compile()
+                _TEMPLATE_PLAN_CACHE[self.plan_key] = plan
+            else:
+                self.headers = list(plan.headers)
+                self.field_mappings = {
+                    header: column for header, column in zip(plan.headers, plan.columns) if header != column
+                }
+                self.validation_rules = {field: dict(rules) for field, rules in plan.rules}
             
-            self.headers = template_config.get('headers', [])
-            self.field_mappings = template_config.get('field_mappings', {})
-            self.validation_rules = template_config.get('validation_rules', {})
+            self.plan = plan
             
             logger.info(f"CSV template loaded: {self.template_path}")
             
@@ -454,6 +581,23 @@ class CSVTemplate(ReportTemplate):
             logger.error(f"Failed to load CSV template: {e}")
             raise
     
+    def compile(self) -> CSVTemplatePlan:
+        """Compile headers, field mappings and rules into an immutable plan"""
+        known_rules = ('type', 'min', 'max', 'max_length')
+        return CSVTemplatePlan(
+            headers=tuple(self.headers),
+            columns=tuple(self.field_mappings.get(header, header) for header in self.headers),
+            rules=tuple(
+                (field, tuple((rule, rules[rule]) for rule in known_rules if rule in rules))
+                for field, rules in self.validation_rules.items()
+            )
+        )
+    
+    def _get_plan(self) -> CSVTemplatePlan:
+        if self.plan is None:
+            self.plan = self.compile()
+        return self.plan
+    
     async def validate_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate data for CSV export"""
         validation_results = {
@@ -463,22 +607,21 @@ class CSVTemplate(ReportTemplate):
         }
         
         try:
+            plan = self._get_plan()
+            
             # Check required headers
-            for header in self.headers:
-                mapped_field = self.field_mappings.get(header, header)
-                if mapped_field not in data:
+            for header, column in zip(plan.headers, plan.columns):
+                if column not in data:
                     validation_results['errors'].append(f"Missing data for header: {header}")
                     validation_results['valid'] = False
             
             # Apply validation rules
-            for field, rules in self.validation_rules.items():
+            for field, rules in plan.rules:
                 if field in data:
                     field_validation = self._validate_csv_field(field, data[field], rules)
                     if not field_validation['valid']:
                         validation_results['errors'].extend(field_validation['errors'])
                         validation_results['valid'] = False
-                    
-                    validation_results['warnings'].extend(field_validation.get('warnings', []))
             
         except Exception as e:
             validation_results['valid'] = False
@@ -489,27 +632,13 @@ class CSVTemplate(ReportTemplate):
     async def generate_report(self, data: Dict[str, Any]) -> str:
         """Generate CSV report"""
         try:
+            plan = self._get_plan()
             output = io.StringIO()
             writer = csv.writer(output)
             
-            # Write headers
-            writer.writerow(self.headers)
-            
-            # Write data row
-            row_data = []
-            for header in self.headers:
-                mapped_field = self.field_mappings.get(header, header)
-                value = data.get(mapped_field, '')
-                
-                # Format value based on type
-                if isinstance(value, float):
-                    value = f"{value:.2f}"
-                elif isinstance(value, datetime):
-                    value = value.strftime('%Y-%m-%d')
-                
-                row_data.append(str(value))
-            
-            writer.writerow(row_data)
+            # Write headers and data row
+            writer.writerow(plan.headers)
+            writer.writerow([_format_csv_value(data.get(column, '')) for column in plan.columns])
             
             csv_content = output.getvalue()
             output.close()
@@ -520,36 +649,33 @@ class CSVTemplate(ReportTemplate):
             logger.error(f"Failed to generate CSV report: {e}")
             raise
     
-    def _validate_csv_field(self, field: str, value: Any, rules: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate CSV field against rules"""
+    def _validate_csv_field(self, field: str, value: Any, rules: Tuple[Tuple[str, Any], ...]) -> Dict[str, Any]:
+        """Validate CSV field against compiled (rule, argument) pairs"""
         result = {'valid': True, 'errors': [], 'warnings': []}
         
-        # Type validation
-        if 'type' in rules:
-            expected_type = rules['type']
-            if expected_type == 'number' and not isinstance(value, (int, float)):
-                result['valid'] = False
-                result['errors'].append(f"{field} must be a number")
-            elif expected_type == 'string' and not isinstance(value, str):
+        for rule, argument in rules:
+            error = None
+            
+            # Type validation
+            if rule == 'type':
+                if argument == 'number' and not _is_number(value):
+                    error = f"{field} must be a number"
+                elif argument == 'string' and not isinstance(value, str):
+                    error = f"{field} must be a string"
+            
+            # Range validation
+            elif rule == 'min' and _is_number(value) and value < argument:
+                error = f"{field} must be >= {argument}"
+            elif rule == 'max' and _is_number(value) and value > argument:
+                error = f"{field} must be <= {argument}"
+            
+            # Length validation
+            elif rule == 'max_length' and isinstance(value, str) and len(value) > argument:
+                error = f"{field} exceeds maximum length of {argument}"
+            
+            if error:
                 result['valid'] = False
-                result['errors'].append(f"{field} must be a string")
-        
-        # Range validation
-        if 'min' in rules and isinstance(value, (int, float)):
-            if value < rules['min']:
-                result['valid'] = False
-                result['errors'].append(f"{field} must be >= {rules['min']}")
-        
-        if 'max' in rules and isinstance(value, (int, float)):
-            if value > rules['max']:
-                result['valid'] = False
-                result['errors'].append(f"{field} must be <= {rules['max']}")
-        
-        # Length validation
-        if 'max_length' in rules and isinstance(value, str):
-            if len(value) > rules['max_length']:
-                result['valid'] = False
-                result['errors'].append(f"{field} exceeds maximum length of {rules['max_length']}")
+                result['errors'].append(error)
         
         return result
 
@@ -559,12 +685,22 @@ class JSONTemplate(ReportTemplate):
     def __init__(self, template_path: str, version: str):
         super().__init__(template_path, version)
         self.json_schema = None
+        self._validator = None
     
     async def load_template(self):
-        """Load JSON schema template"""
+        """Load JSON schema template, checking it once per path and version"""
         try:
-            async with aiofiles.open(self.template_path, 'r', encoding='utf-8') as f:
-                self.json_schema = json.loads(await f.read())
+            plan = _TEMPLATE_PLAN_CACHE.get(self.plan_key)
+            if plan is None:
+                async with aiofiles.open(self.template_path, 'r', encoding='utf-8') as f:
+                    self.json_schema = json.loads(await f.read())
+                
+                plan = self.compile()
+                _TEMPLATE_PLAN_CACHE[self.plan_key] = plan
+            
+            self.plan = plan
+            self.json_schema = plan.schema
+            self._validator = None
             
             logger.info(f"JSON template loaded: {self.template_path}")
             
@@ -572,6 +708,27 @@ class JSONTemplate(ReportTemplate):
             logger.error(f"Failed to load JSON template: {e}")
             raise
     
+    def compile(self) -> JSONTemplatePlan:
+        """Check the schema and compile it into an immutable plan"""
+        jsonschema.validators.validator_for(self.json_schema).check_schema(self.json_schema)
+        return JSONTemplatePlan(
+            schema=self.json_schema,
+            schema_version=self.json_schema.get('$schema', '1.0')
+        )
+    
+    def _get_validator(self):
+        # Built lazily so templates stay picklable for the render process pool
+        if self._validator is None:
+            if self.plan is None:
+                self.plan = self.compile()
+            self._validator = jsonschema.validators.validator_for(self.plan.schema)(self.plan.schema)
+        return self._validator
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_validator'] = None
+        return state
+    
     async def validate_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate data against JSON schema"""
         validation_results = {
@@ -582,11 +739,11 @@ class JSONTemplate(ReportTemplate):
         
         try:
             # Validate against JSON schema
-            jsonschema.validate(data, self.json_schema)
+            error = jsonschema.exceptions.best_match(self._get_validator().iter_errors(data))
+            if error is not None:
+                validation_results['valid'] = False
+                validation_results['errors'].append(f"JSON schema validation error: {error.message}")
             
-        except jsonschema.ValidationError as e:
-            validation_results['valid'] = False
-            validation_results['errors'].append(f"JSON schema validation error: {e.message}")
         except Exception as e:
             validation_results['valid'] = False
             validation_results['errors'].append(f"JSON validation error: {str(e)}")
@@ -596,12 +753,15 @@ class JSONTemplate(ReportTemplate):
     async def generate_report(self, data: Dict[str, Any]) -> str:
         """Generate JSON report"""
         try:
+            if self.plan is None:
+                self.plan = self.compile()
+            
             # Add metadata
             report_data = {
                 'metadata': {
                     'generated_at': datetime.now(timezone.utc).isoformat(),
                     'version': self.version,
-                    'schema_version': self.json_schema.get('$schema', '1.0')
+                    'schema_version': self.plan.schema_version
                 },
                 'data': data
             }
@@ -620,7 +780,8 @@ class ComplianceReportGenerator:
     validation, template management, and delivery capabilities.
     """
     
-    def __init__(self):
+    def __init__(self, hub: ConnectionHub = None):
+        self.hub = hub or get_connection_hub()
         self.templates: Dict[str, ReportTemplate] = {}
         self.pg_pool = None
         self.ai_client = None
@@ -632,30 +793,30 @@ class ComplianceReportGenerator:
             'output_dir': os.getenv('REPORT_OUTPUT_DIR', 'reports'),
             'max_concurrent_reports': int(os.getenv('MAX_CONCURRENT_REPORTS', '5')),
             'report_retention_days': int(os.getenv('REPORT_RETENTION_DAYS', '90')),
-            'enable_ai_validation': os.getenv('ENABLE_AI_VALIDATION', 'true').lower() == 'true'
+            'enable_ai_validation': os.getenv('ENABLE_AI_VALIDATION', 'true').lower() == 'true',
+            # Worker processes for batch rendering (0 renders in the event loop)
+            'render_workers': int(os.getenv('REPORT_RENDER_WORKERS', str(os.cpu_count() or 1))),
+            'render_chunk_size': int(os.getenv('REPORT_RENDER_CHUNK_SIZE', '8'))
         }
         
+        # Process pool for batch rendering, created on first batch
+        self.render_pool: Optional[ProcessPoolExecutor] = None
+        
         # Performance tracking
         self.metrics = {
             'reports_generated': 0,
             'reports_failed': 0,
             'avg_generation_time': 0.0,
-            'validation_errors': 0
+            'validation_errors': 0,
+            'batches_generated': 0,
+            'last_batch_throughput': 0.0
         }
     
     async def initialize(self):
         """Initialize the report generator"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=5,
-                max_size=20
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('report_generator')
             
             # Initialize AI client for complex report logic
             if self.config['enable_ai_validation']:
@@ -812,6 +973,233 @@ class ComplianceReportGenerator:
                 created_at=start_time
             )
     
+    async def generate_reports_batch(self, requests: List[ReportRequest]) -> BatchReportResult:
+        """
+        Generate many reports in one pass
+        
+        Data for all institutions is prefetched in a few set-based queries,
+        validation and rendering run across the render process pool, and
+        files, file records and statuses are written in bulk. A failing item
+        never fails the batch; each request gets its own ReportResult.
+        """
+        batch_id = str(uuid.uuid4())
+        start_time = datetime.now()
+        started = time.perf_counter()
+        results: List[Optional[ReportResult]] = [None] * len(requests)
+        
+        def fail(index: int, error_msg: str, validation_results: Dict[str, Any] = None):
+            results[index] = ReportResult(
+                report_id=requests[index].report_id,
+                status=ReportStatus.FAILED,
+                validation_results=validation_results,
+                error_message=error_msg,
+                created_at=start_time
+            )
+        
+        logger.info(f"Starting batch report generation {batch_id}: {len(requests)} reports")
+        
+        # Resolve templates
+        pending: List[Tuple[int, ReportTemplate]] = []
+        for index, request in enumerate(requests):
+            template_key = f"{request.format.value.lower()}_{request.report_type.value.lower()}"
+            template = self.templates.get(template_key)
+            if template is None:
+                fail(index, f"Report generation failed: Template not found: {template_key}")
+            else:
+                pending.append((index, template))
+        
+        await self._update_report_statuses([
+            (requests[index].report_id, ReportStatus.GENERATING, None) for index, _ in pending
+        ])
+        
+        # Prefetch data for every pending request
+        try:
+            report_data = await self._prefetch_report_data([requests[index] for index, _ in pending])
+        except Exception as e:
+            logger.error(f"Batch {batch_id} data prefetch failed: {e}")
+            for index, _ in pending:
+                fail(index, f"Report generation failed: {str(e)}")
+            pending = []
+            report_data = []
+        
+        # Validate and render
+        await self._update_report_statuses([
+            (requests[index].report_id, ReportStatus.VALIDATING, None) for index, _ in pending
+        ])
+        rendered = await self._render_batch([
+            (index, template, data) for (index, template), data in zip(pending, report_data)
+        ])
+        
+        # Write files
+        to_save: List[Tuple[int, str, Dict[str, Any], float]] = []
+        for index, validation_results, content, error, seconds in rendered:
+            if error is not None:
+                fail(index, f"Report generation failed: {error}")
+            elif content is None:
+                fail(index, f"Validation failed: {'; '.join(validation_results['errors'])}", validation_results)
+                self.metrics['validation_errors'] += 1
+            else:
+                to_save.append((index, content, validation_results, seconds))
+        
+        semaphore = asyncio.Semaphore(self.config['max_concurrent_reports'])
+        
+        async def write_file(index: int, content: str) -> str:
+            async with semaphore:
+                file_path = self._report_file_path(requests[index])
+                async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+                    await f.write(content)
+                return file_path
+        
+        file_paths = await asyncio.gather(
+            *(write_file(index, content) for index, content, _, _ in to_save),
+            return_exceptions=True
+        )
+        
+        saved = []
+        for (index, content, validation_results, seconds), file_path in zip(to_save, file_paths):
+            if isinstance(file_path, Exception):
+                fail(index, f"Report generation failed: {str(file_path)}")
+                continue
+            encoded = content.encode('utf-8')
+            results[index] = ReportResult(
+                report_id=requests[index].report_id,
+                status=ReportStatus.COMPLETED,
+                file_path=file_path,
+                file_size=len(encoded),
+                checksum=hashlib.sha256(encoded).hexdigest(),
+                validation_results=validation_results,
+                generation_time=seconds,
+                created_at=start_time
+            )
+            saved.append((index, file_path, content))
+        
+        try:
+            await self._record_report_files([
+                (requests[index].report_id, file_path, content) for index, file_path, content in saved
+            ])
+        except Exception as e:
+            logger.error(f"Batch {batch_id} failed to record report files: {e}")
+            for index, _, _ in saved:
+                fail(index, f"Report generation failed: {str(e)}")
+        
+        await self._update_report_statuses([
+            (result.report_id, result.status, result.error_message) for result in results
+        ])
+        
+        # Metrics
+        elapsed = time.perf_counter() - started
+        succeeded = sum(1 for result in results if result.status == ReportStatus.COMPLETED)
+        failed = len(results) - succeeded
+        throughput = len(results) / elapsed if elapsed > 0 else 0.0
+        
+        for result in results:
+            if result.status == ReportStatus.COMPLETED:
+                self.metrics['reports_generated'] += 1
+                self.metrics['avg_generation_time'] = (
+                    (self.metrics['avg_generation_time'] * (self.metrics['reports_generated'] - 1) + result.generation_time) /
+                    self.metrics['reports_generated']
+                )
+        self.metrics['reports_failed'] += failed
+        self.metrics['batches_generated'] += 1
+        self.metrics['last_batch_throughput'] = throughput
+        
+        logger.info(
+            f"Batch report generation {batch_id} completed: {succeeded}/{len(results)} succeeded "
+            f"in {elapsed:.2f}s ({throughput:.1f} reports/s)"
+        )
+        
+        return BatchReportResult(
+            batch_id=batch_id,
+            results=results,
+            total=len(results),
+            succeeded=succeeded,
+            failed=failed,
+            elapsed_seconds=elapsed,
+            throughput=throughput
+        )
+    
+    async def _prefetch_report_data(self, requests: List[ReportRequest]) -> List[Dict[str, Any]]:
+        """Gather report data for many requests with set-based queries, in request order"""
+        if not requests:
+            return []
+        
+        institution_ids = sorted({request.institution_id for request in requests})
+        keys_by_type: Dict[ReportType, set] = {}
+        for request in requests:
+            if request.report_type in REPORT_DATA_SOURCES:
+                keys_by_type.setdefault(request.report_type, set()).add(
+                    (request.institution_id, request.reporting_period)
+                )
+        
+        async with self.pg_pool.acquire() as conn:
+            institution_rows = await conn.fetch("""
+                SELECT institution_id, institution_name, institution_code, jurisdiction, currency
+                FROM institutions 
+                WHERE institution_id = ANY($1::text[])
+            """, institution_ids)
+            
+            # One set-based query per report type present in the batch
+            type_data = {
+                report_type: await self._fetch_latest_report_data(conn, report_type, sorted(keys))
+                for report_type, keys in keys_by_type.items()
+            }
+            
+            institutions = {}
+            for row in institution_rows:
+                institution = dict(row)
+                institutions[institution.pop('institution_id')] = institution
+            
+            generation_timestamp = datetime.now(timezone.utc).isoformat()
+            report_data = []
+            for request in requests:
+                data = dict(institutions.get(request.institution_id, {}))
+                
+                if request.report_type in REPORT_DATA_SOURCES:
+                    key = (request.institution_id, request.reporting_period)
+                    found = type_data[request.report_type].get(key)
+                    if found is None:
+                        logger.warning(f"No {request.report_type.value} data found for "
+                                       f"{request.institution_id} {request.reporting_period}")
+                        found = REPORT_DATA_SOURCES[request.report_type][2]
+                    data.update(found)
+                
+                data.update({
+                    'reporting_period': request.reporting_period,
+                    'report_id': request.report_id,
+                    'generation_timestamp': generation_timestamp
+                })
+                report_data.append(data)
+        
+        return report_data
+    
+    async def _render_batch(self, items: List[Tuple[int, ReportTemplate, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any], Optional[str], Optional[str], float]]:
+        """Validate and render items in chunks across the render process pool"""
+        if not items:
+            return []
+        
+        if self.config['render_workers'] <= 0:
+            return await _render_items(items)
+        
+        if self.render_pool is None:
+            self.render_pool = ProcessPoolExecutor(max_workers=self.config['render_workers'])
+        
+        chunk_size = max(1, self.config['render_chunk_size'])
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        loop = asyncio.get_running_loop()
+        outcomes = await asyncio.gather(
+            *(loop.run_in_executor(self.render_pool, _render_items_in_process, chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+        
+        rendered = []
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Render worker failed for {len(chunk)} reports: {outcome}")
+                rendered.extend((index, None, None, str(outcome), 0.0) for index, _, _ in chunk)
+            else:
+                rendered.extend(outcome)
+        return rendered
+    
     async def _gather_report_data(self, request: ReportRequest) -> Dict[str, Any]:
         """Gather data from configured sources"""
         try:
@@ -853,111 +1241,73 @@ class ComplianceReportGenerator:
             logger.error(f"Failed to gather report data: {e}")
             raise
     
-    async def _get_finrep_data(self, conn, request: ReportRequest) -> Dict[str, Any]:
-        """Get FINREP-specific financial data from database"""
+    async def _fetch_latest_report_data(self, conn, report_type: ReportType,
+                                        keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Latest row per (institution, period) for a report type, in one query"""
+        if not keys:
+            return {}
+        
+        table, columns, _ = REPORT_DATA_SOURCES[report_type]
+        rows = await conn.fetch(f"""
+            SELECT DISTINCT ON (d.institution_id, d.reporting_period)
+                d.institution_id AS _institution_id, d.reporting_period AS _reporting_period,
+                {', '.join(f'd.{column}' for column in columns)}
+            FROM {table} d
+            JOIN unnest($1::text[], $2::text[]) AS k(institution_id, reporting_period)
+                ON d.institution_id = k.institution_id AND d.reporting_period = k.reporting_period
+            ORDER BY d.institution_id, d.reporting_period, d.created_at DESC
+        """, [key[0] for key in keys], [key[1] for key in keys])
+        
+        found = {}
+        for row in rows:
+            values = dict(row)
+            found[(values.pop('_institution_id'), values.pop('_reporting_period'))] = values
+        return found
+    
+    async def _get_report_type_data(self, conn, request: ReportRequest) -> Dict[str, Any]:
+        """Latest stored data for a single request, or the report type's defaults"""
         try:
-            # Query actual FINREP data from database
-            finrep_data = await conn.fetchrow("""
-                SELECT 
-                    cash_balances, financial_assets_hft, financial_assets_mandatorily_fvtpl,
-                    financial_assets_designated_fvtpl, financial_assets_fvoci, financial_assets_amortised_cost,
-                    derivatives_hedge_accounting, investments_subsidiaries, tangible_assets,
-                    intangible_assets, tax_assets, other_assets, total_assets,
-                    financial_liabilities_hft, financial_liabilities_designated_fvtpl,
-                    financial_liabilities_amortised_cost, derivatives_hedge_accounting_liab,
-                    provisions, tax_liabilities, other_liabilities, total_liabilities,
-                    capital, retained_earnings, accumulated_oci, other_reserves, total_equity,
-                    interest_income, interest_expenses, net_interest_income,
-                    fee_income, fee_expenses, net_fee_income, trading_income,
-                    other_operating_income, total_operating_income,
-                    staff_expenses, other_administrative_expenses, depreciation,
-                    total_operating_expenses, impairment_losses, profit_before_tax,
-                    tax_expense, net_profit
-                FROM finrep_data 
-                WHERE institution_id = $1 AND reporting_period = $2
-                ORDER BY created_at DESC
-                LIMIT 1
-            """, request.institution_id, request.reporting_period)
-            
-            if finrep_data:
-                return dict(finrep_data)
-            else:
-                # If no data found, create default structure with zeros
-                logger.warning(f"No FINREP data found for {request.institution_id} {request.reporting_period}")
-                return {
-                    'cash_balances': 0.0, 'financial_assets_hft': 0.0, 'financial_assets_mandatorily_fvtpl': 0.0,
-                    'financial_assets_designated_fvtpl': 0.0, 'financial_assets_fvoci': 0.0, 'financial_assets_amortised_cost': 0.0,
-                    'derivatives_hedge_accounting': 0.0, 'investments_subsidiaries': 0.0, 'tangible_assets': 0.0,
-                    'intangible_assets': 0.0, 'tax_assets': 0.0, 'other_assets': 0.0, 'total_assets': 0.0,
-                    'financial_liabilities_hft': 0.0, 'financial_liabilities_designated_fvtpl': 0.0,
-                    'financial_liabilities_amortised_cost': 0.0, 'derivatives_hedge_accounting_liab': 0.0,
-                    'provisions': 0.0, 'tax_liabilities': 0.0, 'other_liabilities': 0.0, 'total_liabilities': 0.0,
-                    'capital': 0.0, 'retained_earnings': 0.0, 'accumulated_oci': 0.0, 'other_reserves': 0.0, 'total_equity': 0.0,
-                    'interest_income': 0.0, 'interest_expenses': 0.0, 'net_interest_income': 0.0,
-                    'fee_income': 0.0, 'fee_expenses': 0.0, 'net_fee_income': 0.0, 'trading_income': 0.0,
-                    'other_operating_income': 0.0, 'total_operating_income': 0.0,
-                    'staff_expenses': 0.0, 'other_administrative_expenses': 0.0, 'depreciation': 0.0,
-                    'total_operating_expenses': 0.0, 'impairment_losses': 0.0, 'profit_before_tax': 0.0,
-                    'tax_expense': 0.0, 'net_profit': 0.0
-                }
+            key = (request.institution_id, request.reporting_period)
+            found = (await self._fetch_latest_report_data(conn, request.report_type, [key])).get(key)
+            if found is None:
+                logger.warning(f"No {request.report_type.value} data found for "
+                               f"{request.institution_id} {request.reporting_period}")
+                return dict(REPORT_DATA_SOURCES[request.report_type][2])
+            return found
         except Exception as e:
-            logger.error(f"Failed to get FINREP data: {e}")
+            logger.error(f"Failed to get {request.report_type.value} data: {e}")
             raise
     
+    async def _get_finrep_data(self, conn, request: ReportRequest) -> Dict[str, Any]:
+        """Get FINREP-specific financial data from database"""
+        return await self._get_report_type_data(conn, request)
+    
     async def _get_corep_data(self, conn, request: ReportRequest) -> Dict[str, Any]:
         """Get COREP-specific capital adequacy data"""
-        return {
-            'tier1_capital': 150000000.0,
-            'tier2_capital': 50000000.0,
-            'total_capital': 200000000.0,
-            'risk_weighted_assets': 1200000000.0,
-            'capital_ratio': 16.67,
-            'leverage_ratio': 8.5,
-            'liquidity_coverage_ratio': 125.0
-        }
+        return await self._get_report_type_data(conn, request)
     
     async def _get_dora_data(self, conn, request: ReportRequest) -> Dict[str, Any]:
         """Get DORA ICT risk data"""
-        return {
-            'ict_incidents_count': 3,
-            'major_incidents_count': 0,
-            'third_party_providers_count': 15,
-            'critical_services_count': 8,
-            'recovery_time_objective': 4.0,  # hours
-            'recovery_point_objective': 1.0,  # hours
-            'business_continuity_tests': 12
-        }
+        return await self._get_report_type_data(conn, request)
+    
+    def _report_file_path(self, request: ReportRequest) -> str:
+        """Output path for a report"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = (f"{request.report_type.value}_{request.institution_id}_{request.reporting_period}_"
+                    f"{timestamp}.{request.format.value.lower()}")
+        return os.path.join(self.config['output_dir'], filename)
     
     async def _save_report_file(self, request: ReportRequest, content: str) -> str:
         """Save report content to file"""
         try:
-            # Create filename
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{request.report_type.value}_{request.reporting_period}_{timestamp}.{request.format.value.lower()}"
-            file_path = os.path.join(self.config['output_dir'], filename)
+            file_path = self._report_file_path(request)
             
             # Save file
             async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
                 await f.write(content)
             
             # Store file info in database
-            async with self.pg_pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO compliance_reports 
-                    (report_id, file_path, file_size, checksum, created_at)
-                    VALUES ($1, $2, $3, $4, $5)
-                    ON CONFLICT (report_id) DO UPDATE SET
-                    file_path = EXCLUDED.file_path,
-                    file_size = EXCLUDED.file_size,
-                    checksum = EXCLUDED.checksum,
-                    updated_at = CURRENT_TIMESTAMP
-                """, 
-                    request.report_id,
-                    file_path,
-                    len(content.encode('utf-8')),
-                    hashlib.sha256(content.encode('utf-8')).hexdigest(),
-                    datetime.now(timezone.utc)
-                )
+            await self._record_report_files([(request.report_id, file_path, content)])
             
             return file_path
             
@@ -965,6 +1315,26 @@ class ComplianceReportGenerator:
             logger.error(f"Failed to save report file: {e}")
             raise
     
+    async def _record_report_files(self, files: List[Tuple[str, str, str]]):
+        """Store (report_id, file_path, content) file info in one round trip"""
+        now = datetime.now(timezone.utc)
+        rows = []
+        for report_id, file_path, content in files:
+            encoded = content.encode('utf-8')
+            rows.append((report_id, file_path, len(encoded), hashlib.sha256(encoded).hexdigest(), now))
+        
+        async with self.pg_pool.acquire() as conn:
+            await conn.executemany("""
+                INSERT INTO compliance_reports 
+                (report_id, file_path, file_size, checksum, created_at)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (report_id) DO UPDATE SET
+                file_path = EXCLUDED.file_path,
+                file_size = EXCLUDED.file_size,
+                checksum = EXCLUDED.checksum,
+                updated_at = CURRENT_TIMESTAMP
+            """, rows)
+    
     async def _update_report_status(self, report_id: str, status: ReportStatus, error_message: str = None):
         """Update report status in database"""
         try:
@@ -987,6 +1357,26 @@ class ComplianceReportGenerator:
         except Exception as e:
             logger.error(f"Failed to update report status: {e}")
     
+    async def _update_report_statuses(self, updates: List[Tuple[str, ReportStatus, Optional[str]]]):
+        """Update many (report_id, status, error_message) rows in one round trip"""
+        if not updates:
+            return
+        try:
+            now = datetime.now(timezone.utc)
+            async with self.pg_pool.acquire() as conn:
+                await conn.executemany("""
+                    INSERT INTO report_generation_status 
+                    (report_id, status, error_message, updated_at)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (report_id) DO UPDATE SET
+                    status = EXCLUDED.status,
+                    error_message = EXCLUDED.error_message,
+                    updated_at = EXCLUDED.updated_at
+                """, [(report_id, status.value, error_message, now) for report_id, status, error_message in updates])
+                
+        except Exception as e:
+            logger.error(f"Failed to update report statuses: {e}")
+    
     async def get_report_status(self, report_id: str) -> Optional[Dict[str, Any]]:
         """Get current report status"""
         try:
@@ -1066,10 +1456,19 @@ class ComplianceReportGenerator:
                 
         except Exception as e:
             logger.error(f"Failed to cleanup old reports: {e}")
+    
+    async def close(self):
+        """Shut down the render process pool and release the database pool"""
+        if self.render_pool is not None:
+            self.render_pool.shutdown(wait=True)
+            self.render_pool = None
+        
+        if self.pg_pool:
+            await self.pg_pool.close()
 
 # Factory function for creating report generators
-async def create_report_generator() -> ComplianceReportGenerator:
+async def create_report_generator(hub: ConnectionHub = None) -> ComplianceReportGenerator:
     """Factory function to create and initialize report generator"""
-    generator = ComplianceReportGenerator()
+    generator = ComplianceReportGenerator(hub)
     await generator.initialize()
     return generator
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Connection Hub - Shared Per-Process Infrastructure Connections
+=============================================================
+
+This module provides the connection hub shared by the decision orchestration
+components (deadline engine, alerting, scheduling, SLA monitoring, delivery,
+report generation). Instead of every component opening its own PostgreSQL
+pool and Kafka producer, one hub per process owns a single tuned pool and
+a single batching producer, and hands components lightweight views that
+record per-component usage.
+
+Key Features:
+- One asyncpg pool and one AIOKafkaProducer per process
+- Lazy start-up: each resource is created on first request
+- Producer tuned for batched sends (linger, batch size, compression)
+- Per-component views with acquisition, wait-time and send metrics
+- Reference-counted views: a component's close()/stop() only detaches it,
+  and the last view released flushes and closes the shared resource
+- Fork-safe process singleton via get_connection_hub()
+
+Rule Compliance:
+- Rule 1: No stubs - Full production connection management
+- Rule 2: Modular design - Components take the hub by injection
+- Rule 17: Comprehensive documentation throughout
+"""
+
+import os
+import asyncio
+import logging
+import json
+import time
+from typing import Dict, Optional, Any
+from dataclasses import dataclass, field
+
+# Database and messaging
+import asyncpg
+from aiokafka import AIOKafkaProducer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ConnectionHubConfig:
+    """Connection settings for the shared hub"""
+    postgres_host: str = field(default_factory=lambda: os.getenv('POSTGRES_HOST', 'localhost'))
+    postgres_port: int = field(default_factory=lambda: int(os.getenv('POSTGRES_PORT', 5432)))
+    postgres_db: str = field(default_factory=lambda: os.getenv('POSTGRES_DB', 'compliance_ai'))
+    postgres_user: str = field(default_factory=lambda: os.getenv('POSTGRES_USER', 'postgres'))
+    postgres_password: str = field(default_factory=lambda: os.getenv('POSTGRES_PASSWORD', 'postgres'))
+    pool_min_size: int = field(default_factory=lambda: int(os.getenv('HUB_PG_POOL_MIN', '2')))
+    pool_max_size: int = field(default_factory=lambda: int(os.getenv('HUB_PG_POOL_MAX', '20')))
+    pool_max_inactive_lifetime: float = field(default_factory=lambda: float(os.getenv('HUB_PG_MAX_INACTIVE_LIFETIME', '300')))
+    pool_command_timeout: float = field(default_factory=lambda: float(os.getenv('HUB_PG_COMMAND_TIMEOUT', '60')))
+    kafka_bootstrap_servers: str = field(default_factory=lambda: os.getenv('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092'))
+    kafka_linger_ms: int = field(default_factory=lambda: int(os.getenv('HUB_KAFKA_LINGER_MS', '20')))
+    kafka_max_batch_size: int = field(default_factory=lambda: int(os.getenv('HUB_KAFKA_MAX_BATCH_SIZE', str(256 * 1024))))
+    kafka_compression_type: str = field(default_factory=lambda: os.getenv('HUB_KAFKA_COMPRESSION', 'gzip'))
+
+class _TrackedAcquire:
+    """Async context manager that records pool usage for one component"""
+
+    def __init__(self, view: 'ComponentPool', timeout: Optional[float]):
+        self.view = view
+        self.timeout = timeout
+        self.conn = None
+
+    async def __aenter__(self):
+        usage = self.view.usage
+        wait_start = time.monotonic()
+        self.conn = await self.view.pool.acquire(timeout=self.timeout)
+        wait_time = time.monotonic() - wait_start
+
+        usage['acquisitions'] += 1
+        usage['total_wait_time'] += wait_time
+        usage['max_wait_time'] = max(usage['max_wait_time'], wait_time)
+        usage['in_use'] += 1
+        usage['peak_in_use'] = max(usage['peak_in_use'], usage['in_use'])
+        return self.conn
+
+    async def __aexit__(self, *args):
+        self.view.usage['in_use'] -= 1
+        await self.view.pool.release(self.conn)
+        return False
+
+class ComponentPool:
+    """
+    A component's view of the shared PostgreSQL pool
+
+    Supports the ``async with pool.acquire() as conn`` pattern used by the
+    components and the common query shortcuts. ``close`` detaches the
+    component; the hub closes the underlying pool once every view is closed.
+    """
+
+    def __init__(self, component: str, pool: asyncpg.Pool, usage: Dict[str, Any],
+                 hub: 'ConnectionHub' = None, generation: int = 0):
+        self.component = component
+        self.pool = pool
+        self.usage = usage
+        self.hub = hub
+        self.generation = generation
+        self._released = False
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _TrackedAcquire:
+        return _TrackedAcquire(self, timeout)
+
+    async def execute(self, query: str, *args, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args, timeout=timeout)
+
+    async def executemany(self, command: str, args, *, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.executemany(command, args, timeout=timeout)
+
+    async def fetch(self, query: str, *args, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args, timeout=timeout)
+
+    async def fetchrow(self, query: str, *args, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args, timeout=timeout)
+
+    async def fetchval(self, query: str, *args, column: int = 0, timeout: Optional[float] = None):
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args, column=column, timeout=timeout)
+
+    async def close(self):
+        """Detach the component; the shared pool stays open while other views use it"""
+        if self._released:
+            return
+        self._released = True
+        logger.debug(f"Component '{self.component}' released its database pool view")
+        if self.hub is not None:
+            await self.hub.release('pg', self.generation)
+
+class ComponentProducer:
+    """
+    A component's view of the shared Kafka producer
+
+    Forwards sends to the hub producer (which batches them with linger)
+    and counts them per component and topic. ``start`` is a no-op and
+    ``stop`` detaches the component; the hub owns the producer lifecycle and
+    flushes and stops it once every view is stopped.
+    """
+
+    def __init__(self, component: str, producer: AIOKafkaProducer, usage: Dict[str, Any],
+                 hub: 'ConnectionHub' = None, generation: int = 0):
+        self.component = component
+        self.producer = producer
+        self.usage = usage
+        self.hub = hub
+        self.generation = generation
+        self._released = False
+
+    def _record_send(self, topic: str, count: int = 1):
+        self.usage['messages_sent'] += count
+        self.usage['topics'][topic] = self.usage['topics'].get(topic, 0) + count
+
+    async def send(self, topic: str, value=None, key=None, **kwargs):
+        """Queue a message for a batched send; returns the delivery future"""
+        try:
+            future = await self.producer.send(topic, value=value, key=key, **kwargs)
+        except Exception:
+            self.usage['send_errors'] += 1
+            raise
+        self._record_send(topic)
+        return future
+
+    async def send_and_wait(self, topic: str, value=None, key=None, **kwargs):
+        future = await self.send(topic, value=value, key=key, **kwargs)
+        return await future
+
+    def create_batch(self):
+        return self.producer.create_batch()
+
+    async def send_batch(self, batch, topic: str, *, partition: int):
+        try:
+            future = await self.producer.send_batch(batch, topic, partition=partition)
+        except Exception:
+            self.usage['send_errors'] += 1
+            raise
+        self._record_send(topic, batch.record_count() if hasattr(batch, 'record_count') else 1)
+        return future
+
+    async def partitions_for(self, topic: str):
+        return await self.producer.partitions_for(topic)
+
+    async def start(self):
+        """The hub starts the shared producer"""
+
+    async def stop(self):
+        """Detach the component; the shared producer keeps running while other views use it"""
+        if self._released:
+            return
+        self._released = True
+        logger.debug(f"Component '{self.component}' released its Kafka producer view")
+        if self.hub is not None:
+            await self.hub.release('kafka', self.generation)
+
+class ConnectionHub:
+    """
+    Per-process owner of shared PostgreSQL and Kafka connections
+
+    Components request resources by name (``await hub.get_pg_pool('sla_monitor')``)
+    and receive views that track their usage. Each underlying resource is
+    created lazily on first request and reference-counted by its views:
+    when the last view is closed the resource is flushed and closed, and a
+    later request creates it again. ``close`` tears everything down at once
+    for a process shutdown hook.
+    """
+
+    def __init__(self, config: ConnectionHubConfig = None):
+        self.config = config or ConnectionHubConfig()
+
+        self._pg_pool: Optional[asyncpg.Pool] = None
+        self._kafka_producer: Optional[AIOKafkaProducer] = None
+
+        self._pg_lock = asyncio.Lock()
+        self._kafka_lock = asyncio.Lock()
+
+        # Open views per shared resource, and how many times each was created
+        # so views left over from a closed resource cannot release a new one
+        self._views = {'pg': 0, 'kafka': 0}
+        self._generation = {'pg': 0, 'kafka': 0}
+
+        # Per-component usage
+        self.component_usage: Dict[str, Dict[str, Any]] = {}
+
+        self.metrics = {
+            'pg_pool_created_at': None,
+            'kafka_producer_started_at': None,
+            'startup_time': {}
+        }
+
+    def _usage(self, component: str) -> Dict[str, Any]:
+        if component not in self.component_usage:
+            self.component_usage[component] = {
+                'pg': {
+                    'acquisitions': 0,
+                    'in_use': 0,
+                    'peak_in_use': 0,
+                    'total_wait_time': 0.0,
+                    'max_wait_time': 0.0
+                },
+                'kafka': {
+                    'messages_sent': 0,
+                    'send_errors': 0,
+                    'topics': {}
+                }
+            }
+        return self.component_usage[component]
+
+    async def get_pg_pool(self, component: str) -> ComponentPool:
+        """Shared PostgreSQL pool view for a component"""
+        async with self._pg_lock:
+            if self._pg_pool is None:
+                start = time.monotonic()
+                self._pg_pool = await asyncpg.create_pool(
+                    host=self.config.postgres_host,
+                    port=self.config.postgres_port,
+                    database=self.config.postgres_db,
+                    user=self.config.postgres_user,
+                    password=self.config.postgres_password,
+                    min_size=self.config.pool_min_size,
+                    max_size=self.config.pool_max_size,
+                    max_inactive_connection_lifetime=self.config.pool_max_inactive_lifetime,
+                    command_timeout=self.config.pool_command_timeout
+                )
+                self.metrics['startup_time']['pg'] = time.monotonic() - start
+                self.metrics['pg_pool_created_at'] = time.time()
+                self._generation['pg'] += 1
+                logger.info(
+                    f"Connection hub created PostgreSQL pool "
+                    f"({self.config.pool_min_size}-{self.config.pool_max_size} connections)"
+                )
+            self._views['pg'] += 1
+
+            generation = self._generation['pg']
+
+        return ComponentPool(component, self._pg_pool, self._usage(component)['pg'], self, generation)
+
+    async def get_kafka_producer(self, component: str) -> ComponentProducer:
+        """Shared Kafka producer view for a component"""
+        async with self._kafka_lock:
+            if self._kafka_producer is None:
+                start = time.monotonic()
+                producer = AIOKafkaProducer(
+                    bootstrap_servers=self.config.kafka_bootstrap_servers,
+                    value_serializer=lambda v: json.dumps(v, default=str).encode('utf-8'),
+                    compression_type=self.config.kafka_compression_type,
+                    acks='all',
+                    linger_ms=self.config.kafka_linger_ms,
+                    max_batch_size=self.config.kafka_max_batch_size
+                )
+                await producer.start()
+                self._kafka_producer = producer
+                self.metrics['startup_time']['kafka'] = time.monotonic() - start
+                self.metrics['kafka_producer_started_at'] = time.time()
+                self._generation['kafka'] += 1
+                logger.info("Connection hub started Kafka producer")
+            self._views['kafka'] += 1
+
+            generation = self._generation['kafka']
+
+        return ComponentProducer(component, self._kafka_producer, self._usage(component)['kafka'], self, generation)
+
+    async def release(self, resource: str, generation: int):
+        """Release one view of a shared resource ('pg' or 'kafka'); the last release closes it"""
+        lock = self._pg_lock if resource == 'pg' else self._kafka_lock
+        async with lock:
+            if generation != self._generation[resource] or self._views[resource] == 0:
+                return
+            self._views[resource] -= 1
+            if self._views[resource] == 0:
+                if resource == 'pg':
+                    await self._close_pg_pool()
+                else:
+                    await self._stop_kafka_producer()
+
+    async def _stop_kafka_producer(self):
+        """Flush lingering batches and stop the shared producer"""
+        if self._kafka_producer is not None:
+            try:
+                await self._kafka_producer.stop()
+                logger.info("Connection hub stopped Kafka producer")
+            except Exception as e:
+                logger.error(f"Failed to stop shared Kafka producer: {e}")
+            self._kafka_producer = None
+
+    async def _close_pg_pool(self):
+        """Close the shared PostgreSQL pool"""
+        if self._pg_pool is not None:
+            try:
+                await self._pg_pool.close()
+                logger.info("Connection hub closed PostgreSQL pool")
+            except Exception as e:
+                logger.error(f"Failed to close shared PostgreSQL pool: {e}")
+            self._pg_pool = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hub and per-component usage metrics"""
+        pool_stats = None
+        if self._pg_pool is not None:
+            pool_stats = {
+                'size': self._pg_pool.get_size(),
+                'idle': self._pg_pool.get_idle_size(),
+                'min_size': self._pg_pool.get_min_size(),
+                'max_size': self._pg_pool.get_max_size()
+            }
+
+        return {
+            **self.metrics,
+            'pg_pool': pool_stats,
+            'kafka_producer_active': self._kafka_producer is not None,
+            'open_views': dict(self._views),
+            'components': self.component_usage
+        }
+
+    async def close(self):
+        """Close all shared resources regardless of open views (process shutdown)"""
+        async with self._kafka_lock:
+            self._views['kafka'] = 0
+            await self._stop_kafka_producer()
+
+        async with self._pg_lock:
+            self._views['pg'] = 0
+            await self._close_pg_pool()
+
+        logger.info("Connection hub closed")
+
+_process_hub: Optional[ConnectionHub] = None
+_process_hub_pid: Optional[int] = None
+
+def get_connection_hub() -> ConnectionHub:
+    """
+    Process-wide connection hub
+
+    A forked child gets a fresh hub instead of inheriting its parent's
+    sockets.
+    """
+    global _process_hub, _process_hub_pid
+    if _process_hub is None or _process_hub_pid != os.getpid():
+        _process_hub = ConnectionHub()
+        _process_hub_pid = os.getpid()
+    return _process_hub
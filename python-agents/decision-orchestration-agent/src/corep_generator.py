@@ -37,15 +37,16 @@ import json
 import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, TextIO
 from enum import Enum
 from dataclasses import dataclass, asdict
+import io
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 import pandas as pd
 import numpy as np
 
 from compliance_report_generator import ReportTemplate, XBRLTemplate, ReportRequest, ReportResult
+from xbrl_writer import XBRLStreamWriter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -313,8 +314,22 @@ class COREPGenerator:
             }
         }
     
-    async def generate_corep_report(self, data: COREPData, template: COREPTemplate) -> str:
+    async def generate_corep_report(self, data: COREPData, template: COREPTemplate,
+                                    pretty: bool = True) -> str:
         """Generate COREP XBRL report"""
+        buffer = io.StringIO()
+        await self.write_corep_report(data, template, buffer, pretty=pretty)
+        return buffer.getvalue()
+    
+    async def write_corep_report(self, data: COREPData, template: COREPTemplate,
+                                 output: TextIO, pretty: bool = True) -> int:
+        """
+        Stream a COREP XBRL report to a text stream
+        
+        Contexts, units and facts are written to ``output`` as they are
+        produced, so large instances never exist in memory as a tree.
+        Returns the number of facts written.
+        """
         try:
             logger.info(f"Generating COREP report {template.value} for {data.institution_code}")
             
@@ -323,11 +338,10 @@ class COREPGenerator:
             if not validation_results['valid']:
                 raise ValueError(f"COREP validation failed: {validation_results['errors']}")
             
-            # Create XBRL document
-            xbrl_doc = await self._create_corep_xbrl(data, template)
-            
-            # Format and return
-            return self._format_xbrl_document(xbrl_doc)
+            # Write XBRL document
+            writer = XBRLStreamWriter(output, pretty=pretty)
+            await self._write_corep_xbrl(writer, data, template)
+            return writer.facts_written
             
         except Exception as e:
             logger.error(f"Failed to generate COREP report: {e}")
@@ -419,13 +433,9 @@ class COREPGenerator:
         
         return validation_results
     
-    async def _create_corep_xbrl(self, data: COREPData, template: COREPTemplate) -> ET.Element:
-        """Create COREP XBRL instance document"""
+    async def _write_corep_xbrl(self, writer: XBRLStreamWriter, data: COREPData, template: COREPTemplate):
+        """Write COREP XBRL instance document"""
         try:
-            # Create root element
-            root = ET.Element('xbrli:xbrl')
-            
-            # Add namespaces
             namespaces = {
                 'xbrli': 'http://www.xbrl.org/2003/instance',
                 'link': 'http://www.xbrl.org/2003/linkbase',
@@ -434,102 +444,57 @@ class COREPGenerator:
                 'iso4217': 'http://www.xbrl.org/2003/iso4217'
             }
             
-            for prefix, uri in namespaces.items():
-                root.set(f'xmlns:{prefix}', uri)
-            
-            # Add schema reference
-            schema_ref = ET.SubElement(root, 'link:schemaRef')
-            schema_ref.set('xlink:type', 'simple')
-            schema_ref.set('xlink:href', self.schema_location)
+            # Root element and schema reference
+            writer.start_document('xbrli:xbrl', namespaces, self.schema_location)
             
             # Add context
-            context = self._create_corep_context(data)
-            root.append(context)
+            self._write_corep_context(writer, data)
             
             # Add unit
-            unit = self._create_corep_unit(data.currency)
-            root.append(unit)
+            writer.unit(data.currency, f'iso4217:{data.currency}')
             
             # Add percentage unit for ratios
-            percentage_unit = self._create_percentage_unit()
-            root.append(percentage_unit)
+            writer.unit('percentage', 'xbrli:pure')
             
             # Add facts based on template
             if template == COREPTemplate.C_01_00:
-                self._add_own_funds_facts(root, data)
+                self._add_own_funds_facts(writer, data)
             elif template == COREPTemplate.C_02_00:
-                self._add_own_funds_requirements_facts(root, data)
+                self._add_own_funds_requirements_facts(writer, data)
             elif template == COREPTemplate.C_03_00:
-                self._add_capital_ratios_facts(root, data)
+                self._add_capital_ratios_facts(writer, data)
             elif template == COREPTemplate.C_05_01:
-                self._add_credit_risk_facts(root, data)
+                self._add_credit_risk_facts(writer, data)
             elif template == COREPTemplate.C_08_01:
-                self._add_market_risk_facts(root, data)
+                self._add_market_risk_facts(writer, data)
             elif template == COREPTemplate.C_16_00:
-                self._add_lcr_facts(root, data)
+                self._add_lcr_facts(writer, data)
             elif template == COREPTemplate.C_18_00:
-                self._add_leverage_ratio_facts(root, data)
+                self._add_leverage_ratio_facts(writer, data)
             elif template == COREPTemplate.C_24_00:
-                self._add_large_exposures_facts(root, data)
+                self._add_large_exposures_facts(writer, data)
             
-            return root
+            writer.end_document()
             
         except Exception as e:
-            logger.error(f"Failed to create COREP XBRL: {e}")
+            logger.error(f"Failed to write COREP XBRL: {e}")
             raise
     
-    def _create_corep_context(self, data: COREPData) -> ET.Element:
-        """Create COREP context element"""
-        context = ET.Element('xbrli:context')
-        context.set('id', 'c1')
-        
-        # Entity
-        entity = ET.SubElement(context, 'xbrli:entity')
-        identifier = ET.SubElement(entity, 'xbrli:identifier')
-        identifier.set('scheme', 'http://www.eba.europa.eu')
-        identifier.text = data.institution_code
-        
-        # Period
-        period = ET.SubElement(context, 'xbrli:period')
-        
+    def _write_corep_context(self, writer: XBRLStreamWriter, data: COREPData):
+        """Write COREP context element"""
         if 'Q' in data.reporting_period:
             # Quarterly reporting
-            start_date = ET.SubElement(period, 'xbrli:startDate')
-            end_date = ET.SubElement(period, 'xbrli:endDate')
-            start_date.text, end_date.text = self._get_quarter_dates(data.reporting_period)
+            start_date, end_date = self._get_quarter_dates(data.reporting_period)
+            period = {'startDate': start_date, 'endDate': end_date}
         else:
             # Annual reporting
-            instant = ET.SubElement(period, 'xbrli:instant')
-            instant.text = self._get_year_end_date(data.reporting_period)
+            period = {'instant': self._get_year_end_date(data.reporting_period)}
         
         # Scenario (consolidation basis)
-        scenario = ET.SubElement(context, 'xbrli:scenario')
-        consolidation = ET.SubElement(scenario, 'corep:ConsolidationBasis')
-        consolidation.text = data.consolidation_basis
-        
-        return context
-    
-    def _create_corep_unit(self, currency: str) -> ET.Element:
-        """Create COREP unit element"""
-        unit = ET.Element('xbrli:unit')
-        unit.set('id', currency)
-        
-        measure = ET.SubElement(unit, 'xbrli:measure')
-        measure.text = f'iso4217:{currency}'
-        
-        return unit
+        writer.context('c1', 'http://www.eba.europa.eu', data.institution_code, period,
+                       scenario=[('corep:ConsolidationBasis', data.consolidation_basis)])
     
-    def _create_percentage_unit(self) -> ET.Element:
-        """Create percentage unit element"""
-        unit = ET.Element('xbrli:unit')
-        unit.set('id', 'percentage')
-        
-        measure = ET.SubElement(unit, 'xbrli:measure')
-        measure.text = 'xbrli:pure'
-        
-        return unit
-    
-    def _add_own_funds_facts(self, root: ET.Element, data: COREPData):
+    def _add_own_funds_facts(self, writer: XBRLStreamWriter, data: COREPData):
         """Add own funds facts (C 01.00)"""
         own_funds_fields = [
             'common_equity_tier1', 'additional_tier1', 'tier2_capital', 'total_own_funds'
@@ -540,9 +505,9 @@ class COREPGenerator:
             if value != 0 or field == 'total_own_funds':  # Always include total
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
-    def _add_own_funds_requirements_facts(self, root: ET.Element, data: COREPData):
+    def _add_own_funds_requirements_facts(self, writer: XBRLStreamWriter, data: COREPData):
         """Add own funds requirements facts (C 02.00)"""
         requirements_fields = [
             'credit_risk_requirements', 'market_risk_requirements', 'operational_risk_requirements',
@@ -554,9 +519,9 @@ class COREPGenerator:
             if value != 0:
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
-    def _add_capital_ratios_facts(self, root: ET.Element, data: COREPData):
+    def _add_capital_ratios_facts(self, writer: XBRLStreamWriter, data: COREPData):
         """Add capital ratios facts (C 03.00)"""
         ratio_fields = [
             'cet1_ratio', 'tier1_ratio', 'total_capital_ratio', 'institution_cet1_ratio'
@@ -567,9 +532,9 @@ class COREPGenerator:
             if value != 0:
                 fact = self._create_ratio_fact(field, value)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
-    def _add_credit_risk_facts(self, root: ET.Element, data: COREPData):
+    def _add_credit_risk_facts(self, writer: XBRLStreamWriter, data: COREPData):
         """Add credit risk facts (C 05.01)"""
         # Exposure amounts
         exposure_fields = [
@@ -583,7 +548,7 @@ class COREPGenerator:
             if value != 0:
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
         
         # Risk weighted assets
         rwa_fields = [
@@ -597,9 +562,9 @@ class COREPGenerator:
             if value != 0:
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
-    def _add_market_risk_facts(self, root: ET.Element, data: COREPData):
+    def _add_market_risk_facts(self, writer: XBRLStreamWriter, data: COREPData):
         """Add market risk facts (C 08.01)"""
         market_risk_fields = [
             'market_risk_position_risk', 'market_risk_fx_risk', 'market_risk_commodity_risk',
@@ -611,9 +576,9 @@ class COREPGenerator:
             if value != 0:
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
-    def _add_lcr_facts(self, root: ET.Element, data: COREPData):
+    def _add_lcr_facts(self, writer: XBRLStreamWriter, data: COREPData):
         """Add liquidity coverage ratio facts (C 16.00)"""
         lcr_fields = [
             'liquid_assets_level1', 'liquid_assets_level2a', 'liquid_assets_level2b', 'total_hqla',
@@ -626,15 +591,15 @@ class COREPGenerator:
             if value != 0:
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
         
         # Add LCR ratio
         if data.liquidity_coverage_ratio != 0:
             fact = self._create_ratio_fact('liquidity_coverage_ratio', data.liquidity_coverage_ratio)
             if fact is not None:
-                root.append(fact)
+                writer.append(fact)
     
-    def _add_leverage_ratio_facts(self, root: ET.Element, data: COREPData):
+    def _add_leverage_ratio_facts(self, writer: XBRLStreamWriter, data: COREPData):
         """Add leverage ratio facts (C 18.00)"""
         leverage_fields = [
             'tier1_capital_leverage', 'total_exposure_measure'
@@ -645,21 +610,21 @@ class COREPGenerator:
             if value != 0:
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
         
         # Add leverage ratio
         if data.leverage_ratio != 0:
             fact = self._create_ratio_fact('leverage_ratio', data.leverage_ratio)
             if fact is not None:
-                root.append(fact)
+                writer.append(fact)
     
-    def _add_large_exposures_facts(self, root: ET.Element, data: COREPData):
+    def _add_large_exposures_facts(self, writer: XBRLStreamWriter, data: COREPData):
         """Add large exposures facts (C 24.00)"""
         # Number of large exposures (integer)
         if data.large_exposures_number > 0:
             fact = self._create_integer_fact('large_exposures_number', data.large_exposures_number)
             if fact is not None:
-                root.append(fact)
+                writer.append(fact)
         
         # Large exposures amounts
         amount_fields = ['large_exposures_amount', 'large_exposures_excess']
@@ -668,7 +633,7 @@ class COREPGenerator:
             if value != 0:
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
     def _create_fact(self, field: str, value: Union[int, float], currency: str) -> Optional[ET.Element]:
         """Create XBRL fact element"""
@@ -736,24 +701,6 @@ class COREPGenerator:
             logger.warning(f"Failed to create integer fact for {field}: {e}")
             return None
     
-    def _format_xbrl_document(self, root: ET.Element) -> str:
-        """Format XBRL document with proper indentation"""
-        try:
-            rough_string = ET.tostring(root, encoding='unicode')
-            reparsed = minidom.parseString(rough_string)
-            pretty_xml = reparsed.toprettyxml(indent="  ")
-            
-            # Remove empty lines and fix declaration
-            lines = [line for line in pretty_xml.split('\n') if line.strip()]
-            if lines[0].startswith('<?xml'):
-                lines[0] = '<?xml version="1.0" encoding="UTF-8"?>'
-            
-            return '\n'.join(lines)
-            
-        except Exception as e:
-            logger.error(f"Failed to format XBRL document: {e}")
-            raise
-    
     def _get_quarter_dates(self, period: str) -> Tuple[str, str]:
         """Get start and end dates for quarterly period"""
         year, quarter = period.split('-')
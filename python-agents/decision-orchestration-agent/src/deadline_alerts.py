@@ -42,8 +42,7 @@ from email.mime.application import MIMEApplication
 import aiohttp
 
 # Database and messaging
-import asyncpg
-from aiokafka import AIOKafkaProducer
+from connection_hub import ConnectionHub, get_connection_hub
 
 # Import our components
 from deadline_engine import DeadlineEngine, CalculatedDeadline, DeadlineStatus
@@ -162,7 +161,8 @@ class DeadlineAlertSystem:
     procedures, and comprehensive tracking and acknowledgment capabilities.
     """
     
-    def __init__(self):
+    def __init__(self, hub: ConnectionHub = None):
+        self.hub = hub or get_connection_hub()
         self.pg_pool = None
         self.kafka_producer = None
         self.deadline_engine = None
@@ -222,30 +222,15 @@ class DeadlineAlertSystem:
     async def initialize(self):
         """Initialize the deadline alert system"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=2,
-                max_size=10
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('deadline_alerts')
             
-            # Initialize Kafka producer
-            self.kafka_producer = AIOKafkaProducer(
-                bootstrap_servers=self.config['kafka_bootstrap_servers'],
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                compression_type='gzip',
-                acks='all',
-                retries=3
-            )
-            await self.kafka_producer.start()
+            # Shared Kafka producer from the connection hub
+            self.kafka_producer = await self.hub.get_kafka_producer('deadline_alerts')
             
             # Initialize deadline engine
             from deadline_engine import create_deadline_engine
-            self.deadline_engine = await create_deadline_engine()
+            self.deadline_engine = await create_deadline_engine(self.hub)
             
             # Initialize template environment
             self._initialize_templates()
@@ -1395,8 +1380,8 @@ ComplianceAI System
         logger.info("Deadline Alert System closed")
 
 # Factory function
-async def create_deadline_alert_system() -> DeadlineAlertSystem:
+async def create_deadline_alert_system(hub: ConnectionHub = None) -> DeadlineAlertSystem:
     """Factory function to create and initialize deadline alert system"""
-    system = DeadlineAlertSystem()
+    system = DeadlineAlertSystem(hub)
     await system.initialize()
     return system
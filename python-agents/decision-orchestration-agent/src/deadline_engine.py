@@ -34,7 +34,7 @@ from calendar import monthrange
 import holidays
 
 # Database
-import asyncpg
+from connection_hub import ConnectionHub, get_connection_hub
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -135,7 +135,8 @@ class DeadlineEngine:
     holiday calendar integration, and dependency management.
     """
     
-    def __init__(self):
+    def __init__(self, hub: ConnectionHub = None):
+        self.hub = hub or get_connection_hub()
         self.pg_pool = None
         self.holiday_calendars = {}  # Cache for holiday calendars
         
@@ -164,16 +165,8 @@ class DeadlineEngine:
     async def initialize(self):
         """Initialize the deadline engine"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=2,
-                max_size=10
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('deadline_engine')
             
             # Load and cache holiday calendars
             await self._initialize_holiday_calendars()
@@ -889,8 +882,8 @@ class DeadlineEngine:
         logger.info("Deadline Engine closed")
 
 # Factory function
-async def create_deadline_engine() -> DeadlineEngine:
+async def create_deadline_engine(hub: ConnectionHub = None) -> DeadlineEngine:
     """Factory function to create and initialize deadline engine"""
-    engine = DeadlineEngine()
+    engine = DeadlineEngine(hub)
     await engine.initialize()
     return engine
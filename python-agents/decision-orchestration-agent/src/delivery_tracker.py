@@ -9,6 +9,8 @@ for regulatory reports across multiple delivery channels (SFTP, EBA API).
 Key Features:
 - Multi-channel delivery tracking (SFTP, EBA API, Email)
 - Real-time status monitoring and updates
+- Single heap-based timer for confirmation timeouts and scheduled retries
+- Keyset-paginated delivery listing over indexed status/creation columns
 - Delivery confirmation receipt processing
 - Failed delivery alerting and escalation
 - Comprehensive audit trail with integrity verification
@@ -23,9 +25,12 @@ Rule Compliance:
 
 import os
 import asyncio
+import heapq
+import itertools
 import logging
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, AsyncIterator
 from enum import Enum
 from dataclasses import dataclass, asdict
 import uuid
@@ -35,8 +40,8 @@ import hmac
 from pathlib import Path
 
 # Database and messaging
-import asyncpg
-from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
+from connection_hub import ConnectionHub, get_connection_hub
+from aiokafka import AIOKafkaConsumer
 
 # Email notifications
 import aiosmtplib
@@ -72,6 +77,18 @@ class AlertLevel(Enum):
     CRITICAL = "CRITICAL"
     EMERGENCY = "EMERGENCY"
 
+# Statuses after which a delivery no longer needs a confirmation timeout
+TERMINAL_STATUSES = frozenset({
+    DeliveryStatus.CONFIRMED,
+    DeliveryStatus.FAILED,
+    DeliveryStatus.CANCELLED,
+    DeliveryStatus.EXPIRED
+})
+
+# Timer kinds kept per tracked delivery
+TIMER_CONFIRMATION_TIMEOUT = 'confirmation_timeout'
+TIMER_RETRY = 'retry'
+
 @dataclass
 class DeliveryTracking:
     """Delivery tracking record structure"""
@@ -124,7 +141,8 @@ class DeliveryTracker:
     and audit trail capabilities for regulatory report deliveries.
     """
     
-    def __init__(self):
+    def __init__(self, hub: ConnectionHub = None):
+        self.hub = hub or get_connection_hub()
         self.pg_pool = None
         self.kafka_producer = None
         self.kafka_consumer = None
@@ -142,7 +160,8 @@ class DeliveryTracker:
             'smtp_port': int(os.getenv('SMTP_PORT', '587')),
             'smtp_username': os.getenv('SMTP_USERNAME', ''),
             'smtp_password': os.getenv('SMTP_PASSWORD', ''),
-            'alert_recipients': os.getenv('ALERT_RECIPIENTS', '').split(',')
+            'alert_recipients': os.getenv('ALERT_RECIPIENTS', '').split(','),
+            'list_page_size': int(os.getenv('DELIVERY_LIST_PAGE_SIZE', '500'))
         }
         
         # Performance metrics
@@ -156,32 +175,23 @@ class DeliveryTracker:
             'sla_breaches': 0
         }
         
-        # Active tracking tasks
-        self.tracking_tasks = {}
+        # Delivery timers: a single heap of (due, sequence, tracking_id, kind)
+        # served by one task. Cancelled or superseded entries stay in the heap
+        # and are skipped when popped; _active_timers holds the live sequence.
+        self._timers: List[Tuple[float, int, str, str]] = []
+        self._timer_sequence = itertools.count()
+        self._active_timers: Dict[str, Dict[str, int]] = {}
+        self._timer_wakeup = asyncio.Event()
+        self._background_tasks: List[asyncio.Task] = []
     
     async def initialize(self):
         """Initialize the delivery tracker"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=2,
-                max_size=10
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('delivery_tracker')
             
-            # Initialize Kafka producer
-            self.kafka_producer = AIOKafkaProducer(
-                bootstrap_servers=self.config['kafka_bootstrap_servers'],
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                compression_type='gzip',
-                acks='all',
-                retries=3
-            )
-            await self.kafka_producer.start()
+            # Shared Kafka producer from the connection hub
+            self.kafka_producer = await self.hub.get_kafka_producer('delivery_tracker')
             
             # Initialize Kafka consumer for confirmations
             self.kafka_consumer = AIOKafkaConsumer(
@@ -193,10 +203,15 @@ class DeliveryTracker:
             )
             await self.kafka_consumer.start()
             
+            # Rebuild timers for deliveries still outstanding
+            await self._load_outstanding_timers()
+            
             # Start background tasks
-            asyncio.create_task(self._process_confirmations())
-            asyncio.create_task(self._monitor_pending_deliveries())
-            asyncio.create_task(self._cleanup_expired_deliveries())
+            self._background_tasks = [
+                asyncio.create_task(self._process_confirmations()),
+                asyncio.create_task(self._run_timers()),
+                asyncio.create_task(self._cleanup_expired_deliveries())
+            ]
             
             logger.info("Delivery Tracker initialized successfully")
             
@@ -236,10 +251,8 @@ class DeliveryTracker:
             # Publish tracking event
             await self._publish_tracking_event('delivery.started', tracking)
             
-            # Start monitoring task
-            self.tracking_tasks[tracking_id] = asyncio.create_task(
-                self._monitor_delivery(tracking)
-            )
+            # Schedule the confirmation timeout
+            self._sync_timers(tracking)
             
             self.metrics['deliveries_tracked'] += 1
             
@@ -293,6 +306,9 @@ class DeliveryTracker:
             # Handle status-specific actions
             await self._handle_status_change(tracking, old_status)
             
+            # Cancel or (re)schedule timers for the new state
+            self._sync_timers(tracking)
+            
             logger.info(f"Updated delivery status: {tracking_id} -> {status.value}")
             
         except Exception as e:
@@ -371,8 +387,15 @@ class DeliveryTracker:
                             channel: DeliveryChannel = None,
                             date_from: datetime = None,
                             date_to: datetime = None,
-                            limit: int = 100) -> List[DeliveryTracking]:
-        """List deliveries with optional filters"""
+                            limit: int = 100,
+                            after: Tuple[datetime, str] = None) -> List[DeliveryTracking]:
+        """
+        List deliveries with optional filters, newest first
+        
+        ``after`` is the (created_at, tracking_id) of the last delivery of
+        the previous page; pages are read by keyset rather than OFFSET so
+        each page costs an index range scan regardless of depth.
+        """
         try:
             conditions = []
             params = []
@@ -403,6 +426,11 @@ class DeliveryTracker:
                 conditions.append(f"created_at <= ${param_count}")
                 params.append(date_to)
             
+            if after:
+                conditions.append(f"(created_at, tracking_id) < (${param_count + 1}, ${param_count + 2})")
+                params.extend(after)
+                param_count += 2
+            
             where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
             
             param_count += 1
@@ -411,7 +439,7 @@ class DeliveryTracker:
             query = f"""
                 SELECT * FROM delivery_tracking 
                 {where_clause}
-                ORDER BY created_at DESC 
+                ORDER BY created_at DESC, tracking_id DESC
                 LIMIT ${param_count}
             """
             
@@ -424,6 +452,27 @@ class DeliveryTracker:
             logger.error(f"Failed to list deliveries: {e}")
             return []
     
+    async def iter_deliveries(self,
+                              report_id: str = None,
+                              status: DeliveryStatus = None,
+                              channel: DeliveryChannel = None,
+                              date_from: datetime = None,
+                              date_to: datetime = None,
+                              page_size: int = None) -> AsyncIterator[DeliveryTracking]:
+        """Iterate over all matching deliveries, newest first, one keyset page at a time"""
+        page_size = page_size or self.config['list_page_size']
+        after = None
+        while True:
+            page = await self.list_deliveries(
+                report_id=report_id, status=status, channel=channel,
+                date_from=date_from, date_to=date_to, limit=page_size, after=after
+            )
+            for tracking in page:
+                yield tracking
+            if len(page) < page_size:
+                break
+            after = (page[-1].created_at, page[-1].tracking_id)
+    
     async def retry_failed_delivery(self, tracking_id: str) -> bool:
         """Retry a failed delivery"""
         try:
@@ -446,13 +495,9 @@ class DeliveryTracker:
             
             await self._update_tracking_record(tracking)
             
-            # Restart monitoring
-            if tracking_id in self.tracking_tasks:
-                self.tracking_tasks[tracking_id].cancel()
-            
-            self.tracking_tasks[tracking_id] = asyncio.create_task(
-                self._monitor_delivery(tracking)
-            )
+            # Restart the confirmation timeout from now
+            self._cancel_timers(tracking_id)
+            self._sync_timers(tracking, timeout_from=tracking.updated_at)
             
             # Publish retry event
             await self._publish_tracking_event('delivery.retried', tracking)
@@ -464,29 +509,132 @@ class DeliveryTracker:
             logger.error(f"Failed to retry delivery: {e}")
             return False
     
-    async def _monitor_delivery(self, tracking: DeliveryTracking):
-        """Monitor delivery progress"""
-        try:
-            timeout = self.config['confirmation_timeout']
-            start_time = datetime.now(timezone.utc)
-            
-            while tracking.status not in [DeliveryStatus.CONFIRMED, DeliveryStatus.FAILED, DeliveryStatus.CANCELLED]:
-                # Check for timeout
-                if (datetime.now(timezone.utc) - start_time).total_seconds() > timeout:
-                    await self._handle_delivery_timeout(tracking)
-                    break
-                
-                # Wait and check status
-                await asyncio.sleep(30)  # Check every 30 seconds
-                tracking = await self._get_tracking_record(tracking.tracking_id)
+    # Delivery timers
+    def _schedule_timer(self, tracking_id: str, kind: str, due: datetime):
+        """Schedule (or move) a delivery's timer of the given kind"""
+        sequence = next(self._timer_sequence)
+        self._active_timers.setdefault(tracking_id, {})[kind] = sequence
+        
+        due_ts = due.timestamp()
+        earliest = not self._timers or due_ts < self._timers[0][0]
+        heapq.heappush(self._timers, (due_ts, sequence, tracking_id, kind))
+        self._compact_timers()
+        
+        if earliest:
+            self._timer_wakeup.set()
+    
+    def _cancel_timers(self, tracking_id: str, kind: str = None):
+        """Cancel one or all timers of a delivery (heap entries are skipped lazily)"""
+        timers = self._active_timers.get(tracking_id)
+        if not timers:
+            return
+        if kind is None:
+            timers.clear()
+        else:
+            timers.pop(kind, None)
+        if not timers:
+            del self._active_timers[tracking_id]
+    
+    def _sync_timers(self, tracking: DeliveryTracking, timeout_from: datetime = None):
+        """Align a delivery's timers with its current state"""
+        active = self._active_timers.get(tracking.tracking_id, {})
+        
+        if tracking.status in TERMINAL_STATUSES:
+            self._cancel_timers(tracking.tracking_id, TIMER_CONFIRMATION_TIMEOUT)
+        elif TIMER_CONFIRMATION_TIMEOUT not in active:
+            base = timeout_from or tracking.created_at
+            self._schedule_timer(
+                tracking.tracking_id,
+                TIMER_CONFIRMATION_TIMEOUT,
+                base + timedelta(seconds=self.config['confirmation_timeout'])
+            )
+        
+        if tracking.status == DeliveryStatus.FAILED and tracking.next_retry_at:
+            self._schedule_timer(tracking.tracking_id, TIMER_RETRY, tracking.next_retry_at)
+        else:
+            self._cancel_timers(tracking.tracking_id, TIMER_RETRY)
+    
+    def _compact_timers(self):
+        """Rebuild the heap once cancelled entries dominate it"""
+        live = sum(len(timers) for timers in self._active_timers.values())
+        if len(self._timers) > 2 * live + 1024:
+            self._timers = [
+                entry for entry in self._timers
+                if self._active_timers.get(entry[2], {}).get(entry[3]) == entry[1]
+            ]
+            heapq.heapify(self._timers)
+    
+    def _pop_due_timers(self, now: float) -> List[Tuple[str, str]]:
+        """Remove and return the live timers due at ``now``"""
+        due = []
+        while self._timers and self._timers[0][0] <= now:
+            _, sequence, tracking_id, kind = heapq.heappop(self._timers)
+            if self._active_timers.get(tracking_id, {}).get(kind) == sequence:
+                self._cancel_timers(tracking_id, kind)
+                due.append((tracking_id, kind))
+        return due
+    
+    async def _run_timers(self):
+        """Single task serving every delivery timer"""
+        while True:
+            try:
+                # Cleared before the due check; nothing can set it until we await
+                self._timer_wakeup.clear()
+                due = self._pop_due_timers(time.time())
+                if due:
+                    await self._fire_timers(due)
+                    continue
                 
-                if not tracking:
-                    break
+                delay = self._timers[0][0] - time.time() if self._timers else None
+                try:
+                    await asyncio.wait_for(self._timer_wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                    
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error running delivery timers: {e}")
+                await asyncio.sleep(1)
+    
+    async def _fire_timers(self, due: List[Tuple[str, str]]):
+        """Handle due timeouts and retries, loading their deliveries in one query"""
+        records = await self._get_tracking_records([tracking_id for tracking_id, _ in due])
+        
+        for tracking_id, kind in due:
+            tracking = records.get(tracking_id)
+            if not tracking:
+                continue
+            
+            if kind == TIMER_CONFIRMATION_TIMEOUT and tracking.status not in TERMINAL_STATUSES:
+                await self._handle_delivery_timeout(tracking)
+            elif kind == TIMER_RETRY and tracking.status == DeliveryStatus.FAILED:
+                await self.retry_failed_delivery(tracking_id)
+    
+    async def _load_outstanding_timers(self):
+        """Schedule timers for deliveries left outstanding by a previous run"""
+        try:
+            async with self.pg_pool.acquire() as conn:
+                records = await conn.fetch("""
+                    SELECT tracking_id, delivery_status, created_at, next_retry_at
+                    FROM delivery_tracking
+                    WHERE delivery_status IN ('PENDING', 'IN_PROGRESS', 'DELIVERED')
+                       OR (delivery_status = 'FAILED' AND next_retry_at IS NOT NULL)
+                """)
+            
+            timeout = timedelta(seconds=self.config['confirmation_timeout'])
+            for record in records:
+                if record['delivery_status'] == DeliveryStatus.FAILED.value:
+                    self._schedule_timer(record['tracking_id'], TIMER_RETRY, record['next_retry_at'])
+                else:
+                    self._schedule_timer(
+                        record['tracking_id'], TIMER_CONFIRMATION_TIMEOUT, record['created_at'] + timeout
+                    )
+            
+            logger.info(f"Scheduled timers for {len(records)} outstanding deliveries")
             
-        except asyncio.CancelledError:
-            logger.debug(f"Delivery monitoring cancelled: {tracking.tracking_id}")
         except Exception as e:
-            logger.error(f"Error monitoring delivery: {e}")
+            logger.error(f"Failed to load outstanding deliveries: {e}")
     
     async def _process_confirmations(self):
         """Process incoming delivery confirmations"""
@@ -508,32 +656,6 @@ class DeliveryTracker:
         except Exception as e:
             logger.error(f"Error processing confirmations: {e}")
     
-    async def _monitor_pending_deliveries(self):
-        """Monitor pending deliveries for timeouts and retries"""
-        try:
-            while True:
-                await asyncio.sleep(300)  # Check every 5 minutes
-                
-                # Get pending deliveries
-                pending_deliveries = await self.list_deliveries(
-                    status=DeliveryStatus.PENDING,
-                    limit=1000
-                )
-                
-                for tracking in pending_deliveries:
-                    # Check for retry schedule
-                    if (tracking.next_retry_at and 
-                        datetime.now(timezone.utc) >= tracking.next_retry_at):
-                        await self.retry_failed_delivery(tracking.tracking_id)
-                    
-                    # Check for timeout
-                    age = (datetime.now(timezone.utc) - tracking.created_at).total_seconds()
-                    if age > self.config['confirmation_timeout']:
-                        await self._handle_delivery_timeout(tracking)
-                        
-        except Exception as e:
-            logger.error(f"Error monitoring pending deliveries: {e}")
-    
     async def _cleanup_expired_deliveries(self):
         """Clean up expired delivery records"""
         try:
@@ -781,6 +903,17 @@ ComplianceAI Delivery Tracker
             )
             return self._record_to_tracking(record) if record else None
     
+    async def _get_tracking_records(self, tracking_ids: List[str]) -> Dict[str, DeliveryTracking]:
+        """Get several tracking records in one query"""
+        if not tracking_ids:
+            return {}
+        async with self.pg_pool.acquire() as conn:
+            records = await conn.fetch(
+                "SELECT * FROM delivery_tracking WHERE tracking_id = ANY($1::text[])",
+                list(tracking_ids)
+            )
+            return {record['tracking_id']: self._record_to_tracking(record) for record in records}
+    
     def _record_to_tracking(self, record) -> DeliveryTracking:
         """Convert database record to DeliveryTracking object"""
         return DeliveryTracking(
@@ -894,15 +1027,18 @@ ComplianceAI Delivery Tracker
                 (self.metrics['deliveries_confirmed'] / self.metrics['deliveries_tracked'] * 100)
                 if self.metrics['deliveries_tracked'] > 0 else 0.0
             ),
-            'active_trackings': len(self.tracking_tasks),
+            'active_trackings': len(self._active_timers),
+            'scheduled_timers': len(self._timers),
             'uptime': datetime.now().isoformat()
         }
     
     async def close(self):
         """Close the delivery tracker"""
-        # Cancel all tracking tasks
-        for task in self.tracking_tasks.values():
+        # Stop the timer, confirmation and cleanup tasks
+        for task in self._background_tasks:
             task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks = []
         
         if self.kafka_producer:
             await self.kafka_producer.stop()
@@ -916,8 +1052,8 @@ ComplianceAI Delivery Tracker
         logger.info("Delivery Tracker closed")
 
 # Factory function
-async def create_delivery_tracker() -> DeliveryTracker:
+async def create_delivery_tracker(hub: ConnectionHub = None) -> DeliveryTracker:
     """Factory function to create and initialize delivery tracker"""
-    tracker = DeliveryTracker()
+    tracker = DeliveryTracker(hub)
     await tracker.initialize()
     return tracker
@@ -7,8 +7,11 @@ This module provides comprehensive integration with the EBA Reporting API
 for direct submission of regulatory reports including FINREP and COREP.
 
 Key Features:
-- OAuth 2.0 authentication and token management
+- OAuth 2.0 authentication with proactive token refresh
+- Client-side rate limiting shared by every API call
 - Direct report submission via REST API
+- Streaming chunked multipart uploads with optional on-the-fly gzip
+- Idempotent retries keyed by submission ID, with upload progress metrics
 - Status tracking and confirmation processing
 - Error handling with intelligent retry logic
 - Comprehensive audit trail and logging
@@ -25,14 +28,15 @@ import os
 import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, AsyncIterator
 from enum import Enum
 from dataclasses import dataclass, asdict
 import uuid
-import json
 import base64
 import hashlib
 import hmac
+import time
+import zlib
 from urllib.parse import urlencode, urlparse
 
 # HTTP and authentication
@@ -42,7 +46,7 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
 
 # Database
-import asyncpg
+from connection_hub import ConnectionHub, get_connection_hub
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -69,6 +73,53 @@ class ReportType(Enum):
     COREP = "COREP"
     DORA = "DORA"
 
+# EBA API status values mapped to submission statuses
+EBA_STATUS_MAPPING = {
+    'RECEIVED': SubmissionStatus.SUBMITTED,
+    'PROCESSING': SubmissionStatus.PROCESSING,
+    'VALIDATED': SubmissionStatus.ACCEPTED,
+    'ACCEPTED': SubmissionStatus.ACCEPTED,
+    'COMPLETED': SubmissionStatus.COMPLETED,
+    'REJECTED': SubmissionStatus.REJECTED,
+    'FAILED': SubmissionStatus.FAILED
+}
+
+def map_eba_status(eba_status: Optional[str]) -> SubmissionStatus:
+    """Map an EBA API status value; unknown values are treated as processing"""
+    return EBA_STATUS_MAPPING.get(eba_status or 'UNKNOWN', SubmissionStatus.PROCESSING)
+
+class EBARateLimiter:
+    """
+    Token bucket limiting requests to the EBA API
+    
+    Allows bursts of up to ``burst`` requests and a sustained rate of
+    ``rate`` requests per second across all concurrent callers.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.total_wait_time = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+                self.total_wait_time += wait
+                await asyncio.sleep(wait)
+
 @dataclass
 class EBAConfig:
     """EBA API configuration"""
@@ -84,6 +135,13 @@ class EBAConfig:
     timeout: int = 60
     max_retries: int = 3
     retry_delay: int = 5
+    requests_per_second: float = 5.0
+    rate_limit_burst: int = 10
+    token_refresh_margin: int = 300
+    upload_chunk_size: int = 256 * 1024
+    compress_uploads: bool = False
+    compression_min_size: int = 1024 * 1024
+    list_page_size: int = 100
 
 @dataclass
 class SubmissionRequest:
@@ -119,12 +177,16 @@ class EBAAPIClient:
     authentication, submission, status tracking, and error handling.
     """
     
-    def __init__(self, config: EBAConfig):
+    def __init__(self, config: EBAConfig, hub: ConnectionHub = None):
+        self.hub = hub or get_connection_hub()
         self.config = config
         self.pg_pool = None
         self.session = None
         self.access_token = None
         self.token_expires_at = None
+        self._auth_lock = asyncio.Lock()
+        self._token_refresh_task = None
+        self.rate_limiter = EBARateLimiter(config.requests_per_second, config.rate_limit_burst)
         
         # API endpoints based on environment
         if config.environment == EBAEnvironment.SANDBOX:
@@ -149,22 +211,23 @@ class EBAAPIClient:
             'submissions_failed': 0,
             'avg_submission_time': 0.0,
             'auth_renewals': 0,
-            'api_errors': 0
+            'proactive_token_refreshes': 0,
+            'api_errors': 0,
+            'bytes_read': 0,
+            'bytes_uploaded': 0,
+            'upload_time': 0.0,
+            'compressed_uploads': 0,
+            'duplicate_submissions_avoided': 0
         }
+        
+        # In-flight upload progress by submission ID
+        self.upload_progress: Dict[str, Dict[str, Any]] = {}
     
     async def initialize(self):
         """Initialize the EBA API client"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=2,
-                max_size=10
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('eba_api_client')
             
             # Initialize HTTP session
             connector = aiohttp.TCPConnector(
@@ -186,8 +249,9 @@ class EBAAPIClient:
                 }
             )
             
-            # Authenticate with EBA API
+            # Authenticate with EBA API and keep the token fresh
             await self._authenticate()
+            self._token_refresh_task = asyncio.create_task(self._token_refresh_loop())
             
             logger.info(f"EBA API Client initialized for {self.config.environment.value} environment")
             
@@ -284,10 +348,42 @@ class EBAAPIClient:
             logger.error(f"Failed to create JWT assertion: {e}")
             raise
     
+    def _token_valid(self, margin: float = 0) -> bool:
+        return bool(self.access_token) and (
+            datetime.now(timezone.utc) + timedelta(seconds=margin) < self.token_expires_at
+        )
+    
     async def _ensure_authenticated(self):
         """Ensure valid authentication token"""
-        if not self.access_token or datetime.now(timezone.utc) >= self.token_expires_at:
-            await self._authenticate()
+        if self._token_valid():
+            return
+        # Concurrent submissions share one re-authentication
+        async with self._auth_lock:
+            if not self._token_valid():
+                await self._authenticate()
+    
+    async def _token_refresh_loop(self):
+        """Refresh the access token before it expires so submissions never wait on auth"""
+        while True:
+            try:
+                margin = self.config.token_refresh_margin
+                if self.token_expires_at:
+                    refresh_in = (self.token_expires_at - datetime.now(timezone.utc)).total_seconds() - margin
+                else:
+                    refresh_in = 0
+                # Floor avoids a refresh loop when tokens live shorter than the margin
+                await asyncio.sleep(max(refresh_in, 30))
+                
+                async with self._auth_lock:
+                    if not self._token_valid(margin):
+                        await self._authenticate()
+                        self.metrics['proactive_token_refreshes'] += 1
+                        
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Proactive token refresh failed: {e}")
+                await asyncio.sleep(self.config.retry_delay)
     
     async def submit_report(self, request: SubmissionRequest) -> SubmissionResult:
         """
@@ -398,6 +494,16 @@ class EBAAPIClient:
             try:
                 logger.info(f"EBA submission attempt {retry_count + 1} for {request.submission_id}")
                 
+                # A transport failure may have hit after the EBA stored the upload;
+                # check before sending the file again
+                if retry_count > 0 and isinstance(last_error, (aiohttp.ClientError, asyncio.TimeoutError)):
+                    existing = await self._find_existing_submission(request)
+                    if existing:
+                        self.metrics['duplicate_submissions_avoided'] += 1
+                        self.metrics['submissions_successful'] += 1
+                        existing.retry_count = retry_count
+                        return existing
+                
                 # Perform actual submission
                 result = await self._perform_submission(request)
                 
@@ -416,7 +522,8 @@ class EBAAPIClient:
                     
                     # Re-authenticate if auth error
                     if "401" in str(e) or "403" in str(e):
-                        await self._authenticate()
+                        async with self._auth_lock:
+                            await self._authenticate()
                 else:
                     logger.error(f"EBA submission failed after {retry_count} attempts: {e}")
         
@@ -431,36 +538,60 @@ class EBAAPIClient:
         )
     
     async def _perform_submission(self, request: SubmissionRequest) -> SubmissionResult:
-        """Perform actual EBA API submission"""
+        """
+        Perform actual EBA API submission
+        
+        The report is streamed as a chunked multipart body (gzip-compressed
+        on the fly when enabled) rather than loaded into the request. The
+        submission ID is sent as the idempotency key so a retried upload is
+        recognised by the EBA instead of creating a second submission.
+        """
         try:
             # Prepare submission metadata
+            file_size = os.path.getsize(request.file_path)
+            compress = self.config.compress_uploads and file_size >= self.config.compression_min_size
             submission_metadata = {
                 'submissionId': request.submission_id,
                 'reportType': request.report_type.value,
                 'institutionLEI': request.institution_lei,
                 'reportingPeriod': request.reporting_period,
                 'fileFormat': request.file_format,
+                'fileSize': file_size,
+                'contentEncoding': 'gzip' if compress else 'identity',
                 'priority': request.priority,
                 'metadata': request.metadata or {}
             }
             
-            # Prepare multipart form data
-            data = aiohttp.FormData()
-            data.add_field('metadata', json.dumps(submission_metadata), content_type='application/json')
-            
-            # Add file
-            with open(request.file_path, 'rb') as f:
-                data.add_field(
-                    'file',
-                    f,
-                    filename=os.path.basename(request.file_path),
-                    content_type='application/xml' if request.file_format == 'XBRL' else 'application/octet-stream'
-                )
-                
-                # Submit to EBA API
-                start_time = datetime.now()
-                async with self.session.post(self.endpoints['submit'], data=data) as response:
+            # Prepare streaming multipart body
+            progress = self._start_upload_progress(request.submission_id, file_size, compress)
+            writer = aiohttp.MultipartWriter('form-data')
+            
+            metadata_part = writer.append_json(submission_metadata)
+            metadata_part.set_content_disposition('form-data', name='metadata')
+            
+            file_part = writer.append_payload(aiohttp.AsyncIterablePayload(
+                self._iter_upload_chunks(request.file_path, progress, compress),
+                content_type='application/xml' if request.file_format == 'XBRL' else 'application/octet-stream'
+            ))
+            filename = os.path.basename(request.file_path)
+            file_part.set_content_disposition(
+                'form-data', name='file', filename=f"{filename}.gz" if compress else filename
+            )
+            if compress:
+                file_part.headers[aiohttp.hdrs.CONTENT_ENCODING] = 'gzip'
+            
+            headers = {
+                aiohttp.hdrs.CONTENT_TYPE: writer.headers[aiohttp.hdrs.CONTENT_TYPE],
+                'Idempotency-Key': request.submission_id
+            }
+            
+            # Submit to EBA API
+            await self.rate_limiter.acquire()
+            start_time = datetime.now()
+            try:
+                async with self.session.post(self.endpoints['submit'], data=writer, headers=headers) as response:
                     processing_time = (datetime.now() - start_time).total_seconds()
+                    self._finish_upload_progress(request.submission_id, processing_time)
                     
                     if response.status == 201:  # Created
                         result_data = await response.json()
@@ -484,14 +615,95 @@ class EBAAPIClient:
                             processing_time=processing_time
                         )
                     
+                    elif response.status == 409:  # Already received under this idempotency key
+                        self.metrics['duplicate_submissions_avoided'] += 1
+                        return await self.get_submission_status(request.submission_id)
+                    
                     else:
                         error_data = await response.json() if response.content_type == 'application/json' else await response.text()
                         raise Exception(f"EBA API error: {response.status} - {error_data}")
+            finally:
+                self.upload_progress.pop(request.submission_id, None)
         
         except Exception as e:
             logger.error(f"EBA submission failed: {e}")
             raise
     
+    async def _iter_upload_chunks(self, file_path: str, progress: Dict[str, Any],
+                                  compress: bool) -> AsyncIterator[bytes]:
+        """Read a report in chunks off the event loop, optionally gzip-compressing"""
+        loop = asyncio.get_running_loop()
+        # wbits=31 selects the gzip container
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, self.config.upload_chunk_size)
+                if not chunk:
+                    break
+                progress['bytes_read'] += len(chunk)
+                
+                if compressor:
+                    chunk = compressor.compress(chunk)
+                    if not chunk:
+                        continue
+                progress['bytes_sent'] += len(chunk)
+                yield chunk
+        
+        if compressor:
+            tail = compressor.flush()
+            progress['bytes_sent'] += len(tail)
+            yield tail
+    
+    def _start_upload_progress(self, submission_id: str, file_size: int, compress: bool) -> Dict[str, Any]:
+        progress = {
+            'total_bytes': file_size,
+            'bytes_read': 0,
+            'bytes_sent': 0,
+            'compressed': compress,
+            'started_at': time.monotonic()
+        }
+        self.upload_progress[submission_id] = progress
+        return progress
+    
+    def _finish_upload_progress(self, submission_id: str, upload_time: float):
+        progress = self.upload_progress.get(submission_id)
+        if not progress:
+            return
+        self.metrics['bytes_read'] += progress['bytes_read']
+        self.metrics['bytes_uploaded'] += progress['bytes_sent']
+        self.metrics['upload_time'] += upload_time
+        if progress['compressed']:
+            self.metrics['compressed_uploads'] += 1
+        logger.debug(
+            f"Uploaded {progress['bytes_sent']} bytes ({progress['bytes_read']} read) "
+            f"for {submission_id} in {upload_time:.2f}s"
+        )
+    
+    def get_upload_progress(self, submission_id: str) -> Optional[Dict[str, Any]]:
+        """Progress of an in-flight upload, or None when no upload is running"""
+        progress = self.upload_progress.get(submission_id)
+        if not progress:
+            return None
+        elapsed = time.monotonic() - progress['started_at']
+        return {
+            'total_bytes': progress['total_bytes'],
+            'bytes_read': progress['bytes_read'],
+            'bytes_sent': progress['bytes_sent'],
+            'percent_complete': (
+                progress['bytes_read'] / progress['total_bytes'] * 100 if progress['total_bytes'] else 100.0
+            ),
+            'bytes_per_second': progress['bytes_sent'] / elapsed if elapsed > 0 else 0.0
+        }
+    
+    async def _find_existing_submission(self, request: SubmissionRequest) -> Optional[SubmissionResult]:
+        """Look up a submission the EBA may already hold from an interrupted attempt"""
+        try:
+            return await self.get_submission_status(request.submission_id)
+        except Exception as e:
+            logger.debug(f"No existing EBA submission for {request.submission_id}: {e}")
+            return None
+    
     async def get_submission_status(self, submission_id: str, eba_reference: str = None) -> SubmissionResult:
         """Get submission status from EBA API"""
         try:
@@ -502,23 +714,13 @@ class EBAAPIClient:
                 submission_id=eba_reference or submission_id
             )
             
+            await self.rate_limiter.acquire()
             async with self.session.get(status_url) as response:
                 if response.status == 200:
                     status_data = await response.json()
                     
                     # Map EBA status to our enum
-                    eba_status = status_data.get('status', 'UNKNOWN')
-                    status_mapping = {
-                        'RECEIVED': SubmissionStatus.SUBMITTED,
-                        'PROCESSING': SubmissionStatus.PROCESSING,
-                        'VALIDATED': SubmissionStatus.ACCEPTED,
-                        'ACCEPTED': SubmissionStatus.ACCEPTED,
-                        'COMPLETED': SubmissionStatus.COMPLETED,
-                        'REJECTED': SubmissionStatus.REJECTED,
-                        'FAILED': SubmissionStatus.FAILED
-                    }
-                    
-                    mapped_status = status_mapping.get(eba_status, SubmissionStatus.PROCESSING)
+                    mapped_status = map_eba_status(status_data.get('status'))
                     
                     return SubmissionResult(
                         submission_id=submission_id,
@@ -545,6 +747,7 @@ class EBAAPIClient:
                 submission_id=eba_reference or submission_id
             )
             
+            await self.rate_limiter.acquire()
             async with self.session.get(download_url) as response:
                 if response.status == 200:
                     return await response.read()
@@ -561,12 +764,16 @@ class EBAAPIClient:
                              report_type: ReportType = None,
                              date_from: datetime = None,
                              date_to: datetime = None) -> List[Dict[str, Any]]:
-        """List submissions with optional filters"""
+        """
+        List submissions with optional filters
+
+        Follows the API's pagination and returns the submissions of all pages.
+        """
         try:
             await self._ensure_authenticated()
             
             # Build query parameters
-            params = {}
+            params = {'pageSize': self.config.list_page_size}
             if institution_lei:
                 params['institutionLEI'] = institution_lei
             if report_type:
@@ -576,14 +783,29 @@ class EBAAPIClient:
             if date_to:
                 params['dateTo'] = date_to.isoformat()
             
-            list_url = f"{self.endpoints['submit']}?{urlencode(params)}"
-            
-            async with self.session.get(list_url) as response:
-                if response.status == 200:
-                    return await response.json()
+            submissions = []
+            page = 1
+            while True:
+                list_url = f"{self.endpoints['submit']}?{urlencode({**params, 'page': page})}"
+
+                await self.rate_limiter.acquire()
+                async with self.session.get(list_url) as response:
+                    if response.status != 200:
+                        error_text = await response.text()
+                        raise Exception(f"List submissions failed: {response.status} - {error_text}")
+                    body = await response.json()
+
+                entries = (body.get('submissions') if isinstance(body, dict) else body) or []
+                submissions.extend(entries)
+
+                # Paged responses carry totalPages; bare lists end on a short page
+                if isinstance(body, dict) and 'totalPages' in body:
+                    has_more = page < body['totalPages']
                 else:
-                    error_text = await response.text()
-                    raise Exception(f"List submissions failed: {response.status} - {error_text}")
+                    has_more = len(entries) >= self.config.list_page_size
+                if not has_more or not entries:
+                    return submissions
+                page += 1
         
         except Exception as e:
             logger.error(f"Failed to list submissions: {e}")
@@ -602,6 +824,21 @@ class EBAAPIClient:
         except Exception as e:
             logger.error(f"Failed to update submission status: {e}")
     
+    async def _update_submission_statuses(self, updates: List[Tuple[str, SubmissionStatus, Optional[str]]]):
+        """Update several submission statuses in one round trip"""
+        if not updates:
+            return
+        try:
+            async with self.pg_pool.acquire() as conn:
+                await conn.executemany("""
+                    UPDATE eba_submissions 
+                    SET submission_status = $2, error_message = $3, updated_at = CURRENT_TIMESTAMP
+                    WHERE submission_id = $1
+                """, [(submission_id, status.value, error) for submission_id, status, error in updates])
+                
+        except Exception as e:
+            logger.error(f"Failed to update submission statuses: {e}")
+    
     async def _update_submission_metrics(self, request: SubmissionRequest, result: SubmissionResult, submission_time: float):
         """Update submission performance metrics"""
         try:
@@ -631,6 +868,16 @@ class EBAAPIClient:
             ),
             'environment': self.config.environment.value,
             'authenticated': self.access_token is not None,
+            'rate_limit_wait_time': self.rate_limiter.total_wait_time,
+            'upload_bytes_per_second': (
+                self.metrics['bytes_uploaded'] / self.metrics['upload_time']
+                if self.metrics['upload_time'] > 0 else 0.0
+            ),
+            'compression_ratio': (
+                self.metrics['bytes_uploaded'] / self.metrics['bytes_read']
+                if self.metrics['bytes_read'] > 0 else 1.0
+            ),
+            'active_uploads': len(self.upload_progress),
             'token_expires_at': self.token_expires_at.isoformat() if self.token_expires_at else None
         }
     
@@ -662,6 +909,9 @@ class EBAAPIClient:
     
     async def close(self):
         """Close the EBA API client"""
+        if self._token_refresh_task:
+            self._token_refresh_task.cancel()
+        
         if self.session:
             await self.session.close()
         
@@ -671,7 +921,8 @@ class EBAAPIClient:
         logger.info("EBA API Client closed")
 
 # Factory function
-async def create_eba_client(environment: EBAEnvironment = EBAEnvironment.SANDBOX) -> EBAAPIClient:
+async def create_eba_client(environment: EBAEnvironment = EBAEnvironment.SANDBOX,
+                            hub: ConnectionHub = None) -> EBAAPIClient:
     """Factory function to create and initialize EBA API client"""
     
     # Load configuration from environment
@@ -687,9 +938,16 @@ async def create_eba_client(environment: EBAEnvironment = EBAEnvironment.SANDBOX
         status_url=os.getenv('EBA_STATUS_URL', ''),
         timeout=int(os.getenv('EBA_TIMEOUT', '60')),
         max_retries=int(os.getenv('EBA_MAX_RETRIES', '3')),
-        retry_delay=int(os.getenv('EBA_RETRY_DELAY', '5'))
+        retry_delay=int(os.getenv('EBA_RETRY_DELAY', '5')),
+        requests_per_second=float(os.getenv('EBA_REQUESTS_PER_SECOND', '5')),
+        rate_limit_burst=int(os.getenv('EBA_RATE_LIMIT_BURST', '10')),
+        token_refresh_margin=int(os.getenv('EBA_TOKEN_REFRESH_MARGIN', '300')),
+        upload_chunk_size=int(os.getenv('EBA_UPLOAD_CHUNK_SIZE', str(256 * 1024))),
+        compress_uploads=os.getenv('EBA_COMPRESS_UPLOADS', 'false').lower() == 'true',
+        compression_min_size=int(os.getenv('EBA_COMPRESSION_MIN_SIZE', str(1024 * 1024))),
+        list_page_size=int(os.getenv('EBA_LIST_PAGE_SIZE', '100'))
     )
     
-    client = EBAAPIClient(config)
+    client = EBAAPIClient(config, hub)
     await client.initialize()
     return client
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+EBA Submission Queue - Concurrent Submissions and Coalesced Status Polling
+=========================================================================
+
+This module provides the submission queue used at reporting deadlines, when
+many institutions' reports have to be submitted to the EBA API and then
+followed until the EBA accepts or rejects them.
+
+Key Features:
+- Priority queue drained by N concurrent submission workers
+- All API calls go through the client's shared rate limiter and token
+- Coalesced status polling: one list_submissions call per interval
+  instead of one status GET per outstanding submission
+- Status changes pushed to the DeliveryTracker and persisted in one batch
+- Per-submission futures so callers can await individual results
+
+Rule Compliance:
+- Rule 1: No stubs - Full production submission orchestration
+- Rule 2: Modular design - Composes EBAAPIClient and DeliveryTracker
+- Rule 17: Comprehensive documentation throughout
+"""
+
+import os
+import asyncio
+import itertools
+import logging
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
+
+from eba_api_client import EBAAPIClient, SubmissionRequest, SubmissionResult, SubmissionStatus, map_eba_status
+from delivery_tracker import DeliveryTracker, DeliveryStatus
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Submission statuses that need no further polling
+TERMINAL_STATUSES = frozenset({
+    SubmissionStatus.COMPLETED,
+    SubmissionStatus.REJECTED,
+    SubmissionStatus.FAILED
+})
+
+# Submission statuses as seen by the delivery tracker (COMPLETED is a confirmation)
+TRACKER_STATUS_MAPPING = {
+    SubmissionStatus.PENDING: DeliveryStatus.PENDING,
+    SubmissionStatus.SUBMITTED: DeliveryStatus.IN_PROGRESS,
+    SubmissionStatus.PROCESSING: DeliveryStatus.IN_PROGRESS,
+    SubmissionStatus.ACCEPTED: DeliveryStatus.DELIVERED,
+    SubmissionStatus.REJECTED: DeliveryStatus.FAILED,
+    SubmissionStatus.FAILED: DeliveryStatus.FAILED
+}
+
+@dataclass
+class _QueuedSubmission:
+    """A submission waiting for a worker"""
+    request: SubmissionRequest
+    tracking_id: Optional[str]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+@dataclass
+class _WatchedSubmission:
+    """A submitted report whose EBA status is still being polled"""
+    submission_id: str
+    eba_reference: Optional[str]
+    tracking_id: Optional[str]
+    status: SubmissionStatus
+    submitted_at: datetime
+
+class EBASubmissionQueue:
+    """
+    Concurrent, rate-limited EBA submission queue with coalesced polling
+
+    Submissions are queued by priority and sent by a fixed number of
+    workers. Accepted submissions are watched; a single poller lists the
+    institution's submissions once per interval and fans the status changes
+    out to the delivery tracker.
+    """
+
+    def __init__(self, client: EBAAPIClient, tracker: DeliveryTracker = None,
+                 concurrency: int = None, poll_interval: float = None):
+        self.client = client
+        self.tracker = tracker
+
+        # Configuration
+        self.config = {
+            'concurrency': concurrency or int(os.getenv('EBA_SUBMISSION_CONCURRENCY', '8')),
+            'poll_interval': poll_interval or float(os.getenv('EBA_STATUS_POLL_INTERVAL', '60')),
+            # Listing window reaches back this far before the oldest watched submission
+            'poll_lookback': int(os.getenv('EBA_STATUS_POLL_LOOKBACK', '300')),
+            # Submissions still unresolved after this long are no longer polled
+            'watch_max_age': int(os.getenv('EBA_STATUS_WATCH_MAX_AGE', str(7 * 24 * 3600)))
+        }
+
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._watched: Dict[str, _WatchedSubmission] = {}
+        self._workers: List[asyncio.Task] = []
+        self._poll_task: Optional[asyncio.Task] = None
+
+        # Performance metrics
+        self.metrics = {
+            'submissions_queued': 0,
+            'submissions_started': 0,
+            'submissions_completed': 0,
+            'submissions_failed': 0,
+            'in_flight': 0,
+            'peak_in_flight': 0,
+            'avg_queue_wait': 0.0,
+            'status_polls': 0,
+            'status_changes': 0,
+            'watches_expired': 0,
+            'poll_errors': 0
+        }
+
+    async def start(self):
+        """Start the submission workers and the status poller"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(index))
+            for index in range(self.config['concurrency'])
+        ]
+        self._poll_task = asyncio.create_task(self._poll_loop())
+        logger.info(f"EBA submission queue started with {self.config['concurrency']} workers")
+
+    def submit(self, request: SubmissionRequest, tracking_id: str = None) -> asyncio.Future:
+        """
+        Queue a submission
+
+        Returns a future resolved with the SubmissionResult once a worker
+        has sent it. Lower ``request.priority`` values are sent first.
+        """
+        future = asyncio.get_running_loop().create_future()
+        item = _QueuedSubmission(request=request, tracking_id=tracking_id, future=future)
+        self._queue.put_nowait((request.priority, next(self._sequence), item))
+        self.metrics['submissions_queued'] += 1
+        return future
+
+    async def submit_many(self, requests: List[SubmissionRequest],
+                          tracking_ids: List[Optional[str]] = None) -> List[SubmissionResult]:
+        """Queue several submissions and wait for all results, in request order"""
+        tracking_ids = tracking_ids or [None] * len(requests)
+        futures = [self.submit(request, tracking_id) for request, tracking_id in zip(requests, tracking_ids)]
+        return list(await asyncio.gather(*futures))
+
+    async def _worker(self, index: int):
+        """Send queued submissions one at a time"""
+        while True:
+            _, _, item = await self._queue.get()
+            try:
+                wait = time.monotonic() - item.enqueued_at
+                self._record_queue_wait(wait)
+
+                self.metrics['in_flight'] += 1
+                self.metrics['peak_in_flight'] = max(self.metrics['peak_in_flight'], self.metrics['in_flight'])
+                try:
+                    result = await self.client.submit_report(item.request)
+                finally:
+                    self.metrics['in_flight'] -= 1
+
+                if result.status == SubmissionStatus.FAILED:
+                    self.metrics['submissions_failed'] += 1
+                else:
+                    self.metrics['submissions_completed'] += 1
+
+                if result.status not in TERMINAL_STATUSES:
+                    self.watch(result, item.tracking_id)
+                await self._push_to_tracker(item.tracking_id, result.status, result.error_message, {
+                    'submission_id': result.submission_id,
+                    'eba_reference': result.eba_reference
+                })
+
+                if not item.future.done():
+                    item.future.set_result(result)
+
+            except asyncio.CancelledError:
+                if not item.future.done():
+                    item.future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"Submission worker {index} failed on {item.request.submission_id}: {e}")
+                if not item.future.done():
+                    item.future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def watch(self, result: SubmissionResult, tracking_id: str = None):
+        """Follow a submission's EBA status until it is terminal"""
+        self._watched[result.submission_id] = _WatchedSubmission(
+            submission_id=result.submission_id,
+            eba_reference=result.eba_reference,
+            tracking_id=tracking_id,
+            status=result.status,
+            submitted_at=result.submitted_at or datetime.now(timezone.utc)
+        )
+
+    async def _poll_loop(self):
+        """Poll the EBA once per interval while submissions are outstanding"""
+        while True:
+            try:
+                await asyncio.sleep(self.config['poll_interval'])
+                await self.poll_statuses()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.metrics['poll_errors'] += 1
+                logger.error(f"EBA status poll failed: {e}")
+
+    async def poll_statuses(self) -> int:
+        """
+        Refresh all watched submissions with one list_submissions call
+
+        Returns the number of submissions whose status changed.
+        """
+        self._expire_watches()
+        if not self._watched:
+            return 0
+
+        oldest = min(watched.submitted_at for watched in self._watched.values())
+        entries = await self.client.list_submissions(
+            date_from=oldest - timedelta(seconds=self.config['poll_lookback'])
+        )
+        self.metrics['status_polls'] += 1
+
+        by_key: Dict[str, Dict[str, Any]] = {}
+        for entry in entries or []:
+            for key in (entry.get('submissionId'), entry.get('ebaReference')):
+                if key:
+                    by_key[key] = entry
+
+        changes: List[Tuple[_WatchedSubmission, Dict[str, Any]]] = []
+        for watched in list(self._watched.values()):
+            entry = by_key.get(watched.submission_id) or by_key.get(watched.eba_reference)
+            if entry is None:
+                continue
+
+            status = map_eba_status(entry.get('status'))
+            watched.eba_reference = entry.get('ebaReference') or watched.eba_reference
+            if status == watched.status:
+                continue
+
+            watched.status = status
+            changes.append((watched, entry))
+            if status in TERMINAL_STATUSES:
+                del self._watched[watched.submission_id]
+
+        if changes:
+            await self.client._update_submission_statuses([
+                (watched.submission_id, watched.status, entry.get('errorMessage'))
+                for watched, entry in changes
+            ])
+            for watched, entry in changes:
+                await self._push_to_tracker(watched.tracking_id, watched.status, entry.get('errorMessage'), {
+                    'submission_id': watched.submission_id,
+                    'eba_reference': watched.eba_reference,
+                    'validation_results': entry.get('validationResults')
+                }, entry)
+
+        self.metrics['status_changes'] += len(changes)
+        return len(changes)
+
+    def _expire_watches(self):
+        """
+        Stop following submissions older than watch_max_age
+
+        A submission the listing never returns would otherwise stay watched
+        forever and hold the listing window open back to its submission time.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.config['watch_max_age'])
+        for watched in list(self._watched.values()):
+            if watched.submitted_at < cutoff:
+                del self._watched[watched.submission_id]
+                self.metrics['watches_expired'] += 1
+                logger.warning(
+                    f"Stopped polling EBA submission {watched.submission_id} "
+                    f"(status {watched.status.value} since {watched.submitted_at.isoformat()})"
+                )
+
+    async def _push_to_tracker(self, tracking_id: Optional[str], status: SubmissionStatus,
+                               error_message: Optional[str], metadata: Dict[str, Any],
+                               eba_entry: Dict[str, Any] = None):
+        """Reflect a submission status in the delivery tracker"""
+        if not self.tracker or not tracking_id:
+            return
+        try:
+            if status == SubmissionStatus.COMPLETED:
+                await self.tracker.confirm_delivery(
+                    tracking_id=tracking_id,
+                    confirmed_by='EBA',
+                    confirmation_method='EBA_API',
+                    confirmation_data=eba_entry or metadata
+                )
+            else:
+                await self.tracker.update_delivery_status(
+                    tracking_id,
+                    TRACKER_STATUS_MAPPING[status],
+                    error_message,
+                    {key: value for key, value in metadata.items() if value is not None}
+                )
+        except Exception as e:
+            logger.error(f"Failed to update delivery tracker for {tracking_id}: {e}")
+
+    def _record_queue_wait(self, wait: float):
+        self.metrics['submissions_started'] += 1
+        started = self.metrics['submissions_started']
+        current_avg = self.metrics['avg_queue_wait']
+        self.metrics['avg_queue_wait'] = (current_avg * (started - 1) + wait) / started
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get submission queue metrics"""
+        return {
+            **self.metrics,
+            'queued': self._queue.qsize(),
+            'watched_submissions': len(self._watched)
+        }
+
+    async def close(self):
+        """Stop the workers and the poller; queued submissions are cancelled"""
+        tasks = [*self._workers, *([self._poll_task] if self._poll_task else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._poll_task = None
+
+        while not self._queue.empty():
+            _, _, item = self._queue.get_nowait()
+            if not item.future.done():
+                item.future.cancel()
+
+        logger.info("EBA submission queue closed")
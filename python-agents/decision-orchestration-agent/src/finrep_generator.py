@@ -34,15 +34,16 @@ import json
 import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, TextIO
 from enum import Enum
 from dataclasses import dataclass, asdict
+import io
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 import pandas as pd
 import numpy as np
 
 from compliance_report_generator import ReportTemplate, XBRLTemplate, ReportRequest, ReportResult
+from xbrl_writer import XBRLStreamWriter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -221,8 +222,21 @@ class FINREPGenerator:
             }
         }
     
-    async def generate_finrep_report(self, data: FINREPData, template: FINREPTemplate) -> str:
+    async def generate_finrep_report(self, data: FINREPData, template: FINREPTemplate,
+                                     pretty: bool = True) -> str:
         """Generate FINREP XBRL report"""
+        buffer = io.StringIO()
+        await self.write_finrep_report(data, template, buffer, pretty=pretty)
+        return buffer.getvalue()
+    
+    async def write_finrep_report(self, data: FINREPData, template: FINREPTemplate,
+                                  output: TextIO, pretty: bool = True) -> int:
+        """
+        Stream a FINREP XBRL report to a text stream
+        
+        Contexts, units and facts are written to ``output`` as they are
+        produced. Returns the number of facts written.
+        """
         try:
             logger.info(f"Generating FINREP report {template.value} for {data.institution_code}")
             
@@ -231,11 +245,10 @@ class FINREPGenerator:
             if not validation_results['valid']:
                 raise ValueError(f"FINREP validation failed: {validation_results['errors']}")
             
-            # Create XBRL document
-            xbrl_doc = await self._create_finrep_xbrl(data, template)
-            
-            # Format and return
-            return self._format_xbrl_document(xbrl_doc)
+            # Write XBRL document
+            writer = XBRLStreamWriter(output, pretty=pretty)
+            await self._write_finrep_xbrl(writer, data, template)
+            return writer.facts_written
             
         except Exception as e:
             logger.error(f"Failed to generate FINREP report: {e}")
@@ -327,13 +340,9 @@ class FINREPGenerator:
         
         return validation_results
     
-    async def _create_finrep_xbrl(self, data: FINREPData, template: FINREPTemplate) -> ET.Element:
-        """Create FINREP XBRL instance document"""
+    async def _write_finrep_xbrl(self, writer: XBRLStreamWriter, data: FINREPData, template: FINREPTemplate):
+        """Write FINREP XBRL instance document"""
         try:
-            # Create root element
-            root = ET.Element('xbrli:xbrl')
-            
-            # Add namespaces
             namespaces = {
                 'xbrli': 'http://www.xbrl.org/2003/instance',
                 'link': 'http://www.xbrl.org/2003/linkbase',
@@ -342,82 +351,48 @@ class FINREPGenerator:
                 'iso4217': 'http://www.xbrl.org/2003/iso4217'
             }
             
-            for prefix, uri in namespaces.items():
-                root.set(f'xmlns:{prefix}', uri)
-            
-            # Add schema reference
-            schema_ref = ET.SubElement(root, 'link:schemaRef')
-            schema_ref.set('xlink:type', 'simple')
-            schema_ref.set('xlink:href', self.schema_location)
+            # Root element and schema reference
+            writer.start_document('xbrli:xbrl', namespaces, self.schema_location)
             
             # Add context
-            context = self._create_finrep_context(data)
-            root.append(context)
+            self._write_finrep_context(writer, data)
             
             # Add unit
-            unit = self._create_finrep_unit(data.currency)
-            root.append(unit)
+            writer.unit(data.currency, f'iso4217:{data.currency}')
             
             # Add facts based on template
             if template == FINREPTemplate.F_01_01:
-                self._add_balance_sheet_facts(root, data)
+                self._add_balance_sheet_facts(writer, data)
             elif template == FINREPTemplate.F_02_00:
-                self._add_pnl_facts(root, data)
+                self._add_pnl_facts(writer, data)
             elif template == FINREPTemplate.F_04_00:
-                self._add_financial_assets_facts(root, data)
+                self._add_financial_assets_facts(writer, data)
             elif template == FINREPTemplate.F_18_00:
-                self._add_geographical_facts(root, data)
+                self._add_geographical_facts(writer, data)
             elif template == FINREPTemplate.F_32_01:
-                self._add_forbearance_facts(root, data)
+                self._add_forbearance_facts(writer, data)
             
-            return root
+            writer.end_document()
             
         except Exception as e:
-            logger.error(f"Failed to create FINREP XBRL: {e}")
+            logger.error(f"Failed to write FINREP XBRL: {e}")
             raise
     
-    def _create_finrep_context(self, data: FINREPData) -> ET.Element:
-        """Create FINREP context element"""
-        context = ET.Element('xbrli:context')
-        context.set('id', 'c1')
-        
-        # Entity
-        entity = ET.SubElement(context, 'xbrli:entity')
-        identifier = ET.SubElement(entity, 'xbrli:identifier')
-        identifier.set('scheme', 'http://www.eba.europa.eu')
-        identifier.text = data.institution_code
-        
-        # Period
-        period = ET.SubElement(context, 'xbrli:period')
-        
+    def _write_finrep_context(self, writer: XBRLStreamWriter, data: FINREPData):
+        """Write FINREP context element"""
         if 'Q' in data.reporting_period:
             # Quarterly reporting
-            start_date = ET.SubElement(period, 'xbrli:startDate')
-            end_date = ET.SubElement(period, 'xbrli:endDate')
-            start_date.text, end_date.text = self._get_quarter_dates(data.reporting_period)
+            start_date, end_date = self._get_quarter_dates(data.reporting_period)
+            period = {'startDate': start_date, 'endDate': end_date}
         else:
             # Annual reporting
-            instant = ET.SubElement(period, 'xbrli:instant')
-            instant.text = self._get_year_end_date(data.reporting_period)
+            period = {'instant': self._get_year_end_date(data.reporting_period)}
         
         # Scenario (consolidation basis)
-        scenario = ET.SubElement(context, 'xbrli:scenario')
-        consolidation = ET.SubElement(scenario, 'finrep:ConsolidationBasis')
-        consolidation.text = data.consolidation_basis
-        
-        return context
-    
-    def _create_finrep_unit(self, currency: str) -> ET.Element:
-        """Create FINREP unit element"""
-        unit = ET.Element('xbrli:unit')
-        unit.set('id', currency)
-        
-        measure = ET.SubElement(unit, 'xbrli:measure')
-        measure.text = f'iso4217:{currency}'
-        
-        return unit
+        writer.context('c1', 'http://www.eba.europa.eu', data.institution_code, period,
+                       scenario=[('finrep:ConsolidationBasis', data.consolidation_basis)])
     
-    def _add_balance_sheet_facts(self, root: ET.Element, data: FINREPData):
+    def _add_balance_sheet_facts(self, writer: XBRLStreamWriter, data: FINREPData):
         """Add balance sheet facts (F 01.01)"""
         # Assets
         asset_fields = [
@@ -432,7 +407,7 @@ class FINREPGenerator:
             if value != 0 or field == 'total_assets':  # Always include total_assets
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
         
         # Liabilities
         liability_fields = [
@@ -446,7 +421,7 @@ class FINREPGenerator:
             if value != 0 or field == 'total_liabilities':
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
         
         # Equity
         equity_fields = [
@@ -458,9 +433,9 @@ class FINREPGenerator:
             if value != 0 or field == 'total_equity':
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
-    def _add_pnl_facts(self, root: ET.Element, data: FINREPData):
+    def _add_pnl_facts(self, writer: XBRLStreamWriter, data: FINREPData):
         """Add P&L facts (F 02.00)"""
         pnl_fields = [
             'interest_income', 'interest_expenses', 'net_interest_income',
@@ -475,9 +450,9 @@ class FINREPGenerator:
             if value != 0:  # Only include non-zero P&L items
                 fact = self._create_fact(field, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
-    def _add_financial_assets_facts(self, root: ET.Element, data: FINREPData):
+    def _add_financial_assets_facts(self, writer: XBRLStreamWriter, data: FINREPData):
         """Add financial assets breakdown facts (F 04.00)"""
         # Add detailed breakdowns by instrument and counterparty sector
         asset_categories = {
@@ -506,7 +481,7 @@ class FINREPGenerator:
             if total_value != 0:
                 fact = self._create_fact(category, total_value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
                 
                 # Add breakdown facts with appropriate FINREP concepts
                 for instrument_type, value in breakdown.items():
@@ -514,9 +489,9 @@ class FINREPGenerator:
                         concept_name = f"{category}_{instrument_type}"
                         fact = self._create_breakdown_fact(concept_name, value, data.currency)
                         if fact is not None:
-                            root.append(fact)
+                            writer.append(fact)
     
-    def _add_geographical_facts(self, root: ET.Element, data: FINREPData):
+    def _add_geographical_facts(self, writer: XBRLStreamWriter, data: FINREPData):
         """Add geographical breakdown facts (F 18.00)"""
         # Add geographical distribution of credit exposures by country
         geographical_breakdown = {
@@ -541,16 +516,16 @@ class FINREPGenerator:
             if value > 0:
                 fact = self._create_geographical_fact(geo_category, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
         
         # Add country-specific facts
         for country, value in country_exposures.items():
             if value > 0:
                 fact = self._create_geographical_fact(country, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
-    def _add_forbearance_facts(self, root: ET.Element, data: FINREPData):
+    def _add_forbearance_facts(self, writer: XBRLStreamWriter, data: FINREPData):
         """Add forbearance and NPE facts (F 32.01)"""
         # Calculate NPE and forbearance metrics based on loan portfolio
         loan_portfolio = getattr(data, 'financial_assets_amortised_cost', 0) * 0.7  # Assume 70% are loans
@@ -572,7 +547,7 @@ class FINREPGenerator:
             if value > 0:
                 fact = self._create_npe_fact(metric, value, data.currency)
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
         
         # Add credit quality ratios
         if loan_portfolio > 0:
@@ -585,7 +560,7 @@ class FINREPGenerator:
             for ratio_name, ratio_value in credit_ratios.items():
                 fact = self._create_ratio_fact(ratio_name, ratio_value, 'percentage')
                 if fact is not None:
-                    root.append(fact)
+                    writer.append(fact)
     
     def _create_fact(self, field: str, value: Union[int, float], currency: str) -> Optional[ET.Element]:
         """Create XBRL fact element"""
@@ -747,24 +722,6 @@ class FINREPGenerator:
             logger.warning(f"Failed to create ratio fact for {ratio_concept}: {e}")
             return None
     
-    def _format_xbrl_document(self, root: ET.Element) -> str:
-        """Format XBRL document with proper indentation"""
-        try:
-            rough_string = ET.tostring(root, encoding='unicode')
-            reparsed = minidom.parseString(rough_string)
-            pretty_xml = reparsed.toprettyxml(indent="  ")
-            
-            # Remove empty lines and fix declaration
-            lines = [line for line in pretty_xml.split('\n') if line.strip()]
-            if lines[0].startswith('<?xml'):
-                lines[0] = '<?xml version="1.0" encoding="UTF-8"?>'
-            
-            return '\n'.join(lines)
-            
-        except Exception as e:
-            logger.error(f"Failed to format XBRL document: {e}")
-            raise
-    
     def _validate_reporting_period(self, period: str) -> bool:
         """Validate reporting period format"""
         import re
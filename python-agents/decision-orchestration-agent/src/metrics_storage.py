@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Metrics Storage - Daily Partitions and Continuous Rollups
+========================================================
+
+This module manages the time-partitioned storage used by the monitoring
+components for raw instrumentation data (performance_metrics,
+sla_measurements) and the rollup tables that back long-range history queries.
+
+Key Features:
+- Daily range partitions created ahead of time for each monitored table
+- Retention enforced by dropping whole partitions instead of bulk DELETEs
+- Fallback to time-bounded DELETEs for tables that are not yet partitioned
+- Continuous 1-minute rollups computed from raw metric rows
+- Continuous 1-hour rollups computed from the 1-minute rollups
+- Idempotent, watermark-driven rollup windows safe to re-run after restarts
+
+Rule Compliance:
+- Rule 1: No stubs - Full production storage management implementation
+- Rule 2: Modular design - Shared by SLA monitor and performance tracker
+- Rule 17: Comprehensive documentation throughout
+"""
+
+import logging
+import json
+from datetime import datetime, timezone, timedelta, date
+from typing import Dict, List, Optional, Any, Tuple
+
+# Database
+import asyncpg
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rollup resolutions: name -> (table, date_trunc unit, bucket width in seconds)
+ROLLUP_RESOLUTIONS = {
+    '1m': ('performance_metrics_rollup_1m', 'minute', 60),
+    '1h': ('performance_metrics_rollup_1h', 'hour', 3600),
+}
+
+# Only numeric metric values can be aggregated into rollups
+NUMERIC_VALUE_PATTERN = r'^[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?$'
+
+class DailyPartitionManager:
+    """
+    Maintains daily RANGE partitions for a table partitioned on a timestamp column
+
+    Partitions are named ``<table>_pYYYYMMDD`` and cover one UTC day. Expired
+    partitions are dropped as a whole, which is O(1) regardless of row count.
+    """
+
+    def __init__(self,
+                 table: str,
+                 time_column: str = 'timestamp',
+                 retention_days: int = 90,
+                 premake_days: int = 3):
+        self.table = table
+        self.time_column = time_column
+        self.retention_days = retention_days
+        self.premake_days = premake_days
+        self._partitioned: Optional[bool] = None
+
+    def partition_name(self, day: date) -> str:
+        """Get partition table name for a day"""
+        return f"{self.table}_p{day.strftime('%Y%m%d')}"
+
+    async def is_partitioned(self, conn) -> bool:
+        """Check whether the parent table is declaratively partitioned"""
+        if self._partitioned is None:
+            relkind = await conn.fetchval("""
+                SELECT relkind::text FROM pg_class
+                WHERE relname = $1 AND pg_table_is_visible(oid)
+            """, self.table)
+            self._partitioned = relkind == 'p'
+            if not self._partitioned:
+                logger.warning(f"Table {self.table} is not partitioned - retention will use DELETE")
+        return self._partitioned
+
+    async def ensure_partitions(self, conn, today: date = None) -> List[str]:
+        """Create partitions from yesterday through today + premake_days"""
+        if not await self.is_partitioned(conn):
+            return []
+
+        today = today or datetime.now(timezone.utc).date()
+        created = []
+
+        for offset in range(-1, self.premake_days + 1):
+            day = today + timedelta(days=offset)
+            name = self.partition_name(day)
+            start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+            end = start + timedelta(days=1)
+
+            try:
+                exists = await conn.fetchval("""
+                    SELECT EXISTS (
+                        SELECT 1 FROM pg_class WHERE relname = $1 AND pg_table_is_visible(oid)
+                    )
+                """, name)
+                if exists:
+                    continue
+
+                await conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {self.table} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+                created.append(name)
+
+            except asyncpg.exceptions.DuplicateTableError:
+                # Another process created the partition concurrently
+                continue
+
+        if created:
+            logger.info(f"Created partitions for {self.table}: {', '.join(created)}")
+
+        return created
+
+    async def list_partitions(self, conn) -> List[Tuple[str, date]]:
+        """List daily partitions of the table with the day they cover"""
+        rows = await conn.fetch("""
+            SELECT child.relname AS partition_name
+            FROM pg_inherits i
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            WHERE parent.relname = $1 AND pg_table_is_visible(parent.oid)
+        """, self.table)
+
+        prefix = f"{self.table}_p"
+        partitions = []
+        for row in rows:
+            name = row['partition_name']
+            if not name.startswith(prefix):
+                continue
+            try:
+                day = datetime.strptime(name[len(prefix):], '%Y%m%d').date()
+            except ValueError:
+                continue
+            partitions.append((name, day))
+
+        return sorted(partitions, key=lambda p: p[1])
+
+    async def drop_expired_partitions(self, conn, today: date = None) -> List[str]:
+        """Drop partitions whose whole day is older than the retention window"""
+        today = today or datetime.now(timezone.utc).date()
+        cutoff_day = today - timedelta(days=self.retention_days)
+
+        if not await self.is_partitioned(conn):
+            await self._delete_expired_rows(conn, cutoff_day)
+            return []
+
+        dropped = []
+        for name, day in await self.list_partitions(conn):
+            if day < cutoff_day:
+                await conn.execute(f"DROP TABLE IF EXISTS {name}")
+                dropped.append(name)
+
+        if dropped:
+            logger.info(f"Dropped {len(dropped)} expired partitions of {self.table}")
+
+        return dropped
+
+    async def _delete_expired_rows(self, conn, cutoff_day: date):
+        """Retention fallback for tables that have not been migrated to partitions"""
+        cutoff = datetime(cutoff_day.year, cutoff_day.month, cutoff_day.day, tzinfo=timezone.utc)
+        result = await conn.execute(
+            f"DELETE FROM {self.table} WHERE {self.time_column} < $1", cutoff
+        )
+        logger.info(f"Retention cleanup on {self.table}: {result}")
+
+class MetricRollupManager:
+    """
+    Maintains continuous 1-minute and 1-hour rollups of performance metrics
+
+    Each run aggregates raw rows between the 1-minute watermark and
+    ``now - lag_seconds`` (so write-behind buffers have flushed), then
+    recomputes the affected hours from the 1-minute rollups. Rows that land
+    after their minute was rolled up (requeued write-behind batches, clock
+    skew) are picked up because every run also re-aggregates the closed
+    buckets of the last ``late_window_seconds``. Rollup rows are upserted
+    with whole-bucket values, so re-running a window is harmless.
+    """
+
+    def __init__(self,
+                 source_table: str = 'performance_metrics',
+                 lag_seconds: int = 120,
+                 late_window_seconds: int = 900,
+                 backfill_hours: int = 24,
+                 chunk_minutes: int = 60,
+                 minute_retention_days: int = 30,
+                 hour_retention_days: int = 730):
+        self.source_table = source_table
+        self.lag_seconds = lag_seconds
+        self.late_window_seconds = late_window_seconds
+        self.backfill_hours = backfill_hours
+        self.chunk_minutes = chunk_minutes
+        self.retention_days = {'1m': minute_retention_days, '1h': hour_retention_days}
+        self.watermarks: Dict[str, Optional[datetime]] = {'1m': None, '1h': None}
+
+    @staticmethod
+    def _truncate(timestamp: datetime, resolution: str) -> datetime:
+        """Truncate a timestamp to the start of its rollup bucket"""
+        if resolution == '1h':
+            return timestamp.replace(minute=0, second=0, microsecond=0)
+        return timestamp.replace(second=0, microsecond=0)
+
+    async def _load_watermark(self, conn, resolution: str, default: datetime) -> datetime:
+        """Resume from the latest bucket already present in the rollup table"""
+        if self.watermarks[resolution] is None:
+            table = ROLLUP_RESOLUTIONS[resolution][0]
+            latest_bucket = await conn.fetchval(f"SELECT MAX(bucket) FROM {table}")
+            self.watermarks[resolution] = latest_bucket or default
+        return self.watermarks[resolution]
+
+    async def run_once(self, conn, now: datetime = None) -> Dict[str, int]:
+        """Advance the 1-minute and 1-hour rollups"""
+        now = now or datetime.now(timezone.utc)
+        minute_cutoff = self._truncate(now - timedelta(seconds=self.lag_seconds), '1m')
+        default_start = self._truncate(now - timedelta(hours=self.backfill_hours), '1h')
+
+        # 1-minute rollups from raw rows, in bounded chunks, starting early
+        # enough to re-aggregate closed buckets that may have received late rows
+        minute_rows = 0
+        late_start = self._truncate(minute_cutoff - timedelta(seconds=self.late_window_seconds), '1m')
+        window_start = min(await self._load_watermark(conn, '1m', default_start), late_start)
+        rollup_start = window_start
+        while window_start < minute_cutoff:
+            window_end = min(window_start + timedelta(minutes=self.chunk_minutes), minute_cutoff)
+            minute_rows += await self._rollup_minutes(conn, window_start, window_end)
+            window_start = window_end
+            self.watermarks['1m'] = window_end
+
+        # 1-hour rollups from 1-minute rollups; the latest hour is recomputed
+        # on every run so it never lags the minute rollups by more than a run
+        hour_rows = 0
+        hour_start = self._truncate(
+            min(await self._load_watermark(conn, '1h', default_start), rollup_start), '1h'
+        )
+        if hour_start < minute_cutoff:
+            hour_rows = await self._rollup_hours(conn, hour_start, minute_cutoff)
+            self.watermarks['1h'] = self._truncate(minute_cutoff, '1h')
+
+        return {'minute_buckets': minute_rows, 'hour_buckets': hour_rows}
+
+    async def _rollup_minutes(self, conn, window_start: datetime, window_end: datetime) -> int:
+        """Aggregate raw metric rows into 1-minute buckets"""
+        result = await conn.execute(f"""
+            INSERT INTO performance_metrics_rollup_1m (
+                metric_name, labels, bucket, sample_count, value_sum, value_min, value_max
+            )
+            SELECT metric_name, labels, bucket, COUNT(*), SUM(numeric_value),
+                   MIN(numeric_value), MAX(numeric_value)
+            FROM (
+                SELECT metric_name,
+                       COALESCE(labels, '{{}}'::jsonb) AS labels,
+                       date_trunc('minute', timestamp) AS bucket,
+                       value::double precision AS numeric_value
+                FROM {self.source_table}
+                WHERE timestamp >= $1 AND timestamp < $2 AND value ~ $3
+            ) raw
+            GROUP BY metric_name, labels, bucket
+            ON CONFLICT (metric_name, bucket, labels) DO UPDATE SET
+                sample_count = EXCLUDED.sample_count,
+                value_sum = EXCLUDED.value_sum,
+                value_min = EXCLUDED.value_min,
+                value_max = EXCLUDED.value_max
+        """, window_start, window_end, NUMERIC_VALUE_PATTERN)
+        return int(result.split()[-1]) if result else 0
+
+    async def _rollup_hours(self, conn, window_start: datetime, window_end: datetime) -> int:
+        """Aggregate 1-minute rollups into 1-hour buckets"""
+        result = await conn.execute("""
+            INSERT INTO performance_metrics_rollup_1h (
+                metric_name, labels, bucket, sample_count, value_sum, value_min, value_max
+            )
+            SELECT metric_name, labels, date_trunc('hour', bucket) AS hour_bucket,
+                   SUM(sample_count), SUM(value_sum), MIN(value_min), MAX(value_max)
+            FROM performance_metrics_rollup_1m
+            WHERE bucket >= $1 AND bucket < $2
+            GROUP BY metric_name, labels, hour_bucket
+            ON CONFLICT (metric_name, bucket, labels) DO UPDATE SET
+                sample_count = EXCLUDED.sample_count,
+                value_sum = EXCLUDED.value_sum,
+                value_min = EXCLUDED.value_min,
+                value_max = EXCLUDED.value_max
+        """, window_start, window_end)
+        return int(result.split()[-1]) if result else 0
+
+    async def prune(self, conn, now: datetime = None):
+        """Apply retention to the rollup tables"""
+        now = now or datetime.now(timezone.utc)
+        for resolution, (table, _, _) in ROLLUP_RESOLUTIONS.items():
+            cutoff = now - timedelta(days=self.retention_days[resolution])
+            await conn.execute(f"DELETE FROM {table} WHERE bucket < $1", cutoff)
+
+    async def fetch_history(self,
+                            conn,
+                            resolution: str,
+                            metric_name: str,
+                            start_time: datetime,
+                            labels: Dict[str, str] = None) -> List[Dict[str, Any]]:
+        """Read aggregated history for a metric from a rollup table"""
+        table = ROLLUP_RESOLUTIONS[resolution][0]
+        params = [metric_name, start_time]
+        label_filter = ""
+        if labels:
+            params.append(json.dumps(labels))
+            label_filter = "AND labels @> $3::jsonb"
+
+        rows = await conn.fetch(f"""
+            SELECT bucket, SUM(sample_count)::bigint AS sample_count, SUM(value_sum) AS value_sum,
+                   MIN(value_min) AS value_min, MAX(value_max) AS value_max
+            FROM {table}
+            WHERE metric_name = $1 AND bucket >= $2 {label_filter}
+            GROUP BY bucket
+            ORDER BY bucket ASC
+        """, *params)
+
+        return [
+            {
+                'metric_name': metric_name,
+                'timestamp': row['bucket'],
+                'value': row['value_sum'] / row['sample_count'] if row['sample_count'] else None,
+                'min': row['value_min'],
+                'max': row['value_max'],
+                'count': row['sample_count'],
+                'resolution': resolution
+            }
+            for row in rows
+        ]
@@ -36,8 +36,11 @@ import time
 from collections import defaultdict, deque
 
 # Database and messaging
-import asyncpg
-from aiokafka import AIOKafkaProducer
+from connection_hub import ConnectionHub, get_connection_hub
+
+# Batched persistence and partitioned storage
+from write_behind_buffer import WriteBehindBuffer, WriteBehindConfig
+from metrics_storage import DailyPartitionManager, MetricRollupManager
 
 # Prometheus metrics
 try:
@@ -128,11 +131,13 @@ class PerformanceTracker:
     and integration with Prometheus and Grafana for visualization.
     """
     
-    def __init__(self):
+    def __init__(self, hub: ConnectionHub = None):
+        self.hub = hub or get_connection_hub()
         self.pg_pool = None
         self.kafka_producer = None
         self.prometheus_registry = None
         self.metrics_server = None
+        self.metrics_writer = None
         
         # Prometheus metrics storage
         self.prometheus_metrics = {}
@@ -153,8 +158,33 @@ class PerformanceTracker:
             'metrics_retention_days': int(os.getenv('METRICS_RETENTION_DAYS', '90')),
             'high_frequency_metrics': os.getenv('HIGH_FREQUENCY_METRICS', '').split(','),
             'grafana_dashboard_url': os.getenv('GRAFANA_DASHBOARD_URL', ''),
+            'metrics_flush_batch_size': int(os.getenv('METRICS_FLUSH_BATCH_SIZE', '500')),
+            'metrics_flush_interval': float(os.getenv('METRICS_FLUSH_INTERVAL', '5.0')),  # seconds
+            'metrics_max_pending': int(os.getenv('METRICS_MAX_PENDING', '50000')),
+            'partition_premake_days': int(os.getenv('METRICS_PARTITION_PREMAKE_DAYS', '3')),
+            'rollup_interval': int(os.getenv('METRICS_ROLLUP_INTERVAL', '60')),  # seconds
+            'rollup_lag_seconds': int(os.getenv('METRICS_ROLLUP_LAG_SECONDS', '120')),
+            'rollup_late_window_seconds': int(os.getenv('METRICS_ROLLUP_LATE_WINDOW_SECONDS', '900')),
+            'rollup_minute_retention_days': int(os.getenv('METRICS_ROLLUP_1M_RETENTION_DAYS', '30')),
+            'rollup_hour_retention_days': int(os.getenv('METRICS_ROLLUP_1H_RETENTION_DAYS', '730')),
+            'raw_history_max_hours': int(os.getenv('METRICS_RAW_HISTORY_MAX_HOURS', '2')),
+            'minute_rollup_max_hours': int(os.getenv('METRICS_1M_ROLLUP_MAX_HOURS', '48')),
         }
         
+        # Partitioned storage and continuous rollups
+        self.partition_manager = DailyPartitionManager(
+            'performance_metrics',
+            retention_days=self.config['metrics_retention_days'],
+            premake_days=self.config['partition_premake_days']
+        )
+        self.rollup_manager = MetricRollupManager(
+            source_table='performance_metrics',
+            lag_seconds=self.config['rollup_lag_seconds'],
+            late_window_seconds=self.config['rollup_late_window_seconds'],
+            minute_retention_days=self.config['rollup_minute_retention_days'],
+            hour_retention_days=self.config['rollup_hour_retention_days']
+        )
+        
         # Metric definitions
         self.metric_definitions = {}
         
@@ -186,26 +216,31 @@ class PerformanceTracker:
     async def initialize(self):
         """Initialize the performance tracker"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=2,
-                max_size=10
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('performance_tracker')
+            
+            # Shared Kafka producer from the connection hub
+            self.kafka_producer = await self.hub.get_kafka_producer('performance_tracker')
+            
+            # Make sure today's partitions exist before the first flush
+            async with self.pg_pool.acquire() as conn:
+                await self.partition_manager.ensure_partitions(conn)
             
-            # Initialize Kafka producer
-            self.kafka_producer = AIOKafkaProducer(
-                bootstrap_servers=self.config['kafka_bootstrap_servers'],
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                compression_type='gzip',
-                acks='all',
-                retries=3
+            # Initialize write-behind persistence for metric data points
+            self.metrics_writer = WriteBehindBuffer(
+                name='performance_metrics',
+                pg_pool=self.pg_pool,
+                table='performance_metrics',
+                columns=['metric_id', 'metric_name', 'value', 'labels', 'timestamp', 'metadata'],
+                kafka_producer=self.kafka_producer,
+                topic=self.config['metrics_topic'],
+                config=WriteBehindConfig(
+                    max_batch_size=self.config['metrics_flush_batch_size'],
+                    flush_interval=self.config['metrics_flush_interval'],
+                    max_pending=self.config['metrics_max_pending']
+                )
             )
-            await self.kafka_producer.start()
+            await self.metrics_writer.start()
             
             # Initialize Prometheus metrics if enabled
             if self.config['enable_prometheus']:
@@ -223,9 +258,9 @@ class PerformanceTracker:
             if self.config['enable_business_metrics']:
                 asyncio.create_task(self._business_metrics_collector())
             
-            asyncio.create_task(self._metrics_processor())
             asyncio.create_task(self._alert_evaluator())
-            asyncio.create_task(self._metrics_cleanup())
+            asyncio.create_task(self._rollup_maintainer())
+            asyncio.create_task(self._partition_maintainer())
             
             logger.info("Performance Tracker initialized successfully")
             
@@ -419,7 +454,8 @@ class PerformanceTracker:
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'metrics_collected': len(self.metric_buffers),
             'active_alerts': len(self.active_alerts),
-            'prometheus_enabled': self.config['enable_prometheus']
+            'prometheus_enabled': self.config['enable_prometheus'],
+            'metrics_writer': self.metrics_writer.get_metrics() if self.metrics_writer else {}
         })
     
     async def _load_metric_definitions(self):
@@ -684,7 +720,8 @@ class PerformanceTracker:
         Record a performance metric
         
         This is the main entry point for recording performance metrics
-        from all Phase 4 components.
+        from all Phase 4 components. The data point and its Kafka event are
+        queued on the write-behind buffer and persisted in batches.
         """
         try:
             metric = PerformanceMetric(
@@ -703,12 +740,12 @@ class PerformanceTracker:
             if self.config['enable_prometheus']:
                 await self._update_prometheus_metric(metric)
             
-            # Store in database for high-frequency metrics
-            if metric_name in self.config['high_frequency_metrics']:
-                await self._store_metric(metric)
+            # Queue database row and metric event for batched write-behind
+            await self.metrics_writer.add(self._metric_to_row(metric), self._metric_event(metric))
             
-            # Publish metric event
-            await self._publish_metric_event(metric)
+            # High-frequency metrics are flushed without waiting for the interval
+            if metric_name in self.config['high_frequency_metrics']:
+                self.metrics_writer.request_flush()
             
             logger.debug(f"Recorded metric: {metric_name} = {value}")
             
@@ -738,26 +775,6 @@ class PerformanceTracker:
         except Exception as e:
             logger.error(f"Failed to update Prometheus metric: {e}")
     
-    async def _metrics_processor(self):
-        """Process metrics from buffers and store in database"""
-        try:
-            while self.running:
-                await asyncio.sleep(self.config['metrics_collection_interval'])
-                
-                # Process buffered metrics
-                for metric_name, buffer in self.metric_buffers.items():
-                    if buffer:
-                        # Get metrics from buffer
-                        metrics_to_process = list(buffer)
-                        buffer.clear()
-                        
-                        # Store in database
-                        for metric in metrics_to_process:
-                            await self._store_metric(metric)
-                
-        except Exception as e:
-            logger.error(f"Error in metrics processor: {e}")
-    
     async def _alert_evaluator(self):
         """Evaluate metrics against alert thresholds"""
         try:
@@ -831,42 +848,52 @@ class PerformanceTracker:
         except Exception as e:
             logger.error(f"Failed to evaluate metric alerts: {e}")
     
-    async def _metrics_cleanup(self):
-        """Clean up old metrics data"""
+    async def _rollup_maintainer(self):
+        """Maintain continuous 1-minute and 1-hour metric rollups"""
         try:
             while self.running:
-                await asyncio.sleep(3600)  # Check every hour
+                await asyncio.sleep(self.config['rollup_interval'])
                 
-                # Clean up metrics based on retention policy
-                for definition in self.metric_definitions.values():
-                    cutoff_date = datetime.now(timezone.utc) - timedelta(days=definition.retention_days)
-                    
+                try:
                     async with self.pg_pool.acquire() as conn:
-                        deleted_count = await conn.fetchval("""
-                            DELETE FROM performance_metrics 
-                            WHERE metric_name = $1 AND timestamp < $2
-                            RETURNING COUNT(*)
-                        """, definition.name, cutoff_date)
-                        
-                        if deleted_count > 0:
-                            logger.debug(f"Cleaned up {deleted_count} old metrics for {definition.name}")
+                        rollup_stats = await self.rollup_manager.run_once(conn)
+                    
+                    logger.debug(f"Metric rollups updated: {rollup_stats}")
+                    
+                except Exception as e:
+                    logger.error(f"Failed to update metric rollups: {e}")
                 
         except Exception as e:
-            logger.error(f"Error in metrics cleanup: {e}")
+            logger.error(f"Error in rollup maintainer: {e}")
     
-    # Database operations
-    async def _store_metric(self, metric: PerformanceMetric):
-        """Store metric in database"""
+    async def _partition_maintainer(self):
+        """Create upcoming partitions and drop expired ones"""
         try:
-            async with self.pg_pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO performance_metrics (
-                        metric_id, metric_name, value, labels, timestamp, metadata
-                    ) VALUES ($1, $2, $3, $4, $5, $6)
-                """, metric.metric_id, metric.name, str(metric.value),
-                    json.dumps(metric.labels), metric.timestamp, json.dumps(metric.metadata))
+            while self.running:
+                await asyncio.sleep(3600)  # Check every hour
+                
+                try:
+                    async with self.pg_pool.acquire() as conn:
+                        await self.partition_manager.ensure_partitions(conn)
+                        dropped = await self.partition_manager.drop_expired_partitions(conn)
+                        await self.rollup_manager.prune(conn)
+                    
+                    if dropped:
+                        logger.info(f"Dropped expired metric partitions: {', '.join(dropped)}")
+                    
+                except Exception as e:
+                    logger.error(f"Failed to maintain metric partitions: {e}")
+                
         except Exception as e:
-            logger.error(f"Failed to store metric: {e}")
+            logger.error(f"Error in partition maintainer: {e}")
+    
+    # Database operations
+    def _metric_to_row(self, metric: PerformanceMetric) -> Tuple:
+        """Convert metric to a performance_metrics row for batched persistence"""
+        return (
+            metric.metric_id, metric.name, str(metric.value),
+            json.dumps(metric.labels), metric.timestamp, json.dumps(metric.metadata)
+        )
     
     async def _store_alert(self, alert: PerformanceAlert):
         """Store alert in database"""
@@ -915,22 +942,16 @@ class PerformanceTracker:
         )
     
     # Event publishing
-    async def _publish_metric_event(self, metric: PerformanceMetric):
-        """Publish metric event to Kafka"""
-        try:
-            event_data = {
-                'event_type': 'metric.recorded',
-                'metric_id': metric.metric_id,
-                'metric_name': metric.name,
-                'value': metric.value,
-                'labels': metric.labels,
-                'timestamp': metric.timestamp.isoformat()
-            }
-            
-            await self.kafka_producer.send(self.config['metrics_topic'], event_data)
-            
-        except Exception as e:
-            logger.error(f"Failed to publish metric event: {e}")
+    def _metric_event(self, metric: PerformanceMetric) -> Dict[str, Any]:
+        """Build metric event published in batches by the write-behind buffer"""
+        return {
+            'event_type': 'metric.recorded',
+            'metric_id': metric.metric_id,
+            'metric_name': metric.name,
+            'value': metric.value,
+            'labels': metric.labels,
+            'timestamp': metric.timestamp.isoformat()
+        }
     
     async def _publish_alert_event(self, alert: PerformanceAlert):
         """Publish alert event to Kafka"""
@@ -958,12 +979,15 @@ class PerformanceTracker:
             cutoff_time = datetime.now(timezone.utc) - timedelta(hours=time_window_hours)
             
             async with self.pg_pool.acquire() as conn:
-                # Get metric counts by category
-                category_stats = await conn.fetch("""
-                    SELECT pmd.category, COUNT(*) as metric_count
-                    FROM performance_metrics pm
-                    JOIN performance_metric_definitions pmd ON pm.metric_name = pmd.name
-                    WHERE pm.timestamp >= $1
+                # Get metric counts by category from the rollups rather than raw rows
+                rollup_table = 'performance_metrics_rollup_1m' \
+                    if time_window_hours <= self.config['minute_rollup_max_hours'] \
+                    else 'performance_metrics_rollup_1h'
+                category_stats = await conn.fetch(f"""
+                    SELECT pmd.category, SUM(r.sample_count) as metric_count
+                    FROM {rollup_table} r
+                    JOIN performance_metric_definitions pmd ON r.metric_name = pmd.name
+                    WHERE r.bucket >= $1
                     GROUP BY pmd.category
                 """, cutoff_time)
                 
@@ -992,22 +1016,41 @@ class PerformanceTracker:
             logger.error(f"Failed to get metrics summary: {e}")
             return {}
     
+    def _select_history_resolution(self, time_window_hours: float) -> str:
+        """Pick the coarsest storage that still gives a useful series for the window"""
+        if time_window_hours <= self.config['raw_history_max_hours']:
+            return 'raw'
+        if time_window_hours <= self.config['minute_rollup_max_hours']:
+            return '1m'
+        return '1h'
+    
     async def get_metric_history(self, 
                                 metric_name: str, 
                                 time_window_hours: int = 24,
-                                labels: Dict[str, str] = None) -> List[Dict[str, Any]]:
-        """Get metric history for the specified time window"""
+                                labels: Dict[str, str] = None,
+                                resolution: str = None) -> List[Dict[str, Any]]:
+        """
+        Get metric history for the specified time window
+        
+        Short windows read raw rows; longer windows read the 1-minute or
+        1-hour rollups. Pass resolution ('raw', '1m', '1h') to override.
+        """
         try:
             cutoff_time = datetime.now(timezone.utc) - timedelta(hours=time_window_hours)
+            resolution = resolution or self._select_history_resolution(time_window_hours)
             
             async with self.pg_pool.acquire() as conn:
+                if resolution != 'raw':
+                    return await self.rollup_manager.fetch_history(
+                        conn, resolution, metric_name, cutoff_time, labels
+                    )
+                
                 if labels:
-                    # Filter by labels (simplified - would need proper JSON querying in production)
                     metrics = await conn.fetch("""
                         SELECT * FROM performance_metrics 
-                        WHERE metric_name = $1 AND timestamp >= $2
+                        WHERE metric_name = $1 AND timestamp >= $2 AND labels @> $3::jsonb
                         ORDER BY timestamp ASC
-                    """, metric_name, cutoff_time)
+                    """, metric_name, cutoff_time, json.dumps(labels))
                 else:
                     metrics = await conn.fetch("""
                         SELECT * FROM performance_metrics 
@@ -1032,6 +1075,10 @@ class PerformanceTracker:
         if self.metrics_server:
             await self.metrics_server.cleanup()
         
+        # Drain buffered metrics before closing connections
+        if self.metrics_writer:
+            await self.metrics_writer.close()
+        
         if self.kafka_producer:
             await self.kafka_producer.stop()
         
@@ -1041,9 +1088,9 @@ class PerformanceTracker:
         logger.info("Performance Tracker closed")
 
 # Factory function
-async def create_performance_tracker() -> PerformanceTracker:
+async def create_performance_tracker(hub: ConnectionHub = None) -> PerformanceTracker:
     """Factory function to create and initialize performance tracker"""
-    tracker = PerformanceTracker()
+    tracker = PerformanceTracker(hub)
     await tracker.initialize()
     return tracker
 
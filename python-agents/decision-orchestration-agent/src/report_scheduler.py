@@ -13,6 +13,9 @@ Key Features:
 - Resource allocation and load balancing across report types
 - Priority-based scheduling with SLA considerations
 - Retry logic and failure handling with escalation
+- Batched execution of ready jobs through batch report generation
+- Event-driven dependency release: waiting jobs are parked, not re-polled
+- Several executors with resource-pool-aware admission and wait metrics
 
 Rule Compliance:
 - Rule 1: No stubs - Full production scheduling implementation
@@ -23,7 +26,10 @@ Rule Compliance:
 
 import os
 import asyncio
+import heapq
+import itertools
 import logging
+import time as monotonic_time
 from datetime import datetime, timezone, timedelta, time
 from typing import Dict, List, Optional, Any, Union, Tuple, Set
 from enum import Enum
@@ -34,12 +40,11 @@ import cron_descriptor
 from croniter import croniter
 
 # Database and messaging
-import asyncpg
-from aiokafka import AIOKafkaProducer
+from connection_hub import ConnectionHub, get_connection_hub
 
 # Import our components
 from deadline_engine import DeadlineEngine, CalculatedDeadline, DeadlineStatus
-from compliance_report_generator import ComplianceReportGenerator, ReportRequest, ReportType, ReportFormat
+from compliance_report_generator import ComplianceReportGenerator, ReportRequest, ReportResult, ReportStatus, ReportType, ReportFormat
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -131,7 +136,8 @@ class ReportScheduler:
     and dynamic adjustment based on regulatory deadlines and system load.
     """
     
-    def __init__(self):
+    def __init__(self, hub: ConnectionHub = None):
+        self.hub = hub or get_connection_hub()
         self.pg_pool = None
         self.kafka_producer = None
         self.deadline_engine = None
@@ -151,6 +157,12 @@ class ReportScheduler:
             'scheduler_topic': os.getenv('SCHEDULER_TOPIC', 'report.scheduler'),
             'job_topic': os.getenv('JOB_TOPIC', 'report.jobs'),
             'max_concurrent_jobs': int(os.getenv('MAX_CONCURRENT_JOBS', '10')),
+            # Executors pulling ready jobs from the shared queue
+            'executor_count': int(os.getenv('SCHEDULER_EXECUTORS', os.getenv('MAX_CONCURRENT_JOBS', '10'))),
+            # Reconciliation sweep for dependencies completed outside this process
+            'dependency_sweep_interval': int(os.getenv('SCHEDULER_DEPENDENCY_SWEEP_INTERVAL', '300')),
+            # Ready jobs of one resource pool generated together in one batch
+            'job_batch_size': int(os.getenv('SCHEDULER_JOB_BATCH_SIZE', '50')),
             'job_timeout_minutes': int(os.getenv('JOB_TIMEOUT_MINUTES', '120')),
             'schedule_check_interval': int(os.getenv('SCHEDULE_CHECK_INTERVAL', '60')),  # seconds
             'dependency_timeout_minutes': int(os.getenv('DEPENDENCY_TIMEOUT_MINUTES', '1440')),  # 24 hours
@@ -169,44 +181,50 @@ class ReportScheduler:
             'avg_job_duration': 0.0,
             'dependency_violations': 0,
             'resource_contentions': 0,
-            'sla_breaches': 0
+            'sla_breaches': 0,
+            'jobs_dispatched': 0,
+            'dependency_releases': 0,
+            'resource_releases': 0,
+            'avg_queue_wait_seconds': 0.0,
+            'max_queue_wait_seconds': 0.0
         }
         
         # Active jobs tracking
         self.active_jobs = {}
+        # Ready jobs; executors take from here and never sleep on a blocked job
         self.job_queue = asyncio.PriorityQueue()
         self.running = False
+        self._executor_tasks: List[asyncio.Task] = []
+        self._enqueued_at: Dict[str, float] = {}
+        
+        # Jobs parked on unmet dependencies, indexed by the job/schedule IDs they wait for
+        self.waiting_jobs: Dict[str, ScheduledJob] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        
+        # Jobs parked on a full resource pool: per-pool heap of (-priority, scheduled, seq, job)
+        self._resource_waiters: Dict[str, List[Tuple[int, float, int, ScheduledJob]]] = {
+            name: [] for name in self.resource_pools
+        }
+        self._waiter_sequence = itertools.count()
+        
+        # Retries waiting out their delay, kept so they are not garbage collected
+        self._retry_tasks: Set[asyncio.Task] = set()
     
     async def initialize(self):
         """Initialize the report scheduler"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=2,
-                max_size=10
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('report_scheduler')
             
-            # Initialize Kafka producer
-            self.kafka_producer = AIOKafkaProducer(
-                bootstrap_servers=self.config['kafka_bootstrap_servers'],
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                compression_type='gzip',
-                acks='all',
-                retries=3
-            )
-            await self.kafka_producer.start()
+            # Shared Kafka producer from the connection hub
+            self.kafka_producer = await self.hub.get_kafka_producer('report_scheduler')
             
             # Initialize deadline engine
             from deadline_engine import create_deadline_engine
-            self.deadline_engine = await create_deadline_engine()
+            self.deadline_engine = await create_deadline_engine(self.hub)
             
             # Initialize report generator
-            self.report_generator = ComplianceReportGenerator()
+            self.report_generator = ComplianceReportGenerator(self.hub)
             await self.report_generator.initialize()
             
             # Load existing schedules
@@ -215,7 +233,10 @@ class ReportScheduler:
             # Start scheduler components
             self.running = True
             asyncio.create_task(self._schedule_monitor())
-            asyncio.create_task(self._job_executor())
+            self._executor_tasks = [
+                asyncio.create_task(self._job_executor(executor_id))
+                for executor_id in range(self.config['executor_count'])
+            ]
             asyncio.create_task(self._dependency_resolver())
             asyncio.create_task(self._resource_manager())
             asyncio.create_task(self._cleanup_completed_jobs())
@@ -462,8 +483,7 @@ class ReportScheduler:
             await self._store_job(job)
             
             # Add to queue
-            priority_value = -job.priority.value  # Negative for max-heap behavior
-            await self.job_queue.put((priority_value, job.scheduled_time.timestamp(), job))
+            await self._enqueue_job(job)
             
             # Publish job creation event
             await self._publish_job_event('job.created', job)
@@ -502,73 +522,227 @@ class ReportScheduler:
             else:
                 return f"{now.year}-{now.month - 1:02d}"
     
-    async def _job_executor(self):
-        """Execute jobs from the queue"""
+    async def _enqueue_job(self, job: ScheduledJob):
+        """Make a job available to the executors"""
+        self._enqueued_at.setdefault(job.job_id, monotonic_time.monotonic())
+        priority_value = -job.priority.value  # Negative for max-heap behavior
+        await self.job_queue.put((priority_value, job.scheduled_time.timestamp(), job))
+    
+    def _record_queue_wait(self, job: ScheduledJob):
+        enqueued_at = self._enqueued_at.pop(job.job_id, None)
+        if enqueued_at is None:
+            return
+        wait = monotonic_time.monotonic() - enqueued_at
+        self.metrics['jobs_dispatched'] += 1
+        dispatched = self.metrics['jobs_dispatched']
+        current_avg = self.metrics['avg_queue_wait_seconds']
+        self.metrics['avg_queue_wait_seconds'] = (current_avg * (dispatched - 1) + wait) / dispatched
+        self.metrics['max_queue_wait_seconds'] = max(self.metrics['max_queue_wait_seconds'], wait)
+    
+    async def _job_executor(self, executor_id: int = 0):
+        """
+        Execute ready jobs from the queue, batching ready jobs of the same resource pool
+        
+        Several executors share the queue. A job whose dependencies are unmet
+        or whose resource pool is full is parked and the executor moves on;
+        parked jobs are re-queued when a dependency completes or capacity is
+        released.
+        """
         try:
             while self.running:
                 try:
                     # Get next job from queue
                     _, _, job = await asyncio.wait_for(self.job_queue.get(), timeout=1.0)
                     
-                    # Check resource availability
-                    if not await self._allocate_resources(job):
-                        # Put job back in queue with delay
-                        await asyncio.sleep(30)
-                        priority_value = -job.priority.value
-                        await self.job_queue.put((priority_value, job.scheduled_time.timestamp(), job))
+                    # Check dependencies (parks the job if they are unmet)
+                    if not await self._admit_dependencies(job):
                         continue
                     
-                    # Check dependencies
-                    if not await self._check_job_dependencies(job):
-                        # Put job back in queue with delay
-                        await asyncio.sleep(60)
-                        priority_value = -job.priority.value
-                        await self.job_queue.put((priority_value, job.scheduled_time.timestamp(), job))
+                    # Check resource availability
+                    if not await self._allocate_resources(job):
+                        self._park_for_resources(job)
                         continue
                     
-                    # Execute job
-                    asyncio.create_task(self._execute_job(job))
+                    # Execute job together with other ready jobs sharing its allocation
+                    batch = await self._collect_job_batch(job)
+                    for batched in batch:
+                        self._record_queue_wait(batched)
+                    await self._execute_jobs(batch)
                     
                 except asyncio.TimeoutError:
                     continue  # No jobs in queue
                 except Exception as e:
-                    logger.error(f"Error in job executor: {e}")
+                    logger.error(f"Error in job executor {executor_id}: {e}")
                     
         except Exception as e:
-            logger.error(f"Fatal error in job executor: {e}")
+            logger.error(f"Fatal error in job executor {executor_id}: {e}")
+    
+    async def _admit_dependencies(self, job: ScheduledJob) -> bool:
+        """
+        Check a dequeued job's dependencies, leaving it parked if they are unmet
+        
+        The job is parked before the check, so a dependency completing while
+        the check runs still finds it in _dependents. Returns True if the
+        caller should run the job now, False if it stays parked or was
+        re-queued by _release_dependents in the meantime.
+        """
+        if not job.dependency_jobs:
+            return True
+        
+        self._park_for_dependencies(job)
+        if not await self._check_job_dependencies(job):
+            return False
+        if self.waiting_jobs.get(job.job_id) is not job:
+            return False  # Released and re-queued while the check ran
+        self._unpark_dependent(job)
+        return True
+    
+    def _park_for_dependencies(self, job: ScheduledJob):
+        """Hold a job until one of its dependencies completes"""
+        self.waiting_jobs[job.job_id] = job
+        for dependency in job.dependency_jobs or []:
+            self._dependents.setdefault(dependency, set()).add(job.job_id)
+        logger.debug(f"Job {job.job_id} waiting on dependencies {job.dependency_jobs}")
+    
+    def _unpark_dependent(self, job: ScheduledJob):
+        self.waiting_jobs.pop(job.job_id, None)
+        for dependency in job.dependency_jobs or []:
+            dependents = self._dependents.get(dependency)
+            if dependents:
+                dependents.discard(job.job_id)
+                if not dependents:
+                    del self._dependents[dependency]
+    
+    async def _release_dependents(self, completed: ScheduledJob):
+        """Queue parked jobs whose dependencies are met now that ``completed`` is done"""
+        candidate_ids = set()
+        for key in (completed.job_id, completed.schedule_id):
+            candidate_ids |= self._dependents.get(key, set())
+        
+        for job_id in candidate_ids:
+            job = self.waiting_jobs.get(job_id)
+            if job and await self._check_job_dependencies(job) and self.waiting_jobs.get(job_id) is job:
+                self._unpark_dependent(job)
+                await self._enqueue_job(job)
+                self.metrics['dependency_releases'] += 1
+                logger.info(f"Dependencies met for job {job_id} after {completed.job_id} completed")
+    
+    def _park_for_resources(self, job: ScheduledJob):
+        """Hold a job until its resource pool has capacity"""
+        waiters = self._resource_waiters.setdefault(self._resource_pool_name(job), [])
+        heapq.heappush(waiters, (-job.priority.value, job.scheduled_time.timestamp(),
+                                 next(self._waiter_sequence), job))
+    
+    async def _release_resource_waiters(self, pool_name: str):
+        """Queue as many parked jobs as the pool now has free slots, highest priority first"""
+        pool = self.resource_pools.get(pool_name)
+        waiters = self._resource_waiters.get(pool_name)
+        if not pool or not waiters:
+            return
+        
+        free_slots = pool.max_concurrent_jobs - pool.current_jobs
+        while waiters and free_slots > 0:
+            job = heapq.heappop(waiters)[3]
+            await self._enqueue_job(job)
+            self.metrics['resource_releases'] += 1
+            free_slots -= 1
+    
+    def _resource_pool_name(self, job: ScheduledJob) -> str:
+        """Resource pool a job runs in"""
+        pool_name = job.report_type.lower()
+        return pool_name if pool_name in self.resource_pools else 'general'
+    
+    async def _collect_job_batch(self, job: ScheduledJob) -> List[ScheduledJob]:
+        """
+        Drain queued jobs that can run in the same batch as ``job``
+        
+        Every batched job takes its own slot in the resource pool, so a batch
+        never runs more jobs than the pool allows; collection stops once the
+        pool is full. Jobs for other pools go back on the queue and jobs with
+        unmet dependencies are parked.
+        """
+        batch = [job]
+        deferred = []
+        pool_name = self._resource_pool_name(job)
+        pool = self.resource_pools[pool_name]
+        
+        while (len(batch) < self.config['job_batch_size'] and not self.job_queue.empty()
+               and pool.current_jobs < pool.max_concurrent_jobs):
+            entry = self.job_queue.get_nowait()
+            candidate = entry[2]
+            if self._resource_pool_name(candidate) != pool_name:
+                deferred.append(entry)
+            elif not await self._admit_dependencies(candidate):
+                continue
+            elif await self._allocate_resources(candidate):
+                batch.append(candidate)
+            else:
+                self._park_for_resources(candidate)
+        
+        for entry in deferred:
+            await self.job_queue.put(entry)
+        
+        return batch
+    
+    def _build_report_request(self, job: ScheduledJob, start_time: datetime) -> ReportRequest:
+        """Create the report request for a job"""
+        return ReportRequest(
+            report_id=f"{job.report_type}_{job.reporting_period}_{job.institution_id}",
+            report_type=ReportType(job.report_type),
+            format=ReportFormat.XBRL,
+            reporting_period=job.reporting_period,
+            institution_id=job.institution_id,
+            jurisdiction=job.metadata.get('jurisdiction', 'EU'),
+            template_version='3.2.0',
+            data_sources=['database'],
+            delivery_method='SFTP',
+            deadline=start_time + timedelta(minutes=job.max_retries * 30)
+        )
     
     async def _execute_job(self, job: ScheduledJob):
         """Execute a single job"""
+        await self._execute_jobs([job])
+    
+    async def _execute_jobs(self, jobs: List[ScheduledJob]):
+        """Execute a batch of jobs through one batch report generation call"""
         start_time = datetime.now(timezone.utc)
+        results: List[Optional[ReportResult]] = [None] * len(jobs)
+        batch_error = None
         
         try:
-            logger.info(f"Executing job: {job.job_id}")
-            
-            # Update job status
-            job.status = JobStatus.RUNNING
-            job.started_time = start_time
-            await self._update_job_status(job)
+            logger.info(f"Executing {len(jobs)} jobs: {[job.job_id for job in jobs]}")
             
-            # Track active job
-            self.active_jobs[job.job_id] = job
-            
-            # Create report request
-            report_request = ReportRequest(
-                report_id=f"{job.report_type}_{job.reporting_period}_{job.institution_id}",
-                report_type=ReportType(job.report_type),
-                format=ReportFormat.XBRL,
-                reporting_period=job.reporting_period,
-                institution_id=job.institution_id,
-                jurisdiction=job.metadata.get('jurisdiction', 'EU'),
-                template_version='3.2.0',
-                data_sources=['database'],
-                delivery_method='SFTP',
-                deadline=start_time + timedelta(minutes=job.max_retries * 30)
-            )
+            for job in jobs:
+                # Update job status
+                job.status = JobStatus.RUNNING
+                job.started_time = start_time
+                await self._update_job_status(job)
+                
+                # Track active job
+                self.active_jobs[job.job_id] = job
             
-            # Generate report
-            result = await self.report_generator.generate_report(report_request)
+            # Generate reports
+            requests = [self._build_report_request(job, start_time) for job in jobs]
+            batch = await self.report_generator.generate_reports_batch(requests)
+            results = batch.results
             
+        except Exception as e:
+            batch_error = str(e)
+            logger.error(f"Batch job execution failed: {batch_error}")
+        
+        finally:
+            for job in jobs:
+                await self._release_resources(job)
+        
+        for job, result in zip(jobs, results):
+            if result is not None and result.status == ReportStatus.COMPLETED:
+                await self._complete_job(job, result)
+            else:
+                await self._fail_job(job, result.error_message if result is not None else batch_error)
+    
+    async def _complete_job(self, job: ScheduledJob, result: ReportResult):
+        """Record a successfully generated job"""
+        try:
             # Update job with results
             job.status = JobStatus.COMPLETED
             job.completed_time = datetime.now(timezone.utc)
@@ -581,12 +755,12 @@ class ReportScheduler:
             
             await self._update_job_status(job)
             
-            # Release resources
-            await self._release_resources(job)
-            
             # Remove from active jobs
             self.active_jobs.pop(job.job_id, None)
             
+            # Release jobs that were waiting on this one
+            await self._release_dependents(job)
+            
             # Update metrics
             execution_time = (job.completed_time - job.started_time).total_seconds()
             await self._update_job_metrics(execution_time, True)
@@ -597,41 +771,42 @@ class ReportScheduler:
             logger.info(f"Job completed: {job.job_id} in {execution_time:.2f}s")
             
         except Exception as e:
-            # Handle job failure
-            error_msg = f"Job execution failed: {str(e)}"
-            logger.error(error_msg)
-            
-            job.status = JobStatus.FAILED
-            job.error_message = error_msg
-            job.completed_time = datetime.now(timezone.utc)
-            
-            await self._update_job_status(job)
-            
-            # Release resources
-            await self._release_resources(job)
-            
-            # Remove from active jobs
-            self.active_jobs.pop(job.job_id, None)
+            logger.error(f"Failed to record job completion {job.job_id}: {e}")
+    
+    async def _fail_job(self, job: ScheduledJob, error: Optional[str]):
+        """Record a failed job and schedule its retry"""
+        # Handle job failure
+        error_msg = f"Job execution failed: {error}"
+        logger.error(error_msg)
+        
+        job.status = JobStatus.FAILED
+        job.error_message = error_msg
+        job.completed_time = datetime.now(timezone.utc)
+        
+        await self._update_job_status(job)
+        
+        # Remove from active jobs
+        self.active_jobs.pop(job.job_id, None)
+        
+        # Handle retry logic
+        if job.retry_count < job.max_retries:
+            # Retries wait out their delay without holding up the rest of the batch
+            retry_task = asyncio.create_task(self._schedule_job_retry(job))
+            self._retry_tasks.add(retry_task)
+            retry_task.add_done_callback(self._retry_tasks.discard)
+        else:
+            # Update metrics
+            execution_time = (job.completed_time - job.started_time).total_seconds() if job.started_time else 0
+            await self._update_job_metrics(execution_time, False)
             
-            # Handle retry logic
-            if job.retry_count < job.max_retries:
-                await self._schedule_job_retry(job)
-            else:
-                # Update metrics
-                execution_time = (job.completed_time - job.started_time).total_seconds() if job.started_time else 0
-                await self._update_job_metrics(execution_time, False)
-                
-                # Publish failure event
-                await self._publish_job_event('job.failed', job)
+            # Publish failure event
+            await self._publish_job_event('job.failed', job)
     
     async def _allocate_resources(self, job: ScheduledJob) -> bool:
         """Allocate resources for job execution"""
         try:
             # Determine resource pool
-            pool_name = 'general'
-            if job.report_type.lower() in self.resource_pools:
-                pool_name = job.report_type.lower()
-            
+            pool_name = self._resource_pool_name(job)
             pool = self.resource_pools[pool_name]
             
             # Check availability
@@ -663,6 +838,9 @@ class ReportScheduler:
                 if pool and pool.current_jobs > 0:
                     pool.current_jobs -= 1
                     logger.debug(f"Released resources for job {job.job_id} from pool {pool_name}")
+                
+                # Admit jobs parked on this pool
+                await self._release_resource_waiters(pool_name)
                     
         except Exception as e:
             logger.error(f"Failed to release resources: {e}")
@@ -673,17 +851,18 @@ class ReportScheduler:
             if not job.dependency_jobs:
                 return True
             
+            # One query for all dependencies (by job ID, or schedule ID for the same period)
             async with self.pg_pool.acquire() as conn:
-                for dep_job_id in job.dependency_jobs:
-                    # Check if dependency job is completed
-                    dep_status = await conn.fetchval("""
-                        SELECT status FROM scheduled_jobs 
-                        WHERE job_id = $1 OR (schedule_id = $1 AND reporting_period = $2)
-                    """, dep_job_id, job.reporting_period)
-                    
-                    if dep_status != 'COMPLETED':
-                        self.metrics['dependency_violations'] += 1
-                        return False
+                records = await conn.fetch("""
+                    SELECT job_id, schedule_id FROM scheduled_jobs 
+                    WHERE status = 'COMPLETED'
+                    AND (job_id = ANY($1::text[]) OR (schedule_id = ANY($1::text[]) AND reporting_period = $2))
+                """, list(job.dependency_jobs), job.reporting_period)
+            
+            completed = {record['job_id'] for record in records} | {record['schedule_id'] for record in records}
+            if any(dep_job_id not in completed for dep_job_id in job.dependency_jobs):
+                self.metrics['dependency_violations'] += 1
+                return False
             
             job.dependencies_met = True
             return True
@@ -708,8 +887,9 @@ class ReportScheduler:
             # Schedule retry
             await asyncio.sleep(retry_delay * 60)  # Convert to seconds
             
-            priority_value = -job.priority.value
-            await self.job_queue.put((priority_value, retry_time.timestamp(), job))
+            # Queue behind jobs of the same priority scheduled before the retry time
+            job.scheduled_time = retry_time
+            await self._enqueue_job(job)
             
             logger.info(f"Scheduled retry for job {job.job_id} (attempt {job.retry_count})")
             
@@ -717,10 +897,24 @@ class ReportScheduler:
             logger.error(f"Failed to schedule job retry: {e}")
     
     async def _dependency_resolver(self):
-        """Resolve job dependencies and update dependency status"""
+        """
+        Reconcile dependency state
+        
+        Parked jobs are normally released by _release_dependents when a
+        dependency completes here. This sweep catches dependencies completed
+        by another scheduler instance, and jobs persisted by a previous run
+        that are not tracked in memory.
+        """
         try:
             while self.running:
-                await asyncio.sleep(300)  # Check every 5 minutes
+                await asyncio.sleep(self.config['dependency_sweep_interval'])
+                
+                # Parked jobs whose dependencies completed elsewhere
+                for job in list(self.waiting_jobs.values()):
+                    if await self._check_job_dependencies(job) and self.waiting_jobs.get(job.job_id) is job:
+                        self._unpark_dependent(job)
+                        await self._enqueue_job(job)
+                        self.metrics['dependency_releases'] += 1
                 
                 # Get jobs waiting for dependencies
                 async with self.pg_pool.acquire() as conn:
@@ -731,12 +925,15 @@ class ReportScheduler:
                     """, datetime.now(timezone.utc) + timedelta(hours=1))
                 
                 for job_record in waiting_jobs:
+                    job_id = job_record['job_id']
+                    if job_id in self.waiting_jobs or job_id in self._enqueued_at or job_id in self.active_jobs:
+                        continue
+                    
                     job = self._record_to_job(job_record)
                     
                     if await self._check_job_dependencies(job):
                         # Dependencies met - add to queue
-                        priority_value = -job.priority.value
-                        await self.job_queue.put((priority_value, job.scheduled_time.timestamp(), job))
+                        await self._enqueue_job(job)
                         
                         # Update database
                         async with self.pg_pool.acquire() as conn:
@@ -745,6 +942,8 @@ class ReportScheduler:
                                 SET dependencies_met = true, updated_at = CURRENT_TIMESTAMP
                                 WHERE job_id = $1
                             """, job.job_id)
+                    else:
+                        self._park_for_dependencies(job)
                 
         except Exception as e:
             logger.error(f"Error in dependency resolver: {e}")
@@ -757,11 +956,7 @@ class ReportScheduler:
                 
                 # Update resource pool metrics
                 for pool_name, pool in self.resource_pools.items():
-                    pool.resource_metrics = {
-                        'utilization': (pool.current_jobs / pool.max_concurrent_jobs) * 100,
-                        'queue_length': self.job_queue.qsize(),
-                        'active_jobs': pool.current_jobs
-                    }
+                    pool.resource_metrics = self._pool_metrics(pool_name, pool)
                 
                 # Log resource status
                 logger.debug(f"Resource pools status: {[(name, pool.current_jobs, pool.max_concurrent_jobs) for name, pool in self.resource_pools.items()]}")
@@ -933,6 +1128,13 @@ class ReportScheduler:
         else:
             self.metrics['jobs_failed'] += 1
     
+    def _pool_metrics(self, pool_name: str, pool: ResourcePool) -> Dict[str, float]:
+        return {
+            'utilization': (pool.current_jobs / pool.max_concurrent_jobs) * 100,
+            'queue_length': len(self._resource_waiters.get(pool_name, [])),
+            'active_jobs': pool.current_jobs
+        }
+    
     async def get_metrics(self) -> Dict[str, Any]:
         """Get scheduler metrics"""
         return {
@@ -943,7 +1145,10 @@ class ReportScheduler:
             ),
             'active_jobs_count': len(self.active_jobs),
             'queue_size': self.job_queue.qsize(),
-            'resource_pools': {name: pool.resource_metrics for name, pool in self.resource_pools.items()},
+            'waiting_on_dependencies': len(self.waiting_jobs),
+            'waiting_on_resources': sum(len(waiters) for waiters in self._resource_waiters.values()),
+            'executors': len(self._executor_tasks),
+            'resource_pools': {name: self._pool_metrics(name, pool) for name, pool in self.resource_pools.items()},
             'uptime': datetime.now().isoformat()
         }
     
@@ -983,10 +1188,22 @@ class ReportScheduler:
         """Close the report scheduler"""
         self.running = False
         
+        # Executors finish their current batch and exit
+        await asyncio.gather(*self._executor_tasks, return_exceptions=True)
+        self._executor_tasks = []
+        
+        # Pending retries stay persisted as RETRYING; stop waiting on them here
+        for retry_task in list(self._retry_tasks):
+            retry_task.cancel()
+        await asyncio.gather(*self._retry_tasks, return_exceptions=True)
+        
         # Cancel all active jobs
         for job_id, job in self.active_jobs.items():
             logger.info(f"Cancelling active job: {job_id}")
         
+        if self.report_generator:
+            await self.report_generator.close()
+        
         if self.kafka_producer:
             await self.kafka_producer.stop()
         
@@ -996,8 +1213,8 @@ class ReportScheduler:
         logger.info("Report Scheduler closed")
 
 # Factory function
-async def create_report_scheduler() -> ReportScheduler:
+async def create_report_scheduler(hub: ConnectionHub = None) -> ReportScheduler:
     """Factory function to create and initialize report scheduler"""
-    scheduler = ReportScheduler()
+    scheduler = ReportScheduler(hub)
     await scheduler.initialize()
     return scheduler
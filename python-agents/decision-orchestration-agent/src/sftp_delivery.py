@@ -8,7 +8,9 @@ with encryption, digital signatures, and comprehensive delivery tracking.
 
 Key Features:
 - Secure SFTP connection handling with SSH key management
+- Pooled, keepalive-checked SFTP sessions reused across deliveries
 - File encryption and digital signatures for integrity
+- Single-pass preparation: one read feeds encryption, hashing and signing
 - Delivery confirmation and receipt processing
 - Retry logic for failed deliveries with exponential backoff
 - Comprehensive audit trail and logging
@@ -34,11 +36,9 @@ import hmac
 import base64
 import json
 import tempfile
-import shutil
 from pathlib import Path
 
 # SFTP and cryptography
-import asyncssh
 import paramiko
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
@@ -47,7 +47,8 @@ from cryptography.hazmat.backends import default_backend
 import aiofiles
 
 # Database
-import asyncpg
+from connection_hub import ConnectionHub, get_connection_hub
+from sftp_pool import SFTPConnectionPool, SFTPPoolConfig, EndpointKey
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -112,6 +113,14 @@ class DeliveryResult:
     retry_count: int = 0
     delivery_time: Optional[float] = None
 
+@dataclass
+class PreparedFile:
+    """A report file encrypted/signed and ready for upload"""
+    path: str
+    size: int
+    checksum: str
+    signature_path: Optional[str] = None
+
 class SFTPDeliveryService:
     """
     Secure SFTP delivery service with encryption and digital signatures
@@ -120,7 +129,10 @@ class SFTPDeliveryService:
     reliability, and regulatory compliance features.
     """
     
-    def __init__(self):
+    def __init__(self, hub: ConnectionHub = None, pool_config: SFTPPoolConfig = None):
+        self.hub = hub or get_connection_hub()
+        # SSH connections and SFTP channels reused across deliveries per endpoint
+        self.sftp_pool = SFTPConnectionPool(pool_config)
         self.pg_pool = None
         self.encryption_key = None
         self.signing_key = None
@@ -129,6 +141,7 @@ class SFTPDeliveryService:
         # Configuration
         self.config = {
             'temp_dir': os.getenv('SFTP_TEMP_DIR', '/tmp/sftp_delivery'),
+            'pipeline_buffer_size': int(os.getenv('SFTP_PIPELINE_BUFFER_SIZE', str(1024 * 1024))),
             'key_dir': os.getenv('SFTP_KEY_DIR', 'keys'),
             'max_concurrent_deliveries': int(os.getenv('MAX_CONCURRENT_DELIVERIES', '5')),
             'delivery_timeout': int(os.getenv('DELIVERY_TIMEOUT', '300')),
@@ -149,16 +162,8 @@ class SFTPDeliveryService:
     async def initialize(self):
         """Initialize the SFTP delivery service"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=2,
-                max_size=10
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('sftp_delivery')
             
             # Create temporary directory
             os.makedirs(self.config['temp_dir'], exist_ok=True)
@@ -324,94 +329,101 @@ class SFTPDeliveryService:
             logger.error(f"Delivery request validation failed: {e}")
             raise
     
-    async def _prepare_file_for_delivery(self, request: DeliveryRequest) -> str:
-        """Prepare file for delivery with encryption and signing"""
+    async def _prepare_file_for_delivery(self, request: DeliveryRequest) -> PreparedFile:
+        """
+        Prepare file for delivery with encryption and signing
+        
+        The report is read once in large buffers; each buffer is encrypted
+        (when enabled), hashed and written out in the same pass, so the
+        checksum and signature need no further reads of the output.
+        """
+        output_file = os.path.join(
+            self.config['temp_dir'],
+            f"{request.delivery_id}_{os.path.basename(request.file_path)}"
+        )
+        encrypt = request.encryption_enabled and self.config['enable_encryption']
+        if encrypt:
+            output_file = f"{output_file}.encrypted"
+        
         try:
-            temp_file = os.path.join(
-                self.config['temp_dir'],
-                f"{request.delivery_id}_{os.path.basename(request.file_path)}"
+            loop = asyncio.get_running_loop()
+            file_size, file_digest = await loop.run_in_executor(
+                None, self._stream_delivery_file, request.file_path, output_file, encrypt
             )
             
-            # Copy original file to temp location
-            shutil.copy2(request.file_path, temp_file)
-            
-            # Apply encryption if enabled
-            if request.encryption_enabled and self.config['enable_encryption']:
-                temp_file = await self._encrypt_file(temp_file, request.delivery_id)
+            prepared = PreparedFile(
+                path=output_file,
+                size=file_size,
+                checksum=file_digest.hex()
+            )
             
-            # Apply digital signature if enabled
+            # Apply digital signature if enabled (over the digest computed above)
             if request.digital_signature and self.config['enable_signatures']:
-                temp_file = await self._sign_file(temp_file, request.delivery_id)
+                prepared.signature_path = await self._write_signature(
+                    output_file, file_digest, request.delivery_id
+                )
             
-            logger.debug(f"File prepared for delivery: {temp_file}")
-            return temp_file
+            logger.debug(f"File prepared for delivery: {output_file}")
+            return prepared
             
         except Exception as e:
             logger.error(f"Failed to prepare file for delivery: {e}")
+            await self._cleanup_temp_files(output_file)
             raise
     
-    async def _encrypt_file(self, file_path: str, delivery_id: str) -> str:
-        """Encrypt file using AES-256-GCM"""
-        try:
-            encrypted_file = f"{file_path}.encrypted"
-            
-            # Generate random IV
-            iv = os.urandom(12)  # 96-bit IV for GCM
-            
-            # Create cipher
-            cipher = Cipher(
-                algorithms.AES(self.encryption_key),
-                modes.GCM(iv),
-                backend=default_backend()
-            )
-            encryptor = cipher.encryptor()
-            
-            # Encrypt file
-            async with aiofiles.open(file_path, 'rb') as infile, \
-                       aiofiles.open(encrypted_file, 'wb') as outfile:
-                
-                # Write IV to beginning of encrypted file
-                await outfile.write(iv)
-                
-                # Encrypt file in chunks
-                while True:
-                    chunk = await infile.read(8192)
-                    if not chunk:
-                        break
-                    encrypted_chunk = encryptor.update(chunk)
-                    await outfile.write(encrypted_chunk)
-                
+    def _stream_delivery_file(self, source_path: str, output_path: str, encrypt: bool) -> Tuple[int, bytes]:
+        """
+        Copy a file in one pass, optionally encrypting with AES-256-GCM
+        
+        Runs in an executor thread. The output layout is IV + ciphertext +
+        GCM tag when encrypting. Returns the output size and the SHA-256
+        digest of the output bytes.
+        """
+        file_hash = hashlib.sha256()
+        file_size = 0
+        encryptor = None
+        buffer = bytearray(self.config['pipeline_buffer_size'])
+        view = memoryview(buffer)
+        
+        with open(source_path, 'rb') as infile, open(output_path, 'wb') as outfile:
+            if encrypt:
+                # 96-bit IV for GCM, written to the beginning of the file
+                iv = os.urandom(12)
+                encryptor = Cipher(
+                    algorithms.AES(self.encryption_key),
+                    modes.GCM(iv),
+                    backend=default_backend()
+                ).encryptor()
+                outfile.write(iv)
+                file_hash.update(iv)
+                file_size += len(iv)
+            
+            while True:
+                read = infile.readinto(buffer)
+                if not read:
+                    break
+                chunk = encryptor.update(view[:read]) if encryptor else view[:read]
+                outfile.write(chunk)
+                file_hash.update(chunk)
+                file_size += len(chunk)
+            
+            if encryptor:
                 # Finalize encryption and write authentication tag
-                encryptor.finalize()
-                await outfile.write(encryptor.tag)
-            
-            # Remove original file
-            os.remove(file_path)
-            
-            logger.debug(f"File encrypted successfully: {encrypted_file}")
-            return encrypted_file
-            
-        except Exception as e:
-            logger.error(f"File encryption failed: {e}")
-            raise
+                trailer = encryptor.finalize() + encryptor.tag
+                outfile.write(trailer)
+                file_hash.update(trailer)
+                file_size += len(trailer)
+        
+        return file_size, file_hash.digest()
     
-    async def _sign_file(self, file_path: str, delivery_id: str) -> str:
-        """Create digital signature for file"""
+    async def _write_signature(self, file_path: str, file_digest: bytes, delivery_id: str) -> str:
+        """Create digital signature file for a prepared file's SHA-256 digest"""
         try:
             signature_file = f"{file_path}.sig"
             
-            # Calculate file hash
-            file_hash = hashlib.sha256()
-            async with aiofiles.open(file_path, 'rb') as f:
-                while True:
-                    chunk = await f.read(8192)
-                    if not chunk:
-                        break
-                    file_hash.update(chunk)
-            
             # Create digital signature
             signature = self.signing_key.sign(
-                file_hash.digest(),
+                file_digest,
                 padding.PSS(
                     mgf=padding.MGF1(hashes.SHA256()),
                     salt_length=padding.PSS.MAX_LENGTH
@@ -422,7 +434,7 @@ class SFTPDeliveryService:
             # Save signature
             signature_data = {
                 'delivery_id': delivery_id,
-                'file_hash': file_hash.hexdigest(),
+                'file_hash': file_digest.hex(),
                 'signature': base64.b64encode(signature).decode('utf-8'),
                 'timestamp': datetime.now(timezone.utc).isoformat(),
                 'algorithm': 'RSA-PSS-SHA256'
@@ -432,13 +444,13 @@ class SFTPDeliveryService:
                 await f.write(json.dumps(signature_data, indent=2))
             
             logger.debug(f"File signed successfully: {signature_file}")
-            return file_path  # Return original file path, signature is separate
+            return signature_file
             
         except Exception as e:
             logger.error(f"File signing failed: {e}")
             raise
     
-    async def _perform_sftp_delivery(self, request: DeliveryRequest, file_path: str) -> DeliveryResult:
+    async def _perform_sftp_delivery(self, request: DeliveryRequest, prepared: PreparedFile) -> DeliveryResult:
         """Perform actual SFTP delivery with retry logic"""
         retry_count = 0
         last_error = None
@@ -448,10 +460,10 @@ class SFTPDeliveryService:
                 logger.info(f"SFTP delivery attempt {retry_count + 1} for {request.delivery_id}")
                 
                 # Perform SFTP transfer
-                result = await self._sftp_transfer(request, file_path)
+                result = await self._sftp_transfer(request, prepared)
                 
                 # Success - clean up temp files
-                await self._cleanup_temp_files(file_path)
+                await self._cleanup_temp_files(prepared.path)
                 
                 return result
                 
@@ -467,7 +479,7 @@ class SFTPDeliveryService:
                     logger.error(f"SFTP delivery failed after {retry_count} attempts: {e}")
         
         # All retries exhausted
-        await self._cleanup_temp_files(file_path)
+        await self._cleanup_temp_files(prepared.path)
         
         return DeliveryResult(
             delivery_id=request.delivery_id,
@@ -476,73 +488,74 @@ class SFTPDeliveryService:
             retry_count=retry_count
         )
     
-    async def _sftp_transfer(self, request: DeliveryRequest, file_path: str) -> DeliveryResult:
-        """Perform SFTP file transfer"""
+    def _endpoint_key(self, config: SFTPConfig) -> EndpointKey:
+        """Pool key for a destination"""
+        return (config.hostname, config.port, config.username)
+    
+    def _connect_kwargs(self, config: SFTPConfig) -> Dict[str, Any]:
+        """Build asyncssh connection parameters for a destination"""
+        connect_kwargs = {
+            'host': config.hostname,
+            'port': config.port,
+            'username': config.username,
+            'connect_timeout': config.timeout,
+            'compression_algs': ['zlib'] if config.enable_compression else None
+        }
+        
+        # Add authentication
+        if config.private_key_path:
+            connect_kwargs['client_keys'] = [config.private_key_path]
+            if config.private_key_passphrase:
+                connect_kwargs['passphrase'] = config.private_key_passphrase
+        elif config.password:
+            connect_kwargs['password'] = config.password
+        
+        # Add host key verification
+        if config.host_key_verification and config.known_hosts_file:
+            connect_kwargs['known_hosts'] = config.known_hosts_file
+        elif not config.host_key_verification:
+            connect_kwargs['known_hosts'] = None
+        
+        return connect_kwargs
+    
+    async def _sftp_transfer(self, request: DeliveryRequest, prepared: PreparedFile) -> DeliveryResult:
+        """Perform SFTP file transfer over a pooled session"""
         try:
             config = request.destination_config
             
-            # Prepare connection parameters
-            connect_kwargs = {
-                'host': config.hostname,
-                'port': config.port,
-                'username': config.username,
-                'connect_timeout': config.timeout,
-                'compression_algs': ['zlib'] if config.enable_compression else None
-            }
-            
-            # Add authentication
-            if config.private_key_path:
-                connect_kwargs['client_keys'] = [config.private_key_path]
-                if config.private_key_passphrase:
-                    connect_kwargs['passphrase'] = config.private_key_passphrase
-            elif config.password:
-                connect_kwargs['password'] = config.password
-            
-            # Add host key verification
-            if config.host_key_verification and config.known_hosts_file:
-                connect_kwargs['known_hosts'] = config.known_hosts_file
-            elif not config.host_key_verification:
-                connect_kwargs['known_hosts'] = None
-            
-            # Establish SFTP connection
-            async with asyncssh.connect(**connect_kwargs) as conn:
-                async with conn.start_sftp_client() as sftp:
-                    # Ensure remote directory exists
-                    try:
-                        await sftp.makedirs(config.remote_directory, exist_ok=True)
-                    except Exception as e:
-                        logger.warning(f"Could not create remote directory: {e}")
-                    
-                    # Generate remote filename
-                    local_filename = os.path.basename(file_path)
-                    remote_path = f"{config.remote_directory.rstrip('/')}/{local_filename}"
-                    
-                    # Transfer file
-                    start_time = datetime.now()
-                    await sftp.put(file_path, remote_path)
-                    transfer_time = (datetime.now() - start_time).total_seconds()
-                    
-                    # Get file info
-                    file_size = os.path.getsize(file_path)
-                    checksum = await self._calculate_file_checksum(file_path)
-                    
-                    # Transfer signature file if it exists
-                    signature_file = f"{file_path}.sig"
-                    if os.path.exists(signature_file):
-                        remote_sig_path = f"{remote_path}.sig"
-                        await sftp.put(signature_file, remote_sig_path)
-                    
-                    logger.info(f"SFTP transfer completed: {file_size} bytes in {transfer_time:.2f}s")
-                    
-                    return DeliveryResult(
-                        delivery_id=request.delivery_id,
-                        status=DeliveryStatus.DELIVERED,
-                        delivered_at=datetime.now(timezone.utc),
-                        remote_path=remote_path,
-                        file_size=file_size,
-                        checksum=checksum,
-                        delivery_time=transfer_time
-                    )
+            # Lease a pooled SFTP channel (waits if the endpoint is at its transfer limit)
+            async with self.sftp_pool.session(self._endpoint_key(config), self._connect_kwargs(config)) as session:
+                # Ensure remote directory exists
+                try:
+                    await session.ensure_directory(config.remote_directory)
+                except Exception as e:
+                    logger.warning(f"Could not create remote directory: {e}")
+                
+                # Generate remote filename
+                local_filename = os.path.basename(prepared.path)
+                remote_path = f"{config.remote_directory.rstrip('/')}/{local_filename}"
+                
+                # Transfer file (large files use pipelined block requests)
+                start_time = datetime.now()
+                await session.put(prepared.path, remote_path, prepared.size)
+                transfer_time = (datetime.now() - start_time).total_seconds()
+                
+                # Transfer signature file if one was created
+                if prepared.signature_path:
+                    remote_sig_path = f"{remote_path}.sig"
+                    await session.put(prepared.signature_path, remote_sig_path)
+                
+                logger.info(f"SFTP transfer completed: {prepared.size} bytes in {transfer_time:.2f}s")
+                
+                return DeliveryResult(
+                    delivery_id=request.delivery_id,
+                    status=DeliveryStatus.DELIVERED,
+                    delivered_at=datetime.now(timezone.utc),
+                    remote_path=remote_path,
+                    file_size=prepared.size,
+                    checksum=prepared.checksum,
+                    delivery_time=transfer_time
+                )
             
         except Exception as e:
             logger.error(f"SFTP transfer failed: {e}")
@@ -582,21 +595,6 @@ class SFTPDeliveryService:
         except Exception as e:
             logger.warning(f"Failed to process delivery confirmation: {e}")
     
-    async def _calculate_file_checksum(self, file_path: str) -> str:
-        """Calculate SHA-256 checksum of file"""
-        try:
-            hash_sha256 = hashlib.sha256()
-            async with aiofiles.open(file_path, 'rb') as f:
-                while True:
-                    chunk = await f.read(8192)
-                    if not chunk:
-                        break
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
-        except Exception as e:
-            logger.error(f"Failed to calculate file checksum: {e}")
-            return ""
-    
     async def _cleanup_temp_files(self, file_path: str):
         """Clean up temporary files"""
         try:
@@ -693,9 +691,18 @@ class SFTPDeliveryService:
                 (self.metrics['deliveries_successful'] / self.metrics['deliveries_attempted'] * 100)
                 if self.metrics['deliveries_attempted'] > 0 else 0.0
             ),
+            'sftp_pool': self.sftp_pool.get_metrics(),
             'uptime': datetime.now().isoformat()
         }
     
+    async def close(self):
+        """Close pooled SFTP connections and release the database pool"""
+        await self.sftp_pool.close()
+        
+        if self.pg_pool:
+            await self.pg_pool.close()
+        logger.info("SFTP Delivery Service closed")
+    
     async def retry_failed_delivery(self, delivery_id: str) -> DeliveryResult:
         """Retry a failed delivery"""
         try:
@@ -736,8 +743,8 @@ class SFTPDeliveryService:
             raise
 
 # Factory function
-async def create_sftp_delivery_service() -> SFTPDeliveryService:
+async def create_sftp_delivery_service(hub: ConnectionHub = None) -> SFTPDeliveryService:
     """Factory function to create and initialize SFTP delivery service"""
-    service = SFTPDeliveryService()
+    service = SFTPDeliveryService(hub)
     await service.initialize()
     return service
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+SFTP Connection Pool - Reusable SSH Sessions for Report Delivery
+===============================================================
+
+This module provides the connection pool used by the SFTP delivery service.
+Instead of paying the SSH handshake and SFTP subsystem start-up for every
+delivery, connections are kept per endpoint (host, port, username) and each
+connection multiplexes several SFTP channels that are handed out to
+deliveries and returned afterwards.
+
+Key Features:
+- One pool per endpoint keyed by host, port and username
+- Several SFTP channels multiplexed over each SSH connection
+- SSH keepalives plus round-trip health checks for idle or suspect channels
+- Idle timeout eviction of channels the server may already have dropped
+- Per-endpoint limits on concurrent transfers and SSH connections
+- Pipelined block uploads (parallel read/write requests) for large files
+- Remote directory creation remembered per endpoint
+
+Rule Compliance:
+- Rule 1: No stubs - Full production connection pooling over asyncssh
+- Rule 2: Modular design - Used by SFTPDeliveryService, independent of it
+- Rule 17: Comprehensive documentation throughout
+"""
+
+import os
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import asyncssh
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (hostname, port, username)
+EndpointKey = Tuple[str, int, str]
+
+@dataclass
+class SFTPPoolConfig:
+    """Limits and timings for pooled SFTP sessions"""
+    max_connections_per_endpoint: int = field(default_factory=lambda: int(os.getenv('SFTP_POOL_MAX_CONNECTIONS', '2')))
+    channels_per_connection: int = field(default_factory=lambda: int(os.getenv('SFTP_POOL_CHANNELS_PER_CONNECTION', '4')))
+    max_transfers_per_endpoint: int = field(default_factory=lambda: int(os.getenv('SFTP_POOL_MAX_TRANSFERS', '4')))
+    keepalive_interval: float = field(default_factory=lambda: float(os.getenv('SFTP_KEEPALIVE_INTERVAL', '30')))
+    keepalive_count_max: int = field(default_factory=lambda: int(os.getenv('SFTP_KEEPALIVE_COUNT_MAX', '3')))
+    health_check_interval: float = field(default_factory=lambda: float(os.getenv('SFTP_HEALTH_CHECK_INTERVAL', '60')))
+    health_check_timeout: float = field(default_factory=lambda: float(os.getenv('SFTP_HEALTH_CHECK_TIMEOUT', '5')))
+    idle_timeout: float = field(default_factory=lambda: float(os.getenv('SFTP_POOL_IDLE_TIMEOUT', '300')))
+    large_file_threshold: int = field(default_factory=lambda: int(os.getenv('SFTP_LARGE_FILE_THRESHOLD', str(8 * 1024 * 1024))))
+    # 0 = the server's negotiated max write length; larger values are clamped to it
+    block_size: int = field(default_factory=lambda: int(os.getenv('SFTP_BLOCK_SIZE', '0')))
+    # 0 = asyncssh's default, which scales the request depth with the block size
+    max_requests: int = field(default_factory=lambda: int(os.getenv('SFTP_MAX_REQUESTS', '0')))
+
+@dataclass
+class _PooledConnection:
+    """An SSH connection and the number of SFTP channels open on it"""
+    conn: Any
+    channels: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+@dataclass
+class _PooledChannel:
+    """An SFTP client channel checked in and out of the pool"""
+    connection: _PooledConnection
+    sftp: Any
+    last_used: float = field(default_factory=time.monotonic)
+    needs_check: bool = False
+
+class PooledSFTPSession:
+    """
+    A delivery's lease on a pooled SFTP channel
+
+    Wraps the raw SFTP client with the directory cache and the large-file
+    upload settings of its endpoint.
+    """
+
+    def __init__(self, endpoint: 'SFTPEndpointPool', channel: _PooledChannel):
+        self.endpoint = endpoint
+        self.channel = channel
+
+    @property
+    def sftp(self):
+        return self.channel.sftp
+
+    async def ensure_directory(self, path: str):
+        """Create a remote directory once per endpoint"""
+        if path in self.endpoint.known_directories:
+            return
+        await self.sftp.makedirs(path, exist_ok=True)
+        self.endpoint.known_directories.add(path)
+
+    async def put(self, local_path: str, remote_path: str, file_size: Optional[int] = None):
+        """
+        Upload a file
+
+        Files at or above the large-file threshold are sent with the largest
+        block the server accepts and several outstanding write requests so
+        the transfer is not bound by the round-trip time of a single request.
+        Blocks never exceed the server's max_write_len: OpenSSH rejects SFTP
+        messages over 256 KiB, headers included.
+        """
+        config = self.endpoint.config
+        if file_size is None:
+            file_size = os.path.getsize(local_path)
+
+        if file_size >= config.large_file_threshold:
+            write_limit = self.sftp.limits.max_write_len
+            options = {'block_size': min(config.block_size, write_limit) if config.block_size > 0 else write_limit}
+            if config.max_requests > 0:
+                options['max_requests'] = config.max_requests
+            await self.sftp.put(local_path, remote_path, **options)
+            self.endpoint.metrics['parallel_uploads'] += 1
+        else:
+            await self.sftp.put(local_path, remote_path)
+
+        self.endpoint.metrics['files_uploaded'] += 1
+        self.endpoint.metrics['bytes_uploaded'] += file_size
+
+class SFTPEndpointPool:
+    """
+    Pooled SFTP channels for a single endpoint
+
+    A semaphore bounds concurrent transfers to the endpoint. Channels are
+    reused most-recently-used first; new channels are opened on an existing
+    connection with spare capacity before a new SSH connection is made.
+    """
+
+    def __init__(self, key: EndpointKey, connect_kwargs: Dict[str, Any], config: SFTPPoolConfig):
+        self.key = key
+        self.connect_kwargs = connect_kwargs
+        self.config = config
+
+        self.transfer_slots = asyncio.Semaphore(config.max_transfers_per_endpoint)
+        self.known_directories: Set[str] = set()
+        self._connections: List[_PooledConnection] = []
+        self._idle: List[_PooledChannel] = []
+        # Serialises connection and channel creation (no handshake stampede)
+        self._lock = asyncio.Lock()
+
+        self.metrics = {
+            'connections_opened': 0,
+            'channels_opened': 0,
+            'channels_reused': 0,
+            'channels_discarded': 0,
+            'health_check_failures': 0,
+            'files_uploaded': 0,
+            'parallel_uploads': 0,
+            'bytes_uploaded': 0,
+            'active_transfers': 0
+        }
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[PooledSFTPSession]:
+        """Lease a channel for the duration of a transfer"""
+        channel = await self.acquire()
+        succeeded = False
+        try:
+            yield PooledSFTPSession(self, channel)
+            succeeded = True
+        finally:
+            await self.release(channel, suspect=not succeeded)
+
+    async def acquire(self) -> _PooledChannel:
+        """Wait for a transfer slot and check out a healthy channel"""
+        await self.transfer_slots.acquire()
+        try:
+            channel = await self._checkout()
+        except BaseException:
+            self.transfer_slots.release()
+            raise
+        self.metrics['active_transfers'] += 1
+        return channel
+
+    async def release(self, channel: _PooledChannel, suspect: bool = False):
+        """
+        Return a channel to the pool
+
+        Channels used by a failed transfer are kept but health-checked
+        before their next use; channels on closed connections are dropped.
+        """
+        try:
+            if channel.connection.conn.is_closed():
+                await self._discard(channel)
+            else:
+                channel.last_used = time.monotonic()
+                channel.needs_check = suspect
+                self._idle.append(channel)
+        finally:
+            self.metrics['active_transfers'] -= 1
+            self.transfer_slots.release()
+
+    async def _checkout(self) -> _PooledChannel:
+        now = time.monotonic()
+        while self._idle:
+            channel = self._idle.pop()
+            idle_for = now - channel.last_used
+
+            if channel.connection.conn.is_closed() or idle_for > self.config.idle_timeout:
+                await self._discard(channel)
+                continue
+
+            if (channel.needs_check or idle_for > self.config.health_check_interval) \
+                    and not await self._is_healthy(channel):
+                await self._discard(channel)
+                continue
+
+            channel.needs_check = False
+            self.metrics['channels_reused'] += 1
+            return channel
+
+        return await self._open_channel()
+
+    async def _is_healthy(self, channel: _PooledChannel) -> bool:
+        """Round-trip check on an idle or suspect channel"""
+        try:
+            await asyncio.wait_for(channel.sftp.realpath('.'), self.config.health_check_timeout)
+            return True
+        except Exception as e:
+            self.metrics['health_check_failures'] += 1
+            logger.warning(f"SFTP health check failed for {self._label()}: {e}")
+            return False
+
+    async def _open_channel(self) -> _PooledChannel:
+        async with self._lock:
+            self._connections = [c for c in self._connections if not c.conn.is_closed()]
+
+            connection = next(
+                (c for c in self._connections if c.channels < self.config.channels_per_connection),
+                None
+            )
+            if connection is None:
+                if len(self._connections) < self.config.max_connections_per_endpoint:
+                    connection = await self._connect()
+                else:
+                    # All connections are at their channel limit; share the least loaded
+                    connection = min(self._connections, key=lambda c: c.channels)
+
+            sftp = await connection.conn.start_sftp_client()
+            connection.channels += 1
+            self.metrics['channels_opened'] += 1
+            return _PooledChannel(connection=connection, sftp=sftp)
+
+    async def _connect(self) -> _PooledConnection:
+        conn = await asyncssh.connect(
+            **self.connect_kwargs,
+            keepalive_interval=self.config.keepalive_interval,
+            keepalive_count_max=self.config.keepalive_count_max
+        )
+        connection = _PooledConnection(conn=conn)
+        self._connections.append(connection)
+        self.metrics['connections_opened'] += 1
+        logger.info(f"Opened pooled SFTP connection to {self._label()}")
+        return connection
+
+    async def _discard(self, channel: _PooledChannel):
+        """Close a channel, and its connection once it has no channels left"""
+        connection = channel.connection
+        connection.channels -= 1
+        self.metrics['channels_discarded'] += 1
+        try:
+            channel.sftp.exit()
+        except Exception as e:
+            logger.debug(f"Error closing SFTP channel for {self._label()}: {e}")
+
+        if connection.channels <= 0 or connection.conn.is_closed():
+            if connection in self._connections:
+                self._connections.remove(connection)
+            connection.conn.close()
+
+    async def close(self):
+        """Close every idle channel and connection of this endpoint"""
+        for channel in self._idle:
+            try:
+                channel.sftp.exit()
+            except Exception:
+                pass
+        self._idle.clear()
+
+        for connection in self._connections:
+            connection.conn.close()
+        await asyncio.gather(
+            *(connection.conn.wait_closed() for connection in self._connections),
+            return_exceptions=True
+        )
+        self._connections.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            'open_connections': len(self._connections),
+            'idle_channels': len(self._idle)
+        }
+
+    def _label(self) -> str:
+        host, port, username = self.key
+        return f"{username}@{host}:{port}"
+
+class SFTPConnectionPool:
+    """
+    Process-wide registry of per-endpoint SFTP pools
+
+    The first delivery to an endpoint supplies the connection arguments;
+    later deliveries with the same host, port and username reuse its pool.
+    """
+
+    def __init__(self, config: SFTPPoolConfig = None):
+        self.config = config or SFTPPoolConfig()
+        self._endpoints: Dict[EndpointKey, SFTPEndpointPool] = {}
+
+    def endpoint(self, key: EndpointKey, connect_kwargs: Dict[str, Any]) -> SFTPEndpointPool:
+        pool = self._endpoints.get(key)
+        if pool is None:
+            pool = SFTPEndpointPool(key, connect_kwargs, self.config)
+            self._endpoints[key] = pool
+        return pool
+
+    def session(self, key: EndpointKey, connect_kwargs: Dict[str, Any]):
+        """Lease a pooled SFTP session for an endpoint"""
+        return self.endpoint(key, connect_kwargs).session()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            f"{username}@{host}:{port}": pool.get_metrics()
+            for (host, port, username), pool in self._endpoints.items()
+        }
+
+    async def close(self):
+        """Close every pooled connection"""
+        await asyncio.gather(*(pool.close() for pool in self._endpoints.values()), return_exceptions=True)
+        self._endpoints.clear()
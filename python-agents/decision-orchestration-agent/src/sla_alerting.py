@@ -33,8 +33,8 @@ import json
 from collections import defaultdict
 
 # Database and messaging
-import asyncpg
-from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
+from connection_hub import ConnectionHub, get_connection_hub
+from aiokafka import AIOKafkaConsumer
 
 # HTTP client for external integrations
 import aiohttp
@@ -171,7 +171,8 @@ class SLAAlertingSystem:
     and comprehensive incident management for regulatory compliance systems.
     """
     
-    def __init__(self):
+    def __init__(self, hub: ConnectionHub = None):
+        self.hub = hub or get_connection_hub()
         self.pg_pool = None
         self.kafka_producer = None
         self.kafka_consumer = None
@@ -235,26 +236,11 @@ class SLAAlertingSystem:
     async def initialize(self):
         """Initialize the SLA alerting system"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=2,
-                max_size=10
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('sla_alerting')
             
-            # Initialize Kafka producer
-            self.kafka_producer = AIOKafkaProducer(
-                bootstrap_servers=self.config['kafka_bootstrap_servers'],
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                compression_type='gzip',
-                acks='all',
-                retries=3
-            )
-            await self.kafka_producer.start()
+            # Shared Kafka producer from the connection hub
+            self.kafka_producer = await self.hub.get_kafka_producer('sla_alerting')
             
             # Initialize Kafka consumer for SLA violations
             self.kafka_consumer = AIOKafkaConsumer(
@@ -270,8 +256,8 @@ class SLAAlertingSystem:
             from sla_monitor import create_sla_monitor
             from performance_tracker import create_performance_tracker
             
-            self.sla_monitor = await create_sla_monitor()
-            self.performance_tracker = await create_performance_tracker()
+            self.sla_monitor = await create_sla_monitor(self.hub)
+            self.performance_tracker = await create_performance_tracker(self.hub)
             
             # Load configuration
             await self._load_escalation_rules()
@@ -1448,8 +1434,8 @@ ComplianceAI SLA Alerting System
         logger.info("SLA Alerting System closed")
 
 # Factory function
-async def create_sla_alerting_system() -> SLAAlertingSystem:
+async def create_sla_alerting_system(hub: ConnectionHub = None) -> SLAAlertingSystem:
     """Factory function to create and initialize SLA alerting system"""
-    system = SLAAlertingSystem()
+    system = SLAAlertingSystem(hub)
     await system.initialize()
     return system
@@ -36,8 +36,11 @@ import statistics
 from collections import defaultdict, deque
 
 # Database and messaging
-import asyncpg
-from aiokafka import AIOKafkaProducer
+from connection_hub import ConnectionHub, get_connection_hub
+
+# Batched persistence and partitioned storage
+from write_behind_buffer import WriteBehindBuffer, WriteBehindConfig
+from metrics_storage import DailyPartitionManager
 
 # Prometheus metrics
 try:
@@ -164,10 +167,12 @@ class SLAMonitor:
     and automated alerting with integration to external monitoring systems.
     """
     
-    def __init__(self):
+    def __init__(self, hub: ConnectionHub = None):
+        self.hub = hub or get_connection_hub()
         self.pg_pool = None
         self.kafka_producer = None
         self.prometheus_registry = None
+        self.measurement_writer = None
         
         # Prometheus metrics (if available)
         self.prometheus_metrics = {}
@@ -185,8 +190,19 @@ class SLAMonitor:
             'prometheus_port': int(os.getenv('PROMETHEUS_PORT', '8001')),
             'auto_resolution_timeout': int(os.getenv('AUTO_RESOLUTION_TIMEOUT', '1800')),  # 30 minutes
             'trend_analysis_window': int(os.getenv('TREND_ANALYSIS_WINDOW', '7')),  # days
+            'measurement_flush_batch_size': int(os.getenv('SLA_MEASUREMENT_FLUSH_BATCH_SIZE', '500')),
+            'measurement_flush_interval': float(os.getenv('SLA_MEASUREMENT_FLUSH_INTERVAL', '2.0')),  # seconds
+            'measurement_max_pending': int(os.getenv('SLA_MEASUREMENT_MAX_PENDING', '20000')),
+            'partition_premake_days': int(os.getenv('SLA_PARTITION_PREMAKE_DAYS', '3')),
         }
         
+        # Daily partitions for raw measurements; retention drops whole partitions
+        self.partition_manager = DailyPartitionManager(
+            'sla_measurements',
+            retention_days=self.config['historical_retention_days'],
+            premake_days=self.config['partition_premake_days']
+        )
+        
         # In-memory buffers for real-time processing
         self.measurement_buffers = defaultdict(lambda: deque(maxlen=self.config['measurement_buffer_size']))
         self.active_violations = {}
@@ -209,26 +225,32 @@ class SLAMonitor:
     async def initialize(self):
         """Initialize the SLA monitor"""
         try:
-            # Initialize database connection
-            self.pg_pool = await asyncpg.create_pool(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=int(os.getenv('POSTGRES_PORT', 5432)),
-                database=os.getenv('POSTGRES_DB', 'compliance_ai'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
-                min_size=2,
-                max_size=10
-            )
+            # Shared database pool from the connection hub
+            self.pg_pool = await self.hub.get_pg_pool('sla_monitor')
+            
+            # Shared Kafka producer from the connection hub
+            self.kafka_producer = await self.hub.get_kafka_producer('sla_monitor')
             
-            # Initialize Kafka producer
-            self.kafka_producer = AIOKafkaProducer(
-                bootstrap_servers=self.config['kafka_bootstrap_servers'],
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                compression_type='gzip',
-                acks='all',
-                retries=3
+            # Make sure today's partitions exist before the first flush
+            async with self.pg_pool.acquire() as conn:
+                await self.partition_manager.ensure_partitions(conn)
+            
+            # Initialize write-behind persistence for measurements
+            self.measurement_writer = WriteBehindBuffer(
+                name='sla_measurements',
+                pg_pool=self.pg_pool,
+                table='sla_measurements',
+                columns=['measurement_id', 'sla_id', 'service_name', 'metric_type',
+                         'value', 'timestamp', 'labels', 'metadata'],
+                kafka_producer=self.kafka_producer,
+                topic=self.config['sla_topic'],
+                config=WriteBehindConfig(
+                    max_batch_size=self.config['measurement_flush_batch_size'],
+                    flush_interval=self.config['measurement_flush_interval'],
+                    max_pending=self.config['measurement_max_pending']
+                )
             )
-            await self.kafka_producer.start()
+            await self.measurement_writer.start()
             
             # Initialize Prometheus metrics if enabled
             if self.config['enable_prometheus']:
@@ -504,7 +526,9 @@ class SLAMonitor:
         Record a new SLA measurement
         
         This is the main entry point for recording performance metrics
-        that will be evaluated against SLA thresholds.
+        that will be evaluated against SLA thresholds. Persistence and the
+        measurement event are handed to the write-behind buffer, so callers
+        never wait on a database insert or Kafka round trip.
         """
         try:
             measurement = SLAMeasurement(
@@ -522,15 +546,15 @@ class SLAMonitor:
             buffer_key = f"{service_name}:{metric_type.value}"
             self.measurement_buffers[buffer_key].append(measurement)
             
-            # Store in database
-            await self._store_measurement(measurement)
-            
             # Update Prometheus metrics if enabled
             if self.config['enable_prometheus']:
                 await self._update_prometheus_metrics(measurement)
             
-            # Publish measurement event
-            await self._publish_measurement_event(measurement)
+            # Queue database row and measurement event for batched write-behind
+            await self.measurement_writer.add(
+                self._measurement_to_row(measurement),
+                self._measurement_event(measurement)
+            )
             
             self.metrics['measurements_processed'] += 1
             
@@ -896,21 +920,19 @@ class SLAMonitor:
                 cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.config['historical_retention_days'])
                 
                 async with self.pg_pool.acquire() as conn:
-                    # Clean up old measurements
-                    deleted_measurements = await conn.fetchval("""
-                        DELETE FROM sla_measurements WHERE timestamp < $1
-                        RETURNING COUNT(*)
-                    """, cutoff_date)
+                    # Create upcoming measurement partitions and drop expired ones
+                    await self.partition_manager.ensure_partitions(conn)
+                    dropped_partitions = await self.partition_manager.drop_expired_partitions(conn)
                     
                     # Clean up old resolved violations
-                    deleted_violations = await conn.fetchval("""
+                    deleted_violations = await conn.execute("""
                         DELETE FROM sla_violations 
                         WHERE resolved = true AND violation_end < $1
-                        RETURNING COUNT(*)
                     """, cutoff_date)
                     
-                    if deleted_measurements > 0 or deleted_violations > 0:
-                        logger.info(f"Cleaned up {deleted_measurements} measurements and {deleted_violations} violations")
+                    if dropped_partitions:
+                        logger.info(f"Dropped {len(dropped_partitions)} measurement partitions")
+                    logger.debug(f"Violation cleanup: {deleted_violations}")
                         
         except Exception as e:
             logger.error(f"Error in historical cleanup: {e}")
@@ -943,16 +965,13 @@ class SLAMonitor:
             logger.error(f"Failed to update Prometheus metrics: {e}")
     
     # Database operations
-    async def _store_measurement(self, measurement: SLAMeasurement):
-        """Store measurement in database"""
-        async with self.pg_pool.acquire() as conn:
-            await conn.execute("""
-                INSERT INTO sla_measurements (
-                    measurement_id, sla_id, service_name, metric_type, value, timestamp, labels, metadata
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            """, measurement.measurement_id, measurement.sla_id, measurement.service_name,
-                measurement.metric_type.value, measurement.value, measurement.timestamp,
-                json.dumps(measurement.labels), json.dumps(measurement.metadata))
+    def _measurement_to_row(self, measurement: SLAMeasurement) -> Tuple:
+        """Convert measurement to an sla_measurements row for batched persistence"""
+        return (
+            measurement.measurement_id, measurement.sla_id, measurement.service_name,
+            measurement.metric_type.value, measurement.value, measurement.timestamp,
+            json.dumps(measurement.labels), json.dumps(measurement.metadata)
+        )
     
     async def _store_violation(self, violation: SLAViolation):
         """Store violation in database"""
@@ -1014,22 +1033,16 @@ class SLAMonitor:
         )
     
     # Event publishing
-    async def _publish_measurement_event(self, measurement: SLAMeasurement):
-        """Publish measurement event to Kafka"""
-        try:
-            event_data = {
-                'event_type': 'measurement.recorded',
-                'measurement_id': measurement.measurement_id,
-                'service_name': measurement.service_name,
-                'metric_type': measurement.metric_type.value,
-                'value': measurement.value,
-                'timestamp': measurement.timestamp.isoformat()
-            }
-            
-            await self.kafka_producer.send(self.config['sla_topic'], event_data)
-            
-        except Exception as e:
-            logger.error(f"Failed to publish measurement event: {e}")
+    def _measurement_event(self, measurement: SLAMeasurement) -> Dict[str, Any]:
+        """Build measurement event published in batches by the write-behind buffer"""
+        return {
+            'event_type': 'measurement.recorded',
+            'measurement_id': measurement.measurement_id,
+            'service_name': measurement.service_name,
+            'metric_type': measurement.metric_type.value,
+            'value': measurement.value,
+            'timestamp': measurement.timestamp.isoformat()
+        }
     
     async def _publish_violation_event(self, event_type: str, violation: SLAViolation):
         """Publish violation event to Kafka"""
@@ -1185,6 +1198,7 @@ class SLAMonitor:
                 (self.metrics['violations_resolved'] / self.metrics['violations_detected'] * 100)
                 if self.metrics['violations_detected'] > 0 else 0.0
             ),
+            'measurement_writer': self.measurement_writer.get_metrics() if self.measurement_writer else {},
             'uptime': datetime.now().isoformat()
         }
     
@@ -1199,6 +1213,10 @@ class SLAMonitor:
         """Close the SLA monitor"""
         self.running = False
         
+        # Drain buffered measurements before closing connections
+        if self.measurement_writer:
+            await self.measurement_writer.close()
+        
         if self.kafka_producer:
             await self.kafka_producer.stop()
         
@@ -1208,8 +1226,8 @@ class SLAMonitor:
         logger.info("SLA Monitor closed")
 
 # Factory function
-async def create_sla_monitor() -> SLAMonitor:
+async def create_sla_monitor(hub: ConnectionHub = None) -> SLAMonitor:
     """Factory function to create and initialize SLA monitor"""
-    monitor = SLAMonitor()
+    monitor = SLAMonitor(hub)
     await monitor.initialize()
     return monitor
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Buffer - Batched Persistence for Instrumentation Data
+=================================================================
+
+This module provides a shared write-behind buffer used by the monitoring
+components (SLA monitor, performance tracker) to persist high-volume
+instrumentation rows without paying a database round trip per data point.
+
+Key Features:
+- Size- and time-triggered flushes running in a background task
+- COPY-based bulk loading via asyncpg.copy_records_to_table
+- Multi-row INSERT fallback when COPY is unavailable for a table
+- Rows the database rejects are isolated by splitting the batch, so one
+  bad row does not fail or re-send the whole batch
+- Batched Kafka event publication using producer record batches; an
+  event is only published once its row has been written
+- Bounded memory with producer backpressure and drop counters
+- Bounded retry of failed batches while the database is slow or down
+
+Rule Compliance:
+- Rule 1: No stubs - Full production write-behind implementation
+- Rule 2: Modular design - Reusable by any component that persists rows
+- Rule 17: Comprehensive documentation throughout
+"""
+
+import asyncio
+import logging
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+from dataclasses import dataclass
+from collections import deque
+
+# Database
+import asyncpg
+
+# Row-level errors: bisect the batch to isolate the offending rows
+# (integrity errors include rows outside every partition and NOT NULL violations)
+ROW_DATA_ERRORS = (
+    asyncpg.exceptions.DataError,
+    asyncpg.exceptions.InvalidTextRepresentationError,
+    asyncpg.exceptions.IntegrityConstraintViolationError
+)
+
+# A pending row and the Kafka event to publish once it is written
+PendingRow = Tuple[Tuple[Any, ...], Optional[Dict[str, Any]]]
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class WriteBehindConfig:
+    """Write-behind buffer tuning parameters"""
+    max_batch_size: int = 500  # rows per COPY/INSERT
+    flush_interval: float = 2.0  # seconds between time-triggered flushes
+    max_pending: int = 20000  # rows held in memory before backpressure applies
+    backpressure_timeout: float = 0.5  # seconds a producer waits for space before dropping
+    max_flush_retries: int = 3  # consecutive failures before a batch is dropped
+    use_copy: bool = True  # COPY first, multi-row INSERT as fallback
+    event_batch_size: int = 500  # Kafka events per record batch
+
+class WriteBehindBuffer:
+    """
+    Bounded write-behind buffer for a single table
+
+    Producers call ``add`` with a row tuple (and optionally a Kafka event);
+    a background task flushes rows in batches with COPY and publishes the
+    events of the rows that were written in Kafka record batches. Events of
+    rows that are requeued stay with them; events of dropped or rejected
+    rows are never published. When the buffer is full, ``add``
+    waits up to ``backpressure_timeout`` for the flusher to drain it and then
+    drops the row, counting it in ``records_dropped``.
+    """
+
+    def __init__(self,
+                 name: str,
+                 pg_pool: asyncpg.Pool,
+                 table: str,
+                 columns: Sequence[str],
+                 kafka_producer=None,
+                 topic: Optional[str] = None,
+                 config: WriteBehindConfig = None):
+        self.name = name
+        self.pg_pool = pg_pool
+        self.table = table
+        self.columns = list(columns)
+        self.kafka_producer = kafka_producer
+        self.topic = topic
+        self.config = config or WriteBehindConfig()
+
+        # Pending rows with their events, and events of written rows awaiting publication
+        self._records: deque = deque()
+        self._events: deque = deque()
+
+        # Coordination primitives
+        self._space_available = asyncio.Condition()
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._consecutive_failures = 0
+        self._copy_supported = self.config.use_copy
+        self._insert_sql = self._build_insert_sql()
+
+        # Buffer metrics
+        self.metrics = {
+            'records_enqueued': 0,
+            'records_flushed': 0,
+            'records_dropped': 0,
+            'records_rejected': 0,
+            'events_enqueued': 0,
+            'events_published': 0,
+            'events_dropped': 0,
+            'flushes': 0,
+            'flush_failures': 0,
+            'backpressure_waits': 0,
+            'avg_flush_time': 0.0,
+            'last_flush_at': None
+        }
+
+        self.running = False
+
+    def _build_insert_sql(self) -> str:
+        """Build the INSERT statement used when COPY is not available"""
+        column_list = ", ".join(self.columns)
+        placeholders = ", ".join(f"${i}" for i in range(1, len(self.columns) + 1))
+        return f"INSERT INTO {self.table} ({column_list}) VALUES ({placeholders})"
+
+    async def start(self):
+        """Start the background flusher"""
+        if self.running:
+            return
+        self.running = True
+        self._flusher_task = asyncio.create_task(self._flusher())
+        logger.info(f"Write-behind buffer '{self.name}' started for table {self.table}")
+
+    async def add(self, record: Tuple[Any, ...], event: Dict[str, Any] = None) -> bool:
+        """
+        Queue a row (and optional Kafka event) for write-behind persistence
+
+        Returns False when the row was dropped because the buffer stayed full
+        for longer than the configured backpressure timeout.
+        """
+        if len(self._records) >= self.config.max_pending:
+            self.metrics['backpressure_waits'] += 1
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.config.backpressure_timeout
+
+            # Re-check after every wake-up: another producer may have taken the
+            # freed slot between the notification and this task resuming
+            while len(self._records) >= self.config.max_pending:
+                self._flush_requested.set()
+                remaining = deadline - loop.time()
+                try:
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    await asyncio.wait_for(self._wait_for_space(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    self.metrics['records_dropped'] += 1
+                    if event is not None:
+                        self.metrics['events_dropped'] += 1
+                    logger.warning(f"Write-behind buffer '{self.name}' full - dropped record")
+                    return False
+
+        if event is not None and self.kafka_producer and self.topic:
+            self.metrics['events_enqueued'] += 1
+        else:
+            event = None
+
+        # No await between the capacity check above and this append
+        self._records.append((record, event))
+        self.metrics['records_enqueued'] += 1
+
+        if len(self._records) >= self.config.max_batch_size:
+            self._flush_requested.set()
+
+        return True
+
+    def request_flush(self):
+        """Ask the flusher to write pending rows without waiting for the interval"""
+        self._flush_requested.set()
+
+    async def _wait_for_space(self):
+        """Wait until the flusher has drained the buffer below its limit"""
+        async with self._space_available:
+            await self._space_available.wait_for(
+                lambda: len(self._records) < self.config.max_pending
+            )
+
+    async def _notify_space(self, freed: int):
+        """Wake as many producers waiting on backpressure as slots were freed"""
+        async with self._space_available:
+            self._space_available.notify(freed)
+
+    async def _flusher(self):
+        """Flush on size trigger or flush interval, whichever comes first"""
+        try:
+            while self.running:
+                try:
+                    await asyncio.wait_for(self._flush_requested.wait(), timeout=self.config.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_requested.clear()
+
+                try:
+                    await self.flush()
+                except Exception as e:
+                    logger.error(f"Error flushing write-behind buffer '{self.name}': {e}")
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error in write-behind flusher '{self.name}': {e}")
+
+    async def flush(self):
+        """Flush all pending rows and events in batches"""
+        async with self._flush_lock:
+            while self._records:
+                batch = [self._records.popleft()
+                         for _ in range(min(self.config.max_batch_size, len(self._records)))]
+                await self._notify_space(len(batch))
+
+                written = await self._write_batch(batch)
+                if written is None:
+                    self._handle_failed_batch(batch)
+                    break
+                self._events.extend(event for _, event in written if event is not None)
+
+            await self._publish_events()
+
+    async def _write_batch(self, batch: List[PendingRow]) -> Optional[List[PendingRow]]:
+        """
+        Write a batch with COPY, falling back to a multi-row INSERT
+
+        Returns the rows that were written, or None if the batch failed.
+        """
+        flush_start = time.monotonic()
+
+        try:
+            async with self.pg_pool.acquire() as conn:
+                rejected = await self._write_isolating(conn, batch)
+
+            flush_time = time.monotonic() - flush_start
+            self._consecutive_failures = 0
+            self.metrics['records_flushed'] += len(batch) - len(rejected)
+            self.metrics['flushes'] += 1
+            self.metrics['last_flush_at'] = datetime.now(timezone.utc).isoformat()
+
+            flush_count = self.metrics['flushes']
+            current_avg = self.metrics['avg_flush_time']
+            self.metrics['avg_flush_time'] = (current_avg * (flush_count - 1) + flush_time) / flush_count
+
+            rejected_ids = {id(entry) for entry in rejected}
+            return [entry for entry in batch if id(entry) not in rejected_ids]
+
+        except Exception as e:
+            self._consecutive_failures += 1
+            self.metrics['flush_failures'] += 1
+            logger.error(f"Failed to flush {len(batch)} rows to {self.table}: {e}")
+            return None
+
+    async def _write_rows(self, conn, rows: List[Tuple[Any, ...]]):
+        """Write rows with COPY, or multi-row INSERT once COPY is known unsupported"""
+        if self._copy_supported:
+            try:
+                await conn.copy_records_to_table(self.table, records=rows, columns=self.columns)
+                return
+            except asyncpg.exceptions.FeatureNotSupportedError as e:
+                logger.warning(f"COPY unavailable for {self.table}, using multi-row INSERT: {e}")
+                self._copy_supported = False
+        await conn.executemany(self._insert_sql, rows)
+
+    async def _write_isolating(self, conn, entries: List[PendingRow]) -> List[PendingRow]:
+        """
+        Write rows, splitting the batch around rows the database rejects
+
+        COPY and executemany are atomic, so a single bad row fails the whole
+        call. The batch is halved until the bad rows are isolated: one bad
+        row in a batch of n costs about 2*log2(n) extra round trips, and the
+        good rows are still written. Returns the rejected entries.
+        """
+        rows = [record for record, _ in entries]
+        try:
+            await self._write_rows(conn, rows)
+            return []
+        except ROW_DATA_ERRORS as e:
+            if len(entries) > 1:
+                middle = len(entries) // 2
+                return (await self._write_isolating(conn, entries[:middle]) +
+                        await self._write_isolating(conn, entries[middle:]))
+
+            if self._copy_supported:
+                # COPY is stricter than INSERT about some column encodings
+                try:
+                    await conn.executemany(self._insert_sql, rows)
+                    logger.warning(f"COPY rejected a row INSERT accepts for {self.table}, using multi-row INSERT: {e}")
+                    self._copy_supported = False
+                    return []
+                except ROW_DATA_ERRORS:
+                    pass
+
+            self.metrics['records_rejected'] += 1
+            self._count_dropped_events(entries)
+            logger.error(f"Rejected row for {self.table}: {e}")
+            return entries
+
+    def _handle_failed_batch(self, batch: List[PendingRow]):
+        """Requeue a failed batch (with its events) at the head of the buffer, or drop it"""
+        if self._consecutive_failures > self.config.max_flush_retries:
+            self.metrics['records_dropped'] += len(batch)
+            self._count_dropped_events(batch)
+            self._consecutive_failures = 0
+            logger.error(f"Dropped {len(batch)} rows for {self.table} after repeated flush failures")
+            return
+
+        free_slots = max(0, self.config.max_pending - len(self._records))
+        requeue = batch[:free_slots]
+        overflow = batch[free_slots:]
+
+        self._records.extendleft(reversed(requeue))
+        if overflow:
+            self.metrics['records_dropped'] += len(overflow)
+            self._count_dropped_events(overflow)
+            logger.warning(f"Dropped {len(overflow)} rows for {self.table} - buffer full during retry")
+
+    def _count_dropped_events(self, entries: List[PendingRow]):
+        """Count the events of rows that will never be written"""
+        self.metrics['events_dropped'] += sum(1 for _, event in entries if event is not None)
+
+    async def _publish_events(self):
+        """Publish the events of written rows in record batches"""
+        if not self._events or not self.kafka_producer or not self.topic:
+            return
+
+        events = list(self._events)
+        self._events.clear()
+
+        try:
+            if hasattr(self.kafka_producer, 'create_batch'):
+                await self._send_record_batches(events)
+            else:
+                for event in events:
+                    await self.kafka_producer.send(self.topic, event)
+            self.metrics['events_published'] += len(events)
+
+        except Exception as e:
+            self.metrics['events_dropped'] += len(events)
+            logger.error(f"Failed to publish {len(events)} events to {self.topic}: {e}")
+
+    async def _send_record_batches(self, events: List[Dict[str, Any]]):
+        """Pack events into producer record batches spread across partitions"""
+        partitions = sorted(await self.kafka_producer.partitions_for(self.topic) or [0])
+        partition_index = 0
+        pending_sends = []
+
+        for start in range(0, len(events), self.config.event_batch_size):
+            batch = self.kafka_producer.create_batch()
+
+            for event in events[start:start + self.config.event_batch_size]:
+                value = json.dumps(event, default=str).encode('utf-8')
+                if batch.append(key=None, value=value, timestamp=None) is None:
+                    # Record batch is full - send it and continue with a fresh one
+                    pending_sends.append(await self.kafka_producer.send_batch(
+                        batch, self.topic, partition=partitions[partition_index % len(partitions)]
+                    ))
+                    partition_index += 1
+                    batch = self.kafka_producer.create_batch()
+                    batch.append(key=None, value=value, timestamp=None)
+
+            pending_sends.append(await self.kafka_producer.send_batch(
+                batch, self.topic, partition=partitions[partition_index % len(partitions)]
+            ))
+            partition_index += 1
+
+        if pending_sends:
+            await asyncio.gather(*pending_sends)
+
+    def pending_count(self) -> int:
+        """Number of rows waiting to be flushed"""
+        return len(self._records)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get write-behind buffer metrics"""
+        return {
+            **self.metrics,
+            'name': self.name,
+            'table': self.table,
+            'pending_records': len(self._records),
+            'pending_events': len(self._events),
+            'copy_enabled': self._copy_supported
+        }
+
+    async def close(self):
+        """Stop the flusher and drain all pending rows"""
+        self.running = False
+
+        if self._flusher_task:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to drain write-behind buffer '{self.name}': {e}")
+
+        logger.info(f"Write-behind buffer '{self.name}' closed")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+XBRL Stream Writer - Incremental XBRL Instance Serialisation
+============================================================
+
+This module implements the streaming XBRL writer used by the COREP and
+FINREP generators. Instead of building a complete ElementTree, serialising
+it and re-parsing it with minidom for pretty-printing, the writer emits the
+document header, contexts, units and facts directly to any text stream
+(an open file, a StringIO buffer or a socket wrapper) as they are produced.
+
+Key Features:
+- Constant memory per fact, independent of instance size
+- Optional pretty-printing, byte-compatible with the previous minidom output
+- Helpers for schemaRef, contexts, units and facts
+- Serialises small prebuilt ElementTree fragments in place (append)
+- Prerendered fragments for elements repeated across documents (units)
+
+Rule Compliance:
+- Rule 1: No stubs - Real streaming serialiser with proper escaping
+- Rule 2: Modular design - Shared by COREP and FINREP generators
+- Rule 17: Extensive comments explaining all functionality
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+
+# Declaration minidom's toprettyxml() writes without an encoding
+MINIDOM_XML_DECLARATION = '<?xml version="1.0" ?>'
+
+def _escape(text: str) -> str:
+    """Escape character data and attribute values (same entities as minidom)"""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    return text
+
+def _format_attrs(attrib: Optional[Dict[str, str]]) -> str:
+    if not attrib:
+        return ''
+    return ''.join(f' {name}="{_escape(str(value))}"' for name, value in attrib.items())
+
+class XBRLStreamWriter:
+    """
+    Incremental writer for XBRL instance documents
+
+    Elements are written as soon as they are started; only the stack of
+    open tag names is kept in memory. With ``pretty=True`` the output
+    matches the one-element-per-line, two-space indented layout the
+    generators previously produced via minidom.
+    """
+
+    def __init__(self, stream: TextIO, pretty: bool = True, indent: str = '  '):
+        self.stream = stream
+        self.pretty = pretty
+        self.indent = indent
+
+        self._open: List[str] = []
+        # Whether the innermost open element already has child elements
+        self._has_children: List[bool] = []
+        self.facts_written = 0
+
+    def _newline(self, depth: int) -> str:
+        return '\n' + self.indent * depth if self.pretty else ''
+
+    def _begin_child(self):
+        if self._has_children:
+            self._has_children[-1] = True
+
+    def start_document(self, root_tag: str, namespaces: Dict[str, str],
+                       schema_location: Optional[str] = None,
+                       declaration: str = XML_DECLARATION):
+        """Write the XML declaration, the root element and its schemaRef"""
+        self.stream.write(declaration)
+        self.start(root_tag, {f'xmlns:{prefix}': uri for prefix, uri in namespaces.items()})
+        if schema_location:
+            self.element('link:schemaRef', attrib={'xlink:type': 'simple', 'xlink:href': schema_location})
+
+    def end_document(self):
+        """Close every open element, including the root"""
+        while self._open:
+            self.end()
+        self.stream.flush()
+
+    def start(self, tag: str, attrib: Optional[Dict[str, str]] = None):
+        """Open an element that will receive child elements"""
+        self._begin_child()
+        prefix = self._newline(len(self._open))
+        self.stream.write(f'{prefix}<{tag}{_format_attrs(attrib)}>')
+        self._open.append(tag)
+        self._has_children.append(False)
+
+    def end(self):
+        """Close the innermost open element"""
+        tag = self._open.pop()
+        has_children = self._has_children.pop()
+        prefix = self._newline(len(self._open)) if has_children else ''
+        self.stream.write(f'{prefix}</{tag}>')
+
+    def element(self, tag: str, text: Optional[str] = None, attrib: Optional[Dict[str, str]] = None):
+        """Write a complete leaf element"""
+        self._begin_child()
+        prefix = self._newline(len(self._open))
+        attrs = _format_attrs(attrib)
+        if text:
+            self.stream.write(f'{prefix}<{tag}{attrs}>{_escape(str(text))}</{tag}>')
+        else:
+            self.stream.write(f'{prefix}<{tag}{attrs}/>')
+
+    def write_fragment(self, fragment: str):
+        """Write a fragment produced by prerender() for the current depth"""
+        self._begin_child()
+        self.stream.write(fragment)
+
+    def write_element(self, element: ET.Element):
+        """Serialise a prebuilt ElementTree fragment at the current position"""
+        if len(element):
+            self.start(element.tag, element.attrib)
+            for child in element:
+                self.write_element(child)
+            self.end()
+        else:
+            self.element(element.tag, element.text, element.attrib)
+
+    def append(self, element: ET.Element):
+        """
+        Write a fact built as an ElementTree element
+
+        Lets the generators' ``_add_*_facts`` helpers, which append to a
+        parent, target the writer directly.
+        """
+        self.write_element(element)
+        self.facts_written += 1
+
+    def context(self, context_id: str, scheme: str, identifier: str,
+                period: Dict[str, str], scenario: Sequence[Tuple[str, str]] = ()):
+        """
+        Write an xbrli:context
+
+        ``period`` holds either ``startDate``/``endDate`` or ``instant``;
+        ``scenario`` is a sequence of (tag, text) members.
+        """
+        self.start('xbrli:context', {'id': context_id})
+        self.start('xbrli:entity')
+        self.element('xbrli:identifier', identifier, {'scheme': scheme})
+        self.end()
+        self.start('xbrli:period')
+        for name in ('startDate', 'endDate', 'instant'):
+            if name in period:
+                self.element(f'xbrli:{name}', period[name])
+        self.end()
+        if scenario:
+            self.start('xbrli:scenario')
+            for tag, text in scenario:
+                self.element(tag, text)
+            self.end()
+        self.end()
+
+    def unit(self, unit_id: str, measure: str):
+        """Write an xbrli:unit with a single measure"""
+        self.start('xbrli:unit', {'id': unit_id})
+        self.element('xbrli:measure', measure)
+        self.end()
+
+    def fact(self, concept: str, value: str, context_ref: str,
+             unit_ref: Optional[str] = None, decimals: Optional[str] = None):
+        """Write a single fact"""
+        attrib = {'contextRef': context_ref}
+        if unit_ref is not None:
+            attrib['unitRef'] = unit_ref
+        if decimals is not None:
+            attrib['decimals'] = decimals
+        self.element(concept, value, attrib)
+        self.facts_written += 1
+
+def prerender(build: Callable[[XBRLStreamWriter], None], depth: int = 1,
+              pretty: bool = True, indent: str = '  ') -> str:
+    """
+    Render elements once for reuse with write_fragment()
+
+    ``build`` writes the elements as if nested ``depth`` levels deep, which
+    is where write_fragment() will place them.
+    """
+    buffer = io.StringIO()
+    writer = XBRLStreamWriter(buffer, pretty=pretty, indent=indent)
+    writer._open = [''] * depth
+    writer._has_children = [True] * depth
+    build(writer)
+    return buffer.getvalue()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Async Redis - Shared Non-Blocking Redis Client
+==============================================
+
+This module provides the Redis client used by every component of the
+intelligence agent. RuleCompiler, OverlapResolver, JurisdictionHandler,
+AuditLogger and the Kafka consumer each used to create their own
+synchronous redis.Redis client and call it from async methods, so every
+cache access blocked the event loop for a network round trip.
+
+Key Features:
+- One redis.asyncio client per process over a bounded, blocking
+  connection pool
+- Pipelining helpers: get_many (MGET), set_many and delete_matching
+  (SCAN + batched UNLINK) in one round trip per batch
+- Optional client-side cache for hot key prefixes, kept coherent by
+  server-assisted invalidation (CLIENT TRACKING in BCAST mode)
+- Per-command latency histogram for p99 tracking
+
+Rule Compliance:
+- Rule 1: No stubs - Real Redis commands with invalidation handling
+- Rule 2: Modular design - One client shared by all agent components
+- Rule 17: Extensive comments explaining all functionality
+"""
+
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Iterable
+
+# Database and caching
+import redis.asyncio as aioredis
+
+# Monitoring and logging
+import structlog
+from prometheus_client import Counter, Histogram
+
+# Configure structured logging
+logger = structlog.get_logger()
+
+# Prometheus metrics for Redis access
+REDIS_COMMAND_TIME = Histogram(
+    'intelligence_redis_command_seconds', 'Redis command latency', ['command'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+CLIENT_CACHE_LOOKUPS = Counter(
+    'intelligence_redis_client_cache_total', 'Client-side Redis cache lookups', ['result']
+)
+
+# Channel Redis publishes key invalidations on for redirected tracking
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+class AsyncRedisClient:
+    """
+    Pooled async Redis client with pipelining helpers and client-side caching
+
+    With client-side caching enabled, GETs of keys under the tracked
+    prefixes are served from a local LRU. A dedicated connection enables
+    CLIENT TRACKING for those prefixes in BCAST mode and redirects
+    invalidations to a subscriber connection, so any write to a tracked
+    key, by any client, evicts it here. Until the subscriber is connected,
+    and whenever it drops, the local cache is cleared and bypassed.
+    """
+
+    def __init__(self, host: str = None, port: int = None, db: int = None,
+                 max_connections: int = None, client_cache: bool = None,
+                 cache_prefixes: Iterable[str] = None, cache_size: int = None,
+                 cache_ttl: float = None):
+        self.config = {
+            'host': host or os.getenv('REDIS_HOST', 'redis'),
+            'port': int(port or os.getenv('REDIS_PORT', 6379)),
+            'db': int(db if db is not None else os.getenv('REDIS_DB', 0)),
+            'max_connections': max_connections or int(os.getenv('REDIS_MAX_CONNECTIONS', '50')),
+            'pool_timeout': float(os.getenv('REDIS_POOL_TIMEOUT', '5')),
+            'client_cache': client_cache if client_cache is not None else
+                os.getenv('REDIS_CLIENT_CACHE', 'false').lower() == 'true',
+            'cache_prefixes': list(cache_prefixes) if cache_prefixes is not None else [
+                prefix.strip() for prefix in
+                os.getenv('REDIS_CLIENT_CACHE_PREFIXES', 'rule:,jurisdiction:resolution:').split(',')
+                if prefix.strip()
+            ],
+            'cache_size': cache_size or int(os.getenv('REDIS_CLIENT_CACHE_SIZE', '10000')),
+            # Safety net: entries expire even if an invalidation is missed
+            'cache_ttl': cache_ttl or float(os.getenv('REDIS_CLIENT_CACHE_TTL', '300')),
+            # How often the tracking connection is checked with CLIENT TRACKINGINFO
+            'tracking_check_interval': float(os.getenv('REDIS_TRACKING_CHECK_INTERVAL', '5')),
+            'batch_size': int(os.getenv('REDIS_BATCH_SIZE', '500'))
+        }
+
+        self.pool = aioredis.BlockingConnectionPool(
+            host=self.config['host'],
+            port=self.config['port'],
+            db=self.config['db'],
+            max_connections=self.config['max_connections'],
+            timeout=self.config['pool_timeout'],
+            decode_responses=True
+        )
+        self.redis = aioredis.Redis(connection_pool=self.pool)
+
+        # Client-side cache: key -> (value, expires_at)
+        self._local: OrderedDict = OrderedDict()
+        self._local_ready = False
+        self._invalidation_epoch = 0
+        self._invalidation_task: Optional[asyncio.Task] = None
+
+        # Performance metrics
+        self.metrics = {
+            'commands': 0,
+            'pipelines': 0,
+            'client_cache_hits': 0,
+            'client_cache_misses': 0,
+            'invalidations': 0,
+            'listener_reconnects': 0
+        }
+
+    async def start(self):
+        """Start the invalidation listener when client-side caching is enabled"""
+        if self.config['client_cache'] and self._invalidation_task is None:
+            self._invalidation_task = asyncio.create_task(self._invalidation_listener())
+
+    # Commands
+
+    async def get(self, key: str) -> Optional[str]:
+        cached = self._local_get(key)
+        if cached is not None:
+            return cached
+
+        epoch = self._invalidation_epoch
+        value = await self._timed('get', self.redis.get(key))
+        self._local_put(key, value, epoch)
+        return value
+
+    async def set(self, key: str, value: Any, ex: int = None, nx: bool = False) -> bool:
+        self._local_evict(key)
+        return await self._timed('set', self.redis.set(key, value, ex=ex, nx=nx))
+
+    async def setex(self, key: str, ttl: int, value: Any) -> bool:
+        self._local_evict(key)
+        return await self._timed('setex', self.redis.setex(key, ttl, value))
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        for key in keys:
+            self._local_evict(key)
+        return await self._timed('delete', self.redis.delete(*keys))
+
+    async def scan_iter(self, match: str, count: int = None):
+        """Iterate keys matching a pattern without blocking the server like KEYS"""
+        async for key in self.redis.scan_iter(match=match, count=count or self.config['batch_size']):
+            yield key
+
+    def pipeline(self, transaction: bool = False):
+        """Raw pipeline for callers batching their own commands"""
+        self.metrics['pipelines'] += 1
+        return self.redis.pipeline(transaction=transaction)
+
+    async def ping(self) -> bool:
+        return await self._timed('ping', self.redis.ping())
+
+    # Pipelining helpers
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """Values for several keys, locally cached ones first, the rest in MGET batches"""
+        values: Dict[str, Optional[str]] = {}
+        missing = []
+        for key in keys:
+            cached = self._local_get(key)
+            if cached is not None:
+                values[key] = cached
+            else:
+                missing.append(key)
+
+        epoch = self._invalidation_epoch
+        for batch in self._batches(missing):
+            for key, value in zip(batch, await self._timed('mget', self.redis.mget(batch))):
+                values[key] = value
+                self._local_put(key, value, epoch)
+        return values
+
+    async def set_many(self, mapping: Dict[str, Any], ttl: int = None):
+        """Write several keys (with an optional TTL) in one pipeline per batch"""
+        items = list(mapping.items())
+        for key, _ in items:
+            self._local_evict(key)
+        for batch in self._batches(items):
+            async with self.pipeline() as pipe:
+                for key, value in batch:
+                    if ttl:
+                        pipe.setex(key, ttl, value)
+                    else:
+                        pipe.set(key, value)
+                await self._timed('pipeline', pipe.execute())
+
+    async def delete_matching(self, pattern: str) -> int:
+        """Delete all keys matching a pattern with SCAN and batched UNLINK"""
+        deleted = 0
+        batch = []
+        async for key in self.scan_iter(match=pattern):
+            batch.append(key)
+            if len(batch) >= self.config['batch_size']:
+                deleted += await self._unlink(batch)
+                batch = []
+        if batch:
+            deleted += await self._unlink(batch)
+        return deleted
+
+    async def count_keys(self, pattern: str) -> int:
+        """Count keys matching a pattern with SCAN"""
+        count = 0
+        async for _ in self.scan_iter(match=pattern):
+            count += 1
+        return count
+
+    async def _unlink(self, keys: List[str]) -> int:
+        for key in keys:
+            self._local_evict(key)
+        return await self._timed('unlink', self.redis.unlink(*keys))
+
+    def _batches(self, items: List[Any]):
+        size = self.config['batch_size']
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+    async def _timed(self, command: str, awaitable):
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.metrics['commands'] += 1
+            REDIS_COMMAND_TIME.labels(command=command).observe(time.perf_counter() - start)
+
+    # Client-side cache
+
+    def _tracked(self, key: str) -> bool:
+        return any(key.startswith(prefix) for prefix in self.config['cache_prefixes'])
+
+    def _local_get(self, key: str) -> Optional[str]:
+        if not self._local_ready or not self._tracked(key):
+            return None
+        entry = self._local.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._local.move_to_end(key)
+            self.metrics['client_cache_hits'] += 1
+            CLIENT_CACHE_LOOKUPS.labels(result="hit").inc()
+            return entry[0]
+        if entry is not None:
+            del self._local[key]
+        self.metrics['client_cache_misses'] += 1
+        CLIENT_CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    def _local_put(self, key: str, value: Optional[str], epoch: int):
+        # A value read before an invalidation arrived may already be stale
+        if value is None or not self._local_ready or epoch != self._invalidation_epoch or not self._tracked(key):
+            return
+        self._local[key] = (value, time.monotonic() + self.config['cache_ttl'])
+        self._local.move_to_end(key)
+        while len(self._local) > self.config['cache_size']:
+            self._local.popitem(last=False)
+
+    def _local_evict(self, key: str):
+        self._local.pop(key, None)
+
+    def _invalidate(self, keys: Optional[List[str]]):
+        """Apply an invalidation message; None means the server flushed everything"""
+        self._invalidation_epoch += 1
+        self.metrics['invalidations'] += 1
+        if keys is None:
+            self._local.clear()
+            return
+        for key in keys:
+            self._local.pop(key, None)
+
+    def _reset_local_cache(self, ready: bool):
+        self._local_ready = ready
+        self._invalidation_epoch += 1
+        self._local.clear()
+
+    def _connection(self) -> aioredis.Connection:
+        """Dedicated connection outside the pool (no read timeout)"""
+        return aioredis.Connection(
+            host=self.config['host'], port=self.config['port'], db=self.config['db'],
+            decode_responses=True
+        )
+
+    async def _command(self, connection: aioredis.Connection, *args):
+        await connection.send_command(*args)
+        return await connection.read_response()
+
+    async def _invalidation_listener(self):
+        """
+        Keep the tracking subscription open, reconnecting on failure
+
+        The subscriber connection receives invalidation messages; the
+        tracking connection enables BCAST tracking for the cached prefixes
+        and redirects its invalidations to the subscriber. Both stay open
+        for as long as the local cache is in use. Tracking ends silently if
+        the tracking connection drops, so it is checked periodically; a
+        failure on either connection disables the cache and reconnects both.
+        """
+        while True:
+            subscriber = self._connection()
+            tracker = self._connection()
+            try:
+                await subscriber.connect()
+                await tracker.connect()
+                subscriber_id = await self._command(subscriber, 'CLIENT', 'ID')
+                await self._command(subscriber, 'SUBSCRIBE', INVALIDATION_CHANNEL)
+                prefixes = [part for prefix in self.config['cache_prefixes'] for part in ('PREFIX', prefix)]
+                await self._command(tracker, 'CLIENT', 'TRACKING', 'ON', 'REDIRECT', subscriber_id, 'BCAST', *prefixes)
+
+                self._reset_local_cache(ready=True)
+                logger.info("Redis client-side cache enabled", prefixes=self.config['cache_prefixes'])
+
+                reader = asyncio.create_task(self._read_invalidations(subscriber))
+                monitor = asyncio.create_task(self._monitor_tracking(tracker, subscriber_id))
+                try:
+                    done, _ = await asyncio.wait({reader, monitor}, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                    raise ConnectionError("Redis invalidation listener stopped")
+                finally:
+                    for task in (reader, monitor):
+                        task.cancel()
+                    await asyncio.gather(reader, monitor, return_exceptions=True)
+
+            except asyncio.CancelledError:
+                self._reset_local_cache(ready=False)
+                raise
+            except Exception as e:
+                self._reset_local_cache(ready=False)
+                self.metrics['listener_reconnects'] += 1
+                logger.warning("Redis invalidation listener failed, retrying", error=str(e))
+            finally:
+                await subscriber.disconnect()
+                await tracker.disconnect()
+            await asyncio.sleep(1)
+
+    async def _read_invalidations(self, subscriber: aioredis.Connection):
+        """Apply invalidation messages until the subscriber connection fails"""
+        while True:
+            message = await subscriber.read_response()
+            # ['message', '__redis__:invalidate', [keys] or None on flush]
+            if isinstance(message, list) and len(message) == 3 and message[0] == 'message':
+                self._invalidate(message[2])
+
+    async def _monitor_tracking(self, tracker: aioredis.Connection, subscriber_id: int):
+        """Raise once tracking is off, its redirect is broken or the tracker stops answering"""
+        while True:
+            await asyncio.sleep(self.config['tracking_check_interval'])
+            info = await asyncio.wait_for(
+                self._command(tracker, 'CLIENT', 'TRACKINGINFO'), timeout=self.config['pool_timeout']
+            )
+            # RESP2 returns a flat field/value list, RESP3 a map
+            fields = dict(zip(info[::2], info[1::2])) if isinstance(info, list) else dict(info or {})
+            flags = fields.get('flags') or []
+            if 'on' not in flags or 'broken_redirect' in flags or fields.get('redirect') != subscriber_id:
+                raise ConnectionError(f"Redis client tracking lost: {fields}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get Redis client metrics"""
+        return {
+            **self.metrics,
+            'client_cache_enabled': self._local_ready,
+            'client_cache_entries': len(self._local)
+        }
+
+    async def close(self):
+        """Stop the invalidation listener and close pooled connections"""
+        if self._invalidation_task is not None:
+            self._invalidation_task.cancel()
+            await asyncio.gather(self._invalidation_task, return_exceptions=True)
+            self._invalidation_task = None
+        await self.redis.aclose()
+        await self.pool.disconnect()
+
+# Process-wide client shared by all agent components
+_shared_client: Optional[AsyncRedisClient] = None
+
+async def get_redis_client() -> AsyncRedisClient:
+    """Return the process-wide Redis client, creating it on first use"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncRedisClient()
+        await _shared_client.start()
+    return _shared_client
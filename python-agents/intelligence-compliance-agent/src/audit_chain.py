@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Audit Chain - Hash-Chained Batch Integrity for Audit Records
+============================================================
+
+This module implements the CPU-bound half of audit integrity: per-event
+HMACs, sensitive-state encryption and per-batch chain roots. Every flush of
+audit events is sealed as a batch whose root commits to the ordered event
+hashes and to the root of the previous batch, so any range of the audit
+trail can be checked by recomputing one chain instead of one HMAC lookup
+per event.
+
+All functions operating on event data are pure and take only picklable
+arguments, so they run unchanged inline or in a ProcessPoolExecutor.
+
+Key Features:
+- Canonical event serialisation compatible with existing integrity hashes
+- Batch sealing (HMAC + Fernet encryption) in worker processes
+- Hash-chained batch roots anchored at a fixed genesis root
+- Batch verification reporting tampered and missing events
+
+Rule Compliance:
+- Rule 1: No stubs - Real cryptographic chaining and verification
+- Rule 2: Modular design - Process-pool friendly pure functions
+- Rule 17: Extensive comments explaining all functionality
+"""
+
+import os
+import json
+import hmac
+import base64
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
+
+# Cryptographic functions
+from cryptography.fernet import Fernet
+
+# Monitoring and logging
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger()
+
+# Root used as the "previous root" of the very first batch
+GENESIS_ROOT = '0' * 64
+
+# Ordered fields that make up an event's canonical form. Values are primitives:
+# (event_id, event_type, timestamp_iso, component, operation, resource_type,
+#  resource_id, before_state, after_state) with states as dicts or JSON text.
+CanonicalFields = Tuple[str, str, str, str, str, str, Optional[str], Any, Any]
+
+def _load_state(state: Any) -> Optional[Dict[str, Any]]:
+    """Accept a state as dict, JSON text (as stored) or None"""
+    if state is None or state == '':
+        return None
+    if isinstance(state, str):
+        return json.loads(state)
+    return state
+
+def canonical_event_json(fields: CanonicalFields) -> str:
+    """Canonical JSON for an event, identical to the historical per-event format"""
+    (event_id, event_type, timestamp_iso, component, operation,
+     resource_type, resource_id, before_state, after_state) = fields
+
+    canonical_data = {
+        'event_id': event_id,
+        'event_type': event_type,
+        'timestamp': timestamp_iso,
+        'component': component,
+        'operation': operation,
+        'resource_type': resource_type,
+        'resource_id': resource_id,
+        'before_state': _load_state(before_state),
+        'after_state': _load_state(after_state)
+    }
+    return json.dumps(canonical_data, sort_keys=True, separators=(',', ':'))
+
+def event_hash(hmac_key: bytes, fields: CanonicalFields) -> str:
+    """HMAC-SHA256 of an event's canonical form"""
+    return hmac.new(hmac_key, canonical_event_json(fields).encode('utf-8'), hashlib.sha256).hexdigest()
+
+def compute_batch_root(hmac_key: bytes, previous_root: str, batch_id: str,
+                       event_hashes: List[str]) -> str:
+    """
+    Chain root for a batch
+
+    Commits to the previous batch root, the batch identity and the ordered
+    event hashes, so reordering, removing or altering any event - or
+    splicing batches - changes the root.
+    """
+    digest = hmac.new(hmac_key, digestmod=hashlib.sha256)
+    digest.update(previous_root.encode('ascii'))
+    digest.update(b'|')
+    digest.update(batch_id.encode('utf-8'))
+    digest.update(b'|')
+    digest.update(str(len(event_hashes)).encode('ascii'))
+    for value in event_hashes:
+        digest.update(b'|')
+        digest.update(value.encode('ascii'))
+    return digest.hexdigest()
+
+def _encrypt_state(cipher: Optional[Fernet], state: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not cipher or not state:
+        return None
+    return base64.urlsafe_b64encode(cipher.encrypt(json.dumps(state).encode())).decode()
+
+def seal_events(hmac_key: bytes, encryption_key: Optional[bytes],
+                events: List[CanonicalFields]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Hash and encrypt a batch of events (worker entry point)
+
+    Returns (integrity_hash, encrypted_before_state, encrypted_after_state)
+    per event, in input order.
+    """
+    cipher = Fernet(encryption_key) if encryption_key else None
+    sealed = []
+    for fields in events:
+        sealed.append((
+            event_hash(hmac_key, fields),
+            _encrypt_state(cipher, _load_state(fields[7])),
+            _encrypt_state(cipher, _load_state(fields[8]))
+        ))
+    return sealed
+
+def verify_events(hmac_key: bytes,
+                  events: List[Tuple[CanonicalFields, str]]) -> List[bool]:
+    """Check stored per-event hashes (worker entry point)"""
+    return [
+        hmac.compare_digest(event_hash(hmac_key, fields), stored_hash or '')
+        for fields, stored_hash in events
+    ]
+
+def verify_batch(hmac_key: bytes, batch_id: str, previous_root: str, stored_root: str,
+                 expected_count: int,
+                 events: List[Tuple[CanonicalFields, str]]) -> Dict[str, Any]:
+    """
+    Recompute one batch of the chain (worker entry point)
+
+    ``events`` must be in batch order. Event hashes are recomputed from the
+    canonical fields, so the root check covers event content rather than
+    trusting the stored per-event hashes.
+    """
+    recomputed = [event_hash(hmac_key, fields) for fields, _ in events]
+    invalid_event_ids = [
+        fields[0] for (fields, stored_hash), value in zip(events, recomputed)
+        if not hmac.compare_digest(value, stored_hash or '')
+    ]
+    root = compute_batch_root(hmac_key, previous_root, batch_id, recomputed)
+
+    return {
+        'root_valid': hmac.compare_digest(root, stored_root),
+        'invalid_event_ids': invalid_event_ids,
+        'missing_events': max(0, expected_count - len(events))
+    }
+
+class AuditCryptoPool:
+    """
+    Runs audit sealing and verification off the event loop
+
+    Work is submitted to a lazily created process pool; with zero workers
+    it runs inline, which keeps single-process deployments and tests simple.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        if max_workers is None:
+            max_workers = int(os.getenv('AUDIT_CRYPTO_WORKERS', str(min(4, os.cpu_count() or 1))))
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, func, *args):
+        """Run a module-level function in the pool (or inline without workers)"""
+        executor = self._get_executor()
+        if executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+    def shutdown(self):
+        """Stop worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Audit Export - Streaming Audit Trail Export Writers
+===================================================
+
+This module implements the incremental writers used by AuditLogger to export
+audit trails of any size. Rows arrive in batches from a server-side cursor
+and are serialised straight to disk, so memory use stays constant no matter
+how many years of audit history a regulator requests.
+
+Key Features:
+- JSON Lines, JSON, CSV and XML writers that never hold the full result set
+- Optional on-the-fly gzip compression
+- Chunked file rotation by record count with a JSON manifest
+- SHA-256 content checksums per export part
+- Blocking file I/O offloaded from the event loop per batch
+
+Rule Compliance:
+- Rule 1: No stubs - Real streaming export with production-grade I/O
+- Rule 2: Modular design - New export formats plug in as writer classes
+- Rule 17: Extensive comments explaining all functionality
+"""
+
+import os
+import io
+import csv
+import gzip
+import json
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Type
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from xml.sax.saxutils import escape as xml_escape
+
+# Monitoring and logging
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger()
+
+def _serialise_value(value: Any) -> str:
+    """Flatten a column value to text for CSV/XML output"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value) if value is not None else ''
+
+class ExportFormatWriter:
+    """
+    Base class for incremental export formats
+
+    A writer turns rows into text fragments; it never sees more than one
+    batch of rows at a time. ``header`` is emitted lazily with the first row
+    of each file so formats such as CSV can derive their columns from it.
+    """
+
+    extension = ''
+
+    def header(self, first_row: Optional[Dict[str, Any]]) -> str:
+        return ''
+
+    def row(self, row: Dict[str, Any], index_in_file: int) -> str:
+        raise NotImplementedError
+
+    def footer(self, metadata: Dict[str, Any]) -> str:
+        return ''
+
+class JSONLinesExportWriter(ExportFormatWriter):
+    """One JSON object per line; the natural streaming format"""
+
+    extension = 'jsonl'
+
+    def row(self, row: Dict[str, Any], index_in_file: int) -> str:
+        return json.dumps(row, default=str) + '\n'
+
+class JSONExportWriter(ExportFormatWriter):
+    """
+    Single JSON document with ``audit_events`` and ``export_metadata``
+
+    The metadata object is written after the events so that the record count
+    is known without buffering the events.
+    """
+
+    extension = 'json'
+
+    def header(self, first_row: Optional[Dict[str, Any]]) -> str:
+        return '{"audit_events": [\n'
+
+    def row(self, row: Dict[str, Any], index_in_file: int) -> str:
+        prefix = ',\n' if index_in_file else ''
+        return prefix + json.dumps(row, default=str)
+
+    def footer(self, metadata: Dict[str, Any]) -> str:
+        return '\n], "export_metadata": ' + json.dumps(metadata, default=str) + '}\n'
+
+class CSVExportWriter(ExportFormatWriter):
+    """CSV with columns taken from the first row of each file"""
+
+    extension = 'csv'
+
+    def __init__(self):
+        self.fieldnames: Optional[List[str]] = None
+
+    def _format(self, values: List[str]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(values)
+        return buffer.getvalue()
+
+    def header(self, first_row: Optional[Dict[str, Any]]) -> str:
+        if first_row is None:
+            return ''
+        self.fieldnames = list(first_row.keys())
+        return self._format(self.fieldnames)
+
+    def row(self, row: Dict[str, Any], index_in_file: int) -> str:
+        return self._format([_serialise_value(row.get(field)) for field in self.fieldnames])
+
+class XMLExportWriter(ExportFormatWriter):
+    """``<audit_export>`` document with one ``<event>`` element per row"""
+
+    extension = 'xml'
+
+    def header(self, first_row: Optional[Dict[str, Any]]) -> str:
+        return "<?xml version='1.0' encoding='utf-8'?>\n<audit_export><events>"
+
+    def row(self, row: Dict[str, Any], index_in_file: int) -> str:
+        fields = ''.join(
+            f"<{key}>{xml_escape(_serialise_value(value))}</{key}>"
+            for key, value in row.items()
+        )
+        return f"<event>{fields}</event>\n"
+
+    def footer(self, metadata: Dict[str, Any]) -> str:
+        fields = ''.join(
+            f"<{key}>{xml_escape(_serialise_value(value))}</{key}>"
+            for key, value in metadata.items()
+        )
+        return f"</events><metadata>{fields}</metadata></audit_export>\n"
+
+EXPORT_FORMAT_WRITERS: Dict[str, Type[ExportFormatWriter]] = {
+    'jsonl': JSONLinesExportWriter,
+    'json': JSONExportWriter,
+    'csv': CSVExportWriter,
+    'xml': XMLExportWriter,
+}
+
+@dataclass
+class ExportPart:
+    """A single file produced by an export"""
+    path: str
+    records: int
+    file_size: int
+    content_sha256: str
+
+class StreamingExportSink:
+    """
+    Writes batches of audit rows to one or more export files
+
+    Files are rotated every ``max_records_per_file`` records (each part is a
+    complete document in its format) and optionally gzip-compressed.
+    """
+
+    def __init__(self,
+                 export_dir: Path,
+                 export_id: str,
+                 export_format: str,
+                 metadata: Dict[str, Any],
+                 compress: bool = False,
+                 max_records_per_file: Optional[int] = None):
+        if export_format not in EXPORT_FORMAT_WRITERS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        self.export_dir = Path(export_dir)
+        self.export_id = export_id
+        self.export_format = export_format
+        self.metadata = metadata
+        self.compress = compress
+        self.max_records_per_file = max_records_per_file
+
+        self.parts: List[ExportPart] = []
+        self.total_records = 0
+        self.manifest_path: Optional[str] = None
+
+        self._writer: Optional[ExportFormatWriter] = None
+        self._handle = None
+        self._path: Optional[Path] = None
+        self._hash = None
+        self._records_in_file = 0
+
+    def _part_path(self, part_number: Optional[int]) -> Path:
+        extension = EXPORT_FORMAT_WRITERS[self.export_format].extension
+        suffix = f".part{part_number:04d}" if part_number is not None else ''
+        filename = f"audit_export_{self.export_id}{suffix}.{extension}"
+        if self.compress:
+            filename += '.gz'
+        return self.export_dir / filename
+
+    def _open_part(self) -> Path:
+        """Open the next export file (blocking - runs in a worker thread)"""
+        part_number = len(self.parts) + 1 if self.max_records_per_file else None
+        self._path = self._part_path(part_number)
+        self._handle = (gzip.open(self._path, 'wt', encoding='utf-8', newline='')
+                        if self.compress else open(self._path, 'w', encoding='utf-8', newline=''))
+        self._hash = hashlib.sha256()
+        self._records_in_file = 0
+        self._writer = EXPORT_FORMAT_WRITERS[self.export_format]()
+        return self._path
+
+    def _emit(self, text: str):
+        if text:
+            self._handle.write(text)
+            self._hash.update(text.encode('utf-8'))
+
+    def _close_part(self):
+        """Finish the current file with its footer (blocking)"""
+        if self._handle is None:
+            return
+
+        if self._records_in_file == 0:
+            self._emit(self._writer.header(None))
+
+        self._emit(self._writer.footer({
+            **self.metadata,
+            'part': len(self.parts) + 1,
+            'total_records': self._records_in_file
+        }))
+        self._handle.close()
+
+        self.parts.append(ExportPart(
+            path=str(self._path),
+            records=self._records_in_file,
+            file_size=os.path.getsize(self._path),
+            content_sha256=self._hash.hexdigest()
+        ))
+        self._handle = None
+
+    def _write_batch_sync(self, rows: List[Dict[str, Any]]):
+        """Serialise and write one batch of rows, rotating files as needed"""
+        for row in rows:
+            if self._handle is None:
+                self._open_part()
+
+            if self._records_in_file == 0:
+                self._emit(self._writer.header(row))
+
+            self._emit(self._writer.row(row, self._records_in_file))
+            self._records_in_file += 1
+            self.total_records += 1
+
+            if self.max_records_per_file and self._records_in_file >= self.max_records_per_file:
+                self._close_part()
+
+    async def write_batch(self, rows: List[Dict[str, Any]]):
+        """Write a batch of rows without blocking the event loop"""
+        if rows:
+            await asyncio.to_thread(self._write_batch_sync, rows)
+
+    def _finish_sync(self) -> List[ExportPart]:
+        # An export always produces at least one (possibly empty) document
+        if self._handle is None and not self.parts:
+            self._open_part()
+        self._close_part()
+
+        if len(self.parts) > 1:
+            self._write_manifest()
+
+        return self.parts
+
+    def _write_manifest(self):
+        """Describe a rotated export so consumers can verify every part"""
+        manifest_path = self.export_dir / f"audit_export_{self.export_id}.manifest.json"
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'export_metadata': {**self.metadata, 'total_records': self.total_records},
+                'format': self.export_format,
+                'compressed': self.compress,
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'parts': [asdict(part) for part in self.parts]
+            }, f, indent=2, default=str)
+        self.manifest_path = str(manifest_path)
+
+    async def finish(self) -> List[ExportPart]:
+        """Close the last file and write the manifest for rotated exports"""
+        return await asyncio.to_thread(self._finish_sync)
+
+    @property
+    def primary_path(self) -> str:
+        """Manifest path for rotated exports, otherwise the single export file"""
+        if len(self.parts) > 1:
+            return self.manifest_path
+        return self.parts[0].path if self.parts else ''
+
+    @property
+    def total_size(self) -> int:
+        return sum(part.file_size for part in self.parts)
+
+    def abort(self):
+        """Close any open file after a failed export"""
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except Exception as e:
+                logger.warning("Failed to close export file", error=str(e))
+            self._handle = None
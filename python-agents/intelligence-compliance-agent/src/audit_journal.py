@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Audit Journal - Local Spill-to-Disk Journal for Audit Events
+============================================================
+
+This module implements the durable fallback used by AuditLogger when audit
+events cannot reach PostgreSQL. Batches that fail to flush (or arrive while
+the in-memory queue is full) are appended to fsync'ed JSON Lines segments
+and replayed in order once the database is reachable again, so a database
+outage neither loses audit events nor grows process memory.
+
+Key Features:
+- Append-only JSON Lines segments, fsync'ed before an append returns
+- Size-based segment rotation with a total disk budget
+- Ordered replay with per-segment progress markers (at-least-once: a batch
+  handled just before a crash is offered again, so handlers are idempotent)
+- Blocking file I/O offloaded from the event loop
+
+Rule Compliance:
+- Rule 1: No stubs - Real durable journal with crash-safe replay
+- Rule 2: Modular design - Journal is independent of the event schema
+- Rule 17: Extensive comments explaining all functionality
+"""
+
+import os
+import json
+import asyncio
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Awaitable, Callable, Tuple
+
+# Monitoring and logging
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger()
+
+class JournalFullError(Exception):
+    """Raised when the journal disk budget is exhausted"""
+    pass
+
+class AuditSpillJournal:
+    """
+    Ordered on-disk journal of serialised audit events
+
+    Segments are named ``audit_journal_<ns timestamp>.jsonl``; a segment's
+    replay progress is kept in ``<segment>.offset`` so a replay interrupted
+    by another outage resumes after the last flushed line.
+    """
+
+    def __init__(self, directory: Path, max_segment_bytes: int = 16 * 1024 * 1024,
+                 max_total_bytes: int = 1024 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_total_bytes = max_total_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = asyncio.Lock()
+        self._active_segment: Path = None
+
+        self.stats = {
+            'events_spilled': 0,
+            'events_replayed': 0,
+            'replay_failures': 0
+        }
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.directory.glob('audit_journal_*.jsonl'))
+
+    def _offset_path(self, segment: Path) -> Path:
+        return segment.with_suffix('.offset')
+
+    def _total_bytes(self) -> int:
+        return sum(segment.stat().st_size for segment in self._segments())
+
+    def _append_sync(self, events: List[Dict[str, Any]]):
+        """Append events to the active segment and fsync (blocking)"""
+        payload = ''.join(json.dumps(event, default=str) + '\n' for event in events).encode('utf-8')
+
+        if self._total_bytes() + len(payload) > self.max_total_bytes:
+            raise JournalFullError(f"Audit journal budget of {self.max_total_bytes} bytes exhausted")
+
+        if (self._active_segment is None or not self._active_segment.exists() or
+                self._active_segment.stat().st_size >= self.max_segment_bytes):
+            self._active_segment = self.directory / f"audit_journal_{time.time_ns()}.jsonl"
+
+        with open(self._active_segment, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def append(self, events: List[Dict[str, Any]]):
+        """Durably append serialised events"""
+        if not events:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._append_sync, events)
+        self.stats['events_spilled'] += len(events)
+        logger.warning("Audit events spilled to journal", count=len(events))
+
+    def _read_segment(self, segment: Path) -> Tuple[int, List[Dict[str, Any]]]:
+        offset_path = self._offset_path(segment)
+        done = int(offset_path.read_text()) if offset_path.exists() else 0
+        with open(segment, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        events = []
+        for line in lines[done:]:
+            if not line.endswith('\n'):
+                break  # torn write from a crash mid-append
+            events.append(json.loads(line))
+        return done, events
+
+    def _retire_segment(self, segment: Path):
+        segment.unlink(missing_ok=True)
+        self._offset_path(segment).unlink(missing_ok=True)
+
+    async def replay(self, handler: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+                     batch_size: int = 500) -> int:
+        """
+        Replay journalled events oldest first through ``handler``
+
+        Stops at the first handler failure; progress up to the last
+        successful batch is kept. Progress is recorded after the handler
+        returns, so a crash in between replays that batch again and the
+        handler must tolerate events it has already stored. Returns the
+        number of events replayed.
+        """
+        replayed = 0
+
+        # Seal the active segment so concurrent appends start a new one
+        async with self._lock:
+            self._active_segment = None
+            segments = await asyncio.to_thread(self._segments)
+
+        for segment in segments:
+            done, events = await asyncio.to_thread(self._read_segment, segment)
+
+            for start in range(0, len(events), batch_size):
+                batch = events[start:start + batch_size]
+                try:
+                    await handler(batch)
+                except Exception as e:
+                    self.stats['replay_failures'] += 1
+                    logger.warning("Audit journal replay interrupted", segment=segment.name, error=str(e))
+                    return replayed
+
+                done += len(batch)
+                replayed += len(batch)
+                self.stats['events_replayed'] += len(batch)
+                await asyncio.to_thread(self._offset_path(segment).write_text, str(done))
+
+            await asyncio.to_thread(self._retire_segment, segment)
+
+        if replayed:
+            logger.info("Audit journal replayed", events=replayed)
+        return replayed
+
+    def has_pending(self) -> bool:
+        """Whether any journalled events await replay"""
+        return bool(self._segments())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Journal statistics"""
+        segments = self._segments()
+        return {
+            **self.stats,
+            'segments': len(segments),
+            'journal_bytes': sum(segment.stat().st_size for segment in segments)
+        }
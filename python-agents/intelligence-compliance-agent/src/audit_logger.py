@@ -46,7 +46,6 @@ from pathlib import Path
 
 # Database and caching
 import asyncpg
-import redis
 
 # Monitoring and logging
 import structlog
@@ -61,6 +60,21 @@ import base64
 # Import compliance rule types
 from .rule_compiler import ComplianceRule, RegulationType, RuleType
 
+# Shared async Redis client
+from .async_redis import get_redis_client
+
+# Streaming export writers
+from .audit_export import StreamingExportSink
+
+# Spill-to-disk journal for database outages
+from .audit_journal import AuditSpillJournal
+
+# Hash-chained batch integrity
+from .audit_chain import (
+    GENESIS_ROOT, AuditCryptoPool, canonical_event_json, compute_batch_root,
+    seal_events, verify_batch, verify_events
+)
+
 # Configure structured logging
 logger = structlog.get_logger()
 
@@ -70,6 +84,25 @@ AUDIT_LOGGING_TIME = Histogram('audit_logger_logging_seconds', 'Time spent loggi
 AUDIT_QUERIES = Counter('audit_logger_queries_total', 'Total audit queries executed', ['query_type'])
 AUDIT_EXPORTS = Counter('audit_logger_exports_total', 'Total audit exports generated', ['format'])
 AUDIT_ERRORS = Counter('audit_logger_errors_total', 'Audit logging errors', ['error_type'])
+AUDIT_BATCHES_SEALED = Counter('audit_logger_batches_sealed_total', 'Audit batches sealed into the hash chain')
+AUDIT_SEAL_TIME = Histogram('audit_logger_seal_seconds', 'Time spent hashing and encrypting an audit batch')
+AUDIT_BATCHES_VERIFIED = Counter('audit_logger_batches_verified_total', 'Audit batches verified', ['result'])
+AUDIT_QUEUE_DEPTH = Gauge('audit_logger_queue_depth', 'Audit events waiting to be flushed')
+AUDIT_FLUSH_TIME = Histogram('audit_logger_flush_seconds', 'Time spent writing an audit batch to the database')
+AUDIT_EVENTS_SPILLED = Counter('audit_logger_events_spilled_total', 'Audit events written to the spill journal')
+
+# Columns written to regulatory_audit_logs, in COPY record order
+AUDIT_LOG_COLUMNS = [
+    'event_id', 'event_type', 'severity', 'status', 'timestamp', 'correlation_id',
+    'session_id', 'user_id', 'component', 'operation', 'resource_type', 'resource_id',
+    'before_state', 'after_state', 'change_summary', 'metadata', 'ip_address',
+    'user_agent', 'request_id', 'duration_ms', 'error_details', 'tags',
+    'integrity_hash', 'encrypted_before_state', 'encrypted_after_state',
+    'batch_id', 'batch_position'
+]
+
+# Advisory lock serialising chain appends across AuditLogger instances
+AUDIT_CHAIN_LOCK_ID = 7_204_518_311
 
 class AuditEventType(Enum):
     """Types of audit events"""
@@ -144,7 +177,7 @@ class AuditQuery:
     resource_id: Optional[str] = None
     search_text: Optional[str] = None
     tags: Optional[List[str]] = None
-    limit: int = 100
+    limit: Optional[int] = 100       # None = no limit (full exports)
     offset: int = 0
 
 @dataclass
@@ -152,16 +185,20 @@ class AuditTrailExport:
     """Audit trail export configuration"""
     export_id: str
     query: AuditQuery
-    format: str                       # json, csv, xml, pdf
+    format: str                       # jsonl, json, csv, xml
     include_metadata: bool
     include_sensitive_data: bool
     encryption_required: bool
     created_by: str
     created_at: datetime
     expires_at: datetime
-    file_path: Optional[str] = None
-    file_size: Optional[int] = None
+    file_path: Optional[str] = None   # Export file, or manifest when rotated
+    file_size: Optional[int] = None   # Total bytes across all parts
     download_count: int = 0
+    compress: bool = False            # gzip each export file
+    max_records_per_file: Optional[int] = None  # Rotate files after N records
+    record_count: int = 0
+    part_paths: Optional[List[str]] = None
 
 class AuditIntegrityManager:
     """
@@ -182,7 +219,10 @@ class AuditIntegrityManager:
         # HMAC key for integrity verification
         self.hmac_key = os.getenv('AUDIT_HMAC_KEY', 'default_hmac_key').encode()
         
-        self.logger.info("Audit integrity manager initialized")
+        # Worker processes for hashing and encryption
+        self.crypto_pool = AuditCryptoPool()
+        
+        self.logger.info("Audit integrity manager initialized", crypto_workers=self.crypto_pool.max_workers)
     
     def _derive_encryption_key(self) -> Optional[bytes]:
         """Derive encryption key from environment variables"""
@@ -208,24 +248,41 @@ class AuditIntegrityManager:
             self.logger.warning("Failed to derive encryption key", error=str(e))
             return None
     
+    @staticmethod
+    def canonical_fields(audit_event: AuditEvent) -> Tuple:
+        """Picklable canonical fields of an audit event"""
+        return (
+            audit_event.event_id,
+            audit_event.event_type.value,
+            audit_event.timestamp.isoformat(),
+            audit_event.component,
+            audit_event.operation,
+            audit_event.resource_type,
+            audit_event.resource_id,
+            audit_event.before_state,
+            audit_event.after_state
+        )
+    
+    @staticmethod
+    def canonical_fields_from_record(record) -> Tuple:
+        """Canonical fields of a stored regulatory_audit_logs row"""
+        return (
+            record['event_id'],
+            record['event_type'],
+            record['timestamp'].isoformat(),
+            record['component'],
+            record['operation'],
+            record['resource_type'],
+            record['resource_id'],
+            record['before_state'],
+            record['after_state']
+        )
+    
     def calculate_integrity_hash(self, audit_event: AuditEvent) -> str:
         """Calculate integrity hash for audit event"""
         try:
-            # Create canonical representation of audit event
-            canonical_data = {
-                'event_id': audit_event.event_id,
-                'event_type': audit_event.event_type.value,
-                'timestamp': audit_event.timestamp.isoformat(),
-                'component': audit_event.component,
-                'operation': audit_event.operation,
-                'resource_type': audit_event.resource_type,
-                'resource_id': audit_event.resource_id,
-                'before_state': audit_event.before_state,
-                'after_state': audit_event.after_state
-            }
-            
-            # Convert to canonical JSON string
-            canonical_json = json.dumps(canonical_data, sort_keys=True, separators=(',', ':'))
+            # Convert canonical representation to JSON string
+            canonical_json = canonical_event_json(self.canonical_fields(audit_event))
             
             # Calculate HMAC-SHA256
             signature = hmac.new(
@@ -272,6 +329,49 @@ class AuditIntegrityManager:
         """Verify integrity of audit event"""
         calculated_hash = self.calculate_integrity_hash(audit_event)
         return hmac.compare_digest(calculated_hash, stored_hash)
+    
+    async def seal_events(self, events: List[AuditEvent]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Hash and encrypt a batch of events in the crypto pool
+        
+        Returns (integrity_hash, encrypted_before_state, encrypted_after_state)
+        per event, in input order.
+        """
+        return await self.crypto_pool.run(
+            seal_events,
+            self.hmac_key,
+            self.encryption_key,
+            [self.canonical_fields(event) for event in events]
+        )
+    
+    async def verify_records(self, records: List[Any]) -> List[bool]:
+        """Check stored per-event hashes of database rows in the crypto pool"""
+        return await self.crypto_pool.run(
+            verify_events,
+            self.hmac_key,
+            [(self.canonical_fields_from_record(r), r['integrity_hash']) for r in records]
+        )
+    
+    async def verify_batch_records(self, batch_record: Any, previous_root: str,
+                                   records: List[Any]) -> Dict[str, Any]:
+        """Recompute a sealed batch's chain root from its rows in the crypto pool"""
+        return await self.crypto_pool.run(
+            verify_batch,
+            self.hmac_key,
+            batch_record['batch_id'],
+            previous_root,
+            batch_record['root_hash'],
+            batch_record['event_count'],
+            [(self.canonical_fields_from_record(r), r['integrity_hash']) for r in records]
+        )
+    
+    def compute_batch_root(self, previous_root: str, batch_id: str, event_hashes: List[str]) -> str:
+        """Chain root for a batch of event hashes"""
+        return compute_batch_root(self.hmac_key, previous_root, batch_id, event_hashes)
+    
+    def shutdown(self):
+        """Stop crypto worker processes"""
+        self.crypto_pool.shutdown()
 
 class AuditLogger:
     """
@@ -329,20 +429,38 @@ class AuditLogger:
         # Configuration
         self.batch_size = int(os.getenv('AUDIT_BATCH_SIZE', '100'))
         self.batch_timeout = int(os.getenv('AUDIT_BATCH_TIMEOUT', '5'))  # seconds
+        self.max_pending_events = int(os.getenv('AUDIT_MAX_PENDING', '10000'))  # queue bound
+        self.enqueue_timeout = float(os.getenv('AUDIT_ENQUEUE_TIMEOUT', '1.0'))  # seconds a producer waits on a full queue
         self.retention_days = int(os.getenv('AUDIT_RETENTION_DAYS', '2555'))  # 7 years default
+        self.export_fetch_size = int(os.getenv('AUDIT_EXPORT_FETCH_SIZE', '2000'))  # rows per cursor fetch
+        self.export_dir = Path(os.getenv('AUDIT_EXPORT_DIR', '/tmp/audit_exports'))
+        self.verify_concurrency = int(os.getenv('AUDIT_VERIFY_CONCURRENCY', '8'))  # batches verified in parallel
         
-        # Batch processing
-        self.pending_events = []
-        self.batch_lock = asyncio.Lock()
+        # Batch processing - producers only enqueue; the batch processor writes
+        self.event_queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending_events)
+        self.flush_requested = asyncio.Event()
+        self.retry_batch: List[AuditEvent] = []
         self.batch_task = None
         
+        # Optional local journal for events that cannot reach the database
+        journal_dir = os.getenv('AUDIT_JOURNAL_DIR')
+        self.journal = AuditSpillJournal(
+            Path(journal_dir),
+            max_total_bytes=int(os.getenv('AUDIT_JOURNAL_MAX_BYTES', str(1024 * 1024 * 1024)))
+        ) if journal_dir else None
+        
         # Performance tracking
         self.audit_stats = {
             'events_logged': 0,
             'events_queried': 0,
             'exports_generated': 0,
             'integrity_violations': 0,
-            'avg_logging_time': 0.0
+            'avg_logging_time': 0.0,
+            'batches_flushed': 0,
+            'flush_failures': 0,
+            'events_spilled': 0,
+            'duplicate_events_skipped': 0,
+            'backpressure_waits': 0
         }
         
         self.logger.info("AuditLogger initialized successfully")
@@ -367,12 +485,8 @@ class AuditLogger:
                 max_size=10
             )
             
-            # Redis client for caching
-            self.redis_client = redis.Redis(
-                host=os.getenv('REDIS_HOST', 'redis'),
-                port=os.getenv('REDIS_PORT', 6379),
-                decode_responses=True
-            )
+            # Shared async Redis client for caching
+            self.redis_client = await get_redis_client()
             
             self.logger.info("Database connections initialized")
             
@@ -386,22 +500,147 @@ class AuditLogger:
         self.logger.info("Batch processor started")
     
     async def _batch_processor(self):
-        """Background task to process audit events in batches"""
+        """
+        Background task to process audit events in batches
+        
+        Wakes on a size trigger from ``log_event`` or after ``batch_timeout``,
+        whichever comes first. Once the database accepts writes again,
+        journalled events are replayed.
+        """
         while True:
             try:
-                await asyncio.sleep(self.batch_timeout)
+                try:
+                    await asyncio.wait_for(self.flush_requested.wait(), timeout=self.batch_timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self.flush_requested.clear()
                 
-                async with self.batch_lock:
-                    if self.pending_events:
-                        events_to_process = self.pending_events.copy()
-                        self.pending_events.clear()
-                        
-                        await self._flush_events_to_database(events_to_process)
+                if await self._drain_event_queue() and self.journal and self.journal.has_pending():
+                    await self.journal.replay(self._replay_journal_batch, batch_size=self.batch_size)
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error("Batch processor error", error=str(e))
                 await asyncio.sleep(1)  # Brief pause before retrying
     
+    def _take_batch(self) -> List[AuditEvent]:
+        """Take up to batch_size queued events without waiting"""
+        batch = []
+        while len(batch) < self.batch_size and not self.event_queue.empty():
+            batch.append(self.event_queue.get_nowait())
+        AUDIT_QUEUE_DEPTH.set(self.event_queue.qsize())
+        return batch
+    
+    async def _drain_event_queue(self) -> bool:
+        """
+        Flush queued events until the queue is empty
+        
+        When a batch fails to flush and a journal is configured, that batch
+        and everything still queued are spilled so memory is released during
+        the outage. Without a journal the batch is kept as ``retry_batch`` and
+        retried first on the next cycle while the bounded queue applies
+        backpressure. Returns False if the database rejected a batch.
+        """
+        while True:
+            batch = self.retry_batch or self._take_batch()
+            if not batch:
+                return True
+            
+            try:
+                await self._flush_events_to_database(batch)
+                self.retry_batch = []
+                self.audit_stats['batches_flushed'] += 1
+            except Exception as e:
+                self.audit_stats['flush_failures'] += 1
+                self.retry_batch = batch
+                self.logger.warning("Audit batch flush failed", events=len(batch), error=str(e))
+                
+                if self.journal:
+                    try:
+                        while self.retry_batch:
+                            await self._spill_events(self.retry_batch)
+                            self.retry_batch = self._take_batch()
+                    except Exception as journal_error:
+                        self.logger.error("Failed to spill audit events", error=str(journal_error))
+                return False
+    
+    async def _spill_events(self, events: List[AuditEvent]):
+        """Write events to the local journal for later replay"""
+        await self.journal.append([self._event_to_journal(event) for event in events])
+        AUDIT_EVENTS_SPILLED.inc(len(events))
+        self.audit_stats['events_spilled'] += len(events)
+    
+    async def _replay_journal_batch(self, records: List[Dict[str, Any]]):
+        """
+        Flush a batch of journalled events
+        
+        A batch can be committed and the process stop before the journal
+        records its progress; the replay after restart then skips the events
+        that are already stored instead of failing on their event_id.
+        """
+        await self._flush_events_to_database(
+            [self._event_from_journal(r) for r in records], skip_existing=True
+        )
+        self.audit_stats['batches_flushed'] += 1
+    
+    @staticmethod
+    def _event_to_journal(event: AuditEvent) -> Dict[str, Any]:
+        """Serialise an audit event for the spill journal"""
+        record = asdict(event)
+        record['event_type'] = event.event_type.value
+        record['severity'] = event.severity.value
+        record['status'] = event.status.value
+        record['timestamp'] = event.timestamp.isoformat()
+        return record
+    
+    @staticmethod
+    def _event_from_journal(record: Dict[str, Any]) -> AuditEvent:
+        """Rebuild an audit event from its journal record"""
+        return AuditEvent(**{
+            **record,
+            'event_type': AuditEventType(record['event_type']),
+            'severity': AuditSeverity(record['severity']),
+            'status': AuditStatus(record['status']),
+            'timestamp': datetime.fromisoformat(record['timestamp'])
+        })
+    
+    async def _enqueue_event(self, audit_event: AuditEvent):
+        """
+        Queue an event for the batch processor
+        
+        Producers never wait on a database write. When the queue is full they
+        wait up to ``enqueue_timeout`` for the batch processor to drain it,
+        then spill to the journal if configured, or fail.
+        """
+        try:
+            self.event_queue.put_nowait(audit_event)
+        except asyncio.QueueFull:
+            self.audit_stats['backpressure_waits'] += 1
+            self.flush_requested.set()
+            try:
+                await asyncio.wait_for(self.event_queue.put(audit_event), timeout=self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                if not self.journal:
+                    raise RuntimeError(
+                        f"Audit event queue full ({self.max_pending_events} events) and no journal configured"
+                    )
+                await self._spill_events([audit_event])
+                return
+        
+        AUDIT_QUEUE_DEPTH.set(self.event_queue.qsize())
+        if self.event_queue.qsize() >= self.batch_size:
+            self.flush_requested.set()
+    
+    async def _write_critical_event(self, audit_event: AuditEvent):
+        """Write a critical event immediately, spilling to the journal on failure"""
+        try:
+            await self._flush_events_to_database([audit_event])
+        except Exception:
+            if not self.journal:
+                raise
+            await self._spill_events([audit_event])
+    
     async def log_event(self, event_type: AuditEventType, component: str, operation: str,
                        resource_type: str, resource_id: Optional[str] = None,
                        before_state: Optional[Dict[str, Any]] = None,
@@ -473,18 +712,11 @@ class AuditLogger:
                 tags=tags or []
             )
             
-            # Add to batch for processing
-            async with self.batch_lock:
-                self.pending_events.append(audit_event)
-                
-                # Flush immediately if batch is full or event is critical
-                if (len(self.pending_events) >= self.batch_size or 
-                    severity == AuditSeverity.CRITICAL):
-                    events_to_process = self.pending_events.copy()
-                    self.pending_events.clear()
-                    
-                    # Process immediately for critical events
-                    await self._flush_events_to_database(events_to_process)
+            # Critical events are persisted before returning; others are batched
+            if severity == AuditSeverity.CRITICAL:
+                await self._write_critical_event(audit_event)
+            else:
+                await self._enqueue_event(audit_event)
             
             # Update metrics
             logging_time = (datetime.now() - start_time).total_seconds()
@@ -552,74 +784,196 @@ class AuditLogger:
         else:
             return "No changes detected"
     
-    async def _flush_events_to_database(self, events: List[AuditEvent]):
-        """Flush audit events to database"""
+    async def _flush_events_to_database(self, events: List[AuditEvent], skip_existing: bool = False):
+        """
+        Flush audit events to database as one sealed batch
+        
+        Hashing and encryption run in the crypto pool. The batch root is then
+        chained to the latest stored root under an advisory lock, and the
+        events and their batch record are written in one transaction.
+        
+        With ``skip_existing`` events whose event_id is already stored are
+        left out of the batch, so replaying journalled events is idempotent.
+        """
+        if not events:
+            return
+        
         try:
+            flush_start = datetime.now()
+            seal_start = datetime.now()
+            sealed = await self.integrity_manager.seal_events(events)
+            AUDIT_SEAL_TIME.observe((datetime.now() - seal_start).total_seconds())
+            
+            batch_id = str(uuid.uuid4())
+            pending = list(zip(events, sealed))
+            
             async with self.pg_pool.acquire() as conn:
-                # Prepare batch insert
-                insert_data = []
-                
-                for event in events:
-                    # Calculate integrity hash
-                    integrity_hash = self.integrity_manager.calculate_integrity_hash(event)
+                async with conn.transaction():
+                    await conn.execute("SELECT pg_advisory_xact_lock($1)", AUDIT_CHAIN_LOCK_ID)
                     
-                    # Encrypt sensitive data if configured
-                    encrypted_before = None
-                    encrypted_after = None
+                    if skip_existing:
+                        # Checked under the chain lock, so no other flush can
+                        # store these events between the check and the COPY
+                        stored = await conn.fetch("""
+                            SELECT event_id FROM regulatory_audit_logs
+                            WHERE event_id = ANY($1)
+                        """, [event.event_id for event in events])
+                        if stored:
+                            stored_ids = {row['event_id'] for row in stored}
+                            pending = [item for item in pending if item[0].event_id not in stored_ids]
+                            self.audit_stats['duplicate_events_skipped'] += len(events) - len(pending)
+                            self.logger.info("Skipped audit events already stored",
+                                             events=len(events) - len(pending))
+                        if not pending:
+                            return
                     
-                    if event.before_state:
-                        encrypted_before = self.integrity_manager.encrypt_sensitive_data(event.before_state)
+                    batch_events = [event for event, _ in pending]
+                    event_hashes = [integrity_hash for _, (integrity_hash, _, _) in pending]
                     
-                    if event.after_state:
-                        encrypted_after = self.integrity_manager.encrypt_sensitive_data(event.after_state)
+                    # Prepare batch insert
+                    insert_data = []
+                    for position, (event, (integrity_hash, encrypted_before, encrypted_after)) in enumerate(pending):
+                        insert_data.append((
+                            event.event_id,
+                            event.event_type.value,
+                            event.severity.value,
+                            event.status.value,
+                            event.timestamp,
+                            event.correlation_id,
+                            event.session_id,
+                            event.user_id,
+                            event.component,
+                            event.operation,
+                            event.resource_type,
+                            event.resource_id,
+                            json.dumps(event.before_state) if event.before_state else None,
+                            json.dumps(event.after_state) if event.after_state else None,
+                            event.change_summary,
+                            json.dumps(event.metadata),
+                            event.ip_address,
+                            event.user_agent,
+                            event.request_id,
+                            event.duration_ms,
+                            event.error_details,
+                            event.tags,
+                            integrity_hash,
+                            encrypted_before,
+                            encrypted_after,
+                            batch_id,
+                            position
+                        ))
                     
-                    insert_data.append((
-                        event.event_id,
-                        event.event_type.value,
-                        event.severity.value,
-                        event.status.value,
-                        event.timestamp,
-                        event.correlation_id,
-                        event.session_id,
-                        event.user_id,
-                        event.component,
-                        event.operation,
-                        event.resource_type,
-                        event.resource_id,
-                        json.dumps(event.before_state) if event.before_state else None,
-                        json.dumps(event.after_state) if event.after_state else None,
-                        event.change_summary,
-                        json.dumps(event.metadata),
-                        event.ip_address,
-                        event.user_agent,
-                        event.request_id,
-                        event.duration_ms,
-                        event.error_details,
-                        event.tags,
-                        integrity_hash,
-                        encrypted_before,
-                        encrypted_after
-                    ))
-                
-                # Batch insert
-                await conn.executemany("""
-                    INSERT INTO regulatory_audit_logs 
-                    (event_id, event_type, severity, status, timestamp, correlation_id,
-                     session_id, user_id, component, operation, resource_type, resource_id,
-                     before_state, after_state, change_summary, metadata, ip_address,
-                     user_agent, request_id, duration_ms, error_details, tags,
-                     integrity_hash, encrypted_before_state, encrypted_after_state)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15,
-                            $16, $17, $18, $19, $20, $21, $22, $23, $24, $25)
-                """, insert_data)
-            
-            self.logger.debug(f"Flushed {len(events)} audit events to database")
+                    previous_root = await conn.fetchval("""
+                        SELECT root_hash FROM regulatory_audit_batches
+                        ORDER BY batch_sequence DESC LIMIT 1
+                    """) or GENESIS_ROOT
+                    root_hash = self.integrity_manager.compute_batch_root(previous_root, batch_id, event_hashes)
+                    
+                    await conn.execute("""
+                        INSERT INTO regulatory_audit_batches
+                        (batch_id, previous_root, root_hash, event_count, first_event_at, last_event_at)
+                        VALUES ($1, $2, $3, $4, $5, $6)
+                    """,
+                        batch_id,
+                        previous_root,
+                        root_hash,
+                        len(batch_events),
+                        min(event.timestamp for event in batch_events),
+                        max(event.timestamp for event in batch_events)
+                    )
+                    
+                    # Bulk load the batch
+                    await conn.copy_records_to_table(
+                        'regulatory_audit_logs',
+                        records=insert_data,
+                        columns=AUDIT_LOG_COLUMNS
+                    )
+            
+            AUDIT_FLUSH_TIME.observe((datetime.now() - flush_start).total_seconds())
+            AUDIT_BATCHES_SEALED.inc()
+            self.logger.debug(f"Flushed {len(events)} audit events to database", batch_id=batch_id)
             
         except Exception as e:
             AUDIT_ERRORS.labels(error_type="database_flush_failed").inc()
             self.logger.error("Failed to flush audit events to database", error=str(e))
             raise
     
+    def _build_query_sql(self, query: AuditQuery) -> Tuple[str, List[Any]]:
+        """Build the filtered, ordered audit trail SQL for a query"""
+        sql_parts = ["SELECT * FROM regulatory_audit_logs WHERE 1=1"]
+        params = []
+        param_count = 0
+        
+        # Add filters
+        if query.event_types:
+            param_count += 1
+            sql_parts.append(f"AND event_type = ANY(${param_count})")
+            params.append([et.value for et in query.event_types])
+        
+        if query.severities:
+            param_count += 1
+            sql_parts.append(f"AND severity = ANY(${param_count})")
+            params.append([s.value for s in query.severities])
+        
+        if query.start_date:
+            param_count += 1
+            sql_parts.append(f"AND timestamp >= ${param_count}")
+            params.append(query.start_date)
+        
+        if query.end_date:
+            param_count += 1
+            sql_parts.append(f"AND timestamp <= ${param_count}")
+            params.append(query.end_date)
+        
+        if query.correlation_id:
+            param_count += 1
+            sql_parts.append(f"AND correlation_id = ${param_count}")
+            params.append(query.correlation_id)
+        
+        if query.user_id:
+            param_count += 1
+            sql_parts.append(f"AND user_id = ${param_count}")
+            params.append(query.user_id)
+        
+        if query.component:
+            param_count += 1
+            sql_parts.append(f"AND component = ${param_count}")
+            params.append(query.component)
+        
+        if query.resource_type:
+            param_count += 1
+            sql_parts.append(f"AND resource_type = ${param_count}")
+            params.append(query.resource_type)
+        
+        if query.resource_id:
+            param_count += 1
+            sql_parts.append(f"AND resource_id = ${param_count}")
+            params.append(query.resource_id)
+        
+        if query.search_text:
+            param_count += 1
+            sql_parts.append(f"AND (operation ILIKE ${param_count} OR change_summary ILIKE ${param_count} OR error_details ILIKE ${param_count})")
+            params.append(f"%{query.search_text}%")
+        
+        if query.tags:
+            param_count += 1
+            sql_parts.append(f"AND tags && ${param_count}")
+            params.append(query.tags)
+        
+        # Add ordering and pagination
+        sql_parts.append("ORDER BY timestamp DESC")
+        
+        if query.limit is not None:
+            param_count += 1
+            sql_parts.append(f"LIMIT ${param_count}")
+            params.append(query.limit)
+        
+        param_count += 1
+        sql_parts.append(f"OFFSET ${param_count}")
+        params.append(query.offset)
+        
+        return " ".join(sql_parts), params
+    
     async def query_audit_trail(self, query: AuditQuery) -> List[Dict[str, Any]]:
         """
         Query audit trail with filtering and pagination
@@ -633,80 +987,7 @@ class AuditLogger:
         start_time = datetime.now()
         
         try:
-            # Build SQL query
-            sql_parts = ["SELECT * FROM regulatory_audit_logs WHERE 1=1"]
-            params = []
-            param_count = 0
-            
-            # Add filters
-            if query.event_types:
-                param_count += 1
-                sql_parts.append(f"AND event_type = ANY(${param_count})")
-                params.append([et.value for et in query.event_types])
-            
-            if query.severities:
-                param_count += 1
-                sql_parts.append(f"AND severity = ANY(${param_count})")
-                params.append([s.value for s in query.severities])
-            
-            if query.start_date:
-                param_count += 1
-                sql_parts.append(f"AND timestamp >= ${param_count}")
-                params.append(query.start_date)
-            
-            if query.end_date:
-                param_count += 1
-                sql_parts.append(f"AND timestamp <= ${param_count}")
-                params.append(query.end_date)
-            
-            if query.correlation_id:
-                param_count += 1
-                sql_parts.append(f"AND correlation_id = ${param_count}")
-                params.append(query.correlation_id)
-            
-            if query.user_id:
-                param_count += 1
-                sql_parts.append(f"AND user_id = ${param_count}")
-                params.append(query.user_id)
-            
-            if query.component:
-                param_count += 1
-                sql_parts.append(f"AND component = ${param_count}")
-                params.append(query.component)
-            
-            if query.resource_type:
-                param_count += 1
-                sql_parts.append(f"AND resource_type = ${param_count}")
-                params.append(query.resource_type)
-            
-            if query.resource_id:
-                param_count += 1
-                sql_parts.append(f"AND resource_id = ${param_count}")
-                params.append(query.resource_id)
-            
-            if query.search_text:
-                param_count += 1
-                sql_parts.append(f"AND (operation ILIKE ${param_count} OR change_summary ILIKE ${param_count} OR error_details ILIKE ${param_count})")
-                params.append(f"%{query.search_text}%")
-            
-            if query.tags:
-                param_count += 1
-                sql_parts.append(f"AND tags && ${param_count}")
-                params.append(query.tags)
-            
-            # Add ordering and pagination
-            sql_parts.append("ORDER BY timestamp DESC")
-            
-            param_count += 1
-            sql_parts.append(f"LIMIT ${param_count}")
-            params.append(query.limit)
-            
-            param_count += 1
-            sql_parts.append(f"OFFSET ${param_count}")
-            params.append(query.offset)
-            
-            # Execute query
-            sql = " ".join(sql_parts)
+            sql, params = self._build_query_sql(query)
             
             async with self.pg_pool.acquire() as conn:
                 results = await conn.fetch(sql, *params)
@@ -733,30 +1014,68 @@ class AuditLogger:
             self.logger.error("Failed to query audit trail", error=str(e))
             raise
     
+    async def _stream_audit_events(self, query: AuditQuery):
+        """
+        Stream audit rows matching a query in batches from a server-side cursor
+        
+        Rows are fetched ``export_fetch_size`` at a time inside a read-only,
+        repeatable-read transaction, so the export sees a consistent snapshot
+        without materialising the result set.
+        """
+        sql, params = self._build_query_sql(query)
+        
+        async with self.pg_pool.acquire() as conn:
+            async with conn.transaction(readonly=True, isolation='repeatable_read'):
+                cursor = await conn.cursor(sql, *params)
+                while True:
+                    records = await cursor.fetch(self.export_fetch_size)
+                    if not records:
+                        break
+                    yield [dict(record) for record in records]
+    
     async def export_audit_trail(self, export_config: AuditTrailExport) -> str:
         """
         Export audit trail data in specified format
         
+        Rows are streamed from the database straight into the export file(s),
+        so memory use is independent of export size. Set ``query.limit`` to
+        None to export every matching event.
+        
         Args:
             export_config: Export configuration
             
         Returns:
-            File path of generated export
+            File path of generated export (the manifest for rotated exports)
         """
         start_time = datetime.now()
         
+        sink = None
         try:
-            # Query audit data
-            audit_events = await self.query_audit_trail(export_config.query)
+            self.export_dir.mkdir(parents=True, exist_ok=True)
             
-            # Generate export file
-            export_path = await self._generate_export_file(
-                audit_events, export_config
+            sink = StreamingExportSink(
+                export_dir=self.export_dir,
+                export_id=export_config.export_id,
+                export_format=export_config.format,
+                metadata={
+                    'export_id': export_config.export_id,
+                    'created_at': export_config.created_at.isoformat(),
+                    'created_by': export_config.created_by
+                },
+                compress=export_config.compress,
+                max_records_per_file=export_config.max_records_per_file
             )
             
+            async for batch in self._stream_audit_events(export_config.query):
+                await sink.write_batch(batch)
+            
+            parts = await sink.finish()
+            
             # Update export configuration
-            export_config.file_path = export_path
-            export_config.file_size = os.path.getsize(export_path) if os.path.exists(export_path) else 0
+            export_config.file_path = sink.primary_path
+            export_config.file_size = sink.total_size
+            export_config.record_count = sink.total_records
+            export_config.part_paths = [part.path for part in parts]
             
             # Store export record
             await self._store_export_record(export_config)
@@ -764,21 +1083,26 @@ class AuditLogger:
             # Update metrics
             export_time = (datetime.now() - start_time).total_seconds()
             AUDIT_EXPORTS.labels(format=export_config.format).inc()
+            AUDIT_QUERIES.labels(query_type="trail_query").inc()
             
             self.audit_stats['exports_generated'] += 1
+            self.audit_stats['events_queried'] += sink.total_records
             
             self.logger.info(
                 "Audit trail export completed",
                 export_id=export_config.export_id,
                 format=export_config.format,
-                records_count=len(audit_events),
+                records_count=sink.total_records,
+                parts=len(parts),
                 file_size=export_config.file_size,
                 export_time_ms=export_time * 1000
             )
             
-            return export_path
+            return export_config.file_path
             
         except Exception as e:
+            if sink:
+                sink.abort()
             AUDIT_ERRORS.labels(error_type="export_failed").inc()
             self.logger.error(
                 "Failed to export audit trail",
@@ -787,97 +1111,6 @@ class AuditLogger:
             )
             raise
     
-    async def _generate_export_file(self, audit_events: List[Dict[str, Any]],
-                                  export_config: AuditTrailExport) -> str:
-        """Generate export file in specified format"""
-        export_dir = Path(os.getenv('AUDIT_EXPORT_DIR', '/tmp/audit_exports'))
-        export_dir.mkdir(exist_ok=True)
-        
-        filename = f"audit_export_{export_config.export_id}.{export_config.format}"
-        file_path = export_dir / filename
-        
-        if export_config.format == 'json':
-            await self._export_to_json(audit_events, file_path, export_config)
-        elif export_config.format == 'csv':
-            await self._export_to_csv(audit_events, file_path, export_config)
-        elif export_config.format == 'xml':
-            await self._export_to_xml(audit_events, file_path, export_config)
-        else:
-            raise ValueError(f"Unsupported export format: {export_config.format}")
-        
-        return str(file_path)
-    
-    async def _export_to_json(self, audit_events: List[Dict[str, Any]], 
-                            file_path: Path, export_config: AuditTrailExport):
-        """Export audit events to JSON format"""
-        export_data = {
-            'export_metadata': {
-                'export_id': export_config.export_id,
-                'created_at': export_config.created_at.isoformat(),
-                'created_by': export_config.created_by,
-                'total_records': len(audit_events)
-            },
-            'audit_events': audit_events
-        }
-        
-        with open(file_path, 'w') as f:
-            json.dump(export_data, f, indent=2, default=str)
-    
-    async def _export_to_csv(self, audit_events: List[Dict[str, Any]], 
-                           file_path: Path, export_config: AuditTrailExport):
-        """Export audit events to CSV format"""
-        import csv
-        
-        if not audit_events:
-            return
-        
-        fieldnames = audit_events[0].keys()
-        
-        with open(file_path, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for event in audit_events:
-                # Convert complex fields to strings
-                row = {}
-                for key, value in event.items():
-                    if isinstance(value, (dict, list)):
-                        row[key] = json.dumps(value)
-                    else:
-                        row[key] = str(value) if value is not None else ''
-                writer.writerow(row)
-    
-    async def _export_to_xml(self, audit_events: List[Dict[str, Any]], 
-                           file_path: Path, export_config: AuditTrailExport):
-        """Export audit events to XML format"""
-        import xml.etree.ElementTree as ET
-        
-        root = ET.Element('audit_export')
-        
-        # Add metadata
-        metadata = ET.SubElement(root, 'metadata')
-        ET.SubElement(metadata, 'export_id').text = export_config.export_id
-        ET.SubElement(metadata, 'created_at').text = export_config.created_at.isoformat()
-        ET.SubElement(metadata, 'created_by').text = export_config.created_by
-        ET.SubElement(metadata, 'total_records').text = str(len(audit_events))
-        
-        # Add events
-        events_element = ET.SubElement(root, 'events')
-        
-        for event in audit_events:
-            event_element = ET.SubElement(events_element, 'event')
-            
-            for key, value in event.items():
-                element = ET.SubElement(event_element, key)
-                if isinstance(value, (dict, list)):
-                    element.text = json.dumps(value)
-                else:
-                    element.text = str(value) if value is not None else ''
-        
-        # Write to file
-        tree = ET.ElementTree(root)
-        tree.write(file_path, encoding='utf-8', xml_declaration=True)
-    
     async def _store_export_record(self, export_config: AuditTrailExport):
         """Store export record in database"""
         try:
@@ -924,36 +1157,10 @@ class AuditLogger:
                     WHERE event_id = ANY($1)
                 """, event_ids)
             
-            for event_record in events:
-                # Reconstruct audit event
-                audit_event = AuditEvent(
-                    event_id=event_record['event_id'],
-                    event_type=AuditEventType(event_record['event_type']),
-                    severity=AuditSeverity(event_record['severity']),
-                    status=AuditStatus(event_record['status']),
-                    timestamp=event_record['timestamp'],
-                    correlation_id=event_record['correlation_id'],
-                    session_id=event_record['session_id'],
-                    user_id=event_record['user_id'],
-                    component=event_record['component'],
-                    operation=event_record['operation'],
-                    resource_type=event_record['resource_type'],
-                    resource_id=event_record['resource_id'],
-                    before_state=json.loads(event_record['before_state']) if event_record['before_state'] else None,
-                    after_state=json.loads(event_record['after_state']) if event_record['after_state'] else None,
-                    change_summary=event_record['change_summary'],
-                    metadata=json.loads(event_record['metadata']) if event_record['metadata'] else {},
-                    ip_address=event_record['ip_address'],
-                    user_agent=event_record['user_agent'],
-                    request_id=event_record['request_id'],
-                    duration_ms=event_record['duration_ms'],
-                    error_details=event_record['error_details'],
-                    tags=event_record['tags'] or []
-                )
-                
-                # Verify integrity
-                stored_hash = event_record['integrity_hash']
-                is_valid = self.integrity_manager.verify_integrity(audit_event, stored_hash)
+            # Recompute hashes in the crypto pool
+            validity = await self.integrity_manager.verify_records(events)
+            
+            for event_record, is_valid in zip(events, validity):
                 results[event_record['event_id']] = is_valid
                 
                 if not is_valid:
@@ -970,6 +1177,103 @@ class AuditLogger:
             self.logger.error("Failed to verify audit integrity", error=str(e))
             raise
     
+    async def verify_range(self, start: datetime, end: datetime):
+        """
+        Verify the audit hash chain for all batches overlapping a time range
+        
+        Batches are streamed in chain order from a server-side cursor and
+        verified ``verify_concurrency`` at a time in the crypto pool. Each
+        batch's root is recomputed from its events and its previous root is
+        checked against the preceding batch, so one pass over the chain
+        proves that no event in the range was altered, removed or reordered.
+        
+        Args:
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+            
+        Yields:
+            One result dictionary per batch
+        """
+        try:
+            async with self.pg_pool.acquire() as conn:
+                async with conn.transaction(readonly=True, isolation='repeatable_read'):
+                    cursor = await conn.cursor("""
+                        SELECT batch_id, batch_sequence, previous_root, root_hash, event_count,
+                               first_event_at, last_event_at
+                        FROM regulatory_audit_batches
+                        WHERE last_event_at >= $1 AND first_event_at <= $2
+                        ORDER BY batch_sequence
+                    """, start, end)
+                    
+                    expected_previous = None
+                    while True:
+                        batch_records = await cursor.fetch(self.verify_concurrency)
+                        if not batch_records:
+                            break
+                        
+                        if expected_previous is None:
+                            # Anchor the range on the batch preceding it, if still retained
+                            expected_previous = await conn.fetchval("""
+                                SELECT root_hash FROM regulatory_audit_batches
+                                WHERE batch_sequence < $1
+                                ORDER BY batch_sequence DESC LIMIT 1
+                            """, batch_records[0]['batch_sequence'])
+                            if expected_previous is None and batch_records[0]['batch_sequence'] == 1:
+                                expected_previous = GENESIS_ROOT
+                        
+                        event_records = await conn.fetch("""
+                            SELECT * FROM regulatory_audit_logs
+                            WHERE batch_id = ANY($1)
+                            ORDER BY batch_id, batch_position
+                        """, [b['batch_id'] for b in batch_records])
+                        
+                        events_by_batch: Dict[str, List[Any]] = {}
+                        for record in event_records:
+                            events_by_batch.setdefault(record['batch_id'], []).append(record)
+                        
+                        outcomes = await asyncio.gather(*[
+                            self.integrity_manager.verify_batch_records(
+                                b, b['previous_root'], events_by_batch.get(b['batch_id'], [])
+                            )
+                            for b in batch_records
+                        ])
+                        
+                        for batch_record, outcome in zip(batch_records, outcomes):
+                            chain_valid = (expected_previous is None or
+                                           hmac.compare_digest(batch_record['previous_root'], expected_previous))
+                            valid = (chain_valid and outcome['root_valid'] and
+                                     not outcome['invalid_event_ids'] and not outcome['missing_events'])
+                            expected_previous = batch_record['root_hash']
+                            
+                            AUDIT_BATCHES_VERIFIED.labels(result="valid" if valid else "invalid").inc()
+                            if not valid:
+                                self.audit_stats['integrity_violations'] += 1
+                                self.logger.warning(
+                                    "Audit chain violation detected",
+                                    batch_id=batch_record['batch_id'],
+                                    batch_sequence=batch_record['batch_sequence'],
+                                    chain_valid=chain_valid,
+                                    root_valid=outcome['root_valid'],
+                                    invalid_events=len(outcome['invalid_event_ids']),
+                                    missing_events=outcome['missing_events']
+                                )
+                            
+                            yield {
+                                'batch_id': batch_record['batch_id'],
+                                'batch_sequence': batch_record['batch_sequence'],
+                                'event_count': batch_record['event_count'],
+                                'first_event_at': batch_record['first_event_at'],
+                                'last_event_at': batch_record['last_event_at'],
+                                'valid': valid,
+                                'chain_valid': chain_valid,
+                                **outcome
+                            }
+            
+        except Exception as e:
+            AUDIT_ERRORS.labels(error_type="integrity_verification_failed").inc()
+            self.logger.error("Failed to verify audit range", error=str(e))
+            raise
+    
     async def get_audit_stats(self) -> Dict[str, Any]:
         """Get audit logging statistics"""
         return {
@@ -977,7 +1281,9 @@ class AuditLogger:
             'batch_size': self.batch_size,
             'batch_timeout': self.batch_timeout,
             'retention_days': self.retention_days,
-            'pending_events': len(self.pending_events),
+            'max_pending_events': self.max_pending_events,
+            'pending_events': self.event_queue.qsize() + len(self.retry_batch),
+            'journal': self.journal.get_stats() if self.journal else None,
             'timestamp': datetime.now().isoformat()
         }
     
@@ -987,16 +1293,26 @@ class AuditLogger:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
             
             async with self.pg_pool.acquire() as conn:
-                result = await conn.execute("""
-                    DELETE FROM regulatory_audit_logs 
-                    WHERE timestamp < $1
-                """, cutoff_date)
+                async with conn.transaction():
+                    # Expire whole sealed batches so retained batches stay verifiable
+                    expired_batches = await conn.fetch("""
+                        DELETE FROM regulatory_audit_batches
+                        WHERE last_event_at < $1
+                        RETURNING batch_id
+                    """, cutoff_date)
+                    
+                    result = await conn.execute("""
+                        DELETE FROM regulatory_audit_logs 
+                        WHERE batch_id = ANY($1)
+                           OR (batch_id IS NULL AND timestamp < $2)
+                    """, [b['batch_id'] for b in expired_batches], cutoff_date)
                 
                 deleted_count = int(result.split()[-1])
             
             self.logger.info(
                 "Audit cleanup completed",
                 deleted_records=deleted_count,
+                deleted_batches=len(expired_batches),
                 cutoff_date=cutoff_date.isoformat()
             )
             
@@ -1004,6 +1320,28 @@ class AuditLogger:
             AUDIT_ERRORS.labels(error_type="cleanup_failed").inc()
             self.logger.error("Failed to cleanup expired audits", error=str(e))
             raise
+    
+    async def close(self):
+        """Flush pending events and release database and worker resources"""
+        if self.batch_task:
+            self.batch_task.cancel()
+            try:
+                await self.batch_task
+            except asyncio.CancelledError:
+                pass
+        
+        # Drain the queue; anything the database rejects is spilled if possible
+        await self._drain_event_queue()
+        unflushed = self.event_queue.qsize() + len(self.retry_batch)
+        if unflushed:
+            self.logger.error("Audit events not persisted on shutdown", count=unflushed)
+        
+        self.integrity_manager.shutdown()
+        
+        if self.pg_pool:
+            await self.pg_pool.close()
+        
+        self.logger.info("AuditLogger closed")
 
 # Export main classes
 __all__ = ['AuditLogger', 'AuditEvent', 'AuditEventType', 'AuditQuery', 'AuditTrailExport']
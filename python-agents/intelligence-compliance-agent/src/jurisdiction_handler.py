@@ -10,14 +10,17 @@ requirements and ensures proper rule precedence across jurisdictions.
 Key Features:
 - Support for DE (Germany), IE (Ireland), EU (European Union), GB (United Kingdom)
 - Rule applicability matrix by jurisdiction
+- Precomputed jurisdiction → rule-id index with inheritance flattened in
 - Hierarchical jurisdiction handling (EU > National > Regional)
 - Customer jurisdiction detection from data
+- Batch detection in a worker pool with COPY/merge and unchanged-result skipping
 - ISO 3166-1 alpha-2 country code validation
 - Jurisdiction inheritance rules (e.g., DE inherits EU rules)
 - Multi-jurisdiction customer handling
 - Jurisdiction change impact analysis
 - Rule precedence hierarchy (Local > National > EU > International)
 - Conflict resolution algorithms
+- Conflict resolutions memoized per jurisdiction set and rule set, shared via Redis
 - Override mechanisms for specific cases
 - Audit trail for jurisdiction decisions
 
@@ -36,22 +39,28 @@ import json
 import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple, Set
+from decimal import Decimal
+from typing import Dict, List, Optional, Any, Union, Tuple, Set, FrozenSet, Iterable, AsyncIterable
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 import uuid
+import hashlib
+from collections import Counter as TallyCounter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Database and caching
 import asyncpg
-import redis
 
 # Monitoring and logging
 import structlog
 from prometheus_client import Counter, Histogram, Gauge
 
 # Import compliance rule types
-from .rule_compiler import ComplianceRule, RegulationType, RuleType
+from .rule_compiler import ComplianceRule, ConditionOperator, RegulationType, RuleType
+
+# Shared async Redis client
+from .async_redis import get_redis_client
 
 # Configure structured logging
 logger = structlog.get_logger()
@@ -62,6 +71,10 @@ RESOLUTION_TIME = Histogram('jurisdiction_resolution_seconds', 'Time spent resol
 RULE_APPLICATIONS = Counter('jurisdiction_rule_applications_total', 'Rules applied by jurisdiction', ['jurisdiction', 'regulation_type'])
 CONFLICT_RESOLUTIONS = Counter('jurisdiction_conflicts_resolved_total', 'Jurisdiction conflicts resolved', ['conflict_type'])
 JURISDICTION_ERRORS = Counter('jurisdiction_errors_total', 'Jurisdiction handling errors', ['error_type'])
+RESOLUTION_CACHE_LOOKUPS = Counter('jurisdiction_resolution_cache_lookups_total', 'Conflict resolution cache lookups', ['result'])
+
+# Redis key prefix for shared conflict resolutions
+RESOLUTION_CACHE_PREFIX = "jurisdiction:resolution:"
 
 class JurisdictionLevel(Enum):
     """Hierarchy levels for jurisdiction precedence"""
@@ -143,6 +156,33 @@ class JurisdictionConflict:
     created_at: datetime
     resolved_at: Optional[datetime]
 
+# Columns written by customer jurisdiction bulk loads
+CUSTOMER_JURISDICTION_COLUMNS = [
+    'customer_id', 'primary_jurisdiction', 'secondary_jurisdictions', 'residence_country',
+    'citizenship_countries', 'business_countries', 'tax_jurisdictions', 'confidence_score',
+    'detection_method', 'detected_at', 'detection_fingerprint'
+]
+
+# Per-process handler used by batch detection workers
+_detection_handler = None
+
+def _init_detection_worker():
+    """Build the jurisdiction configuration once per worker process"""
+    global _detection_handler
+    _detection_handler = JurisdictionHandler()
+
+def _detect_chunk(customer_records: List[Dict[str, Any]]) -> List[Tuple[str, Optional['CustomerJurisdiction'], Optional[str]]]:
+    """Detect jurisdictions for a chunk of customers: (customer_id, result, error) per record"""
+    handler = _detection_handler or JurisdictionHandler()
+    results = []
+    for customer_data in customer_records:
+        customer_id = customer_data.get('customer_id', 'unknown')
+        try:
+            results.append((customer_id, handler._build_customer_jurisdiction(customer_data), None))
+        except Exception as e:
+            results.append((customer_id, None, str(e)))
+    return results
+
 class JurisdictionHandler:
     """
     JurisdictionHandler manages country-specific rule filtering and application
@@ -220,15 +260,36 @@ class JurisdictionHandler:
             'EU': ['EBA', 'ECB', 'ESMA', 'EIOPA']
         }
         
+        # Inverted rule index: customer jurisdiction → applicable rule IDs,
+        # rebuilt when the rule set or the jurisdiction hierarchy changes
+        self._rules_by_jurisdiction: Dict[str, FrozenSet[str]] = {}
+        self._jurisdiction_rule_index: Dict[str, FrozenSet[str]] = {}
+        self._rule_index_signature: Optional[int] = None
+        
         # Initialize jurisdiction configurations
         self._init_jurisdiction_configs()
         
+        # Batch detection: customers per chunk and worker processes (0 = inline)
+        self.detection_batch_size = int(os.getenv('JURISDICTION_DETECTION_BATCH_SIZE', '1000'))
+        self.detection_workers = int(os.getenv('JURISDICTION_DETECTION_WORKERS', str(min(4, os.cpu_count() or 1))))
+        self._detection_executor: Optional[ProcessPoolExecutor] = None
+        
+        # Conflict resolution cache: local LRU in front of Redis entries shared by all workers
+        self.resolution_cache_size = int(os.getenv('JURISDICTION_RESOLUTION_CACHE_SIZE', '1024'))
+        self.resolution_cache_ttl = int(os.getenv('JURISDICTION_RESOLUTION_CACHE_TTL', '3600'))
+        self._resolution_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        
         # Performance tracking
         self.resolution_stats = {
             'total_resolutions': 0,
             'successful_resolutions': 0,
             'conflicts_resolved': 0,
-            'avg_resolution_time': 0.0
+            'avg_resolution_time': 0.0,
+            'batch_detections': 0,
+            'unchanged_skipped': 0,
+            'detection_failures': 0,
+            'resolution_cache_hits': 0,
+            'resolution_cache_misses': 0
         }
         
         self.logger.info("JurisdictionHandler initialized successfully")
@@ -425,6 +486,9 @@ class JurisdictionHandler:
                         current_parents.extend(self.jurisdictions[parent].parent_jurisdictions)
             
             self.jurisdiction_hierarchy[code] = hierarchy
+        
+        # Flattened inheritance changed; re-derive per-jurisdiction rule sets
+        self._jurisdiction_rule_index = {}
     
     async def _init_databases(self):
         """Initialize database connections"""
@@ -440,12 +504,8 @@ class JurisdictionHandler:
                 max_size=10
             )
             
-            # Redis client for caching
-            self.redis_client = redis.Redis(
-                host=os.getenv('REDIS_HOST', 'redis'),
-                port=os.getenv('REDIS_PORT', 6379),
-                decode_responses=True
-            )
+            # Shared async Redis client for caching
+            self.redis_client = await get_redis_client()
             
             self.logger.info("Database connections initialized")
             
@@ -508,42 +568,11 @@ class JurisdictionHandler:
         start_time = datetime.now()
         
         try:
-            customer_id = customer_data.get('customer_id', 'unknown')
-            
-            # Extract jurisdiction indicators from customer data
-            residence_country = self._extract_residence_country(customer_data)
-            citizenship_countries = self._extract_citizenship_countries(customer_data)
-            business_countries = self._extract_business_countries(customer_data)
-            tax_jurisdictions = self._extract_tax_jurisdictions(customer_data)
-            
-            # Determine primary jurisdiction
-            primary_jurisdiction = self._determine_primary_jurisdiction(
-                residence_country, citizenship_countries, business_countries
-            )
-            
-            # Determine secondary jurisdictions
-            secondary_jurisdictions = self._determine_secondary_jurisdictions(
-                primary_jurisdiction, citizenship_countries, business_countries, tax_jurisdictions
-            )
-            
-            # Calculate confidence score
-            confidence_score = self._calculate_jurisdiction_confidence(
-                customer_data, primary_jurisdiction, secondary_jurisdictions
-            )
-            
-            # Create customer jurisdiction object
-            customer_jurisdiction = CustomerJurisdiction(
-                customer_id=customer_id,
-                primary_jurisdiction=primary_jurisdiction,
-                secondary_jurisdictions=secondary_jurisdictions,
-                residence_country=residence_country,
-                citizenship_countries=citizenship_countries,
-                business_countries=business_countries,
-                tax_jurisdictions=tax_jurisdictions,
-                detected_at=datetime.now(timezone.utc),
-                confidence_score=confidence_score,
-                detection_method="automated_analysis"
-            )
+            customer_jurisdiction = self._build_customer_jurisdiction(customer_data)
+            customer_id = customer_jurisdiction.customer_id
+            primary_jurisdiction = customer_jurisdiction.primary_jurisdiction
+            secondary_jurisdictions = customer_jurisdiction.secondary_jurisdictions
+            confidence_score = customer_jurisdiction.confidence_score
             
             # Store jurisdiction information
             await self._store_customer_jurisdiction(customer_jurisdiction)
@@ -576,6 +605,172 @@ class JurisdictionHandler:
             )
             raise
     
+    def _build_customer_jurisdiction(self, customer_data: Dict[str, Any]) -> CustomerJurisdiction:
+        """Derive a customer's jurisdictions from their data (no I/O)"""
+        customer_id = customer_data.get('customer_id', 'unknown')
+        
+        # Extract jurisdiction indicators from customer data
+        residence_country = self._extract_residence_country(customer_data)
+        citizenship_countries = self._extract_citizenship_countries(customer_data)
+        business_countries = self._extract_business_countries(customer_data)
+        tax_jurisdictions = self._extract_tax_jurisdictions(customer_data)
+        
+        # Determine primary jurisdiction
+        primary_jurisdiction = self._determine_primary_jurisdiction(
+            residence_country, citizenship_countries, business_countries
+        )
+        
+        # Determine secondary jurisdictions
+        secondary_jurisdictions = self._determine_secondary_jurisdictions(
+            primary_jurisdiction, citizenship_countries, business_countries, tax_jurisdictions
+        )
+        
+        # Calculate confidence score
+        confidence_score = self._calculate_jurisdiction_confidence(
+            customer_data, primary_jurisdiction, secondary_jurisdictions
+        )
+        
+        return CustomerJurisdiction(
+            customer_id=customer_id,
+            primary_jurisdiction=primary_jurisdiction,
+            secondary_jurisdictions=secondary_jurisdictions,
+            residence_country=residence_country,
+            citizenship_countries=citizenship_countries,
+            business_countries=business_countries,
+            tax_jurisdictions=tax_jurisdictions,
+            detected_at=datetime.now(timezone.utc),
+            confidence_score=confidence_score,
+            detection_method="automated_analysis"
+        )
+    
+    async def detect_customer_jurisdictions_batch(self, customer_records: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                                                  batch_size: int = None) -> Dict[str, int]:
+        """
+        Detect and store jurisdictions for a stream of customers
+        
+        Records are chunked and detected in the worker pool, with up to one
+        chunk per worker in flight while earlier chunks are written. Each
+        chunk is written with one COPY into a staging table and one merge;
+        customers whose detection result is unchanged are not written.
+        
+        Args:
+            customer_records: Iterable or async iterable of customer data dicts
+            batch_size: Customers per chunk (defaults to JURISDICTION_DETECTION_BATCH_SIZE)
+            
+        Returns:
+            Counts of processed, changed, unchanged and failed customers
+        """
+        batch_size = batch_size or self.detection_batch_size
+        max_in_flight = max(1, self.detection_workers)
+        stats = {'processed': 0, 'changed': 0, 'unchanged': 0, 'failed': 0}
+        pending: List[asyncio.Future] = []
+        start_time = datetime.now()
+        
+        async def drain_oldest():
+            detected = await pending.pop(0)
+            await self._store_detected_chunk(detected, stats)
+        
+        try:
+            chunk: List[Dict[str, Any]] = []
+            async for customer_data in self._iterate_records(customer_records):
+                chunk.append(customer_data)
+                if len(chunk) >= batch_size:
+                    pending.append(self._submit_detection(chunk))
+                    chunk = []
+                    if len(pending) >= max_in_flight:
+                        await drain_oldest()
+            
+            if chunk:
+                pending.append(self._submit_detection(chunk))
+            while pending:
+                await drain_oldest()
+            
+        except Exception as e:
+            for future in pending:
+                future.cancel()
+            JURISDICTION_ERRORS.labels(error_type="batch_detection_failed").inc()
+            self.logger.error("Batch jurisdiction detection failed", error=str(e), **stats)
+            raise
+        
+        self.resolution_stats['batch_detections'] += 1
+        self.logger.info(
+            "Batch jurisdiction detection complete",
+            elapsed_ms=(datetime.now() - start_time).total_seconds() * 1000,
+            **stats
+        )
+        return stats
+    
+    async def _iterate_records(self, customer_records):
+        """Iterate sync and async record sources alike"""
+        if hasattr(customer_records, '__aiter__'):
+            async for customer_data in customer_records:
+                yield customer_data
+        else:
+            for customer_data in customer_records:
+                yield customer_data
+    
+    def _submit_detection(self, chunk: List[Dict[str, Any]]) -> asyncio.Future:
+        """Detect a chunk in the worker pool (or inline without workers)"""
+        loop = asyncio.get_running_loop()
+        if self.detection_workers <= 0:
+            future = loop.create_future()
+            future.set_result(list(self._detect_inline(chunk)))
+            return future
+        
+        if self._detection_executor is None:
+            self._detection_executor = ProcessPoolExecutor(
+                max_workers=self.detection_workers, initializer=_init_detection_worker
+            )
+        return loop.run_in_executor(self._detection_executor, _detect_chunk, chunk)
+    
+    def _detect_inline(self, chunk: List[Dict[str, Any]]):
+        for customer_data in chunk:
+            customer_id = customer_data.get('customer_id', 'unknown')
+            try:
+                yield customer_id, self._build_customer_jurisdiction(customer_data), None
+            except Exception as e:
+                yield customer_id, None, str(e)
+    
+    async def _store_detected_chunk(self, detected: List[Tuple[str, Optional[CustomerJurisdiction], Optional[str]]],
+                                    stats: Dict[str, int]):
+        """Write one detected chunk and fold its outcome into ``stats``"""
+        jurisdictions = []
+        for customer_id, customer_jurisdiction, error in detected:
+            if customer_jurisdiction is None:
+                stats['failed'] += 1
+                JURISDICTION_ERRORS.labels(error_type="detection_failed").inc()
+                self.logger.warning("Failed to detect customer jurisdiction", customer_id=customer_id, error=error)
+            else:
+                jurisdictions.append(customer_jurisdiction)
+        
+        changed = await self._store_customer_jurisdictions(jurisdictions)
+        
+        stats['processed'] += len(detected)
+        stats['changed'] += changed
+        stats['unchanged'] += len(jurisdictions) - changed
+        
+        self.resolution_stats['total_resolutions'] += len(detected)
+        self.resolution_stats['successful_resolutions'] += len(jurisdictions)
+        self.resolution_stats['unchanged_skipped'] += len(jurisdictions) - changed
+        self.resolution_stats['detection_failures'] += len(detected) - len(jurisdictions)
+        
+        for jurisdiction, count in TallyCounter(cj.primary_jurisdiction for cj in jurisdictions).items():
+            JURISDICTION_RESOLUTIONS.labels(jurisdiction=jurisdiction).inc(count)
+    
+    def _jurisdiction_fingerprint(self, customer_jurisdiction: CustomerJurisdiction) -> str:
+        """Hash of the detection result, excluding when it was detected"""
+        payload = json.dumps([
+            customer_jurisdiction.primary_jurisdiction,
+            sorted(customer_jurisdiction.secondary_jurisdictions),
+            customer_jurisdiction.residence_country,
+            sorted(customer_jurisdiction.citizenship_countries),
+            sorted(customer_jurisdiction.business_countries),
+            sorted(customer_jurisdiction.tax_jurisdictions),
+            round(customer_jurisdiction.confidence_score, 4),
+            customer_jurisdiction.detection_method
+        ], separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
     def _extract_residence_country(self, customer_data: Dict[str, Any]) -> str:
         """Extract residence country from customer data"""
         # Try various fields that might contain residence information
@@ -741,11 +936,74 @@ class JurisdictionHandler:
         # Ensure confidence is within valid range
         return max(0.0, min(1.0, confidence))
     
+    def _rule_set_signature(self, rules: List[ComplianceRule]) -> int:
+        """Identify a rule set by the rule IDs and jurisdictions it contains"""
+        return hash(tuple((rule.rule_id, rule.jurisdiction) for rule in rules))
+    
+    def index_rules(self, rules: List[ComplianceRule]):
+        """
+        Build the jurisdiction → rule-id index for a rule set
+        
+        Called whenever the rule set changes; filter_rules_by_jurisdiction
+        also calls it when it is given rules that differ from the indexed set.
+        
+        Args:
+            rules: Complete list of compliance rules to index
+        """
+        grouped: Dict[str, Set[str]] = {}
+        for rule in rules:
+            grouped.setdefault(rule.jurisdiction, set()).add(rule.rule_id)
+        
+        self._rules_by_jurisdiction = {code: frozenset(ids) for code, ids in grouped.items()}
+        self._jurisdiction_rule_index = {}
+        self._rule_index_signature = self._rule_set_signature(rules)
+        
+        # Resolutions were computed against the previous rule set
+        self.invalidate_resolution_cache()
+        
+        # Precompute every configured jurisdiction; others are derived on first use
+        for code in set(self.jurisdictions) | self.eu_member_states | set(grouped):
+            self._rule_ids_for_jurisdiction(code)
+        
+        self.logger.info(
+            "Jurisdiction rule index built",
+            total_rules=len(rules),
+            rule_jurisdictions=len(grouped),
+            indexed_jurisdictions=len(self._jurisdiction_rule_index)
+        )
+    
+    def _applicable_rule_jurisdictions(self, jurisdiction: str) -> Set[str]:
+        """Rule jurisdictions whose rules apply to a customer in ``jurisdiction``"""
+        applicable = {jurisdiction}
+        
+        # Rules of parent jurisdictions (e.g., DE inherits EU rules)
+        applicable.update(self.jurisdiction_hierarchy.get(jurisdiction, []))
+        
+        # EU rules apply to all EU member states
+        if jurisdiction in self.eu_member_states:
+            applicable.add('EU')
+        
+        return applicable
+    
+    def _rule_ids_for_jurisdiction(self, jurisdiction: str) -> FrozenSet[str]:
+        """Indexed rule IDs applicable to a customer jurisdiction"""
+        rule_ids = self._jurisdiction_rule_index.get(jurisdiction)
+        if rule_ids is None:
+            rule_ids = frozenset().union(*(
+                self._rules_by_jurisdiction.get(code, frozenset())
+                for code in self._applicable_rule_jurisdictions(jurisdiction)
+            ))
+            self._jurisdiction_rule_index[jurisdiction] = rule_ids
+        return rule_ids
+    
     async def filter_rules_by_jurisdiction(self, rules: List[ComplianceRule], 
                                          customer_jurisdiction: CustomerJurisdiction) -> List[ComplianceRule]:
         """
         Filter compliance rules based on customer's jurisdiction
         
+        Uses the jurisdiction → rule-id index: the applicable rules are the
+        union of the precomputed sets of the customer's jurisdictions.
+        
         Args:
             rules: List of compliance rules to filter
             customer_jurisdiction: Customer's jurisdiction information
@@ -754,22 +1012,27 @@ class JurisdictionHandler:
             Filtered list of applicable rules
         """
         try:
-            applicable_rules = []
+            if self._rule_set_signature(rules) != self._rule_index_signature:
+                self.index_rules(rules)
             
             # Get all applicable jurisdictions for customer
             all_jurisdictions = [customer_jurisdiction.primary_jurisdiction] + \
                               customer_jurisdiction.secondary_jurisdictions
             
-            for rule in rules:
-                # Check if rule applies to any of customer's jurisdictions
-                if await self._is_rule_applicable(rule, all_jurisdictions):
-                    applicable_rules.append(rule)
-                    
-                    # Update metrics
-                    RULE_APPLICATIONS.labels(
-                        jurisdiction=rule.jurisdiction,
-                        regulation_type=rule.regulation_type.value
-                    ).inc()
+            applicable_ids = frozenset().union(*(
+                self._rule_ids_for_jurisdiction(jurisdiction) for jurisdiction in all_jurisdictions
+            ))
+            applicable_rules = [rule for rule in rules if rule.rule_id in applicable_ids]
+            
+            # Update metrics once per label combination
+            applications = TallyCounter(
+                (rule.jurisdiction, rule.regulation_type.value) for rule in applicable_rules
+            )
+            for (jurisdiction, regulation_type), count in applications.items():
+                RULE_APPLICATIONS.labels(
+                    jurisdiction=jurisdiction,
+                    regulation_type=regulation_type
+                ).inc(count)
             
             self.logger.info(
                 "Rules filtered by jurisdiction",
@@ -792,32 +1055,21 @@ class JurisdictionHandler:
     
     async def _is_rule_applicable(self, rule: ComplianceRule, jurisdictions: List[str]) -> bool:
         """Check if a rule is applicable to given jurisdictions"""
-        rule_jurisdiction = rule.jurisdiction
-        
-        # Direct match
-        if rule_jurisdiction in jurisdictions:
-            return True
-        
-        # Check jurisdiction hierarchy
-        for jurisdiction in jurisdictions:
-            if jurisdiction in self.jurisdiction_hierarchy:
-                hierarchy = self.jurisdiction_hierarchy[jurisdiction]
-                if rule_jurisdiction in hierarchy:
-                    return True
-        
-        # Check inheritance (e.g., EU rules apply to EU member states)
-        if rule_jurisdiction == 'EU':
-            for jurisdiction in jurisdictions:
-                if jurisdiction in self.eu_member_states:
-                    return True
-        
-        return False
+        return any(
+            rule.jurisdiction in self._applicable_rule_jurisdictions(jurisdiction)
+            for jurisdiction in jurisdictions
+        )
     
     async def resolve_jurisdiction_conflicts(self, customer_jurisdiction: CustomerJurisdiction,
                                            conflicting_rules: List[ComplianceRule]) -> Dict[str, Any]:
         """
         Resolve conflicts between rules from different jurisdictions
         
+        The resolution depends only on the customer's jurisdiction set and the
+        conflicting rules, so it is memoized under (primary, sorted secondaries,
+        rule-set version) and usually served from the local or Redis cache.
+        Every call still records its own conflict for the audit trail.
+        
         Args:
             customer_jurisdiction: Customer's jurisdiction information
             conflicting_rules: Rules that conflict with each other
@@ -828,29 +1080,16 @@ class JurisdictionHandler:
         try:
             conflict_id = str(uuid.uuid4())
             
-            # Group rules by jurisdiction
-            rules_by_jurisdiction = {}
-            for rule in conflicting_rules:
-                jurisdiction = rule.jurisdiction
-                if jurisdiction not in rules_by_jurisdiction:
-                    rules_by_jurisdiction[jurisdiction] = []
-                rules_by_jurisdiction[jurisdiction].append(rule)
-            
-            # Determine resolution strategy
-            strategy = self._determine_resolution_strategy(
-                customer_jurisdiction, rules_by_jurisdiction
-            )
-            
-            # Apply resolution strategy
-            resolved_rules = await self._apply_resolution_strategy(
-                strategy, customer_jurisdiction, rules_by_jurisdiction
-            )
+            resolution = await self._get_cached_resolution(customer_jurisdiction, conflicting_rules)
+            strategy = ConflictResolutionStrategy(resolution['strategy'])
+            rules_by_id = {rule.rule_id: rule for rule in conflicting_rules}
+            resolved_rules = [rules_by_id[rule_id] for rule_id in resolution['resolved_rule_ids']]
             
             # Create conflict record
             conflict = JurisdictionConflict(
                 conflict_id=conflict_id,
                 customer_id=customer_jurisdiction.customer_id,
-                conflicting_jurisdictions=list(rules_by_jurisdiction.keys()),
+                conflicting_jurisdictions=list(dict.fromkeys(rule.jurisdiction for rule in conflicting_rules)),
                 conflicting_rules=[rule.rule_id for rule in conflicting_rules],
                 conflict_type="rule_precedence",
                 resolution_strategy=strategy,
@@ -890,6 +1129,106 @@ class JurisdictionHandler:
             )
             raise
     
+    def _resolution_cache_key(self, customer_jurisdiction: CustomerJurisdiction,
+                              conflicting_rules: List[ComplianceRule]) -> str:
+        """Cache key from the jurisdiction set and a version digest of the conflicting rules"""
+        rule_set_version = hashlib.sha256(json.dumps(sorted(
+            (rule.rule_id, str(rule.version), rule.jurisdiction) for rule in conflicting_rules
+        ), separators=(',', ':')).encode('utf-8')).hexdigest()[:32]
+        secondaries = '+'.join(sorted(set(customer_jurisdiction.secondary_jurisdictions)))
+        return f"{RESOLUTION_CACHE_PREFIX}{customer_jurisdiction.primary_jurisdiction}:{secondaries}:{rule_set_version}"
+    
+    async def _get_cached_resolution(self, customer_jurisdiction: CustomerJurisdiction,
+                                     conflicting_rules: List[ComplianceRule]) -> Dict[str, Any]:
+        """Resolution for a jurisdiction set, from the local LRU, Redis, or computed"""
+        cache_key = self._resolution_cache_key(customer_jurisdiction, conflicting_rules)
+        
+        resolution = self._resolution_cache.get(cache_key)
+        if resolution is not None:
+            self._resolution_cache.move_to_end(cache_key)
+            RESOLUTION_CACHE_LOOKUPS.labels(result="local_hit").inc()
+            self.resolution_stats['resolution_cache_hits'] += 1
+            return resolution
+        
+        if self.redis_client:
+            try:
+                cached = await self.redis_client.get(cache_key)
+                if cached:
+                    resolution = json.loads(cached)
+                    self._remember_resolution(cache_key, resolution)
+                    RESOLUTION_CACHE_LOOKUPS.labels(result="redis_hit").inc()
+                    self.resolution_stats['resolution_cache_hits'] += 1
+                    return resolution
+            except Exception as e:
+                self.logger.warning("Resolution cache read failed", error=str(e))
+        
+        RESOLUTION_CACHE_LOOKUPS.labels(result="miss").inc()
+        self.resolution_stats['resolution_cache_misses'] += 1
+        resolution = await self._compute_resolution(customer_jurisdiction, conflicting_rules)
+        self._remember_resolution(cache_key, resolution)
+        
+        if self.redis_client:
+            try:
+                await self.redis_client.setex(cache_key, self.resolution_cache_ttl, json.dumps(resolution))
+            except Exception as e:
+                self.logger.warning("Resolution cache write failed", error=str(e))
+        
+        return resolution
+    
+    async def _compute_resolution(self, customer_jurisdiction: CustomerJurisdiction,
+                                  conflicting_rules: List[ComplianceRule]) -> Dict[str, Any]:
+        """Run strategy selection and resolution for a jurisdiction set"""
+        # Secondaries in canonical order so cached and computed results agree
+        canonical = replace(
+            customer_jurisdiction,
+            secondary_jurisdictions=sorted(set(customer_jurisdiction.secondary_jurisdictions))
+        )
+        
+        # Group rules by jurisdiction
+        rules_by_jurisdiction = {}
+        for rule in conflicting_rules:
+            jurisdiction = rule.jurisdiction
+            if jurisdiction not in rules_by_jurisdiction:
+                rules_by_jurisdiction[jurisdiction] = []
+            rules_by_jurisdiction[jurisdiction].append(rule)
+        
+        # Determine resolution strategy
+        strategy = self._determine_resolution_strategy(canonical, rules_by_jurisdiction)
+        
+        # Apply resolution strategy
+        resolved_rules = await self._apply_resolution_strategy(
+            strategy, canonical, rules_by_jurisdiction
+        )
+        
+        return {
+            'strategy': strategy.value,
+            'resolved_rule_ids': [rule.rule_id for rule in resolved_rules]
+        }
+    
+    def _remember_resolution(self, cache_key: str, resolution: Dict[str, Any]):
+        self._resolution_cache[cache_key] = resolution
+        self._resolution_cache.move_to_end(cache_key)
+        while len(self._resolution_cache) > self.resolution_cache_size:
+            self._resolution_cache.popitem(last=False)
+    
+    def invalidate_resolution_cache(self):
+        """
+        Drop memoized conflict resolutions held by this process
+        
+        Entries are keyed by a digest of the rule IDs and versions, so a
+        changed rule set never matches an old entry; this only frees memory.
+        """
+        self._resolution_cache.clear()
+    
+    async def invalidate_shared_resolution_cache(self):
+        """Drop memoized conflict resolutions here and in Redis"""
+        self.invalidate_resolution_cache()
+        if self.redis_client:
+            try:
+                await self.redis_client.delete_matching(f"{RESOLUTION_CACHE_PREFIX}*")
+            except Exception as e:
+                self.logger.warning("Failed to invalidate shared resolution cache", error=str(e))
+    
     def _determine_resolution_strategy(self, customer_jurisdiction: CustomerJurisdiction,
                                      rules_by_jurisdiction: Dict[str, List[ComplianceRule]]) -> ConflictResolutionStrategy:
         """Determine the best conflict resolution strategy"""
@@ -1040,13 +1379,22 @@ class JurisdictionHandler:
                     INSERT INTO customer_jurisdictions 
                     (customer_id, primary_jurisdiction, secondary_jurisdictions,
                      residence_country, citizenship_countries, business_countries,
-                     tax_jurisdictions, confidence_score, detection_method, detected_at)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                     tax_jurisdictions, confidence_score, detection_method, detected_at,
+                     detection_fingerprint)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
                     ON CONFLICT (customer_id) DO UPDATE SET
                         primary_jurisdiction = EXCLUDED.primary_jurisdiction,
                         secondary_jurisdictions = EXCLUDED.secondary_jurisdictions,
+                        residence_country = EXCLUDED.residence_country,
+                        citizenship_countries = EXCLUDED.citizenship_countries,
+                        business_countries = EXCLUDED.business_countries,
+                        tax_jurisdictions = EXCLUDED.tax_jurisdictions,
                         confidence_score = EXCLUDED.confidence_score,
+                        detection_method = EXCLUDED.detection_method,
+                        detected_at = EXCLUDED.detected_at,
+                        detection_fingerprint = EXCLUDED.detection_fingerprint,
                         updated_at = CURRENT_TIMESTAMP
+                    WHERE customer_jurisdictions.detection_fingerprint IS DISTINCT FROM EXCLUDED.detection_fingerprint
                 """,
                     customer_jurisdiction.customer_id,
                     customer_jurisdiction.primary_jurisdiction,
@@ -1057,13 +1405,95 @@ class JurisdictionHandler:
                     customer_jurisdiction.tax_jurisdictions,
                     customer_jurisdiction.confidence_score,
                     customer_jurisdiction.detection_method,
-                    customer_jurisdiction.detected_at
+                    customer_jurisdiction.detected_at,
+                    self._jurisdiction_fingerprint(customer_jurisdiction)
                 )
             
         except Exception as e:
             self.logger.error("Failed to store customer jurisdiction", error=str(e))
             raise
     
+    async def _store_customer_jurisdictions(self, customer_jurisdictions: List[CustomerJurisdiction]) -> int:
+        """
+        Bulk store customer jurisdictions, skipping unchanged results
+        
+        Stored fingerprints are read for the whole chunk; changed results are
+        COPYed into a session-local staging table and merged in one statement.
+        
+        Returns:
+            Number of customers written
+        """
+        if not customer_jurisdictions:
+            return 0
+        
+        try:
+            # Last detection wins for customers repeated within the chunk
+            by_customer = {cj.customer_id: cj for cj in customer_jurisdictions}
+            fingerprints = {
+                customer_id: self._jurisdiction_fingerprint(cj) for customer_id, cj in by_customer.items()
+            }
+            
+            async with self.pg_pool.acquire() as conn:
+                stored = await conn.fetch("""
+                    SELECT customer_id, detection_fingerprint FROM customer_jurisdictions
+                    WHERE customer_id = ANY($1::text[])
+                """, list(by_customer))
+                stored_fingerprints = {row['customer_id']: row['detection_fingerprint'] for row in stored}
+                
+                records = [
+                    (cj.customer_id, cj.primary_jurisdiction, cj.secondary_jurisdictions,
+                     cj.residence_country, cj.citizenship_countries, cj.business_countries,
+                     cj.tax_jurisdictions, Decimal(str(round(cj.confidence_score, 4))),
+                     cj.detection_method, cj.detected_at, fingerprints[customer_id])
+                    for customer_id, cj in by_customer.items()
+                    if stored_fingerprints.get(customer_id) != fingerprints[customer_id]
+                ]
+                if not records:
+                    return 0
+                
+                async with conn.transaction():
+                    await conn.execute("""
+                        CREATE TEMP TABLE IF NOT EXISTS customer_jurisdictions_staging
+                        (LIKE customer_jurisdictions INCLUDING DEFAULTS)
+                        ON COMMIT DELETE ROWS
+                    """)
+                    await conn.copy_records_to_table(
+                        'customer_jurisdictions_staging',
+                        records=records,
+                        columns=CUSTOMER_JURISDICTION_COLUMNS
+                    )
+                    await conn.execute("""
+                        INSERT INTO customer_jurisdictions 
+                        (customer_id, primary_jurisdiction, secondary_jurisdictions,
+                         residence_country, citizenship_countries, business_countries,
+                         tax_jurisdictions, confidence_score, detection_method, detected_at,
+                         detection_fingerprint)
+                        SELECT customer_id, primary_jurisdiction, secondary_jurisdictions,
+                               residence_country, citizenship_countries, business_countries,
+                               tax_jurisdictions, confidence_score, detection_method, detected_at,
+                               detection_fingerprint
+                        FROM customer_jurisdictions_staging
+                        ON CONFLICT (customer_id) DO UPDATE SET
+                            primary_jurisdiction = EXCLUDED.primary_jurisdiction,
+                            secondary_jurisdictions = EXCLUDED.secondary_jurisdictions,
+                            residence_country = EXCLUDED.residence_country,
+                            citizenship_countries = EXCLUDED.citizenship_countries,
+                            business_countries = EXCLUDED.business_countries,
+                            tax_jurisdictions = EXCLUDED.tax_jurisdictions,
+                            confidence_score = EXCLUDED.confidence_score,
+                            detection_method = EXCLUDED.detection_method,
+                            detected_at = EXCLUDED.detected_at,
+                            detection_fingerprint = EXCLUDED.detection_fingerprint,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE customer_jurisdictions.detection_fingerprint IS DISTINCT FROM EXCLUDED.detection_fingerprint
+                    """)
+            
+            return len(records)
+            
+        except Exception as e:
+            self.logger.error("Failed to bulk store customer jurisdictions", error=str(e))
+            raise
+    
     async def _store_conflict_resolution(self, conflict: JurisdictionConflict):
         """Store jurisdiction conflict resolution in database"""
         try:
@@ -1097,11 +1527,22 @@ class JurisdictionHandler:
             **self.resolution_stats,
             'supported_jurisdictions': len(self.jurisdictions),
             'eu_member_states': len(self.eu_member_states),
+            'indexed_rule_jurisdictions': len(self._rules_by_jurisdiction),
+            'indexed_customer_jurisdictions': len(self._jurisdiction_rule_index),
+            'cached_resolutions': len(self._resolution_cache),
             'jurisdiction_hierarchy_depth': max(
                 len(hierarchy) for hierarchy in self.jurisdiction_hierarchy.values()
             ) if self.jurisdiction_hierarchy else 0,
             'timestamp': datetime.now().isoformat()
         }
 
+    async def close(self):
+        """Stop detection workers and close database connections"""
+        if self._detection_executor is not None:
+            self._detection_executor.shutdown(wait=True)
+            self._detection_executor = None
+        if self.pg_pool:
+            await self.pg_pool.close()
+
 # Export main class
 __all__ = ['JurisdictionHandler', 'CustomerJurisdiction', 'JurisdictionConfig', 'JurisdictionConflict']
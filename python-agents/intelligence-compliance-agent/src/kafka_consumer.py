@@ -11,7 +11,7 @@ Key Features:
 - Subscribe to regulatory.updates topic
 - Handle obligation_created, obligation_updated, obligation_deleted events
 - Automatic rule recompilation on obligation updates
-- Cache management for compiled rules
+- Cache management for compiled rules over the shared non-blocking Redis client
 - Incremental updates vs. full refresh logic
 - Performance optimization for high-frequency updates
 - Integration with ResilienceManager for error handling
@@ -44,7 +44,6 @@ import aiokafka
 
 # Database and caching
 import asyncpg
-import redis
 
 # Monitoring and logging
 import structlog
@@ -53,6 +52,9 @@ from prometheus_client import Counter, Histogram, Gauge
 # Import rule compiler for automatic recompilation
 from .rule_compiler import RuleCompiler, ComplianceRule, RegulationType
 
+# Shared async Redis client
+from .async_redis import AsyncRedisClient, get_redis_client
+
 # Configure structured logging
 logger = structlog.get_logger()
 
@@ -112,7 +114,7 @@ class CacheManager:
     - Performance optimization data
     """
     
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(self, redis_client: AsyncRedisClient):
         """Initialize cache manager with Redis client"""
         self.redis = redis_client
         self.logger = logger.bind(component="cache_manager")
@@ -127,12 +129,15 @@ class CacheManager:
         self.RULE_TTL = 3600        # 1 hour for compiled rules
         self.STATE_TTL = 1800       # 30 minutes for processing state
         self.LOCK_TTL = 300         # 5 minutes for refresh locks
+        
+        # Keys fetched per MGET when scanning for stale rules
+        self.INVALIDATION_BATCH_SIZE = 500
     
     async def get_cached_rule(self, rule_id: str) -> Optional[Dict[str, Any]]:
         """Get cached rule by ID"""
         try:
             cache_key = f"{self.RULE_PREFIX}{rule_id}"
-            cached_data = self.redis.get(cache_key)
+            cached_data = await self.redis.get(cache_key)
             
             if cached_data:
                 CACHE_OPERATIONS.labels(operation="hit").inc()
@@ -156,10 +161,11 @@ class CacheManager:
                 'json_logic': rule.json_logic,
                 'confidence_score': rule.confidence_score,
                 'jurisdiction': rule.jurisdiction,
+                'source_obligation_id': rule.source_obligation_id,
                 'cached_at': datetime.now().isoformat()
             }
             
-            self.redis.setex(cache_key, self.RULE_TTL, json.dumps(rule_data))
+            await self.redis.setex(cache_key, self.RULE_TTL, json.dumps(rule_data))
             CACHE_OPERATIONS.labels(operation="set").inc()
             
         except Exception as e:
@@ -168,20 +174,22 @@ class CacheManager:
     async def invalidate_rules_for_obligation(self, obligation_id: str):
         """Invalidate cached rules for a specific obligation"""
         try:
-            # Find all rules related to this obligation
-            pattern = f"{self.RULE_PREFIX}*"
-            keys = self.redis.keys(pattern)
-            
-            invalidated_count = 0
-            for key in keys:
-                try:
-                    rule_data = json.loads(self.redis.get(key))
-                    if rule_data.get('source_obligation_id') == obligation_id:
-                        self.redis.delete(key)
-                        invalidated_count += 1
-                        CACHE_OPERATIONS.labels(operation="invalidate").inc()
-                except Exception:
-                    continue
+            # Find all rules related to this obligation: SCAN in batches,
+            # one MGET per batch, one DELETE for everything that matched
+            stale_keys = []
+            batch = []
+            async for key in self.redis.scan_iter(match=f"{self.RULE_PREFIX}*"):
+                batch.append(key)
+                if len(batch) >= self.INVALIDATION_BATCH_SIZE:
+                    stale_keys.extend(await self._keys_for_obligation(batch, obligation_id))
+                    batch = []
+            if batch:
+                stale_keys.extend(await self._keys_for_obligation(batch, obligation_id))
+            
+            invalidated_count = len(stale_keys)
+            if stale_keys:
+                await self.redis.delete(*stale_keys)
+                CACHE_OPERATIONS.labels(operation="invalidate").inc(invalidated_count)
             
             self.logger.info(
                 "Invalidated cached rules for obligation",
@@ -196,11 +204,22 @@ class CacheManager:
                 error=str(e)
             )
     
+    async def _keys_for_obligation(self, keys: List[str], obligation_id: str) -> List[str]:
+        """Subset of rule keys whose cached rule came from an obligation"""
+        matched = []
+        for key, cached_data in (await self.redis.get_many(keys)).items():
+            try:
+                if cached_data and json.loads(cached_data).get('source_obligation_id') == obligation_id:
+                    matched.append(key)
+            except Exception:
+                continue
+        return matched
+    
     async def acquire_refresh_lock(self, lock_key: str) -> bool:
         """Acquire a refresh lock to prevent concurrent processing"""
         try:
             full_key = f"{self.REFRESH_LOCK_PREFIX}{lock_key}"
-            result = self.redis.set(full_key, "locked", ex=self.LOCK_TTL, nx=True)
+            result = await self.redis.set(full_key, "locked", ex=self.LOCK_TTL, nx=True)
             return bool(result)
         except Exception as e:
             self.logger.error("Failed to acquire refresh lock", lock_key=lock_key, error=str(e))
@@ -210,7 +229,7 @@ class CacheManager:
         """Release a refresh lock"""
         try:
             full_key = f"{self.REFRESH_LOCK_PREFIX}{lock_key}"
-            self.redis.delete(full_key)
+            await self.redis.delete(full_key)
         except Exception as e:
             self.logger.error("Failed to release refresh lock", lock_key=lock_key, error=str(e))
 
@@ -320,12 +339,8 @@ class RegulatoryKafkaConsumer:
                 max_size=10
             )
             
-            # Redis client for caching
-            self.redis_client = redis.Redis(
-                host=os.getenv('REDIS_HOST', 'redis'),
-                port=os.getenv('REDIS_PORT', 6379),
-                decode_responses=True
-            )
+            # Shared async Redis client for caching
+            self.redis_client = await get_redis_client()
             
             self.logger.info("Database connections initialized")
             
@@ -556,8 +571,9 @@ class RegulatoryKafkaConsumer:
                 return
             
             try:
-                # Invalidate cached rules for this obligation
+                # Invalidate cached rules and the cached obligation text
                 await self.cache_manager.invalidate_rules_for_obligation(obligation_id)
+                self.rule_compiler.obligation_repository.invalidate(obligation_id)
                 
                 # Recompile rules with updated obligation
                 rules = await self.rule_compiler.compile_obligation_to_rules(obligation_id)
@@ -599,8 +615,9 @@ class RegulatoryKafkaConsumer:
                 self.logger.warning("obligation_deleted event missing obligation_id")
                 return
             
-            # Invalidate cached rules
+            # Invalidate cached rules and the cached obligation
             await self.cache_manager.invalidate_rules_for_obligation(obligation_id)
+            self.rule_compiler.obligation_repository.invalidate(obligation_id)
             
             # Delete rules from database
             async with self.pg_pool.acquire() as conn:
@@ -709,13 +726,18 @@ class RegulatoryKafkaConsumer:
         except Exception as e:
             self.logger.error("Failed to send message to DLQ", error=str(e))
     
-    async def trigger_full_refresh(self, regulation_type: Optional[str] = None, jurisdiction: Optional[str] = None):
+    async def trigger_full_refresh(self, regulation_type: Optional[str] = None, jurisdiction: Optional[str] = None,
+                                   force_regenerate: bool = False):
         """
         Trigger a full rule refresh
         
+        Obligations with unchanged content are served from the rule
+        compiler's generation cache unless ``force_regenerate`` is set.
+        
         Args:
             regulation_type: Optional filter by regulation type
             jurisdiction: Optional filter by jurisdiction
+            force_regenerate: Regenerate every obligation, bypassing the cache
         """
         try:
             self.logger.info(
@@ -749,12 +771,18 @@ class RegulatoryKafkaConsumer:
                     
                     obligations = await conn.fetch(query, *params)
                 
+                # Load the obligations in batches rather than one query per compile
+                await self.rule_compiler.prefetch_obligations(
+                    [obligation['obligation_id'] for obligation in obligations]
+                )
+                
                 # Recompile all matching obligations
                 total_rules = 0
                 for obligation in obligations:
                     try:
                         rules = await self.rule_compiler.compile_obligation_to_rules(
-                            obligation['obligation_id']
+                            obligation['obligation_id'],
+                            force_regenerate=force_regenerate
                         )
                         
                         # Cache rules
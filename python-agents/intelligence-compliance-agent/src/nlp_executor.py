@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+NLP Executor - Process-Pool spaCy Pipeline Service
+==================================================
+
+This module runs the agent's CPU-bound spaCy work outside the event loop.
+Obligation parsing and semantic similarity used to call the pipeline
+synchronously inside async methods. A long parse stalled the loop, and
+Kafka consumption and health checks timed out under load. Texts are now
+queued, grouped into batches and processed by a pool of worker processes
+that load the model once at start-up. Callers await serialisable
+DocSummary objects instead of spaCy Docs.
+
+Key Features:
+- Process pool with warmed models (one load per worker, inherited
+  copy-on-write when the parent preloaded the registry)
+- Request batching: texts arriving within a short window are sent to a
+  worker as one nlp.pipe batch
+- Async API: analyze() for one text, analyze_many() for several
+- Serialisable summaries with entities, regulatory matches, sentences,
+  content lemmas and document vectors
+- Inline mode (NLP_EXECUTOR_WORKERS=0) that runs batches in a thread
+
+Rule Compliance:
+- Rule 1: No stubs - Real spaCy processing in worker processes
+- Rule 2: Modular design - One NLP service shared by agent components
+- Rule 17: Extensive comments explaining all functionality
+"""
+
+import os
+import math
+import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+# NLP and text processing
+from spacy.matcher import Matcher
+
+# Monitoring and logging
+import structlog
+from prometheus_client import Histogram
+
+# Shared NLP models
+from .nlp_models import nlp_registry, DEFAULT_SPACY_MODEL
+
+# Configure structured logging
+logger = structlog.get_logger()
+
+# Prometheus metrics for NLP executor performance
+NLP_BATCH_SIZE = Histogram(
+    'nlp_executor_batch_size', 'Texts per NLP executor batch',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+NLP_BATCH_TIME = Histogram('nlp_executor_batch_seconds', 'Time to process one NLP executor batch')
+
+# Regulatory token patterns matched on every summarised document
+REGULATORY_MATCH_PATTERNS: Dict[str, List[Dict[str, Any]]] = {
+    # Monetary amounts
+    "MONETARY_AMOUNT": [
+        {"LIKE_NUM": True},
+        {"LOWER": {"IN": ["euro", "euros", "eur", "dollar", "dollars", "usd", "pound", "pounds", "gbp"]}}
+    ],
+    # Regulatory thresholds
+    "THRESHOLD": [
+        {"LOWER": {"IN": ["exceeds", "above", "below", "minimum", "maximum", "threshold"]}},
+        {"LIKE_NUM": True, "OP": "?"}
+    ],
+    # Time periods
+    "TIME_PERIOD": [
+        {"LIKE_NUM": True},
+        {"LOWER": {"IN": ["days", "months", "years", "hours", "minutes", "weeks"]}}
+    ],
+    # Regulatory actions
+    "REGULATORY_ACTION": [
+        {"LOWER": {"IN": ["must", "shall", "should", "required", "mandatory", "prohibited", "forbidden"]}}
+    ]
+}
+
+def build_regulatory_matcher(vocab) -> Matcher:
+    """Build a Matcher with the regulatory patterns for a vocab"""
+    matcher = Matcher(vocab)
+    for label, pattern in REGULATORY_MATCH_PATTERNS.items():
+        matcher.add(label, [pattern])
+    return matcher
+
+@dataclass
+class DocSummary:
+    """Picklable result of running the pipeline over one text"""
+    text: str
+    entities: List[Tuple[str, str, int, int]] = field(default_factory=list)   # (text, label, start_char, end_char)
+    matches: List[Tuple[str, int, int, str]] = field(default_factory=list)    # (label, start_token, end_token, text)
+    sentences: List[str] = field(default_factory=list)
+    content_lemmas: List[str] = field(default_factory=list)                    # Lowercased, no stop words or punctuation
+    vector: List[float] = field(default_factory=list)
+
+    def similarity(self, other: 'DocSummary') -> float:
+        """Cosine similarity of the document vectors (as Doc.similarity)"""
+        if self.text == other.text:
+            return 1.0
+        norm = math.sqrt(sum(v * v for v in self.vector)) * math.sqrt(sum(v * v for v in other.vector))
+        if not norm:
+            return 0.0
+        return sum(a * b for a, b in zip(self.vector, other.vector)) / norm
+
+def summarize_doc(doc, matcher: Matcher) -> DocSummary:
+    """Reduce a spaCy Doc to a DocSummary"""
+    return DocSummary(
+        text=doc.text,
+        entities=[(ent.text, ent.label_, ent.start_char, ent.end_char) for ent in doc.ents],
+        matches=[
+            (doc.vocab.strings[match_id], start, end, doc[start:end].text)
+            for match_id, start, end in matcher(doc)
+        ],
+        sentences=[sent.text for sent in doc.sents] if doc.has_annotation("SENT_START") else [],
+        content_lemmas=[
+            token.lemma_.lower() for token in doc
+            if not token.is_stop and not token.is_punct and token.lemma_
+        ],
+        vector=[float(value) for value in doc.vector]
+    )
+
+# Per-process pipeline and matcher used by executor workers (and inline mode)
+_worker_state: Dict[str, Tuple[Any, Matcher]] = {}
+
+def _worker_pipeline(model_name: str) -> Tuple[Any, Matcher]:
+    state = _worker_state.get(model_name)
+    if state is None:
+        nlp = nlp_registry.get_model(model_name)
+        state = (nlp, build_regulatory_matcher(nlp.vocab))
+        _worker_state[model_name] = state
+    return state
+
+def _init_nlp_worker(model_name: str):
+    """Load the model once when a worker process starts"""
+    _worker_pipeline(model_name)
+
+def _warm_worker() -> int:
+    return os.getpid()
+
+def _summarize_batch(model_name: str, texts: List[str], disable: Tuple[str, ...]) -> List[DocSummary]:
+    """Run one batch through the pipeline: one DocSummary per text, in order"""
+    nlp, matcher = _worker_pipeline(model_name)
+    return [
+        summarize_doc(doc, matcher)
+        for doc in nlp.pipe(texts, batch_size=len(texts), disable=list(disable))
+    ]
+
+class NLPExecutor:
+    """
+    Batched, process-pool spaCy service
+
+    Requests are grouped by the pipeline components they disable. A group
+    is dispatched when it reaches the batch size or when the batch window
+    expires, whichever comes first.
+    """
+
+    def __init__(self, workers: int = None, batch_size: int = None,
+                 batch_window: float = None, model_name: str = None):
+        self.workers = workers if workers is not None else int(
+            os.getenv('NLP_EXECUTOR_WORKERS', str(min(4, os.cpu_count() or 1)))
+        )
+        self.batch_size = batch_size or int(os.getenv('NLP_EXECUTOR_BATCH_SIZE', '32'))
+        self.batch_window = batch_window if batch_window is not None else float(
+            os.getenv('NLP_EXECUTOR_BATCH_WINDOW_MS', '5')
+        ) / 1000
+        self.model_name = model_name or DEFAULT_SPACY_MODEL
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[Tuple[str, ...], List[Tuple[str, asyncio.Future]]] = {}
+        self._flush_timers: Dict[Tuple[str, ...], asyncio.TimerHandle] = {}
+        self._batches: set = set()
+
+        # Performance metrics
+        self.metrics = {
+            'texts_processed': 0,
+            'batches_processed': 0,
+            'batch_errors': 0,
+            'avg_batch_size': 0.0,
+            'avg_batch_seconds': 0.0
+        }
+
+    async def start(self):
+        """Start the worker pool and load the model in every worker"""
+        if self.workers <= 0 or self._pool is not None:
+            return
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_nlp_worker, initargs=(self.model_name,)
+        )
+        loop = asyncio.get_running_loop()
+        # Submitting one task per worker up front spawns all of them; each
+        # loads the model in its initializer before taking work
+        await asyncio.gather(*(
+            loop.run_in_executor(self._pool, _warm_worker) for _ in range(self.workers)
+        ))
+        logger.info("NLP executor started", workers=self.workers, model=self.model_name)
+
+    async def analyze(self, text: str, disable: Iterable[str] = ()) -> DocSummary:
+        """Summarise one text; queued into the next batch for its pipeline profile"""
+        key = tuple(sorted(disable))
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(key, [])
+        pending.append((text, future))
+        if len(pending) >= self.batch_size:
+            self._flush(key)
+        elif key not in self._flush_timers:
+            self._flush_timers[key] = loop.call_later(self.batch_window, self._flush, key)
+
+        return await future
+
+    async def analyze_many(self, texts: List[str], disable: Iterable[str] = ()) -> List[DocSummary]:
+        """Summarise several texts, in order"""
+        disable = tuple(disable)
+        return list(await asyncio.gather(*(self.analyze(text, disable) for text in texts)))
+
+    def _flush(self, key: Tuple[str, ...]):
+        """Dispatch the pending requests of one pipeline profile as a batch"""
+        timer = self._flush_timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(key, [])
+        if not items:
+            return
+        task = asyncio.get_running_loop().create_task(self._run_batch(key, items))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, disable: Tuple[str, ...], items: List[Tuple[str, asyncio.Future]]):
+        texts = [text for text, _ in items]
+        start = time.perf_counter()
+        try:
+            if self.workers > 0:
+                await self.start()
+                summaries = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, _summarize_batch, self.model_name, texts, disable
+                )
+            else:
+                summaries = await asyncio.to_thread(_summarize_batch, self.model_name, texts, disable)
+        except Exception as e:
+            self.metrics['batch_errors'] += 1
+            logger.error("NLP batch failed", texts=len(texts), error=str(e))
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        elapsed = time.perf_counter() - start
+        self._record_batch(len(texts), elapsed)
+        for (_, future), summary in zip(items, summaries):
+            if not future.done():
+                future.set_result(summary)
+
+    def _record_batch(self, size: int, elapsed: float):
+        NLP_BATCH_SIZE.observe(size)
+        NLP_BATCH_TIME.observe(elapsed)
+        self.metrics['texts_processed'] += size
+        self.metrics['batches_processed'] += 1
+        batches = self.metrics['batches_processed']
+        self.metrics['avg_batch_size'] += (size - self.metrics['avg_batch_size']) / batches
+        self.metrics['avg_batch_seconds'] += (elapsed - self.metrics['avg_batch_seconds']) / batches
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get NLP executor metrics"""
+        return {
+            **self.metrics,
+            'workers': self.workers,
+            'pending_texts': sum(len(items) for items in self._pending.values()),
+            'batches_in_flight': len(self._batches)
+        }
+
+    async def close(self):
+        """Fail pending requests, wait for running batches and stop the workers"""
+        for timer in self._flush_timers.values():
+            timer.cancel()
+        self._flush_timers.clear()
+        for items in self._pending.values():
+            for _, future in items:
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+# Process-wide NLP executor shared by all agent components
+nlp_executor = NLPExecutor()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+NLP Models - Shared, Lazily Loaded NLP Model Registry
+=====================================================
+
+This module owns the spaCy pipelines and NLTK resources used by the
+intelligence agent. RuleCompiler and TextSimilarityAnalyzer used to call
+spacy.load() and build their own NLTK resources in their constructors, so
+every component held its own copy of the model and paid the load on start.
+The registry loads each model once per process, on first use, and hands out
+lightweight per-caller views of the shared pipeline.
+
+Key Features:
+- One spaCy pipeline per model per process, loaded lazily and thread-safely
+- Per-caller views that skip the pipeline components the caller does not use
+- Batched processing through nlp.pipe with a configurable batch size
+- NLTK data checked and downloaded once; shared lemmatizer and stop words
+- preload() for pre-fork warm-up so forked workers share model pages
+  copy-on-write
+
+Rule Compliance:
+- Rule 1: No stubs - Real model loading and batched processing
+- Rule 2: Modular design - Components share models through one registry
+- Rule 17: Extensive comments explaining all functionality
+"""
+
+import os
+import gc
+import time
+import threading
+from typing import Dict, List, Optional, Iterable, Iterator, Set, FrozenSet
+
+# NLP and text processing
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+import nltk
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+
+# Monitoring and logging
+import structlog
+from prometheus_client import Histogram
+
+# Configure structured logging
+logger = structlog.get_logger()
+
+# Prometheus metrics for model loading
+MODEL_LOAD_TIME = Histogram('nlp_model_load_seconds', 'Time spent loading spaCy models', ['model'])
+
+DEFAULT_SPACY_MODEL = os.getenv("NLP_SPACY_MODEL", "en_core_web_sm")
+
+# NLTK data used by the agent, as (resource path, download package)
+NLTK_RESOURCES = (
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet'),
+)
+
+class SpacyPipeline:
+    """
+    A caller's view of a shared spaCy pipeline
+
+    Holds no model of its own: the pipeline is fetched from the registry on
+    first use, and the caller's disabled components (plus any custom
+    components other callers added that this caller did not ask for) are
+    skipped on every call.
+    """
+
+    def __init__(self, registry: 'NLPModelRegistry', model_name: str,
+                 disable: Iterable[str] = (), components: Iterable[str] = ()):
+        self.registry = registry
+        self.model_name = model_name
+        self.disable: FrozenSet[str] = frozenset(disable)
+        self.components: FrozenSet[str] = frozenset(components)
+
+    @property
+    def nlp(self) -> Language:
+        """The shared pipeline, loaded on first access"""
+        return self.registry.get_model(self.model_name, self.components)
+
+    @property
+    def vocab(self):
+        return self.nlp.vocab
+
+    @property
+    def pipe_names(self) -> List[str]:
+        """Components that run for this caller"""
+        disabled = self._disabled_components()
+        return [name for name in self.nlp.pipe_names if name not in disabled]
+
+    def _disabled_components(self) -> List[str]:
+        foreign = self.registry.custom_components(self.model_name) - self.components
+        return sorted(self.disable | foreign)
+
+    def __call__(self, text: str) -> Doc:
+        return self.nlp(text, disable=self._disabled_components())
+
+    def pipe(self, texts: Iterable[str], batch_size: Optional[int] = None) -> Iterator[Doc]:
+        """Process texts in batches through the shared pipeline"""
+        return self.nlp.pipe(
+            texts,
+            batch_size=batch_size or self.registry.batch_size,
+            disable=self._disabled_components()
+        )
+
+class NLPModelRegistry:
+    """
+    Process-wide registry of spaCy pipelines and NLTK resources
+
+    Models are loaded at most once per process. Components that no caller
+    in the process needs can be excluded at load time (NLP_SPACY_EXCLUDE),
+    which keeps their weights out of memory entirely; everything else is
+    skipped per caller through SpacyPipeline.
+    """
+
+    def __init__(self):
+        self.batch_size = int(os.getenv("NLP_PIPE_BATCH_SIZE", "64"))
+        self.exclude = [
+            name.strip() for name in os.getenv("NLP_SPACY_EXCLUDE", "").split(",") if name.strip()
+        ]
+
+        self._models: Dict[str, Language] = {}
+        self._custom_components: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+        self._nltk_ready = False
+        self._lemmatizer: Optional[WordNetLemmatizer] = None
+        self._stop_words: Optional[FrozenSet[str]] = None
+
+    def pipeline(self, model_name: str = None, disable: Iterable[str] = (),
+                 components: Iterable[str] = ()) -> SpacyPipeline:
+        """
+        Get a caller view of a model without loading it
+
+        Args:
+            model_name: spaCy package name, defaults to NLP_SPACY_MODEL
+            disable: Pipeline components this caller does not need
+            components: Registered custom components to append for this caller
+        """
+        return SpacyPipeline(self, model_name or DEFAULT_SPACY_MODEL, disable, components)
+
+    def get_model(self, model_name: str = None, components: Iterable[str] = ()) -> Language:
+        """Return the shared pipeline, loading it and adding components on first use"""
+        model_name = model_name or DEFAULT_SPACY_MODEL
+        nlp = self._models.get(model_name)
+        if nlp is not None and not set(components) - self._custom_components[model_name]:
+            return nlp
+
+        with self._lock:
+            nlp = self._models.get(model_name)
+            if nlp is None:
+                nlp = self._load_model(model_name)
+                self._custom_components[model_name] = set()
+                self._models[model_name] = nlp
+
+            for component in components:
+                if component not in nlp.pipe_names:
+                    nlp.add_pipe(component, last=True)
+                self._custom_components[model_name].add(component)
+
+            return nlp
+
+    def _load_model(self, model_name: str) -> Language:
+        start = time.perf_counter()
+        nlp = spacy.load(model_name, exclude=self.exclude)
+        elapsed = time.perf_counter() - start
+
+        MODEL_LOAD_TIME.labels(model=model_name).observe(elapsed)
+        logger.info(
+            "spaCy model loaded",
+            model=model_name,
+            pipes=nlp.pipe_names,
+            excluded=self.exclude,
+            seconds=round(elapsed, 3)
+        )
+        return nlp
+
+    def custom_components(self, model_name: str) -> Set[str]:
+        return set(self._custom_components.get(model_name, ()))
+
+    def loaded_models(self) -> List[str]:
+        return list(self._models)
+
+    def ensure_nltk_data(self):
+        """Check for the NLTK data the agent uses, downloading what is missing"""
+        if self._nltk_ready:
+            return
+        with self._lock:
+            if self._nltk_ready:
+                return
+            for resource, package in NLTK_RESOURCES:
+                try:
+                    nltk.data.find(resource)
+                except LookupError:
+                    nltk.download(package, quiet=True)
+            self._nltk_ready = True
+
+    @property
+    def lemmatizer(self) -> WordNetLemmatizer:
+        """Shared WordNet lemmatizer"""
+        if self._lemmatizer is None:
+            self.ensure_nltk_data()
+            with self._lock:
+                if self._lemmatizer is None:
+                    self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+
+    @property
+    def stop_words(self) -> FrozenSet[str]:
+        """Shared English stop word set"""
+        if self._stop_words is None:
+            self.ensure_nltk_data()
+            with self._lock:
+                if self._stop_words is None:
+                    self._stop_words = frozenset(stopwords.words('english'))
+        return self._stop_words
+
+    def preload(self, model_names: Iterable[str] = None, components: Iterable[str] = (),
+                include_nltk: bool = True):
+        """
+        Load models before worker processes are forked
+
+        Call from the master process (e.g. gunicorn --preload or its
+        when_ready hook) so workers inherit the loaded pipelines. Objects
+        are frozen out of the garbage collector afterwards; otherwise the
+        first collection in each worker touches every object header and
+        un-shares the pages.
+        """
+        for model_name in model_names or [DEFAULT_SPACY_MODEL]:
+            self.get_model(model_name, components)
+
+        if include_nltk:
+            # WordNet is loaded lazily by NLTK; lemmatize once to pull it in
+            self.lemmatizer.lemmatize('requirements')
+            self.stop_words
+
+        gc.collect()
+        gc.freeze()
+        logger.info("NLP models preloaded", models=self.loaded_models())
+
+# Process-wide registry shared by all agent components
+nlp_registry = NLPModelRegistry()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Obligation Repository - Batched, Cached Obligation Retrieval
+============================================================
+
+This module loads regulatory obligations for RuleCompiler and
+OverlapResolver. Both used to query regulatory_obligations themselves:
+RuleCompiler one row per compiled obligation, OverlapResolver the full rows
+(including the large content text) once per detection and again for every
+cluster it resolved. Bulk workflows therefore cost one query per obligation.
+
+Key Features:
+- Batched loads: one WHERE obligation_id = ANY($1) query per batch of IDs
+- Projections: metadata only, or metadata plus full content text
+- Version-aware content cache: cached rows are revalidated against the
+  obligation version in the same query, and content is only transferred
+  for obligations whose version changed
+- Prefetch: rows validated within the freshness window are served without
+  a query, so a warmed batch costs nothing per obligation afterwards
+- Explicit invalidation for obligation update and delete events
+
+Rule Compliance:
+- Rule 1: No stubs - Real PostgreSQL queries with cache revalidation
+- Rule 2: Modular design - One repository shared by agent components
+- Rule 17: Extensive comments explaining all functionality
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Iterable
+
+# Database
+import asyncpg
+
+# Monitoring and logging
+import structlog
+from prometheus_client import Counter, Histogram
+
+# Configure structured logging
+logger = structlog.get_logger()
+
+# Prometheus metrics for obligation retrieval
+OBLIGATION_FETCH_TIME = Histogram(
+    'obligation_fetch_seconds', 'Time to load one batch of obligations', ['projection']
+)
+OBLIGATION_CACHE_LOOKUPS = Counter(
+    'obligation_cache_lookups_total', 'Obligation cache lookups', ['result']
+)
+
+# Columns returned by every projection
+OBLIGATION_METADATA_COLUMNS = (
+    'obligation_id',
+    'regulation_type',
+    'jurisdiction',
+    'title',
+    'obligation_level',
+    'confidence_score',
+    'effective_date',
+    'created_at',
+    'version'
+)
+
+class ObligationRepository:
+    """
+    Batched obligation loader with a version-aware in-memory cache
+
+    Only rows fetched with content are cached. A cached row is served
+    directly while it is fresh (validated within OBLIGATION_CACHE_FRESH_SECONDS);
+    after that the next load of it sends its cached version along, and the
+    database returns the content only if the version no longer matches.
+    """
+
+    def __init__(self, batch_size: int = None, cache_size: int = None,
+                 fresh_seconds: float = None):
+        self.batch_size = batch_size or int(os.getenv('OBLIGATION_FETCH_BATCH_SIZE', '500'))
+        self.cache_size = cache_size or int(os.getenv('OBLIGATION_CACHE_SIZE', '5000'))
+        self.fresh_seconds = fresh_seconds if fresh_seconds is not None else float(
+            os.getenv('OBLIGATION_CACHE_FRESH_SECONDS', '30')
+        )
+
+        # obligation_id -> (row with content, validated_at)
+        self._cache: OrderedDict = OrderedDict()
+        self._invalidation_epoch = 0
+
+        # Performance metrics
+        self.metrics = {
+            'queries': 0,
+            'rows_loaded': 0,
+            'fresh_hits': 0,
+            'content_reused': 0,
+            'invalidations': 0
+        }
+
+    async def get_many(self, pg_pool: asyncpg.Pool, obligation_ids: Iterable[str],
+                       include_content: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Load obligations by ID
+
+        Args:
+            pg_pool: Connection pool to query
+            obligation_ids: IDs to load; duplicates are loaded once
+            include_content: Also return the full obligation text
+
+        Returns:
+            Rows keyed by obligation ID, in request order; missing IDs are absent
+        """
+        requested = list(dict.fromkeys(obligation_ids))
+        found: Dict[str, Dict[str, Any]] = {}
+        stale = []
+
+        now = time.monotonic()
+        for obligation_id in requested:
+            entry = self._cache.get(obligation_id)
+            if entry is not None and now - entry[1] < self.fresh_seconds:
+                self._cache.move_to_end(obligation_id)
+                found[obligation_id] = self._project(entry[0], include_content)
+                self.metrics['fresh_hits'] += 1
+                OBLIGATION_CACHE_LOOKUPS.labels(result="fresh_hit").inc()
+            else:
+                stale.append(obligation_id)
+
+        for start in range(0, len(stale), self.batch_size):
+            rows = await self._load_batch(pg_pool, stale[start:start + self.batch_size], include_content)
+            found.update(rows)
+
+        return {obligation_id: found[obligation_id] for obligation_id in requested if obligation_id in found}
+
+    async def get(self, pg_pool: asyncpg.Pool, obligation_id: str,
+                  include_content: bool = True) -> Optional[Dict[str, Any]]:
+        """Load a single obligation"""
+        return (await self.get_many(pg_pool, [obligation_id], include_content)).get(obligation_id)
+
+    async def prefetch(self, pg_pool: asyncpg.Pool, obligation_ids: Iterable[str]) -> int:
+        """Load obligations with content ahead of per-obligation processing"""
+        return len(await self.get_many(pg_pool, obligation_ids, include_content=True))
+
+    async def _load_batch(self, pg_pool: asyncpg.Pool, obligation_ids: List[str],
+                          include_content: bool) -> Dict[str, Dict[str, Any]]:
+        """One query for a batch of IDs, reusing cached content whose version still matches"""
+        # Snapshot: entries may be evicted or invalidated while the query runs
+        cached = {
+            obligation_id: self._cache[obligation_id][0]
+            for obligation_id in obligation_ids
+            if obligation_id in self._cache and self._cache[obligation_id][0].get('version') is not None
+        }
+        epoch = self._invalidation_epoch
+
+        columns = ', '.join(OBLIGATION_METADATA_COLUMNS)
+        if include_content:
+            # Content is NOT NULL, so NULL here means "unchanged, use your copy"
+            query = f"""
+                SELECT {columns},
+                    CASE WHEN version = ($2::jsonb ->> obligation_id) THEN NULL ELSE content END AS content
+                FROM regulatory_obligations
+                WHERE obligation_id = ANY($1)
+            """
+            args = (obligation_ids, json.dumps({oid: row['version'] for oid, row in cached.items()}))
+        else:
+            query = f"""
+                SELECT {columns}
+                FROM regulatory_obligations
+                WHERE obligation_id = ANY($1)
+            """
+            args = (obligation_ids,)
+
+        projection = "full" if include_content else "metadata"
+        with OBLIGATION_FETCH_TIME.labels(projection=projection).time():
+            async with pg_pool.acquire() as conn:
+                records = await conn.fetch(query, *args)
+        self.metrics['queries'] += 1
+        self.metrics['rows_loaded'] += len(records)
+
+        rows = {}
+        now = time.monotonic()
+        for record in records:
+            row = dict(record)
+            obligation_id = row['obligation_id']
+            previous = cached.get(obligation_id)
+            unchanged = previous is not None and previous['version'] == row['version']
+
+            if include_content and row['content'] is None and unchanged:
+                row['content'] = previous['content']
+                self.metrics['content_reused'] += 1
+                OBLIGATION_CACHE_LOOKUPS.labels(result="revalidated").inc()
+            elif include_content:
+                OBLIGATION_CACHE_LOOKUPS.labels(result="miss").inc()
+
+            if epoch == self._invalidation_epoch:
+                if include_content:
+                    self._remember(row, now)
+                elif unchanged:
+                    self._remember(previous, now)
+                else:
+                    self._cache.pop(obligation_id, None)
+            rows[obligation_id] = dict(row)
+
+        return rows
+
+    def _project(self, row: Dict[str, Any], include_content: bool) -> Dict[str, Any]:
+        if include_content:
+            return dict(row)
+        return {column: row.get(column) for column in OBLIGATION_METADATA_COLUMNS}
+
+    def _remember(self, row: Dict[str, Any], validated_at: float):
+        self._cache[row['obligation_id']] = (row, validated_at)
+        self._cache.move_to_end(row['obligation_id'])
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, obligation_id: str = None):
+        """Drop one cached obligation, or all of them"""
+        self._invalidation_epoch += 1
+        self.metrics['invalidations'] += 1
+        if obligation_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(obligation_id, None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get obligation repository metrics"""
+        return {**self.metrics, 'cached_obligations': len(self._cache)}
+
+# Process-wide repository shared by all agent components
+obligation_repository = ObligationRepository()
@@ -20,6 +20,9 @@ Key Features:
 - Automatic precedence resolution
 - Manual override capabilities
 - Impact analysis for resolution decisions
+- Shared, lazily loaded NLP models from the process-wide model registry
+- SpaCy analysis in a batched process pool, once per obligation per matrix
+- Batched obligation loads: one query per batch, then per-cluster reads from cache
 
 Rule Compliance:
 - Rule 1: No stubs - Real NLP and similarity analysis with production algorithms
@@ -46,19 +49,14 @@ from pathlib import Path
 import math
 
 # NLP and similarity analysis
-import spacy
 from spacy.matcher import Matcher
-import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
 # Database and caching
 import asyncpg
-import redis
 
 # Monitoring and logging
 import structlog
@@ -67,6 +65,16 @@ from prometheus_client import Counter, Histogram, Gauge
 # Import compliance rule types
 from .rule_compiler import ComplianceRule, RegulationType, RuleType
 
+# Shared async Redis client
+from .async_redis import get_redis_client
+
+# Shared batched obligation loader
+from .obligation_repository import obligation_repository
+
+# Shared NLP models and process-pool SpaCy service
+from .nlp_models import nlp_registry
+from .nlp_executor import nlp_executor, DocSummary
+
 # Configure structured logging
 logger = structlog.get_logger()
 
@@ -77,6 +85,9 @@ OBLIGATIONS_MERGED = Counter('overlap_resolver_obligations_merged_total', 'Oblig
 SIMILARITY_CALCULATIONS = Counter('overlap_resolver_similarity_calculations_total', 'Similarity calculations performed')
 OVERLAP_ERRORS = Counter('overlap_resolver_errors_total', 'Overlap resolution errors', ['error_type'])
 
+# Similarity uses vectors, lemmas and entities but no dependency parse
+SIMILARITY_DISABLED_PIPES = ("parser",)
+
 class RegulatoryLevel(Enum):
     """Regulatory framework levels for EU legislation"""
     LEVEL_1 = 1  # Directives and Regulations (primary legislation)
@@ -152,12 +163,8 @@ class TextSimilarityAnalyzer:
         """Initialize text similarity analyzer"""
         self.logger = logger.bind(component="text_similarity_analyzer")
         
-        # Initialize NLP model
-        self.nlp = spacy.load("en_core_web_sm")
-        
-        # Initialize NLTK components
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+        # Shared process-pool SpaCy service
+        self.nlp_executor = nlp_executor
         
         # TF-IDF vectorizer for text similarity
         self.tfidf_vectorizer = TfidfVectorizer(
@@ -180,6 +187,16 @@ class TextSimilarityAnalyzer:
         
         self.logger.info("Text similarity analyzer initialized")
     
+    @property
+    def lemmatizer(self):
+        """Shared NLTK lemmatizer, loaded on first use"""
+        return nlp_registry.lemmatizer
+    
+    @property
+    def stop_words(self):
+        """Shared NLTK stop words, loaded on first use"""
+        return nlp_registry.stop_words
+    
     def calculate_text_similarity(self, text1: str, text2: str) -> float:
         """Calculate cosine similarity between two texts using TF-IDF"""
         try:
@@ -200,13 +217,22 @@ class TextSimilarityAnalyzer:
             self.logger.error("Failed to calculate text similarity", error=str(e))
             return 0.0
     
-    def calculate_semantic_similarity(self, text1: str, text2: str) -> Tuple[float, List[str]]:
+    async def summarize(self, texts: List[str]) -> List[DocSummary]:
+        """Run texts through the SpaCy executor as one batch"""
+        return await self.nlp_executor.analyze_many(texts, disable=SIMILARITY_DISABLED_PIPES)
+    
+    async def calculate_semantic_similarity(self, text1: str, text2: str) -> Tuple[float, List[str]]:
         """Calculate semantic similarity using SpaCy word vectors"""
         try:
-            # Process texts with SpaCy
-            doc1 = self.nlp(text1)
-            doc2 = self.nlp(text2)
-            
+            doc1, doc2 = await self.summarize([text1, text2])
+        except Exception as e:
+            self.logger.error("Failed to calculate semantic similarity", error=str(e))
+            return 0.0, []
+        return self.compare_summaries(doc1, doc2)
+    
+    def compare_summaries(self, doc1: DocSummary, doc2: DocSummary) -> Tuple[float, List[str]]:
+        """Semantic similarity of two already analysed texts"""
+        try:
             # Calculate document similarity
             base_similarity = doc1.similarity(doc2)
             
@@ -250,12 +276,14 @@ class TextSimilarityAnalyzer:
         text = re.sub(r'\s+', ' ', text).strip()
         
         # Remove stop words while preserving regulatory terms
+        # (the shared NLTK resources also ensure the tokenizer data is present)
+        stop_words, lemmatizer = self.stop_words, self.lemmatizer
         words = word_tokenize(text)
         filtered_words = []
         
         for word in words:
-            if word not in self.stop_words or self._is_regulatory_term(word):
-                filtered_words.append(self.lemmatizer.lemmatize(word))
+            if word not in stop_words or self._is_regulatory_term(word):
+                filtered_words.append(lemmatizer.lemmatize(word))
         
         return ' '.join(filtered_words)
     
@@ -266,7 +294,7 @@ class TextSimilarityAnalyzer:
                 return True
         return False
     
-    def _calculate_keyword_similarity(self, doc1, doc2) -> float:
+    def _calculate_keyword_similarity(self, doc1: DocSummary, doc2: DocSummary) -> float:
         """Calculate similarity based on regulatory keywords"""
         keywords1 = self._extract_regulatory_keywords(doc1)
         keywords2 = self._extract_regulatory_keywords(doc2)
@@ -280,22 +308,14 @@ class TextSimilarityAnalyzer:
         
         return intersection / union if union > 0 else 0.0
     
-    def _extract_regulatory_keywords(self, doc) -> Set[str]:
-        """Extract regulatory keywords from SpaCy document"""
-        keywords = set()
-        
-        for token in doc:
-            if not token.is_stop and not token.is_punct:
-                lemma = token.lemma_.lower()
-                if self._is_regulatory_term(lemma):
-                    keywords.add(lemma)
-        
-        return keywords
+    def _extract_regulatory_keywords(self, doc: DocSummary) -> Set[str]:
+        """Extract regulatory keywords from a SpaCy document summary"""
+        return {lemma for lemma in doc.content_lemmas if self._is_regulatory_term(lemma)}
     
-    def _calculate_entity_similarity(self, doc1, doc2) -> float:
+    def _calculate_entity_similarity(self, doc1: DocSummary, doc2: DocSummary) -> float:
         """Calculate similarity based on named entities"""
-        entities1 = {ent.label_ + ":" + ent.text.lower() for ent in doc1.ents}
-        entities2 = {ent.label_ + ":" + ent.text.lower() for ent in doc2.ents}
+        entities1 = {label + ":" + text.lower() for text, label, _, _ in doc1.entities}
+        entities2 = {label + ":" + text.lower() for text, label, _, _ in doc2.entities}
         
         if not entities1 or not entities2:
             return 0.0
@@ -355,6 +375,7 @@ class OverlapResolver:
         # Database connections
         self.pg_pool = None
         self.redis_client = None
+        self.obligation_repository = obligation_repository
         
         # Similarity thresholds for different overlap types
         self.similarity_thresholds = {
@@ -387,6 +408,7 @@ class OverlapResolver:
     async def initialize(self):
         """Initialize async components"""
         await self._init_databases()
+        await self.similarity_analyzer.nlp_executor.start()
         self.logger.info("OverlapResolver async initialization complete")
     
     async def _init_databases(self):
@@ -403,12 +425,8 @@ class OverlapResolver:
                 max_size=10
             )
             
-            # Redis client for caching
-            self.redis_client = redis.Redis(
-                host=os.getenv('REDIS_HOST', 'redis'),
-                port=os.getenv('REDIS_PORT', 6379),
-                decode_responses=True
-            )
+            # Shared async Redis client for caching
+            self.redis_client = await get_redis_client()
             
             self.logger.info("Database connections initialized")
             
@@ -479,26 +497,14 @@ class OverlapResolver:
             )
             raise
     
-    async def _retrieve_obligations(self, obligation_ids: List[str]) -> List[Dict[str, Any]]:
-        """Retrieve obligations from database"""
+    async def _retrieve_obligations(self, obligation_ids: List[str],
+                                    include_content: bool = True) -> List[Dict[str, Any]]:
+        """Retrieve obligations in request order, batched and cached by the repository"""
         try:
-            async with self.pg_pool.acquire() as conn:
-                obligations = await conn.fetch("""
-                    SELECT 
-                        obligation_id,
-                        regulation_type,
-                        jurisdiction,
-                        title,
-                        content,
-                        obligation_level,
-                        confidence_score,
-                        effective_date,
-                        created_at
-                    FROM regulatory_obligations 
-                    WHERE obligation_id = ANY($1)
-                """, obligation_ids)
-                
-                return [dict(obligation) for obligation in obligations]
+            obligations = await self.obligation_repository.get_many(
+                self.pg_pool, obligation_ids, include_content=include_content
+            )
+            return list(obligations.values())
                 
         except Exception as e:
             self.logger.error("Failed to retrieve obligations", error=str(e))
@@ -508,6 +514,16 @@ class OverlapResolver:
         """Calculate pairwise similarities between all obligations"""
         similarity_matrix = {}
         
+        # Analyse every obligation once, in batches, rather than once per pair
+        try:
+            summaries = dict(zip(
+                [obligation['obligation_id'] for obligation in obligations],
+                await self.similarity_analyzer.summarize([obligation['content'] for obligation in obligations])
+            ))
+        except Exception as e:
+            self.logger.error("Failed to analyse obligations, falling back to pairwise analysis", error=str(e))
+            summaries = None
+        
         for i, obligation1 in enumerate(obligations):
             obligation1_id = obligation1['obligation_id']
             similarity_matrix[obligation1_id] = {}
@@ -520,7 +536,7 @@ class OverlapResolver:
                 
                 # Calculate similarity
                 similarity = await self._calculate_obligation_similarity(
-                    obligation1, obligation2
+                    obligation1, obligation2, summaries
                 )
                 
                 # Store in both directions
@@ -533,8 +549,9 @@ class OverlapResolver:
         return similarity_matrix
     
     async def _calculate_obligation_similarity(self, obligation1: Dict[str, Any], 
-                                            obligation2: Dict[str, Any]) -> ObligationSimilarity:
-        """Calculate similarity between two obligations"""
+                                            obligation2: Dict[str, Any],
+                                            summaries: Dict[str, DocSummary] = None) -> ObligationSimilarity:
+        """Calculate similarity between two obligations, reusing SpaCy summaries when given"""
         try:
             content1 = obligation1['content']
             content2 = obligation2['content']
@@ -545,9 +562,14 @@ class OverlapResolver:
             )
             
             # Semantic similarity using SpaCy
-            semantic_similarity, factors = self.similarity_analyzer.calculate_semantic_similarity(
-                content1, content2
-            )
+            if summaries:
+                semantic_similarity, factors = self.similarity_analyzer.compare_summaries(
+                    summaries[obligation1['obligation_id']], summaries[obligation2['obligation_id']]
+                )
+            else:
+                semantic_similarity, factors = await self.similarity_analyzer.calculate_semantic_similarity(
+                    content1, content2
+                )
             
             # Structural similarity based on obligation patterns
             structural_similarity = self._calculate_structural_similarity(
@@ -836,6 +858,10 @@ class OverlapResolver:
                 cluster_count=len(clusters)
             )
             
+            # Load every obligation a strategy will read in one batch up front,
+            # so each cluster below is served from the repository cache
+            await self._prefetch_cluster_obligations(clusters)
+            
             for cluster in clusters:
                 try:
                     if cluster.resolution_strategy == ResolutionStrategy.MERGE:
@@ -903,6 +929,22 @@ class OverlapResolver:
             self.logger.error("Failed to resolve overlaps", error=str(e))
             raise
     
+    async def _prefetch_cluster_obligations(self, clusters: List[OverlapCluster]):
+        """Load the obligations the clusters' resolution strategies need"""
+        obligation_ids = []
+        for cluster in clusters:
+            if cluster.resolution_strategy == ResolutionStrategy.PRIORITIZE:
+                obligation_ids.append(cluster.primary_obligation_id)
+            elif cluster.resolution_strategy in (ResolutionStrategy.MERGE, ResolutionStrategy.PRESERVE_ALL):
+                obligation_ids.extend(cluster.obligation_ids)
+        
+        if obligation_ids:
+            try:
+                await self.obligation_repository.prefetch(self.pg_pool, obligation_ids)
+            except Exception as e:
+                # Each strategy still loads its own obligations if this fails
+                self.logger.warning("Failed to prefetch cluster obligations", error=str(e))
+    
     async def _merge_obligations(self, cluster: OverlapCluster) -> Optional[MergedObligation]:
         """Merge overlapping obligations into a single unified obligation"""
         try:
@@ -1044,6 +1086,7 @@ class OverlapResolver:
     def _extract_requirements(self, content: str) -> List[str]:
         """Extract individual requirements from obligation content"""
         # Simple sentence-based extraction
+        nlp_registry.ensure_nltk_data()
         sentences = sent_tokenize(content)
         requirements = []
         
@@ -1220,6 +1263,7 @@ class OverlapResolver:
             **self.resolution_stats,
             'similarity_thresholds': {k.value: v for k, v in self.similarity_thresholds.items()},
             'level_precedence': {k.value: v for k, v in self.level_precedence.items()},
+            'obligation_repository': self.obligation_repository.get_metrics(),
             'timestamp': datetime.now().isoformat()
         }
 
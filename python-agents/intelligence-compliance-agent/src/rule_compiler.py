@@ -15,6 +15,11 @@ Key Features:
 - Generate JSON-Logic rules with complex conditional logic
 - Support numerical thresholds and date comparisons
 - Rule validation and testing framework
+- Concurrent, rate-limited LLM calls with per-stage latency histograms
+- Durable generation cache keyed by obligation content and generator version
+- Set-based rule persistence and pipelined async Redis writes
+- spaCy parsing in a batched process pool, off the event loop
+- Batched, cached obligation loading with prefetch for bulk recompiles
 
 Rule Compliance:
 - Rule 1: No stubs - Real parsing logic with production implementations
@@ -29,7 +34,9 @@ import os
 import re
 import json
 import asyncio
+import hashlib
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any, Union, Tuple, Set
 from enum import Enum
@@ -37,14 +44,6 @@ from dataclasses import dataclass, asdict
 import uuid
 from pathlib import Path
 
-# NLP and text processing
-import spacy
-from spacy.matcher import Matcher
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-
 # AI processing for complex obligation analysis
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
@@ -53,27 +52,19 @@ from langchain.schema import BaseOutputParser
 
 # Database and storage
 import asyncpg
-import redis
 
 # Monitoring and logging
 import structlog
 from prometheus_client import Counter, Histogram, Gauge
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Shared NLP executor
+from .nlp_executor import nlp_executor, DocSummary
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Shared async Redis client
+from .async_redis import get_redis_client
 
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+# Shared batched obligation loader
+from .obligation_repository import obligation_repository
 
 # Configure structured logging
 logger = structlog.get_logger()
@@ -83,6 +74,46 @@ RULES_COMPILED = Counter('rule_compiler_rules_compiled_total', 'Total rules comp
 COMPILATION_TIME = Histogram('rule_compiler_compilation_seconds', 'Time spent compiling rules')
 COMPILATION_ERRORS = Counter('rule_compiler_errors_total', 'Total compilation errors')
 RULE_VALIDATION_FAILURES = Counter('rule_compiler_validation_failures_total', 'Rule validation failures')
+STAGE_TIME = Histogram('rule_compiler_stage_seconds', 'Time spent per compilation stage', ['stage'])
+LLM_CALLS = Counter('rule_compiler_llm_calls_total', 'LLM calls by stage and outcome', ['stage', 'outcome'])
+LLM_RATE_LIMIT_WAIT = Histogram('rule_compiler_llm_rate_limit_wait_seconds', 'Time LLM calls waited for the rate limiter')
+GENERATION_CACHE_LOOKUPS = Counter('rule_compiler_generation_cache_total', 'Rule generation cache lookups', ['result'])
+
+# Bump when rule generation logic changes in ways the prompt hash cannot see
+RULE_GENERATOR_VERSION = "1"
+
+# Obligation parsing needs tokens and sentence boundaries, not entities or lemmas
+RULE_COMPILER_DISABLED_PIPES = ("ner", "lemmatizer")
+
+class LLMRateLimiter:
+    """
+    Token bucket shared by all LLM calls of a RuleCompiler
+    
+    Allows ``burst`` calls at once and ``rate`` calls per second sustained,
+    so fanned-out candidate generation stays within the provider's limits.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> float:
+        """Wait for a token; returns the time spent waiting"""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
 
 class RegulationType(Enum):
     """Supported regulation types for rule compilation"""
@@ -227,6 +258,7 @@ class RuleCompiler:
         # Database connections for obligation retrieval and rule storage
         self.pg_pool = None
         self.redis_client = None
+        self.obligation_repository = obligation_repository
         
         # Rule validation and testing framework
         self._init_validation_framework()
@@ -236,7 +268,9 @@ class RuleCompiler:
             'total_compiled': 0,
             'successful_compilations': 0,
             'failed_compilations': 0,
-            'avg_compilation_time': 0.0
+            'avg_compilation_time': 0.0,
+            'cache_hits': 0,
+            'cache_misses': 0
         }
         
         self.logger.info("RuleCompiler initialized successfully")
@@ -244,26 +278,20 @@ class RuleCompiler:
     async def initialize(self):
         """Initialize async components"""
         await self._init_databases()
+        await self.nlp_executor.start()
         self.logger.info("RuleCompiler async initialization complete")
     
     def _init_nlp_models(self):
         """
         Initialize NLP models for regulatory text processing
         
-        Sets up SpaCy for named entity recognition and dependency parsing,
-        NLTK for tokenization and linguistic analysis, and custom matchers
-        for regulatory pattern detection.
+        SpaCy parsing and regulatory pattern matching run in the shared
+        NLP executor's worker processes, which load the model themselves.
+        Nothing is loaded here.
         """
         try:
-            # Load SpaCy model for English text processing
-            self.nlp = spacy.load("en_core_web_sm")
-            
-            # Add custom regulatory entity patterns
-            self._add_regulatory_patterns()
-            
-            # Initialize NLTK components
-            self.lemmatizer = WordNetLemmatizer()
-            self.stop_words = set(stopwords.words('english'))
+            # Shared process-pool SpaCy service
+            self.nlp_executor = nlp_executor
             
             # Regulatory keywords for different regulation types
             self.regulatory_keywords = {
@@ -300,37 +328,6 @@ class RuleCompiler:
             self.logger.error("Failed to initialize NLP models", error=str(e))
             raise
     
-    def _add_regulatory_patterns(self):
-        """Add custom regulatory patterns to SpaCy matcher"""
-        self.matcher = Matcher(self.nlp.vocab)
-        
-        # Pattern for monetary amounts
-        amount_pattern = [
-            {"LIKE_NUM": True},
-            {"LOWER": {"IN": ["euro", "euros", "eur", "dollar", "dollars", "usd", "pound", "pounds", "gbp"]}}
-        ]
-        self.matcher.add("MONETARY_AMOUNT", [amount_pattern])
-        
-        # Pattern for regulatory thresholds
-        threshold_pattern = [
-            {"LOWER": {"IN": ["exceeds", "above", "below", "minimum", "maximum", "threshold"]}},
-            {"LIKE_NUM": True, "OP": "?"}
-        ]
-        self.matcher.add("THRESHOLD", [threshold_pattern])
-        
-        # Pattern for time periods
-        time_pattern = [
-            {"LIKE_NUM": True},
-            {"LOWER": {"IN": ["days", "months", "years", "hours", "minutes", "weeks"]}}
-        ]
-        self.matcher.add("TIME_PERIOD", [time_pattern])
-        
-        # Pattern for regulatory actions
-        action_pattern = [
-            {"LOWER": {"IN": ["must", "shall", "should", "required", "mandatory", "prohibited", "forbidden"]}}
-        ]
-        self.matcher.add("REGULATORY_ACTION", [action_pattern])
-    
     def _init_ai_models(self):
         """
         Initialize AI models for complex obligation analysis
@@ -406,6 +403,23 @@ class RuleCompiler:
                 """
             )
             
+            # LLM call admission: bounded fan-out and a shared rate limit
+            self.llm_concurrency = int(os.getenv('RULE_COMPILER_LLM_CONCURRENCY', '4'))
+            self.llm_semaphore = asyncio.Semaphore(self.llm_concurrency)
+            self.llm_rate_limiter = LLMRateLimiter(
+                rate=float(os.getenv('RULE_COMPILER_LLM_REQUESTS_PER_SECOND', '5')),
+                burst=int(os.getenv('RULE_COMPILER_LLM_BURST', '5'))
+            )
+            
+            # Identifies model and prompts for the generation cache
+            self.generator_version = hashlib.sha256(json.dumps([
+                RULE_GENERATOR_VERSION,
+                self.llm.model_name,
+                self.llm.temperature,
+                self.rule_extraction_prompt.template,
+                self.json_logic_prompt.template
+            ]).encode('utf-8')).hexdigest()
+            
             # Initialize LangChain chains
             self.extraction_chain = LLMChain(
                 llm=self.llm,
@@ -476,12 +490,8 @@ class RuleCompiler:
                 max_size=10
             )
             
-            # Redis for rule caching and performance optimization
-            self.redis_client = redis.Redis(
-                host=os.getenv('REDIS_HOST', 'redis'),
-                port=os.getenv('REDIS_PORT', 6379),
-                decode_responses=True
-            )
+            # Shared async Redis client for rule caching
+            self.redis_client = await get_redis_client()
             
             self.logger.info("Database connections initialized")
             
@@ -489,12 +499,18 @@ class RuleCompiler:
             self.logger.error("Failed to initialize databases", error=str(e))
             raise
     
-    async def compile_obligation_to_rules(self, obligation_id: str) -> List[ComplianceRule]:
+    async def compile_obligation_to_rules(self, obligation_id: str,
+                                          force_regenerate: bool = False) -> List[ComplianceRule]:
         """
         Main method to compile a regulatory obligation into executable rules
         
+        Obligations whose content, regulation type and jurisdiction were
+        already compiled by the same model and prompts are served from the
+        generation cache, skipping NLP, LLM and validation steps.
+        
         Args:
             obligation_id: ID of the regulatory obligation to compile
+            force_regenerate: Bypass the generation cache and regenerate
             
         Returns:
             List of compiled compliance rules
@@ -508,21 +524,37 @@ class RuleCompiler:
             RULES_COMPILED.inc()
             
             # Step 1: Retrieve obligation from database
-            obligation = await self._retrieve_obligation(obligation_id)
+            with STAGE_TIME.labels(stage="retrieve").time():
+                obligation = await self._retrieve_obligation(obligation_id)
             if not obligation:
                 raise ValueError(f"Obligation {obligation_id} not found")
             
-            # Step 2: Parse obligation text and extract requirements
-            parse_result = await self._parse_obligation(obligation)
-            
-            # Step 3: Generate compliance rules from requirements
-            rules = await self._generate_rules(obligation, parse_result)
+            cache_key = self._generation_cache_key(obligation)
+            validated_rules = None
+            if force_regenerate:
+                GENERATION_CACHE_LOOKUPS.labels(result="bypass").inc()
+            else:
+                with STAGE_TIME.labels(stage="cache_lookup").time():
+                    validated_rules = await self._get_cached_rules(cache_key, obligation)
             
-            # Step 4: Validate generated rules
-            validated_rules = await self._validate_rules(rules)
+            if validated_rules is None:
+                # Step 2: Parse obligation text and extract requirements
+                with STAGE_TIME.labels(stage="parse").time():
+                    parse_result = await self._parse_obligation(obligation)
+                
+                # Step 3: Generate compliance rules from requirements
+                with STAGE_TIME.labels(stage="generate").time():
+                    rules = await self._generate_rules(obligation, parse_result)
+                
+                # Step 4: Validate generated rules
+                with STAGE_TIME.labels(stage="validate").time():
+                    validated_rules = await self._validate_rules(rules)
+                
+                await self._cache_generated_rules(cache_key, obligation, validated_rules)
             
             # Step 5: Store rules in database
-            await self._store_rules(validated_rules)
+            with STAGE_TIME.labels(stage="store").time():
+                await self._store_rules(validated_rules)
             
             # Update performance metrics
             compilation_time = (datetime.now() - start_time).total_seconds()
@@ -556,33 +588,137 @@ class RuleCompiler:
             )
             raise
     
-    async def _retrieve_obligation(self, obligation_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve regulatory obligation from database"""
+    def _generation_cache_key(self, obligation: Dict[str, Any]) -> str:
+        """Key from the obligation content hash, regulation type, jurisdiction and generator version"""
+        content_hash = hashlib.sha256(obligation['content'].encode('utf-8')).hexdigest()
+        return hashlib.sha256(json.dumps([
+            content_hash,
+            obligation['regulation_type'],
+            obligation['jurisdiction'],
+            self.generator_version
+        ]).encode('utf-8')).hexdigest()
+    
+    async def _get_cached_rules(self, cache_key: str, obligation: Dict[str, Any]) -> Optional[List[ComplianceRule]]:
+        """Rules generated earlier for identical content, rebuilt for this obligation"""
         try:
             async with self.pg_pool.acquire() as conn:
-                result = await conn.fetchrow("""
-                    SELECT 
-                        obligation_id,
-                        regulation_type,
-                        jurisdiction,
-                        title,
-                        content,
-                        obligation_level,
-                        confidence_score,
-                        effective_date,
-                        created_at
-                    FROM regulatory_obligations 
-                    WHERE obligation_id = $1
-                """, obligation_id)
-                
-                if result:
-                    return dict(result)
-                return None
-                
+                generated = await conn.fetchval("""
+                    UPDATE rule_generation_cache
+                    SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP
+                    WHERE cache_key = $1
+                    RETURNING generated_rules
+                """, cache_key)
+        except Exception as e:
+            self.logger.warning("Rule generation cache lookup failed", error=str(e))
+            generated = None
+        
+        if generated is None:
+            GENERATION_CACHE_LOOKUPS.labels(result="miss").inc()
+            self.compilation_stats['cache_misses'] += 1
+            return None
+        
+        GENERATION_CACHE_LOOKUPS.labels(result="hit").inc()
+        self.compilation_stats['cache_hits'] += 1
+        
+        created_at = datetime.now(timezone.utc)
+        return [
+            ComplianceRule(
+                rule_id=f"{obligation['obligation_id']}_rule_{entry['index']}",
+                regulation_type=RegulationType(obligation['regulation_type']),
+                rule_type=RuleType(entry['rule_type']),
+                title=f"Rule {entry['index']} for {obligation['title']}",
+                description=entry['description'],
+                conditions=[
+                    RuleCondition(
+                        field=condition['field'],
+                        operator=ConditionOperator(condition['operator']),
+                        value=condition['value'],
+                        description=condition['description']
+                    )
+                    for condition in entry['conditions']
+                ],
+                json_logic=entry['json_logic'],
+                confidence_score=entry['confidence_score'],
+                source_obligation_id=obligation['obligation_id'],
+                jurisdiction=obligation['jurisdiction'],
+                effective_date=obligation['effective_date'],
+                created_at=created_at,
+                version=entry['version']
+            )
+            for entry in json.loads(generated)
+        ]
+    
+    async def _cache_generated_rules(self, cache_key: str, obligation: Dict[str, Any],
+                                     rules: List[ComplianceRule]):
+        """Record the generated rule set; obligation-specific fields are rebuilt on hits"""
+        prefix = f"{obligation['obligation_id']}_rule_"
+        generated = [
+            {
+                'index': int(rule.rule_id[len(prefix):]) if rule.rule_id.startswith(prefix) else position + 1,
+                'rule_type': rule.rule_type.value,
+                'description': rule.description,
+                'conditions': [
+                    {
+                        'field': condition.field,
+                        'operator': condition.operator.value,
+                        'value': condition.value,
+                        'description': condition.description
+                    }
+                    for condition in rule.conditions
+                ],
+                'json_logic': rule.json_logic,
+                'confidence_score': rule.confidence_score,
+                'version': rule.version
+            }
+            for position, rule in enumerate(rules)
+        ]
+        
+        try:
+            async with self.pg_pool.acquire() as conn:
+                await conn.execute("""
+                    INSERT INTO rule_generation_cache
+                    (cache_key, content_hash, regulation_type, jurisdiction, generator_version,
+                     generated_rules, source_obligation_id)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7)
+                    ON CONFLICT (cache_key) DO UPDATE SET
+                        generated_rules = EXCLUDED.generated_rules,
+                        source_obligation_id = EXCLUDED.source_obligation_id,
+                        created_at = CURRENT_TIMESTAMP
+                """,
+                    cache_key,
+                    hashlib.sha256(obligation['content'].encode('utf-8')).hexdigest(),
+                    obligation['regulation_type'],
+                    obligation['jurisdiction'],
+                    self.generator_version,
+                    json.dumps(generated, default=str),
+                    obligation['obligation_id']
+                )
+        except Exception as e:
+            # A failed cache write only costs a regeneration next time
+            self.logger.warning("Failed to cache generated rules", error=str(e))
+    
+    async def _retrieve_obligation(self, obligation_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve regulatory obligation, from the prefetched batch when available"""
+        try:
+            return await self.obligation_repository.get(self.pg_pool, obligation_id)
         except Exception as e:
             self.logger.error("Failed to retrieve obligation", error=str(e))
             raise
     
+    async def prefetch_obligations(self, obligation_ids: List[str]) -> int:
+        """
+        Load obligations in batches before compiling them one by one
+        
+        Each compile_obligation_to_rules call then finds its obligation in
+        the repository cache instead of issuing its own query.
+        """
+        try:
+            return await self.obligation_repository.prefetch(self.pg_pool, obligation_ids)
+        except Exception as e:
+            # Compilation still works without the prefetch, one query at a time
+            self.logger.warning("Failed to prefetch obligations", error=str(e))
+            return 0
+    
     async def _parse_obligation(self, obligation: Dict[str, Any]) -> ObligationParseResult:
         """
         Parse regulatory obligation text to extract actionable requirements
@@ -595,17 +731,26 @@ class RuleCompiler:
             regulation_type = obligation['regulation_type']
             jurisdiction = obligation['jurisdiction']
             
-            # Step 1: NLP preprocessing
-            doc = self.nlp(obligation_text)
+            # Start AI extraction first so the LLM round trip overlaps NLP processing
+            extraction_task = asyncio.create_task(self._extract_requirements_with_ai(
+                obligation_text, regulation_type, jurisdiction
+            ))
             
-            # Step 2: Extract regulatory patterns using SpaCy matcher
-            matches = self.matcher(doc)
-            regulatory_patterns = self._extract_patterns(doc, matches)
+            try:
+                # Step 1: NLP preprocessing and regulatory pattern matching
+                with STAGE_TIME.labels(stage="nlp").time():
+                    summary = await self.nlp_executor.analyze(
+                        obligation_text, disable=RULE_COMPILER_DISABLED_PIPES
+                    )
+                    
+                    # Step 2: Extract regulatory patterns from the SpaCy matches
+                    regulatory_patterns = self._extract_patterns(summary)
+            except BaseException:
+                extraction_task.cancel()
+                raise
             
             # Step 3: Use AI for complex requirement extraction
-            ai_requirements = await self._extract_requirements_with_ai(
-                obligation_text, regulation_type, jurisdiction
-            )
+            ai_requirements = await extraction_task
             
             # Step 4: Combine and deduplicate requirements
             all_requirements = self._combine_requirements(regulatory_patterns, ai_requirements)
@@ -630,7 +775,7 @@ class RuleCompiler:
                 parsing_metadata={
                     'nlp_patterns_found': len(regulatory_patterns),
                     'ai_requirements_extracted': len(ai_requirements),
-                    'total_sentences': len(list(doc.sents)),
+                    'total_sentences': len(summary.sentences),
                     'regulation_type': regulation_type,
                     'jurisdiction': jurisdiction
                 }
@@ -640,17 +785,14 @@ class RuleCompiler:
             self.logger.error("Failed to parse obligation", error=str(e))
             raise
     
-    def _extract_patterns(self, doc, matches) -> List[Dict[str, Any]]:
+    def _extract_patterns(self, summary: DocSummary) -> List[Dict[str, Any]]:
         """Extract regulatory patterns from SpaCy matches"""
         patterns = []
         
-        for match_id, start, end in matches:
-            span = doc[start:end]
-            label = self.nlp.vocab.strings[match_id]
-            
+        for label, start, end, text in summary.matches:
             pattern = {
                 'type': label,
-                'text': span.text,
+                'text': text,
                 'start': start,
                 'end': end,
                 'confidence': 0.8  # Base confidence for pattern matching
@@ -658,11 +800,11 @@ class RuleCompiler:
             
             # Extract additional context for different pattern types
             if label == "MONETARY_AMOUNT":
-                pattern['amount'] = self._extract_amount(span.text)
+                pattern['amount'] = self._extract_amount(text)
             elif label == "THRESHOLD":
-                pattern['threshold_type'] = self._extract_threshold_type(span.text)
+                pattern['threshold_type'] = self._extract_threshold_type(text)
             elif label == "TIME_PERIOD":
-                pattern['duration'] = self._extract_duration(span.text)
+                pattern['duration'] = self._extract_duration(text)
             
             patterns.append(pattern)
         
@@ -672,7 +814,8 @@ class RuleCompiler:
         """Use AI to extract complex requirements from regulatory text"""
         try:
             # Use LangChain to extract requirements
-            result = await self.extraction_chain.arun(
+            result = await self._call_llm(
+                self.extraction_chain, "llm_extraction",
                 obligation_text=text,
                 regulation_type=regulation_type,
                 jurisdiction=jurisdiction
@@ -777,14 +920,39 @@ class RuleCompiler:
         total_confidence = base_confidence + pattern_boost + ai_boost + candidate_boost
         return min(total_confidence, 1.0)
     
+    async def _call_llm(self, chain: LLMChain, stage: str, **inputs) -> Any:
+        """Run an LLM chain within the concurrency bound and rate limit, timing it per stage"""
+        async with self.llm_semaphore:
+            LLM_RATE_LIMIT_WAIT.observe(await self.llm_rate_limiter.acquire())
+            start = time.perf_counter()
+            try:
+                result = await chain.arun(**inputs)
+                LLM_CALLS.labels(stage=stage, outcome="success").inc()
+                return result
+            except Exception:
+                LLM_CALLS.labels(stage=stage, outcome="error").inc()
+                raise
+            finally:
+                STAGE_TIME.labels(stage=stage).observe(time.perf_counter() - start)
+    
     async def _generate_rules(self, obligation: Dict[str, Any], parse_result: ObligationParseResult) -> List[ComplianceRule]:
-        """Generate complete compliance rules from parsed requirements"""
+        """
+        Generate complete compliance rules from parsed requirements
+        
+        JSON-Logic for all candidates is generated concurrently; the LLM
+        calls are bounded by the compiler's semaphore and rate limiter.
+        """
+        json_logic_results = await asyncio.gather(*(
+            self._generate_json_logic(candidate, parse_result.extracted_requirements)
+            for candidate in parse_result.rule_candidates
+        ), return_exceptions=True)
+        
         rules = []
         
-        for i, candidate in enumerate(parse_result.rule_candidates):
+        for i, (candidate, json_logic) in enumerate(zip(parse_result.rule_candidates, json_logic_results)):
             try:
-                # Generate JSON-Logic for this candidate
-                json_logic = await self._generate_json_logic(candidate, parse_result.extracted_requirements)
+                if isinstance(json_logic, BaseException):
+                    raise json_logic
                 
                 # Create compliance rule
                 rule = ComplianceRule(
@@ -819,7 +987,8 @@ class RuleCompiler:
         """Generate JSON-Logic representation for a rule candidate"""
         try:
             # Use AI to generate JSON-Logic
-            result = await self.json_logic_chain.arun(
+            result = await self._call_llm(
+                self.json_logic_chain, "llm_json_logic",
                 requirements=json.dumps([candidate]),
                 regulation_type=candidate['regulation_type']
             )
@@ -1135,45 +1304,65 @@ class RuleCompiler:
         return current
     
     async def _store_rules(self, rules: List[ComplianceRule]):
-        """Store validated rules in database"""
+        """
+        Store validated rules in database
+        
+        All rules are written by one multi-row upsert in a transaction and
+        cached with one Redis pipeline, so storing costs O(1) round trips.
+        """
+        if not rules:
+            return
+        
         try:
+            # One row per rule ID (last wins) so the upsert touches each row once
+            unique_rules = list({rule.rule_id: rule for rule in rules}.values())
+            rows = [
+                {
+                    'rule_id': rule.rule_id,
+                    'regulation_type': rule.regulation_type.value,
+                    'rule_type': rule.rule_type.value,
+                    'title': rule.title,
+                    'description': rule.description,
+                    'json_logic': rule.json_logic,
+                    'confidence_score': rule.confidence_score,
+                    'source_obligation_id': rule.source_obligation_id,
+                    'jurisdiction': rule.jurisdiction,
+                    'effective_date': rule.effective_date.isoformat() if rule.effective_date else None,
+                    'created_at': rule.created_at.isoformat(),
+                    'version': rule.version
+                }
+                for rule in unique_rules
+            ]
+            
             async with self.pg_pool.acquire() as conn:
-                for rule in rules:
+                async with conn.transaction():
                     await conn.execute("""
                         INSERT INTO regulatory_rules 
                         (rule_id, regulation_type, rule_type, title, description,
                          json_logic, confidence_score, source_obligation_id,
                          jurisdiction, effective_date, created_at, version)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+                        SELECT rule_id, regulation_type, rule_type, title, description,
+                               json_logic, confidence_score, source_obligation_id,
+                               jurisdiction, effective_date, created_at, version
+                        FROM jsonb_to_recordset($1::jsonb) AS r(
+                            rule_id text, regulation_type text, rule_type text, title text,
+                            description text, json_logic jsonb, confidence_score float8,
+                            source_obligation_id text, jurisdiction text,
+                            effective_date timestamptz, created_at timestamptz, version text
+                        )
                         ON CONFLICT (rule_id) DO UPDATE SET
                             json_logic = EXCLUDED.json_logic,
                             confidence_score = EXCLUDED.confidence_score,
                             updated_at = CURRENT_TIMESTAMP
-                    """,
-                        rule.rule_id,
-                        rule.regulation_type.value,
-                        rule.rule_type.value,
-                        rule.title,
-                        rule.description,
-                        json.dumps(rule.json_logic),
-                        rule.confidence_score,
-                        rule.source_obligation_id,
-                        rule.jurisdiction,
-                        rule.effective_date,
-                        rule.created_at,
-                        rule.version
-                    )
+                    """, json.dumps(rows, default=str))
             
-            # Cache rules in Redis for fast access
-            for rule in rules:
-                cache_key = f"rule:{rule.rule_id}"
-                self.redis_client.setex(
-                    cache_key,
-                    3600,  # 1 hour cache
-                    json.dumps(asdict(rule), default=str)
-                )
+            # Cache rules in Redis for fast access (one pipeline, 1 hour TTL)
+            await self.redis_client.set_many(
+                {f"rule:{rule.rule_id}": json.dumps(asdict(rule), default=str) for rule in unique_rules},
+                ttl=3600
+            )
             
-            self.logger.info(f"Stored {len(rules)} rules successfully")
+            self.logger.info(f"Stored {len(unique_rules)} rules successfully")
             
         except Exception as e:
             self.logger.error("Failed to store rules", error=str(e))
@@ -1221,7 +1410,9 @@ class RuleCompiler:
         """Get rule compilation statistics"""
         return {
             **self.compilation_stats,
-            'rules_in_cache': len(self.redis_client.keys("rule:*")) if self.redis_client else 0,
+            'llm_concurrency': self.llm_concurrency,
+            'obligation_repository': self.obligation_repository.get_metrics(),
+            'rules_in_cache': await self.redis_client.count_keys("rule:*") if self.redis_client else 0,
             'timestamp': datetime.now().isoformat()
         }
 
@@ -11,6 +11,7 @@ Key Features:
 - PDF/HTML document processing with multiple extraction methods
 - LangChain integration for document loading and text processing
 - SpaCy NLP for entity recognition and linguistic analysis
+- Shared, lazily loaded SpaCy pipeline from the process-wide model registry
 - OpenAI GPT-4 for advanced obligation extraction and confidence scoring
 - Structured obligation extraction with metadata
 - Version tracking and change detection
@@ -88,6 +89,9 @@ from urllib.parse import urljoin, urlparse
 # Import feed scheduler components
 from .feed_scheduler import FeedDocument, ProcessingStatus
 
+# Shared NLP models
+from .nlp_models import nlp_registry
+
 # Configure structured logging for document processing
 logger = structlog.get_logger(__name__)
 
@@ -343,12 +347,9 @@ class RegulatoryDocumentParser:
                 openai_api_key=os.getenv("OPENAI_API_KEY")
             )
             
-            # Initialize SpaCy NLP model for entity extraction
-            self.nlp = spacy.load("en_core_web_sm")
-            
-            # Add custom pipeline components for regulatory text
-            if "regulatory_entities" not in self.nlp.pipe_names:
-                self.nlp.add_pipe("regulatory_entities", last=True)
+            # Shared SpaCy pipeline for entity extraction, loaded on first use,
+            # with the custom regulatory entity component appended
+            self.nlp = nlp_registry.pipeline(components=("regulatory_entities",))
             
             # Initialize LangChain text splitters
             self.text_splitter = RecursiveCharacterTextSplitter(
@@ -357,10 +358,8 @@ class RegulatoryDocumentParser:
                 separators=["\n\n", "\n", ". ", " ", ""]
             )
             
-            self.spacy_splitter = SpacyTextSplitter(
-                chunk_size=2000,
-                chunk_overlap=200
-            )
+            # SpacyTextSplitter loads its own pipeline; built on first use
+            self._spacy_splitter: Optional[SpacyTextSplitter] = None
             
             # Create obligation extraction prompt template
             self.obligation_prompt = PromptTemplate(
@@ -411,6 +410,16 @@ Only extract clear, specific regulatory obligations. Exclude general statements
             self.logger.error("Failed to initialize AI models", error=str(e))
             raise
 
+    @property
+    def spacy_splitter(self) -> SpacyTextSplitter:
+        """Sentence-aware text splitter, created on first use"""
+        if self._spacy_splitter is None:
+            self._spacy_splitter = SpacyTextSplitter(
+                chunk_size=2000,
+                chunk_overlap=200
+            )
+        return self._spacy_splitter
+
     def _setup_document_tools(self):
         """
         Setup document processing tools and libraries
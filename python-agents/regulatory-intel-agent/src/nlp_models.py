@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+NLP Models - Shared, Lazily Loaded spaCy Model Registry
+=======================================================
+
+This module owns the spaCy pipelines used by the regulatory intelligence
+agent. The document parser and the intelligence service used to call
+spacy.load() in their constructors, so the process held one copy of the
+model per component and paid for each load at start-up. The registry loads
+each model once per process, on first use, and hands out lightweight
+per-caller views of the shared pipeline.
+
+Key Features:
+- One spaCy pipeline per model per process, loaded lazily and thread-safely
+- Per-caller views that skip the pipeline components the caller does not use
+- Custom components (e.g. regulatory_entities) added once and only run for
+  the callers that asked for them
+- Batched processing through nlp.pipe with a configurable batch size
+- preload() for pre-fork warm-up so forked workers share model pages
+  copy-on-write
+
+Rule Compliance:
+- Rule 1: No stubs - Real model loading and batched processing
+- Rule 2: Modular design - Components share models through one registry
+- Rule 13: Production grade - Thread-safe loading with load-time metrics
+- Rule 17: Extensive comments explaining all functionality
+"""
+
+import os
+import gc
+import time
+import threading
+from typing import Dict, List, Optional, Iterable, Iterator, Set, FrozenSet
+
+# NLP processing
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+
+# Monitoring and logging
+from prometheus_client import Histogram
+import structlog
+
+# Configure structured logging
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics for model loading
+try:
+    NLP_MODEL_LOAD_TIME = Histogram(
+        'regulatory_nlp_model_load_seconds',
+        'Time spent loading spaCy models',
+        ['model']
+    )
+except ValueError:
+    # Metric already exists, retrieve it from registry
+    from prometheus_client import REGISTRY
+    NLP_MODEL_LOAD_TIME = REGISTRY._names_to_collectors['regulatory_nlp_model_load_seconds']
+
+DEFAULT_SPACY_MODEL = os.getenv("REGULATORY_SPACY_MODEL", "en_core_web_sm")
+
+class SpacyPipeline:
+    """
+    A caller's view of a shared spaCy pipeline
+
+    Holds no model of its own: the pipeline is fetched from the registry on
+    first use, and the caller's disabled components (plus any custom
+    components other callers added that this caller did not ask for) are
+    skipped on every call.
+    """
+
+    def __init__(self, registry: 'NLPModelRegistry', model_name: str,
+                 disable: Iterable[str] = (), components: Iterable[str] = ()):
+        self.registry = registry
+        self.model_name = model_name
+        self.disable: FrozenSet[str] = frozenset(disable)
+        self.components: FrozenSet[str] = frozenset(components)
+
+    @property
+    def nlp(self) -> Language:
+        """The shared pipeline, loaded on first access"""
+        return self.registry.get_model(self.model_name, self.components)
+
+    @property
+    def vocab(self):
+        return self.nlp.vocab
+
+    @property
+    def pipe_names(self) -> List[str]:
+        """Components that run for this caller"""
+        disabled = self._disabled_components()
+        return [name for name in self.nlp.pipe_names if name not in disabled]
+
+    def _disabled_components(self) -> List[str]:
+        foreign = self.registry.custom_components(self.model_name) - self.components
+        return sorted(self.disable | foreign)
+
+    def __call__(self, text: str) -> Doc:
+        return self.nlp(text, disable=self._disabled_components())
+
+    def pipe(self, texts: Iterable[str], batch_size: Optional[int] = None) -> Iterator[Doc]:
+        """Process texts in batches through the shared pipeline"""
+        return self.nlp.pipe(
+            texts,
+            batch_size=batch_size or self.registry.batch_size,
+            disable=self._disabled_components()
+        )
+
+class NLPModelRegistry:
+    """
+    Process-wide registry of spaCy pipelines
+
+    Models are loaded at most once per process. Components that no caller
+    in the process needs can be excluded at load time
+    (REGULATORY_SPACY_EXCLUDE), which keeps their weights out of memory
+    entirely; everything else is skipped per caller through SpacyPipeline.
+    """
+
+    def __init__(self):
+        self.batch_size = int(os.getenv("REGULATORY_NLP_BATCH_SIZE", "32"))
+        self.exclude = [
+            name.strip() for name in os.getenv("REGULATORY_SPACY_EXCLUDE", "").split(",") if name.strip()
+        ]
+
+        self._models: Dict[str, Language] = {}
+        self._custom_components: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def pipeline(self, model_name: str = None, disable: Iterable[str] = (),
+                 components: Iterable[str] = ()) -> SpacyPipeline:
+        """
+        Get a caller view of a model without loading it
+
+        Args:
+            model_name: spaCy package name, defaults to REGULATORY_SPACY_MODEL
+            disable: Pipeline components this caller does not need
+            components: Registered custom components to append for this caller
+        """
+        return SpacyPipeline(self, model_name or DEFAULT_SPACY_MODEL, disable, components)
+
+    def get_model(self, model_name: str = None, components: Iterable[str] = ()) -> Language:
+        """Return the shared pipeline, loading it and adding components on first use"""
+        model_name = model_name or DEFAULT_SPACY_MODEL
+        nlp = self._models.get(model_name)
+        if nlp is not None and not set(components) - self._custom_components[model_name]:
+            return nlp
+
+        with self._lock:
+            nlp = self._models.get(model_name)
+            if nlp is None:
+                nlp = self._load_model(model_name)
+                self._custom_components[model_name] = set()
+                self._models[model_name] = nlp
+
+            for component in components:
+                if component not in nlp.pipe_names:
+                    nlp.add_pipe(component, last=True)
+                self._custom_components[model_name].add(component)
+
+            return nlp
+
+    def _load_model(self, model_name: str) -> Language:
+        start = time.perf_counter()
+        nlp = spacy.load(model_name, exclude=self.exclude)
+        elapsed = time.perf_counter() - start
+
+        NLP_MODEL_LOAD_TIME.labels(model=model_name).observe(elapsed)
+        logger.info(
+            "spaCy model loaded",
+            model=model_name,
+            pipes=nlp.pipe_names,
+            excluded=self.exclude,
+            seconds=round(elapsed, 3)
+        )
+        return nlp
+
+    def custom_components(self, model_name: str) -> Set[str]:
+        return set(self._custom_components.get(model_name, ()))
+
+    def loaded_models(self) -> List[str]:
+        return list(self._models)
+
+    def preload(self, model_names: Iterable[str] = None, components: Iterable[str] = ()):
+        """
+        Load models before worker processes are forked
+
+        Call from the master process (e.g. at import time under
+        gunicorn --preload) so workers inherit the loaded pipelines. Objects
+        are frozen out of the garbage collector afterwards; otherwise the
+        first collection in each worker touches every object header and
+        un-shares the pages.
+        """
+        for model_name in model_names or [DEFAULT_SPACY_MODEL]:
+            self.get_model(model_name, components)
+
+        gc.collect()
+        gc.freeze()
+        logger.info("NLP models preloaded", models=self.loaded_models())
+
+# Process-wide registry shared by all agent components
+nlp_registry = NLPModelRegistry()
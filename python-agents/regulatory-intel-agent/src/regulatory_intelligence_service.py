@@ -62,7 +62,6 @@ except ImportError:
         from langchain.text_splitter import RecursiveCharacterTextSplitter
         from langchain.schema import Document
         from langchain_openai import ChatOpenAI
-import spacy
 
 # Document processing libraries
 import requests
@@ -94,6 +93,7 @@ from .feed_scheduler import RegulatoryFeedScheduler
 from .document_parser import RegulatoryDocumentParser
 from .kafka_producer import RegulatoryKafkaProducer
 from .resilience_manager import ResilienceManager
+from .nlp_models import nlp_registry
 
 # Load environment variables
 load_dotenv()
@@ -119,6 +119,11 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+# Load NLP models at import time when requested, so workers forked from a
+# preloading master (gunicorn --preload) share the model pages copy-on-write
+if os.getenv("REGULATORY_NLP_PRELOAD", "false").lower() == "true":
+    nlp_registry.preload(components=("regulatory_entities",))
+
 # Prometheus metrics for monitoring regulatory intelligence performance
 # Initialize metrics with duplicate handling to prevent registry conflicts on restart
 try:
@@ -526,9 +531,9 @@ class RegulatoryIntelligenceAgent:
                     self.logger.error(f"Fallback initialization also failed: {str(e2)}")
                     raise Exception(f"Could not initialize OpenAI client. Please check API key and network connectivity. Error: {str(e)}")
             
-            # Initialize SpaCy NLP model for entity extraction
+            # Shared SpaCy pipeline for entity extraction, loaded on first use
             # Used for identifying regulatory entities, dates, and references
-            self.nlp_model = spacy.load("en_core_web_sm")
+            self.nlp_model = nlp_registry.pipeline()
             
             # Initialize LangChain text splitter for document processing
             # Handles large documents with proper chunking for AI processing
@@ -1503,6 +1503,23 @@ CREATE TABLE IF NOT EXISTS regulatory_rules (
     CONSTRAINT unique_active_rule UNIQUE (rule_name, jurisdiction, regulation_type) DEFERRABLE INITIALLY DEFERRED
 );
 
+-- Generated rule sets keyed by obligation content and generator version, so
+-- unchanged obligations are not re-run through NLP and the LLM
+CREATE TABLE IF NOT EXISTS rule_generation_cache (
+    cache_key VARCHAR(64) PRIMARY KEY, -- SHA-256 of content hash, regulation type, jurisdiction, generator version
+    content_hash VARCHAR(64) NOT NULL,
+    regulation_type VARCHAR(50) NOT NULL,
+    jurisdiction VARCHAR(10) NOT NULL,
+    generator_version VARCHAR(64) NOT NULL, -- Hash of model and prompt templates
+    generated_rules JSONB NOT NULL,
+    source_obligation_id VARCHAR(100),
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    last_hit_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_rule_generation_cache_version ON rule_generation_cache (generator_version);
+
 -- Table for managing jurisdiction-specific configurations
 CREATE TABLE IF NOT EXISTS regulatory_jurisdictions (
     jurisdiction_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -1619,7 +1636,23 @@ CREATE TABLE IF NOT EXISTS regulatory_audit_logs (
     -- Additional metadata
     user_agent TEXT,
     ip_address INET,
-    additional_context JSONB
+    additional_context JSONB,
+    
+    -- Hash-chained batch the event was sealed in (NULL for rows written before batching)
+    batch_id VARCHAR(100),
+    batch_position INTEGER
+);
+
+-- Hash-chained roots of sealed audit event batches, in chain order
+CREATE TABLE IF NOT EXISTS regulatory_audit_batches (
+    batch_sequence BIGSERIAL PRIMARY KEY,
+    batch_id VARCHAR(100) NOT NULL UNIQUE,
+    previous_root CHAR(64) NOT NULL,
+    root_hash CHAR(64) NOT NULL,
+    event_count INTEGER NOT NULL,
+    first_event_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_event_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
 );
 
 -- Table for managing regulatory deadlines and scheduling
@@ -1691,6 +1724,8 @@ CREATE INDEX IF NOT EXISTS idx_regulatory_audit_logs_entity ON regulatory_audit_
 CREATE INDEX IF NOT EXISTS idx_regulatory_audit_logs_occurred_at ON regulatory_audit_logs (occurred_at DESC);
 CREATE INDEX IF NOT EXISTS idx_regulatory_audit_logs_jurisdiction ON regulatory_audit_logs (jurisdiction);
 CREATE INDEX IF NOT EXISTS idx_regulatory_audit_logs_correlation ON regulatory_audit_logs (correlation_id);
+CREATE INDEX IF NOT EXISTS idx_regulatory_audit_logs_batch ON regulatory_audit_logs (batch_id, batch_position);
+CREATE INDEX IF NOT EXISTS idx_regulatory_audit_batches_event_range ON regulatory_audit_batches (last_event_at, first_event_at);
 
 CREATE INDEX IF NOT EXISTS idx_regulatory_deadlines_jurisdiction ON regulatory_deadlines (jurisdiction);
 CREATE INDEX IF NOT EXISTS idx_regulatory_deadlines_date ON regulatory_deadlines (deadline_date);
@@ -1764,6 +1799,7 @@ COMMENT ON TABLE regulatory_jurisdictions IS 'Configuration and metadata for dif
 COMMENT ON TABLE regulatory_feed_sources IS 'RSS/API feed sources for regulatory updates with health monitoring';
 COMMENT ON TABLE regulatory_reports IS 'Generated compliance reports (FINREP, COREP, DORA) with delivery tracking';
 COMMENT ON TABLE regulatory_audit_logs IS 'Comprehensive audit trail for all regulatory system activities';
+COMMENT ON TABLE regulatory_audit_batches IS 'Hash-chained roots of sealed audit event batches';
 COMMENT ON TABLE regulatory_deadlines IS 'Regulatory deadlines and automated scheduling for compliance activities';
 
 -- =====================================================
@@ -1863,6 +1899,7 @@ CREATE TABLE IF NOT EXISTS customer_jurisdictions (
     confidence_score DECIMAL(5,4) CHECK (confidence_score >= 0 AND confidence_score <= 1),
     detection_method VARCHAR(100) DEFAULT 'automated_analysis',
     detected_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    detection_fingerprint VARCHAR(64), -- SHA-256 of the detection result; unchanged results are not rewritten
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
@@ -2305,6 +2342,40 @@ CREATE TABLE IF NOT EXISTS finrep_data (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- COREP capital adequacy data, latest row per institution and period is reported
+CREATE TABLE IF NOT EXISTS corep_data (
+    data_id VARCHAR(100) PRIMARY KEY,
+    institution_id VARCHAR(50) NOT NULL REFERENCES institutions(institution_id),
+    reporting_period VARCHAR(20) NOT NULL,
+    tier1_capital DECIMAL(18,2) NOT NULL,
+    tier2_capital DECIMAL(18,2) NOT NULL,
+    total_capital DECIMAL(18,2) NOT NULL,
+    risk_weighted_assets DECIMAL(18,2) NOT NULL,
+    capital_ratio DECIMAL(7,2),
+    leverage_ratio DECIMAL(7,2),
+    liquidity_coverage_ratio DECIMAL(7,2),
+    data_source VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- DORA ICT risk data, latest row per institution and period is reported
+CREATE TABLE IF NOT EXISTS dora_ict_data (
+    data_id VARCHAR(100) PRIMARY KEY,
+    institution_id VARCHAR(50) NOT NULL REFERENCES institutions(institution_id),
+    reporting_period VARCHAR(20) NOT NULL,
+    ict_incidents_count INTEGER NOT NULL DEFAULT 0,
+    major_incidents_count INTEGER NOT NULL DEFAULT 0,
+    third_party_providers_count INTEGER NOT NULL DEFAULT 0,
+    critical_services_count INTEGER NOT NULL DEFAULT 0,
+    recovery_time_objective DECIMAL(7,2),
+    recovery_point_objective DECIMAL(7,2),
+    business_continuity_tests INTEGER NOT NULL DEFAULT 0,
+    data_source VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Indexes for Phase 4 tables
 CREATE INDEX IF NOT EXISTS idx_compliance_reports_type_period ON compliance_reports (report_type, reporting_period);
 CREATE INDEX IF NOT EXISTS idx_compliance_reports_institution ON compliance_reports (institution_id);
@@ -2317,12 +2388,16 @@ CREATE INDEX IF NOT EXISTS idx_institutions_active ON institutions (is_active);
 
 CREATE INDEX IF NOT EXISTS idx_finrep_data_institution_period ON finrep_data (institution_id, reporting_period);
 CREATE INDEX IF NOT EXISTS idx_finrep_data_created_at ON finrep_data (created_at);
+CREATE INDEX IF NOT EXISTS idx_corep_data_institution_period ON corep_data (institution_id, reporting_period, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_dora_ict_data_institution_period ON dora_ict_data (institution_id, reporting_period, created_at DESC);
 
 -- Triggers for updated_at columns on Phase 4 tables
 CREATE TRIGGER update_compliance_reports_updated_at BEFORE UPDATE ON compliance_reports FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_report_generation_status_updated_at BEFORE UPDATE ON report_generation_status FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_institutions_updated_at BEFORE UPDATE ON institutions FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_finrep_data_updated_at BEFORE UPDATE ON finrep_data FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_corep_data_updated_at BEFORE UPDATE ON corep_data FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_dora_ict_data_updated_at BEFORE UPDATE ON dora_ict_data FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 -- Insert default data for Phase 4
 
@@ -2416,16 +2491,19 @@ CREATE TABLE IF NOT EXISTS sla_definitions (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Raw SLA measurements, one partition per UTC day (sla_measurements_pYYYYMMDD).
+-- SLAMonitor creates partitions ahead of time and drops expired ones.
 CREATE TABLE IF NOT EXISTS sla_measurements (
-    measurement_id VARCHAR(50) PRIMARY KEY,
-    sla_id VARCHAR(50),
+    measurement_id VARCHAR(100) NOT NULL,
+    sla_id VARCHAR(100),
     service_name VARCHAR(100) NOT NULL,
     metric_type VARCHAR(50) NOT NULL,
-    value DECIMAL(15,6) NOT NULL,
-    timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    value DOUBLE PRECISION NOT NULL,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
     labels JSONB DEFAULT '{}',
-    metadata JSONB DEFAULT '{}'
-);
+    metadata JSONB DEFAULT '{}',
+    PRIMARY KEY (measurement_id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 CREATE TABLE IF NOT EXISTS sla_violations (
     violation_id VARCHAR(50) PRIMARY KEY,
@@ -2461,14 +2539,61 @@ CREATE TABLE IF NOT EXISTS performance_metric_definitions (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Raw performance metric data points, one partition per UTC day
+-- (performance_metrics_pYYYYMMDD). PerformanceTracker creates partitions
+-- ahead of time, drops expired ones and maintains the rollups below.
 CREATE TABLE IF NOT EXISTS performance_metrics (
-    metric_id VARCHAR(50) PRIMARY KEY,
-    metric_name VARCHAR(200) NOT NULL,
+    metric_id VARCHAR(100) NOT NULL,
+    metric_name VARCHAR(255) NOT NULL,
     value TEXT NOT NULL,
-    labels JSONB DEFAULT '{}',
-    timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    metadata JSONB DEFAULT '{}'
-);
+    labels JSONB NOT NULL DEFAULT '{}',
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    metadata JSONB DEFAULT '{}',
+    PRIMARY KEY (metric_id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+-- Continuous rollups of numeric performance metrics
+CREATE TABLE IF NOT EXISTS performance_metrics_rollup_1m (
+    metric_name VARCHAR(255) NOT NULL,
+    labels JSONB NOT NULL DEFAULT '{}',
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    sample_count BIGINT NOT NULL,
+    value_sum DOUBLE PRECISION NOT NULL,
+    value_min DOUBLE PRECISION NOT NULL,
+    value_max DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (metric_name, bucket, labels)
+);
+
+CREATE TABLE IF NOT EXISTS performance_metrics_rollup_1h (
+    metric_name VARCHAR(255) NOT NULL,
+    labels JSONB NOT NULL DEFAULT '{}',
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    sample_count BIGINT NOT NULL,
+    value_sum DOUBLE PRECISION NOT NULL,
+    value_min DOUBLE PRECISION NOT NULL,
+    value_max DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (metric_name, bucket, labels)
+);
+
+-- Initial daily partitions so writes succeed before the agent's first
+-- partition maintenance run
+DO $$
+DECLARE
+    parent TEXT;
+    partition_day DATE;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['performance_metrics', 'sla_measurements'] LOOP
+        partition_day := CURRENT_DATE - 1;
+        WHILE partition_day <= CURRENT_DATE + 3 LOOP
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                parent || '_p' || to_char(partition_day, 'YYYYMMDD'), parent,
+                partition_day::timestamptz, (partition_day + 1)::timestamptz
+            );
+            partition_day := partition_day + 1;
+        END LOOP;
+    END LOOP;
+END $$;
 
 CREATE TABLE IF NOT EXISTS performance_alerts (
     alert_id VARCHAR(50) PRIMARY KEY,
@@ -2763,18 +2888,25 @@ CREATE INDEX IF NOT EXISTS idx_delivery_tracking_report_id ON delivery_tracking(
 CREATE INDEX IF NOT EXISTS idx_delivery_tracking_status ON delivery_tracking(delivery_status);
 CREATE INDEX IF NOT EXISTS idx_delivery_tracking_channel ON delivery_tracking(delivery_channel);
 CREATE INDEX IF NOT EXISTS idx_delivery_tracking_created_at ON delivery_tracking(created_at);
+-- Keyset pagination for list_deliveries (newest first, optionally per status)
+CREATE INDEX IF NOT EXISTS idx_delivery_tracking_keyset ON delivery_tracking(created_at DESC, tracking_id DESC);
+CREATE INDEX IF NOT EXISTS idx_delivery_tracking_status_keyset ON delivery_tracking(delivery_status, created_at DESC, tracking_id DESC);
+-- Outstanding deliveries reloaded into the tracker's timer heap at start-up
+CREATE INDEX IF NOT EXISTS idx_delivery_tracking_outstanding ON delivery_tracking(created_at)
+    WHERE delivery_status IN ('PENDING', 'IN_PROGRESS', 'DELIVERED')
+       OR (delivery_status = 'FAILED' AND next_retry_at IS NOT NULL);
 
 -- SLA monitoring indexes
 CREATE INDEX IF NOT EXISTS idx_sla_definitions_service ON sla_definitions(service_name);
 CREATE INDEX IF NOT EXISTS idx_sla_definitions_active ON sla_definitions(is_active);
-CREATE INDEX IF NOT EXISTS idx_sla_measurements_service_type ON sla_measurements(service_name, metric_type);
-CREATE INDEX IF NOT EXISTS idx_sla_measurements_timestamp ON sla_measurements(timestamp);
+CREATE INDEX IF NOT EXISTS idx_sla_measurements_service_metric_time ON sla_measurements(service_name, metric_type, timestamp);
 CREATE INDEX IF NOT EXISTS idx_sla_violations_service ON sla_violations(service_name);
 CREATE INDEX IF NOT EXISTS idx_sla_violations_resolved ON sla_violations(resolved);
 
 -- Performance tracking indexes
-CREATE INDEX IF NOT EXISTS idx_performance_metrics_name ON performance_metrics(metric_name);
-CREATE INDEX IF NOT EXISTS idx_performance_metrics_timestamp ON performance_metrics(timestamp);
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_name_time ON performance_metrics(metric_name, timestamp);
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_rollup_1m_bucket ON performance_metrics_rollup_1m(bucket);
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_rollup_1h_bucket ON performance_metrics_rollup_1h(bucket);
 CREATE INDEX IF NOT EXISTS idx_performance_alerts_metric ON performance_alerts(metric_name);
 CREATE INDEX IF NOT EXISTS idx_performance_alerts_triggered ON performance_alerts(triggered_at);
 
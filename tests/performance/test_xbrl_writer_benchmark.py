@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+XBRL Serialisation Benchmark for Large COREP/FINREP Instances
+=============================================================
+
+This module benchmarks the streaming XBRL writer against the former
+ElementTree + minidom pretty-print path on large C 24.00 (large exposures,
+one context per counterparty) and F 18.00 (geographical breakdown, one
+context per country and sector) instance documents.
+
+Test Coverage Areas:
+- Identical pretty-printed output from both serialisation paths
+- Wall-clock time and peak traced memory per path
+- Streaming straight to a file without holding the document in memory
+
+Run directly for a standalone report:
+    python tests/performance/test_xbrl_writer_benchmark.py [counterparties]
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade benchmark
+- Rule 12: Automated testing - Comprehensive performance validation
+- Rule 17: Code documentation - Extensive benchmark documentation
+"""
+
+import pytest
+import io
+import time
+import tracemalloc
+import logging
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+from typing import Callable, Dict, Iterator, Tuple
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from xbrl_writer import XBRLStreamWriter, XML_DECLARATION
+
+# Configure test logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NAMESPACES = {
+    'xbrli': 'http://www.xbrl.org/2003/instance',
+    'link': 'http://www.xbrl.org/2003/linkbase',
+    'xlink': 'http://www.w3.org/1999/xlink',
+    'corep': 'http://www.eba.europa.eu/xbrl/crr/dict/dom/corep',
+    'finrep': 'http://www.eba.europa.eu/xbrl/crr/dict/dom/finrep',
+    'iso4217': 'http://www.xbrl.org/2003/iso4217'
+}
+SCHEMA = 'http://www.eba.europa.eu/eu/fr/xbrl/crr/fws/corep/its-005-2020/2021-06-30/mod/corep_cor.xsd'
+
+C24_CONCEPTS = ('corep:OriginalExposure', 'corep:ExposureValueBeforeCRM',
+                'corep:ExposureValueAfterCRM', 'corep:LargeExposuresAmount')
+F18_COUNTRIES = ('DE', 'FR', 'IT', 'ES', 'NL', 'BE', 'AT', 'IE', 'PT', 'FI', 'US', 'GB')
+F18_SECTORS = ('CentralBanks', 'GeneralGovernments', 'CreditInstitutions',
+               'OtherFinancialCorporations', 'NonFinancialCorporations', 'Households')
+F18_CONCEPTS = ('finrep:GrossCarryingAmountPerforming', 'finrep:GrossCarryingAmountNonPerforming',
+                'finrep:AccumulatedImpairment', 'finrep:CollateralReceived')
+
+def c24_rows(counterparties: int) -> Iterator[Tuple[str, Tuple[str, str], Dict[str, str]]]:
+    """(context id, scenario member, concept -> value) per C 24.00 counterparty"""
+    for i in range(counterparties):
+        values = {concept: str(1000000 + i * 37 + n) for n, concept in enumerate(C24_CONCEPTS)}
+        yield f'c{i}', ('corep:Counterparty', f'LEI{i:017d}'), values
+
+def f18_rows(multiplier: int) -> Iterator[Tuple[str, Tuple[str, str], Dict[str, str]]]:
+    """(context id, scenario member, concept -> value) per F 18.00 country/sector/bucket"""
+    i = 0
+    for bucket in range(multiplier):
+        for country in F18_COUNTRIES:
+            for sector in F18_SECTORS:
+                values = {concept: str(500000 + i * 11 + n) for n, concept in enumerate(F18_CONCEPTS)}
+                yield f'c{i}', ('finrep:GeographicalArea', f'{country}-{sector}-{bucket}'), values
+                i += 1
+
+def build_tree(rows) -> ET.Element:
+    """Baseline: build the full instance as an ElementTree"""
+    root = ET.Element('xbrli:xbrl')
+    for prefix, uri in NAMESPACES.items():
+        root.set(f'xmlns:{prefix}', uri)
+    ET.SubElement(root, 'link:schemaRef', {'xlink:type': 'simple', 'xlink:href': SCHEMA})
+    unit = ET.SubElement(root, 'xbrli:unit', {'id': 'EUR'})
+    ET.SubElement(unit, 'xbrli:measure').text = 'iso4217:EUR'
+    for context_id, member, values in rows:
+        context = ET.SubElement(root, 'xbrli:context', {'id': context_id})
+        entity = ET.SubElement(context, 'xbrli:entity')
+        identifier = ET.SubElement(entity, 'xbrli:identifier', {'scheme': 'http://www.eba.europa.eu'})
+        identifier.text = 'TEST001'
+        period = ET.SubElement(context, 'xbrli:period')
+        ET.SubElement(period, 'xbrli:instant').text = '2024-12-31'
+        scenario = ET.SubElement(context, 'xbrli:scenario')
+        ET.SubElement(scenario, member[0]).text = member[1]
+        for concept, value in values.items():
+            fact = ET.SubElement(root, concept, {'contextRef': context_id, 'unitRef': 'EUR', 'decimals': '0'})
+            fact.text = value
+    return root
+
+def minidom_serialise(rows) -> str:
+    """Former path: ET.tostring, minidom re-parse, pretty-print, line cleanup"""
+    root = build_tree(rows)
+    pretty_xml = minidom.parseString(ET.tostring(root, encoding='unicode')).toprettyxml(indent="  ")
+    lines = [line for line in pretty_xml.split('\n') if line.strip()]
+    lines[0] = XML_DECLARATION
+    return '\n'.join(lines)
+
+def stream_serialise(rows, output) -> int:
+    """Streaming path: contexts, units and facts written as produced"""
+    writer = XBRLStreamWriter(output)
+    writer.start_document('xbrli:xbrl', NAMESPACES, SCHEMA)
+    writer.unit('EUR', 'iso4217:EUR')
+    for context_id, member, values in rows:
+        writer.context(context_id, 'http://www.eba.europa.eu', 'TEST001', {'instant': '2024-12-31'},
+                       scenario=[member])
+        for concept, value in values.items():
+            writer.fact(concept, value, context_id, unit_ref='EUR', decimals='0')
+    writer.end_document()
+    return writer.facts_written
+
+def measure(func: Callable[[], object]) -> Tuple[object, float, int]:
+    """Run func once; return (result, seconds, peak traced bytes)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def compare(name: str, rows_factory: Callable[[], Iterator], tmp_dir: str) -> Dict[str, float]:
+    """Benchmark both paths on one instance and check they agree"""
+    expected, minidom_time, minidom_peak = measure(lambda: minidom_serialise(rows_factory()))
+
+    buffer = io.StringIO()
+    _, stream_time, _ = measure(lambda: stream_serialise(rows_factory(), buffer))
+    assert buffer.getvalue() == expected
+
+    path = os.path.join(tmp_dir, f'{name}.xbrl')
+    with open(path, 'w', encoding='utf-8') as output:
+        facts, file_time, file_peak = measure(lambda: stream_serialise(rows_factory(), output))
+
+    result = {
+        'facts': facts,
+        'bytes': len(expected),
+        'minidom_seconds': minidom_time,
+        'stream_seconds': stream_time,
+        'file_seconds': file_time,
+        'minidom_peak_mb': minidom_peak / 1e6,
+        'file_peak_mb': file_peak / 1e6
+    }
+    logger.info(f"{name}: " + ', '.join(f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                                       for key, value in result.items()))
+    return result
+
+class TestXBRLWriterBenchmark:
+    """Benchmark suite for streaming XBRL serialisation"""
+
+    @pytest.mark.load_test
+    def test_large_c_24_00_instance(self, tmp_path):
+        """C 24.00 with 5,000 counterparties"""
+        result = compare('C_24_00', lambda: c24_rows(5000), str(tmp_path))
+        assert result['stream_seconds'] < result['minidom_seconds']
+        assert result['file_peak_mb'] < result['minidom_peak_mb'] / 10
+
+    @pytest.mark.load_test
+    def test_large_f_18_00_instance(self, tmp_path):
+        """F 18.00 with 12 countries x 6 sectors x 60 buckets"""
+        result = compare('F_18_00', lambda: f18_rows(60), str(tmp_path))
+        assert result['stream_seconds'] < result['minidom_seconds']
+        assert result['file_peak_mb'] < result['minidom_peak_mb'] / 10
+
+if __name__ == '__main__':
+    import tempfile
+    counterparties = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        compare('C_24_00', lambda: c24_rows(counterparties), tmp_dir)
+        compare('F_18_00', lambda: f18_rows(max(1, counterparties // 72)), tmp_dir)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Async Redis Client
+=====================================
+
+This module provides unit testing for the shared non-blocking Redis client
+used by the intelligence agent's components.
+
+Test Coverage Areas:
+- MGET batching and SCAN-based bulk deletes
+- Client-side cache hits, tracked prefixes and invalidation races
+- Invalidation listener setup (BCAST tracking redirected to a subscriber)
+- Tracking connection health checks and reconnection
+- CacheManager rule invalidation through the async client
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+import json
+from unittest.mock import AsyncMock
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src.async_redis import AsyncRedisClient, INVALIDATION_CHANNEL
+from src.kafka_consumer import CacheManager
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class _FakeServer:
+    """In-memory stand-in for the redis.asyncio client (no Redis server here)"""
+
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+        self.get = AsyncMock(side_effect=lambda key: self.data.get(key))
+        self.mget = AsyncMock(side_effect=lambda keys: [self.data.get(key) for key in keys])
+        self.unlink = AsyncMock(side_effect=self._remove)
+        self.delete = AsyncMock(side_effect=self._remove)
+
+    def _remove(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    async def scan_iter(self, match, count=None):
+        prefix = match.rstrip('*')
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+class _FakeConnection:
+    """Dedicated connection replaying canned responses, then blocking"""
+
+    def __init__(self, responses):
+        self.commands = []
+        self.responses = list(responses)
+        self.closed = False
+
+    async def connect(self):
+        pass
+
+    async def send_command(self, *args):
+        self.commands.append(args)
+
+    async def read_response(self):
+        if self.responses:
+            return self.responses.pop(0)
+        await asyncio.Event().wait()
+
+    async def disconnect(self):
+        self.closed = True
+
+def _client(data=None, **kwargs):
+    client = AsyncRedisClient(host='localhost', port=6379, **kwargs)
+    client.config['batch_size'] = 2
+    client.redis = _FakeServer(data)
+    return client
+
+class TestAsyncRedisClient:
+    """Test suite for AsyncRedisClient"""
+
+    @pytest.mark.asyncio
+    async def test_get_many_batches_mget(self):
+        """Keys are fetched with one MGET per batch"""
+        client = _client({'a': '1', 'b': '2', 'c': '3'})
+
+        values = await client.get_many(['a', 'b', 'c', 'd'])
+
+        assert values == {'a': '1', 'b': '2', 'c': '3', 'd': None}
+        assert client.redis.mget.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_matching_scans_and_unlinks(self):
+        """Matching keys are unlinked in batches; others are left alone"""
+        client = _client({'rule:1': 'x', 'rule:2': 'y', 'rule:3': 'z', 'other': 'w'})
+
+        assert await client.count_keys('rule:*') == 3
+        assert await client.delete_matching('rule:*') == 3
+        assert client.redis.data == {'other': 'w'}
+        assert client.redis.unlink.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_client_cache_serves_tracked_prefixes(self):
+        """Tracked keys are served locally until invalidated; others always hit Redis"""
+        client = _client({'rule:1': 'cached', 'other': 'plain'}, cache_prefixes=['rule:'])
+        client._reset_local_cache(ready=True)
+
+        assert await client.get('rule:1') == 'cached'
+        assert await client.get('rule:1') == 'cached'
+        assert await client.get('other') == 'plain'
+        assert await client.get('other') == 'plain'
+        assert client.redis.get.await_count == 3
+        assert client.metrics['client_cache_hits'] == 1
+
+        client.redis.data['rule:1'] = 'changed'
+        client._invalidate(['rule:1'])
+        assert await client.get('rule:1') == 'changed'
+
+    @pytest.mark.asyncio
+    async def test_read_racing_invalidation_not_cached(self):
+        """A value read while an invalidation arrives is returned but not cached"""
+        client = _client({'rule:1': 'old'}, cache_prefixes=['rule:'])
+        client._reset_local_cache(ready=True)
+
+        async def get_then_invalidate(key):
+            client._invalidate([key])
+            return 'old'
+
+        client.redis.get = AsyncMock(side_effect=get_then_invalidate)
+        assert await client.get('rule:1') == 'old'
+        assert client._local == {}
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled_until_listener_ready(self):
+        """Without a tracking subscription nothing is cached"""
+        client = _client({'rule:1': 'value'}, cache_prefixes=['rule:'])
+
+        await client.get('rule:1')
+        await client.get('rule:1')
+
+        assert client.redis.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_listener(self, monkeypatch):
+        """Tracking is redirected to the subscriber and invalidations evict keys"""
+        client = _client(client_cache=True, cache_prefixes=['rule:', 'jurisdiction:resolution:'])
+        subscriber = _FakeConnection([
+            42,
+            ['subscribe', INVALIDATION_CHANNEL, 1],
+            ['message', INVALIDATION_CHANNEL, ['rule:1']]
+        ])
+        tracker = _FakeConnection(['OK'])
+        connections = iter([subscriber, tracker])
+        monkeypatch.setattr(client, '_connection', lambda: next(connections))
+
+        client._local['rule:1'] = ('value', float('inf'))
+        client._local['rule:2'] = ('value', float('inf'))
+        await client.start()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert tracker.commands == [(
+            'CLIENT', 'TRACKING', 'ON', 'REDIRECT', 42, 'BCAST',
+            'PREFIX', 'rule:', 'PREFIX', 'jurisdiction:resolution:'
+        )]
+        assert client.metrics['invalidations'] == 1
+        assert client._local_ready
+        assert list(client._local) == []
+
+        client._invalidation_task.cancel()
+        await asyncio.gather(client._invalidation_task, return_exceptions=True)
+        assert not client._local_ready
+        assert subscriber.closed and tracker.closed
+
+    @pytest.mark.asyncio
+    async def test_lost_tracking_disables_cache_and_reconnects(self, monkeypatch):
+        """A tracking connection that stops tracking clears the cache and both connections are replaced"""
+        client = _client(client_cache=True, cache_prefixes=['rule:'])
+        client.config['tracking_check_interval'] = 0.01
+        tracking_on = ['flags', ['on', 'bcast'], 'redirect', 42, 'prefixes', ['rule:']]
+        first_subscriber = _FakeConnection([42, ['subscribe', INVALIDATION_CHANNEL, 1]])
+        # Tracking is on at the first check, then the server reports it off
+        first_tracker = _FakeConnection(['OK', tracking_on, ['flags', ['off'], 'redirect', -1]])
+        second_subscriber = _FakeConnection([43, ['subscribe', INVALIDATION_CHANNEL, 1]])
+        second_tracker = _FakeConnection(['OK'])
+        connections = iter([first_subscriber, first_tracker, second_subscriber, second_tracker])
+        monkeypatch.setattr(client, '_connection', lambda: next(connections))
+
+        await client.start()
+        try:
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert client._local_ready
+            client._local['rule:1'] = ('value', float('inf'))
+
+            await asyncio.sleep(0.05)
+            assert not client._local_ready
+            assert client._local == {}
+            assert first_subscriber.closed and first_tracker.closed
+            assert first_tracker.commands[1:] == [('CLIENT', 'TRACKINGINFO')] * 2
+            assert client.metrics['listener_reconnects'] == 1
+
+            # After the retry delay both connections are replaced
+            for _ in range(30):
+                if client._local_ready:
+                    break
+                await asyncio.sleep(0.1)
+            assert client._local_ready
+            assert second_tracker.commands[0][:5] == ('CLIENT', 'TRACKING', 'ON', 'REDIRECT', 43)
+        finally:
+            client._invalidation_task.cancel()
+            await asyncio.gather(client._invalidation_task, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_unresponsive_tracker_detected(self, monkeypatch):
+        """A tracking connection that stops answering disables the local cache"""
+        client = _client(client_cache=True, cache_prefixes=['rule:'])
+        client.config['tracking_check_interval'] = 0.01
+        client.config['pool_timeout'] = 0.02
+        subscriber = _FakeConnection([42, ['subscribe', INVALIDATION_CHANNEL, 1]])
+        tracker = _FakeConnection(['OK'])
+        connections = iter([subscriber, tracker])
+        monkeypatch.setattr(client, '_connection', lambda: next(connections))
+
+        await client.start()
+        try:
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert client._local_ready
+
+            await asyncio.sleep(0.1)
+            assert not client._local_ready
+            assert tracker.closed and subscriber.closed
+        finally:
+            client._invalidation_task.cancel()
+            await asyncio.gather(client._invalidation_task, return_exceptions=True)
+
+class TestCacheManager:
+    """Test suite for CacheManager over the async client"""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_rules_for_obligation(self):
+        """Only rules compiled from the obligation are deleted"""
+        client = _client({
+            'rule:R1': json.dumps({'source_obligation_id': 'OBL-1'}),
+            'rule:R2': json.dumps({'source_obligation_id': 'OBL-2'}),
+            'rule:R3': json.dumps({'source_obligation_id': 'OBL-1'}),
+            'refresh_lock:OBL-1': 'locked'
+        })
+        manager = CacheManager(client)
+
+        await manager.invalidate_rules_for_obligation('OBL-1')
+
+        assert sorted(client.redis.data) == ['refresh_lock:OBL-1', 'rule:R2']
+        client.redis.delete.assert_awaited_once_with('rule:R1', 'rule:R3')
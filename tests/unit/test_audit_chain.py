@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Audit Hash Chain
+===============================
+
+This module provides unit testing for the batch sealing and verification
+functions behind AuditLogger's hash-chained audit integrity.
+
+Test Coverage Areas:
+- Canonical event serialisation compatibility with stored JSON states
+- Batch sealing with and without encryption
+- Chain root sensitivity to content, order and previous root
+- Batch verification of tampered and missing events
+- Process pool execution of sealing
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import json
+import base64
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent/src'))
+
+from cryptography.fernet import Fernet
+from audit_chain import (
+    GENESIS_ROOT, AuditCryptoPool, canonical_event_json, compute_batch_root,
+    event_hash, seal_events, verify_batch, verify_events
+)
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+HMAC_KEY = b'test_hmac_key'
+
+def _fields(i, operation='update'):
+    return (f"evt-{i}", 'rule_updated', '2026-01-01T00:00:00+00:00', 'rule_compiler',
+            operation, 'rule', f"rule-{i}", {'version': i}, {'version': i + 1})
+
+class TestAuditChain:
+    """
+    Test suite for audit_chain
+
+    Exercises the pure functions exactly as the crypto pool runs them.
+    """
+
+    def test_canonical_json_accepts_stored_json_text(self):
+        """States read back as JSON text hash the same as the original dicts"""
+        fields = _fields(1)
+        stored = fields[:7] + (json.dumps(fields[7]), json.dumps(fields[8]))
+
+        assert canonical_event_json(fields) == canonical_event_json(stored)
+        assert event_hash(HMAC_KEY, fields) == event_hash(HMAC_KEY, stored)
+
+    def test_seal_events_encrypts_states(self):
+        """Sealing returns hashes and decryptable state ciphertexts"""
+        key = Fernet.generate_key()
+        sealed = seal_events(HMAC_KEY, key, [_fields(1), _fields(2)])
+
+        assert [s[0] for s in sealed] == [event_hash(HMAC_KEY, _fields(i)) for i in (1, 2)]
+        token = base64.urlsafe_b64decode(sealed[0][2].encode())
+        assert json.loads(Fernet(key).decrypt(token)) == {'version': 2}
+
+    def test_seal_events_without_encryption_key(self):
+        """Encryption is skipped when no key is configured"""
+        sealed = seal_events(HMAC_KEY, None, [_fields(1)])
+        assert sealed[0][1] is None and sealed[0][2] is None
+
+    def test_batch_root_depends_on_order_and_previous_root(self):
+        """Roots change when events are reordered or the chain is spliced"""
+        hashes = [event_hash(HMAC_KEY, _fields(i)) for i in range(3)]
+        root = compute_batch_root(HMAC_KEY, GENESIS_ROOT, 'batch-1', hashes)
+
+        assert root != compute_batch_root(HMAC_KEY, GENESIS_ROOT, 'batch-1', list(reversed(hashes)))
+        assert root != compute_batch_root(HMAC_KEY, 'f' * 64, 'batch-1', hashes)
+        assert root != compute_batch_root(HMAC_KEY, GENESIS_ROOT, 'batch-1', hashes[:2])
+
+    def test_verify_batch_detects_tampering_and_missing_events(self):
+        """Altered event content and deleted events both invalidate the root"""
+        events = [_fields(i) for i in range(3)]
+        hashes = [event_hash(HMAC_KEY, f) for f in events]
+        root = compute_batch_root(HMAC_KEY, GENESIS_ROOT, 'batch-1', hashes)
+        stored = list(zip(events, hashes))
+
+        intact = verify_batch(HMAC_KEY, 'batch-1', GENESIS_ROOT, root, 3, stored)
+        assert intact == {'root_valid': True, 'invalid_event_ids': [], 'missing_events': 0}
+
+        tampered = list(stored)
+        tampered[1] = (_fields(1, operation='delete'), hashes[1])
+        result = verify_batch(HMAC_KEY, 'batch-1', GENESIS_ROOT, root, 3, tampered)
+        assert not result['root_valid']
+        assert result['invalid_event_ids'] == ['evt-1']
+
+        result = verify_batch(HMAC_KEY, 'batch-1', GENESIS_ROOT, root, 3, stored[1:])
+        assert not result['root_valid']
+        assert result['missing_events'] == 1
+
+    def test_verify_events_checks_stored_hashes(self):
+        """Per-event verification compares against stored hashes"""
+        fields = _fields(1)
+        assert verify_events(HMAC_KEY, [(fields, event_hash(HMAC_KEY, fields)), (fields, 'bad')]) == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_crypto_pool_runs_in_worker_processes(self):
+        """Pool execution matches inline execution"""
+        pool = AuditCryptoPool(max_workers=1)
+        try:
+            sealed = await pool.run(seal_events, HMAC_KEY, None, [_fields(1)])
+        finally:
+            pool.shutdown()
+
+        inline = await AuditCryptoPool(max_workers=0).run(seal_events, HMAC_KEY, None, [_fields(1)])
+        assert sealed == inline
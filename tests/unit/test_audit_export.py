@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Streaming Audit Export
+=====================================
+
+This module provides unit testing for the incremental export writers used by
+AuditLogger.export_audit_trail.
+
+Test Coverage Areas:
+- JSON Lines, JSON, CSV and XML documents written batch by batch
+- Gzip compression of export files
+- File rotation by record count and the export manifest
+- Empty exports and unsupported formats
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import csv
+import gzip
+import json
+import hashlib
+import logging
+import xml.etree.ElementTree as ET
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent/src'))
+
+from audit_export import StreamingExportSink
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+METADATA = {'export_id': 'exp-1', 'created_by': 'auditor'}
+
+def _rows(start, count):
+    return [
+        {'event_id': f"evt-{i}", 'severity': 'info', 'after_state': {'value': i}, 'user_id': None}
+        for i in range(start, start + count)
+    ]
+
+class TestStreamingExportSink:
+    """
+    Test suite for StreamingExportSink
+
+    Batches are fed exactly as AuditLogger feeds them from its cursor.
+    """
+
+    @pytest.mark.asyncio
+    async def test_jsonl_export_written_incrementally(self, tmp_path):
+        """Each batch is appended as JSON Lines"""
+        sink = StreamingExportSink(tmp_path, 'exp-1', 'jsonl', METADATA)
+        await sink.write_batch(_rows(0, 3))
+        await sink.write_batch(_rows(3, 2))
+        parts = await sink.finish()
+
+        assert len(parts) == 1
+        with open(sink.primary_path) as f:
+            lines = [json.loads(line) for line in f]
+        assert [line['event_id'] for line in lines] == [f"evt-{i}" for i in range(5)]
+        assert sink.total_records == 5
+        assert sink.total_size == os.path.getsize(sink.primary_path)
+
+    @pytest.mark.asyncio
+    async def test_json_export_is_valid_document(self, tmp_path):
+        """JSON exports keep the audit_events/export_metadata layout"""
+        sink = StreamingExportSink(tmp_path, 'exp-1', 'json', METADATA)
+        await sink.write_batch(_rows(0, 2))
+        await sink.write_batch(_rows(2, 2))
+        await sink.finish()
+
+        with open(sink.primary_path) as f:
+            document = json.load(f)
+        assert len(document['audit_events']) == 4
+        assert document['audit_events'][1]['after_state'] == {'value': 1}
+        assert document['export_metadata']['total_records'] == 4
+        assert document['export_metadata']['created_by'] == 'auditor'
+
+    @pytest.mark.asyncio
+    async def test_csv_export_flattens_values(self, tmp_path):
+        """CSV columns come from the first row and nested values become JSON"""
+        sink = StreamingExportSink(tmp_path, 'exp-1', 'csv', METADATA)
+        await sink.write_batch(_rows(0, 2))
+        await sink.finish()
+
+        with open(sink.primary_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 2
+        assert rows[0]['after_state'] == '{"value": 0}'
+        assert rows[0]['user_id'] == ''
+
+    @pytest.mark.asyncio
+    async def test_xml_export_escapes_content(self, tmp_path):
+        """XML exports are well-formed even with markup in values"""
+        sink = StreamingExportSink(tmp_path, 'exp-1', 'xml', METADATA)
+        await sink.write_batch([{'event_id': 'evt-<1>', 'operation': 'a & b'}])
+        await sink.finish()
+
+        root = ET.parse(sink.primary_path).getroot()
+        assert root.find('events/event/event_id').text == 'evt-<1>'
+        assert root.find('events/event/operation').text == 'a & b'
+        assert root.find('metadata/total_records').text == '1'
+
+    @pytest.mark.asyncio
+    async def test_rotation_writes_parts_and_manifest(self, tmp_path):
+        """Rotated exports produce complete parts described by a manifest"""
+        sink = StreamingExportSink(tmp_path, 'exp-1', 'json', METADATA,
+                                   compress=True, max_records_per_file=2)
+        await sink.write_batch(_rows(0, 3))
+        await sink.write_batch(_rows(3, 2))
+        parts = await sink.finish()
+
+        assert [part.records for part in parts] == [2, 2, 1]
+        assert sink.primary_path.endswith('audit_export_exp-1.manifest.json')
+
+        with open(sink.primary_path) as f:
+            manifest = json.load(f)
+        assert manifest['export_metadata']['total_records'] == 5
+        assert manifest['compressed'] is True
+
+        for part in manifest['parts']:
+            assert part['path'].endswith('.json.gz')
+            with gzip.open(part['path'], 'rt', encoding='utf-8') as f:
+                content = f.read()
+            assert hashlib.sha256(content.encode('utf-8')).hexdigest() == part['content_sha256']
+            assert len(json.loads(content)['audit_events']) == part['records']
+
+    @pytest.mark.asyncio
+    async def test_empty_export_produces_document(self, tmp_path):
+        """An export with no matching events still yields a valid file"""
+        sink = StreamingExportSink(tmp_path, 'exp-1', 'json', METADATA)
+        parts = await sink.finish()
+
+        assert len(parts) == 1
+        with open(sink.primary_path) as f:
+            document = json.load(f)
+        assert document['audit_events'] == []
+        assert document['export_metadata']['total_records'] == 0
+
+    def test_unsupported_format_rejected(self, tmp_path):
+        """Unknown formats fail before any file is created"""
+        with pytest.raises(ValueError):
+            StreamingExportSink(tmp_path, 'exp-1', 'pdf', METADATA)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Audit Spill Journal
+==================================
+
+This module provides unit testing for the spill-to-disk journal AuditLogger
+uses while PostgreSQL is unavailable.
+
+Test Coverage Areas:
+- Durable append and ordered replay
+- Resuming an interrupted replay without duplicates
+- Segment rotation and disk budget enforcement
+- Idempotent AuditLogger replay after a crash between commit and progress marker
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import Mock
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent/src'))
+
+import asyncpg
+from audit_journal import AuditSpillJournal, JournalFullError
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+from src.audit_chain import AuditCryptoPool
+from src.audit_logger import (
+    AuditLogger, AuditEvent, AuditEventType, AuditSeverity, AuditStatus
+)
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def _events(start, count):
+    return [{'event_id': f"evt-{i}", 'operation': 'update'} for i in range(start, start + count)]
+
+class _FakeAuditDatabase:
+    """Audit tables with a unique event_id, evaluating AuditLogger's statements"""
+
+    def __init__(self):
+        self.logs = {}
+        self.batches = []
+
+    async def execute(self, query, *args):
+        if 'INSERT INTO regulatory_audit_batches' in query:
+            self.batches.append(args)
+
+    async def fetch(self, query, event_ids):
+        return [{'event_id': event_id} for event_id in event_ids if event_id in self.logs]
+
+    async def fetchval(self, query):
+        return self.batches[-1][2] if self.batches else None
+
+    async def copy_records_to_table(self, table, records, columns):
+        for record in records:
+            if record[0] in self.logs:
+                raise asyncpg.exceptions.UniqueViolationError('duplicate key value violates unique constraint')
+        for record in records:
+            self.logs[record[0]] = record
+
+    @asynccontextmanager
+    async def transaction(self):
+        logs, batches = dict(self.logs), list(self.batches)
+        try:
+            yield
+        except BaseException:
+            self.logs, self.batches = logs, batches
+            raise
+
+    def pool(self):
+        @asynccontextmanager
+        async def acquire():
+            yield self
+        return Mock(acquire=acquire)
+
+def _audit_logger(database):
+    audit_logger = AuditLogger()
+    audit_logger.integrity_manager.crypto_pool = AuditCryptoPool(max_workers=0)
+    audit_logger.pg_pool = database.pool()
+    return audit_logger
+
+def _audit_record(audit_logger, i):
+    return audit_logger._event_to_journal(AuditEvent(
+        event_id=f"evt-{i}", event_type=AuditEventType.RULE_UPDATED, severity=AuditSeverity.INFO,
+        status=AuditStatus.SUCCESS, timestamp=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        correlation_id='corr', session_id=None, user_id=None, component='rule_compiler',
+        operation='update', resource_type='rule', resource_id=f"rule-{i}", before_state=None,
+        after_state={'version': i}, change_summary=None, metadata={}, ip_address=None,
+        user_agent=None, request_id=None, duration_ms=None, error_details=None, tags=[]
+    ))
+
+class TestAuditSpillJournal:
+    """Test suite for AuditSpillJournal"""
+
+    @pytest.mark.asyncio
+    async def test_replay_in_order_and_retire_segments(self, tmp_path):
+        """Journalled events are replayed oldest first and then removed"""
+        journal = AuditSpillJournal(tmp_path)
+        await journal.append(_events(0, 3))
+        await journal.append(_events(3, 2))
+
+        replayed = []
+
+        async def handler(batch):
+            replayed.extend(event['event_id'] for event in batch)
+
+        assert await journal.replay(handler, batch_size=2) == 5
+        assert replayed == [f"evt-{i}" for i in range(5)]
+        assert not journal.has_pending()
+
+    @pytest.mark.asyncio
+    async def test_interrupted_replay_resumes_without_duplicates(self, tmp_path):
+        """A replay that fails midway resumes after the last flushed batch"""
+        journal = AuditSpillJournal(tmp_path)
+        await journal.append(_events(0, 6))
+
+        replayed = []
+        calls = {'count': 0}
+
+        async def flaky_handler(batch):
+            calls['count'] += 1
+            if calls['count'] == 2:
+                raise ConnectionError('database down')
+            replayed.extend(event['event_id'] for event in batch)
+
+        assert await journal.replay(flaky_handler, batch_size=2) == 2
+        assert journal.has_pending()
+        assert journal.get_stats()['replay_failures'] == 1
+
+        assert await journal.replay(flaky_handler, batch_size=2) == 4
+        assert replayed == [f"evt-{i}" for i in range(6)]
+        assert not journal.has_pending()
+
+    @pytest.mark.asyncio
+    async def test_appends_after_replay_start_use_new_segment(self, tmp_path):
+        """Events appended during a replay are not lost when segments retire"""
+        journal = AuditSpillJournal(tmp_path)
+        await journal.append(_events(0, 1))
+
+        async def handler(batch):
+            await journal.append(_events(100, 1))
+
+        await journal.replay(handler)
+        assert journal.has_pending()
+        assert journal.get_stats()['segments'] == 1
+
+    @pytest.mark.asyncio
+    async def test_segment_rotation_and_budget(self, tmp_path):
+        """Segments rotate by size and the total budget is enforced"""
+        journal = AuditSpillJournal(tmp_path, max_segment_bytes=50, max_total_bytes=400)
+        await journal.append(_events(0, 2))
+        await journal.append(_events(2, 2))
+        assert journal.get_stats()['segments'] == 2
+
+        with pytest.raises(JournalFullError):
+            await journal.append(_events(4, 10))
+
+class TestAuditLoggerReplay:
+    """Journal replay through AuditLogger"""
+
+    @pytest.mark.asyncio
+    async def test_replay_after_crash_between_commit_and_offset(self, tmp_path):
+        """A batch committed before the progress marker was written replays without duplicates"""
+        database = _FakeAuditDatabase()
+        audit_logger = _audit_logger(database)
+        journal = AuditSpillJournal(tmp_path)
+        await journal.append([_audit_record(audit_logger, i) for i in range(5)])
+
+        async def commit_then_crash(batch):
+            await audit_logger._replay_journal_batch(batch)
+            raise SystemError('process killed before the offset was written')
+
+        assert await journal.replay(commit_then_crash, batch_size=3) == 0
+        assert sorted(database.logs) == ['evt-0', 'evt-1', 'evt-2']
+
+        # Restart: a fresh journal over the same directory replays from the start
+        restarted = AuditSpillJournal(tmp_path)
+        assert await restarted.replay(audit_logger._replay_journal_batch, batch_size=3) == 5
+
+        assert sorted(database.logs) == [f"evt-{i}" for i in range(5)]
+        assert [batch[3] for batch in database.batches] == [3, 2]
+        assert [database.logs[f"evt-{i}"][-1] for i in (3, 4)] == [0, 1]
+        assert audit_logger.audit_stats['duplicate_events_skipped'] == 3
+        assert not restarted.has_pending()
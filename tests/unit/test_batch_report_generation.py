@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Batch Report Generation
+======================================
+
+This module provides unit testing for ComplianceReportGenerator's batch API
+used for quarter-end group reporting across many institutions and templates.
+
+Test Coverage Areas:
+- Set-based data prefetch in request order, one query per report type
+- Per-item results for completed, invalid and unknown-template requests
+- Bulk status and file record writes
+- Rendering in the process pool and inline
+- ReportScheduler batching ready jobs into one generation call
+- Per-job resource allocation within a batch and tracked retry tasks
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from unittest.mock import Mock, AsyncMock, MagicMock
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from compliance_report_generator import (
+    BatchReportResult, ComplianceReportGenerator, CSVTemplate, ReportFormat, ReportRequest,
+    ReportResult, ReportStatus, ReportType, COREP_DATA_DEFAULTS
+)
+from report_scheduler import JobStatus, ReportScheduler, ScheduledJob
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def _csv_template(tmp_path) -> CSVTemplate:
+    template = CSVTemplate(str(tmp_path / 'finrep.json'), '1.0')
+    template.headers = ['institution_code', 'total_assets', 'total_equity']
+    template.validation_rules = {'total_assets': {'type': 'number', 'min': 0}}
+    return template
+
+def _request(institution_id: str, report_type: ReportType = ReportType.FINREP) -> ReportRequest:
+    return ReportRequest(
+        report_id=f"{report_type.value}_2024-Q4_{institution_id}",
+        report_type=report_type,
+        format=ReportFormat.CSV,
+        reporting_period='2024-Q4',
+        institution_id=institution_id,
+        jurisdiction='DE',
+        template_version='1.0',
+        data_sources=['database'],
+        delivery_method='SFTP',
+        deadline=datetime(2025, 2, 12, tzinfo=timezone.utc)
+    )
+
+def _fake_pool(institutions, finrep_rows, corep_rows=(), dora_rows=()):
+    conn = MagicMock()
+
+    async def fetch(sql, *args):
+        if 'FROM institutions' in sql:
+            return institutions
+        if 'FROM corep_data' in sql:
+            return list(corep_rows)
+        if 'FROM dora_ict_data' in sql:
+            return list(dora_rows)
+        return finrep_rows
+
+    conn.fetch = AsyncMock(side_effect=fetch)
+    conn.executemany = AsyncMock()
+    acquire = MagicMock()
+    acquire.__aenter__ = AsyncMock(return_value=conn)
+    acquire.__aexit__ = AsyncMock(return_value=False)
+    pool = MagicMock()
+    pool.acquire = Mock(return_value=acquire)
+    pool.close = AsyncMock()
+    return pool, conn
+
+def _generator(tmp_path, workers: int):
+    generator = ComplianceReportGenerator(hub=Mock())
+    generator.config['output_dir'] = str(tmp_path)
+    generator.config['render_workers'] = workers
+    generator.config['render_chunk_size'] = 1
+    generator.templates['csv_finrep'] = _csv_template(tmp_path)
+
+    institutions = [
+        {'institution_id': 'INST1', 'institution_name': 'Bank One', 'institution_code': 'BANK1',
+         'jurisdiction': 'DE', 'currency': 'EUR'},
+        {'institution_id': 'INST2', 'institution_name': 'Bank Two', 'institution_code': 'BANK2',
+         'jurisdiction': 'DE', 'currency': 'EUR'}
+    ]
+    finrep_rows = [
+        {'_institution_id': 'INST1', '_reporting_period': '2024-Q4', 'total_assets': 1000.0, 'total_equity': 100.0},
+        {'_institution_id': 'INST2', '_reporting_period': '2024-Q4', 'total_assets': -5.0, 'total_equity': 100.0}
+    ]
+    generator.pg_pool, conn = _fake_pool(institutions, finrep_rows)
+    return generator, conn
+
+class TestBatchReportGeneration:
+    """Test suite for ComplianceReportGenerator.generate_reports_batch"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('workers', [0, 2])
+    async def test_per_item_results(self, tmp_path, workers):
+        """Each request gets its own result regardless of other items"""
+        generator, conn = _generator(tmp_path, workers)
+        requests = [_request('INST1'), _request('INST2'), _request('INST1', ReportType.DORA_ICT)]
+
+        try:
+            batch = await generator.generate_reports_batch(requests)
+        finally:
+            await generator.close()
+
+        assert [result.report_id for result in batch.results] == [request.report_id for request in requests]
+        assert (batch.total, batch.succeeded, batch.failed) == (3, 1, 2)
+        assert batch.throughput > 0
+
+        completed, invalid, missing = batch.results
+        assert completed.status == ReportStatus.COMPLETED
+        with open(completed.file_path, encoding='utf-8') as f:
+            assert f.read().splitlines()[1] == 'BANK1,1000.00,100.00'
+        assert invalid.status == ReportStatus.FAILED
+        assert 'total_assets must be >= 0' in invalid.error_message
+        assert missing.error_message.endswith('Template not found: csv_dora_ict')
+
+        assert generator.metrics['reports_generated'] == 1
+        assert generator.metrics['reports_failed'] == 2
+        assert generator.metrics['batches_generated'] == 1
+
+    @pytest.mark.asyncio
+    async def test_prefetch_uses_set_based_queries(self, tmp_path):
+        """Institutions and FINREP rows are fetched once for the whole batch"""
+        generator, conn = _generator(tmp_path, 0)
+        requests = [_request('INST1'), _request('INST2'), _request('INST3')]
+
+        data = await generator._prefetch_report_data(requests)
+
+        assert conn.fetch.await_count == 2
+        institution_args = conn.fetch.await_args_list[0].args
+        assert institution_args[1] == ['INST1', 'INST2', 'INST3']
+        finrep_args = conn.fetch.await_args_list[1].args
+        assert finrep_args[1:] == (['INST1', 'INST2', 'INST3'], ['2024-Q4'] * 3)
+
+        assert [item['report_id'] for item in data] == [request.report_id for request in requests]
+        assert data[0]['institution_code'] == 'BANK1' and data[0]['total_assets'] == 1000.0
+        # Missing FINREP data falls back to zeros like the single-report path
+        assert 'institution_code' not in data[2] and data[2]['total_assets'] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_prefetch_corep_and_dora_one_query_per_type(self, tmp_path):
+        """COREP and DORA rows are loaded with one latest-row-per-key query each"""
+        generator, _ = _generator(tmp_path, 0)
+        corep_rows = [{'_institution_id': 'INST1', '_reporting_period': '2024-Q4', **COREP_DATA_DEFAULTS,
+                       'tier1_capital': 925000000.0}]
+        dora_rows = [{'_institution_id': 'INST2', '_reporting_period': '2024-Q4', 'ict_incidents_count': 7}]
+        generator.pg_pool, conn = _fake_pool([], [], corep_rows, dora_rows)
+        requests = [
+            _request('INST1', ReportType.COREP), _request('INST2', ReportType.COREP),
+            _request('INST2', ReportType.DORA_ICT), _request('INST1', ReportType.DORA_ICT)
+        ]
+
+        data = await generator._prefetch_report_data(requests)
+
+        queries = [call.args for call in conn.fetch.await_args_list]
+        assert len(queries) == 3
+        corep_query = next(args for args in queries if 'FROM corep_data' in args[0])
+        assert 'DISTINCT ON' in corep_query[0]
+        assert corep_query[1:] == (['INST1', 'INST2'], ['2024-Q4'] * 2)
+        assert data[0]['tier1_capital'] == 925000000.0
+        assert data[1]['tier1_capital'] == COREP_DATA_DEFAULTS['tier1_capital']
+        assert data[2]['ict_incidents_count'] == 7
+        assert data[3]['ict_incidents_count'] == 3
+
+        # The single-request path reads the same table
+        conn.fetch.reset_mock()
+        assert (await generator._get_corep_data(conn, requests[0]))['tier1_capital'] == 925000000.0
+        assert 'FROM corep_data' in conn.fetch.await_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_statuses_and_files_written_in_bulk(self, tmp_path):
+        """Statuses and file records use executemany rather than a query per report"""
+        generator, conn = _generator(tmp_path, 0)
+        await generator.generate_reports_batch([_request('INST1'), _request('INST2')])
+
+        statements = [call.args[0] for call in conn.executemany.await_args_list]
+        assert sum('report_generation_status' in sql for sql in statements) == 3
+        assert sum('compliance_reports' in sql for sql in statements) == 1
+
+        final_statuses = conn.executemany.await_args_list[-1].args[1]
+        assert [(row[0], row[1]) for row in final_statuses] == [
+            ('FINREP_2024-Q4_INST1', 'COMPLETED'), ('FINREP_2024-Q4_INST2', 'FAILED')
+        ]
+
+class TestSchedulerBatching:
+    """Test suite for ReportScheduler batch execution"""
+
+    def _job(self, institution_id: str, report_type: str = 'FINREP') -> ScheduledJob:
+        return ScheduledJob(
+            job_id=f"job-{institution_id}-{report_type}",
+            schedule_id=f"schedule-{institution_id}",
+            report_type=report_type,
+            institution_id=institution_id,
+            reporting_period='2024-Q4',
+            scheduled_time=datetime.now(timezone.utc),
+            metadata={'jurisdiction': 'DE'}
+        )
+
+    def _scheduler(self) -> ReportScheduler:
+        scheduler = ReportScheduler(hub=Mock())
+        scheduler._update_job_status = AsyncMock()
+        scheduler._publish_job_event = AsyncMock()
+        scheduler._schedule_job_retry = AsyncMock()
+        scheduler._check_job_dependencies = AsyncMock(return_value=True)
+        return scheduler
+
+    @pytest.mark.asyncio
+    async def test_collect_batch_keeps_other_pools_queued(self):
+        """Only ready jobs from the first job's resource pool join its batch"""
+        scheduler = self._scheduler()
+        first = self._job('INST1')
+        assert await scheduler._allocate_resources(first)
+        for job in (self._job('INST2'), self._job('INST3', 'COREP'), self._job('INST4')):
+            await scheduler.job_queue.put((-job.priority.value, job.scheduled_time.timestamp(), job))
+
+        batch = await scheduler._collect_job_batch(first)
+
+        assert [job.institution_id for job in batch] == ['INST1', 'INST2', 'INST4']
+        assert scheduler.job_queue.qsize() == 1
+        assert scheduler.resource_pools['finrep'].current_jobs == 3
+        assert all(job.resource_allocation['pool'] == 'finrep' for job in batch)
+
+    @pytest.mark.asyncio
+    async def test_collect_batch_capped_at_free_pool_slots(self):
+        """A batch never takes more jobs than the pool has free slots"""
+        scheduler = self._scheduler()
+        pool = scheduler.resource_pools['dora']
+        first = self._job('INST0', 'DORA')
+        assert await scheduler._allocate_resources(first)
+        for index in range(1, 5):
+            job = self._job(f"INST{index}", 'DORA')
+            await scheduler.job_queue.put((-job.priority.value, job.scheduled_time.timestamp(), job))
+
+        batch = await scheduler._collect_job_batch(first)
+
+        assert len(batch) == pool.max_concurrent_jobs
+        assert pool.current_jobs == pool.max_concurrent_jobs
+        assert scheduler.job_queue.qsize() == 5 - pool.max_concurrent_jobs
+
+        await scheduler._release_resources(batch[0])
+        assert pool.current_jobs == pool.max_concurrent_jobs - 1
+
+    @pytest.mark.asyncio
+    async def test_execute_jobs_applies_per_item_results(self):
+        """One generation call; each job completes or fails on its own result"""
+        scheduler = self._scheduler()
+        jobs = [self._job('INST1'), self._job('INST2')]
+        for job in jobs:
+            assert await scheduler._allocate_resources(job)
+
+        scheduler.report_generator = Mock()
+        scheduler.report_generator.generate_reports_batch = AsyncMock(return_value=BatchReportResult(
+            batch_id='batch-1',
+            results=[
+                ReportResult(report_id='FINREP_2024-Q4_INST1', status=ReportStatus.COMPLETED, file_path='/tmp/r1'),
+                ReportResult(report_id='FINREP_2024-Q4_INST2', status=ReportStatus.FAILED, error_message='Validation failed')
+            ],
+            total=2, succeeded=1, failed=1, elapsed_seconds=0.1, throughput=20.0
+        ))
+
+        await scheduler._execute_jobs(jobs)
+
+        scheduler.report_generator.generate_reports_batch.assert_awaited_once()
+        assert jobs[0].status == JobStatus.COMPLETED
+        assert jobs[0].result_data['file_path'] == '/tmp/r1'
+        assert jobs[1].status == JobStatus.FAILED
+        assert 'Validation failed' in jobs[1].error_message
+        assert scheduler.resource_pools['finrep'].current_jobs == 0
+        assert scheduler.active_jobs == {}
+
+        # The failed job's retry is tracked until it finishes
+        assert len(scheduler._retry_tasks) == 1
+        await asyncio.gather(*scheduler._retry_tasks)
+        await asyncio.sleep(0)
+        scheduler._schedule_job_retry.assert_awaited_once_with(jobs[1])
+        assert scheduler._retry_tasks == set()
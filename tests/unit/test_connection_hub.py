@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for ConnectionHub Component
+======================================
+
+This module provides unit testing for the per-process connection hub shared
+by the decision orchestration components.
+
+Test Coverage Areas:
+- Lazy, single creation of the shared PostgreSQL pool and Kafka producer
+- Per-component pool and producer usage metrics
+- Component close()/stop() leaving shared resources open for other views
+- Last view released (or hub close) flushing and closing shared resources
+- Fork-aware process singleton
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+import connection_hub
+from connection_hub import ConnectionHub, get_connection_hub
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def _fake_pool():
+    conn = MagicMock()
+    conn.fetchval = AsyncMock(return_value=1)
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=conn)
+    pool.release = AsyncMock()
+    pool.close = AsyncMock()
+    return pool, conn
+
+def _fake_producer():
+    send_future = asyncio.get_running_loop().create_future()
+    send_future.set_result(None)
+    producer = MagicMock()
+    producer.start = AsyncMock()
+    producer.stop = AsyncMock()
+    producer.send = AsyncMock(return_value=send_future)
+    return producer
+
+class TestConnectionHub:
+    """
+    Test suite for ConnectionHub
+
+    asyncpg.create_pool and AIOKafkaProducer are replaced with fakes so the
+    sharing behaviour can be verified without running services.
+    """
+
+    @pytest.mark.asyncio
+    async def test_pool_created_once_and_shared(self):
+        """Components share one lazily created pool"""
+        pool, conn = _fake_pool()
+        with patch.object(connection_hub.asyncpg, 'create_pool', AsyncMock(return_value=pool)) as create_pool:
+            hub = ConnectionHub()
+            assert create_pool.await_count == 0
+
+            engine_pool, monitor_pool = await asyncio.gather(
+                hub.get_pg_pool('deadline_engine'),
+                hub.get_pg_pool('sla_monitor')
+            )
+
+            assert create_pool.await_count == 1
+            assert engine_pool.pool is monitor_pool.pool
+
+            async with engine_pool.acquire() as acquired:
+                assert acquired is conn
+                assert hub.component_usage['deadline_engine']['pg']['in_use'] == 1
+            assert await monitor_pool.fetchval("SELECT 1") == 1
+
+        usage = hub.get_metrics()['components']
+        assert usage['deadline_engine']['pg']['acquisitions'] == 1
+        assert usage['deadline_engine']['pg']['in_use'] == 0
+        assert usage['sla_monitor']['pg']['acquisitions'] == 1
+        assert pool.release.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_component_close_keeps_shared_pool_open(self):
+        """A component closing its view does not close the pool other views use"""
+        pool, _ = _fake_pool()
+        with patch.object(connection_hub.asyncpg, 'create_pool', AsyncMock(return_value=pool)):
+            hub = ConnectionHub()
+            view = await hub.get_pg_pool('eba_api_client')
+            other = await hub.get_pg_pool('deadline_engine')
+            await view.close()
+            await view.close()
+            pool.close.assert_not_awaited()
+            assert hub.get_metrics()['open_views']['pg'] == 1
+
+            await other.close()
+            pool.close.assert_awaited_once()
+            assert hub.get_metrics()['pg_pool'] is None
+
+    @pytest.mark.asyncio
+    async def test_pool_recreated_after_last_release(self):
+        """A request after the pool was closed creates a new one that stale views cannot close"""
+        first_pool, _ = _fake_pool()
+        second_pool, _ = _fake_pool()
+        with patch.object(connection_hub.asyncpg, 'create_pool',
+                          AsyncMock(side_effect=[first_pool, second_pool])):
+            hub = ConnectionHub()
+            stale = await hub.get_pg_pool('deadline_engine')
+            await hub.close()
+            first_pool.close.assert_awaited_once()
+
+            fresh = await hub.get_pg_pool('deadline_engine')
+            await stale.close()
+            second_pool.close.assert_not_awaited()
+            assert fresh.pool is second_pool
+
+            await fresh.close()
+            second_pool.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_producer_shared_and_sends_counted(self):
+        """One producer serves all components and counts sends per topic"""
+        producer = _fake_producer()
+        with patch.object(connection_hub, 'AIOKafkaProducer', Mock(return_value=producer)) as factory:
+            hub = ConnectionHub()
+            scheduler = await hub.get_kafka_producer('report_scheduler')
+            alerts = await hub.get_kafka_producer('deadline_alerts')
+
+            await scheduler.send('scheduler.events', {'event': 1})
+            await scheduler.send('job.events', {'event': 2})
+            await alerts.send_and_wait('alerts', {'event': 3})
+            await scheduler.stop()
+
+            assert factory.call_count == 1
+            assert factory.call_args.kwargs['linger_ms'] == hub.config.kafka_linger_ms
+            producer.start.assert_awaited_once()
+            producer.stop.assert_not_awaited()
+
+            # The last component stopping flushes and stops the shared producer
+            await alerts.stop()
+            producer.stop.assert_awaited_once()
+            assert not hub.get_metrics()['kafka_producer_active']
+
+        usage = hub.get_metrics()['components']
+        assert usage['report_scheduler']['kafka']['messages_sent'] == 2
+        assert usage['report_scheduler']['kafka']['topics'] == {'scheduler.events': 1, 'job.events': 1}
+        assert usage['deadline_alerts']['kafka']['messages_sent'] == 1
+
+    @pytest.mark.asyncio
+    async def test_send_errors_counted(self):
+        """Failed sends are counted against the component"""
+        producer = _fake_producer()
+        producer.send = AsyncMock(side_effect=ConnectionError('broker down'))
+        with patch.object(connection_hub, 'AIOKafkaProducer', Mock(return_value=producer)):
+            hub = ConnectionHub()
+            view = await hub.get_kafka_producer('delivery_tracker')
+            with pytest.raises(ConnectionError):
+                await view.send('delivery.events', {})
+
+        assert hub.component_usage['delivery_tracker']['kafka']['send_errors'] == 1
+
+    def test_process_singleton_resets_after_fork(self):
+        """The process hub is reused within a process and rebuilt in a child"""
+        hub = get_connection_hub()
+        assert get_connection_hub() is hub
+
+        with patch.object(connection_hub.os, 'getpid', return_value=os.getpid() + 1):
+            assert get_connection_hub() is not hub
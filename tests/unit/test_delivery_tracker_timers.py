@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for DeliveryTracker Timers
+=====================================
+
+This module provides unit testing for the single heap-based timer that
+drives delivery confirmation timeouts and scheduled retries.
+
+Test Coverage Areas:
+- No per-delivery monitoring tasks regardless of deliveries tracked
+- Confirmation timeouts firing only for unconfirmed deliveries
+- Scheduled retries of failed deliveries
+- Heap compaction of cancelled timers
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+import copy
+from datetime import datetime, timezone, timedelta
+from unittest.mock import Mock, AsyncMock
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from delivery_tracker import DeliveryTracker, DeliveryChannel, DeliveryStatus
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def _tracker(confirmation_timeout=0.05):
+    """Tracker backed by an in-memory record store instead of PostgreSQL"""
+    tracker = DeliveryTracker(hub=Mock())
+    tracker.config['confirmation_timeout'] = confirmation_timeout
+    store = {}
+
+    async def store_record(tracking):
+        store[tracking.tracking_id] = copy.deepcopy(tracking)
+
+    async def get_record(tracking_id):
+        return copy.deepcopy(store.get(tracking_id))
+
+    async def get_records(tracking_ids):
+        return {tid: copy.deepcopy(store[tid]) for tid in tracking_ids if tid in store}
+
+    tracker._store_tracking_record = AsyncMock(side_effect=store_record)
+    tracker._update_tracking_record = AsyncMock(side_effect=store_record)
+    tracker._get_tracking_record = AsyncMock(side_effect=get_record)
+    tracker._get_tracking_records = AsyncMock(side_effect=get_records)
+    tracker._publish_tracking_event = AsyncMock()
+    tracker._generate_alert = AsyncMock()
+    return tracker, store
+
+class TestDeliveryTrackerTimers:
+    """Test suite for DeliveryTracker timer scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_tracking_creates_no_tasks(self):
+        """Tracking many deliveries schedules timers, not tasks"""
+        tracker, _ = _tracker(confirmation_timeout=3600)
+        tasks_before = len(asyncio.all_tasks())
+
+        for index in range(500):
+            await tracker.track_delivery(f"RPT-{index}", DeliveryChannel.SFTP, 'sftp.regulator.eu')
+
+        assert len(asyncio.all_tasks()) == tasks_before
+        metrics = await tracker.get_metrics()
+        assert metrics['active_trackings'] == 500
+        assert metrics['scheduled_timers'] == 500
+
+    @pytest.mark.asyncio
+    async def test_timeout_fires_only_for_unconfirmed(self):
+        """Unconfirmed deliveries expire; confirmed ones are left alone"""
+        tracker, store = _tracker()
+        pending = await tracker.track_delivery('RPT-1', DeliveryChannel.SFTP, 'sftp.regulator.eu')
+        confirmed = await tracker.track_delivery('RPT-2', DeliveryChannel.EBA_API, 'eba')
+        await tracker.update_delivery_status(confirmed, DeliveryStatus.CONFIRMED)
+
+        runner = asyncio.create_task(tracker._run_timers())
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+        assert store[pending].status == DeliveryStatus.EXPIRED
+        assert store[confirmed].status == DeliveryStatus.CONFIRMED
+        assert tracker.metrics['sla_breaches'] == 1
+        assert tracker._active_timers == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_delivery_retried_when_due(self):
+        """A failed delivery with a retry time is retried by the timer"""
+        tracker, store = _tracker(confirmation_timeout=3600)
+        tracking_id = await tracker.track_delivery('RPT-1', DeliveryChannel.SFTP, 'sftp.regulator.eu')
+
+        tracking = store[tracking_id]
+        tracking.status = DeliveryStatus.FAILED
+        tracking.next_retry_at = datetime.now(timezone.utc) + timedelta(milliseconds=50)
+        store[tracking_id] = tracking
+        tracker._sync_timers(tracking)
+
+        runner = asyncio.create_task(tracker._run_timers())
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+        assert store[tracking_id].status == DeliveryStatus.PENDING
+        assert store[tracking_id].retry_count == 1
+        assert 'confirmation_timeout' in tracker._active_timers[tracking_id]
+
+    def test_cancelled_timers_compacted(self):
+        """Superseded heap entries are dropped once they dominate the heap"""
+        tracker, _ = _tracker(confirmation_timeout=3600)
+        due = datetime.now(timezone.utc) + timedelta(hours=1)
+        for _ in range(3000):
+            tracker._schedule_timer('TRK-1', 'retry', due)
+
+        assert len(tracker._active_timers['TRK-1']) == 1
+        assert len(tracker._timers) <= 1026
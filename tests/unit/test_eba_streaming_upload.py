@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for EBA Streaming Submission Uploads
+===============================================
+
+This module provides unit testing for the chunked multipart upload path of
+EBAAPIClient against a local aiohttp server.
+
+Test Coverage Areas:
+- Chunked multipart body with on-the-fly gzip compression
+- Idempotency key and 409 handling for repeated submissions
+- Retry after a transport failure reusing an already stored submission
+- Upload byte and throughput metrics
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+import gzip
+import json
+from datetime import datetime, timezone, timedelta
+from unittest.mock import Mock, AsyncMock
+import logging
+
+import aiohttp
+from aiohttp import web
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from eba_api_client import (
+    EBAAPIClient, EBAConfig, EBAEnvironment, SubmissionRequest, SubmissionResult,
+    SubmissionStatus, ReportType
+)
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class _FakeEBA:
+    """Minimal EBA submission endpoint recording what it received"""
+
+    def __init__(self):
+        self.received = {}
+        self.headers = []
+
+    async def submit(self, request):
+        self.headers.append(dict(request.headers))
+        key = request.headers['Idempotency-Key']
+        if key in self.received:
+            return web.json_response({'error': 'duplicate'}, status=409)
+
+        parts = {}
+        reader = await request.multipart()
+        async for part in reader:
+            parts[part.name] = {
+                'body': await part.read(),
+                'filename': part.filename,
+                'encoding': part.headers.get('Content-Encoding')
+            }
+        self.received[key] = parts
+        return web.json_response({'ebaReference': f"EBA-{key}"}, status=201)
+
+    async def status(self, request):
+        return web.json_response({'status': 'PROCESSING', 'ebaReference': f"EBA-{request.match_info['id']}"})
+
+async def _start_server(fake):
+    app = web.Application()
+    app.router.add_post('/submissions', fake.submit)
+    app.router.add_get('/submissions/{id}/status', fake.status)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+def _client(base_url, **overrides):
+    values = dict(
+        environment=EBAEnvironment.SANDBOX, client_id='client', client_secret='secret',
+        private_key_path='key.pem', certificate_path='cert.pem', base_url='', auth_url='',
+        submission_url='', status_url='', retry_delay=0, upload_chunk_size=4096
+    )
+    values.update(overrides)
+    client = EBAAPIClient(EBAConfig(**values), hub=Mock())
+    client.endpoints['submit'] = f"{base_url}/submissions"
+    client.endpoints['status'] = f"{base_url}/submissions/{{submission_id}}/status"
+    client.access_token = 'token'
+    client.token_expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    # Same default headers as initialize(), including the JSON content type
+    client.session = aiohttp.ClientSession(headers={
+        'Accept': 'application/json',
+        'Content-Type': 'application/json',
+        'Authorization': 'Bearer token'
+    })
+    return client
+
+def _request(path, submission_id='SUB-001'):
+    return SubmissionRequest(
+        submission_id=submission_id,
+        report_id='RPT-001',
+        report_type=ReportType.COREP,
+        institution_lei='5493001KJTIIGC8Y1R12',
+        reporting_period='2026-09',
+        file_path=str(path)
+    )
+
+class TestStreamingUpload:
+    """Test suite for EBAAPIClient streaming uploads"""
+
+    @pytest.mark.asyncio
+    async def test_gzip_chunked_multipart_upload(self, tmp_path):
+        """The report is streamed gzip-compressed with the submission ID as idempotency key"""
+        report = tmp_path / 'corep.xbrl'
+        content = b'<eba_met:mi53 contextRef="c1" unitRef="EUR">1000</eba_met:mi53>\n' * 2000
+        report.write_bytes(content)
+
+        fake = _FakeEBA()
+        runner, base_url = await _start_server(fake)
+        client = _client(base_url, compress_uploads=True, compression_min_size=0)
+        try:
+            result = await client._perform_submission(_request(report))
+        finally:
+            await client.session.close()
+            await runner.cleanup()
+
+        assert result.status == SubmissionStatus.SUBMITTED
+        assert result.eba_reference == 'EBA-SUB-001'
+
+        parts = fake.received['SUB-001']
+        metadata = json.loads(parts['metadata']['body'])
+        assert metadata['contentEncoding'] == 'gzip'
+        assert metadata['fileSize'] == len(content)
+        assert parts['file']['encoding'] == 'gzip'
+        assert parts['file']['filename'] == 'corep.xbrl.gz'
+        assert gzip.decompress(parts['file']['body']) == content
+        assert fake.headers[0]['Content-Type'].startswith('multipart/form-data')
+        assert fake.headers[0].get('Transfer-Encoding') == 'chunked'
+
+        metrics = await client.get_metrics()
+        assert metrics['bytes_read'] == len(content)
+        assert metrics['bytes_uploaded'] == len(parts['file']['body'])
+        assert metrics['compression_ratio'] < 0.1
+        assert metrics['upload_bytes_per_second'] > 0
+        assert metrics['active_uploads'] == 0
+
+    @pytest.mark.asyncio
+    async def test_repeated_submission_returns_existing_status(self, tmp_path):
+        """A second upload under the same submission ID resolves to the stored submission"""
+        report = tmp_path / 'finrep.xbrl'
+        report.write_bytes(b'<xbrli:xbrl/>')
+
+        fake = _FakeEBA()
+        runner, base_url = await _start_server(fake)
+        client = _client(base_url)
+        try:
+            first = await client._perform_submission(_request(report))
+            second = await client._perform_submission(_request(report))
+        finally:
+            await client.session.close()
+            await runner.cleanup()
+
+        assert first.status == SubmissionStatus.SUBMITTED
+        assert second.status == SubmissionStatus.PROCESSING
+        assert second.eba_reference == 'EBA-SUB-001'
+        assert fake.received['SUB-001']['file']['encoding'] is None
+        assert client.metrics['duplicate_submissions_avoided'] == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_transport_error_checks_existing_submission(self, tmp_path):
+        """A retry after a dropped connection reuses the stored submission instead of re-uploading"""
+        client = _client('http://127.0.0.1:9')
+        try:
+            client._perform_submission = AsyncMock(side_effect=aiohttp.ClientConnectionError('connection reset'))
+            client.get_submission_status = AsyncMock(return_value=SubmissionResult(
+                submission_id='SUB-001', status=SubmissionStatus.PROCESSING, eba_reference='EBA-SUB-001'
+            ))
+
+            result = await client._perform_submission_with_retry(_request(tmp_path / 'corep.xbrl'))
+        finally:
+            await client.session.close()
+
+        assert result.status == SubmissionStatus.PROCESSING
+        assert result.retry_count == 1
+        assert client._perform_submission.await_count == 1
+        assert client.metrics['duplicate_submissions_avoided'] == 1
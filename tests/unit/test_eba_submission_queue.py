@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for EBA Submission Queue
+===================================
+
+This module provides unit testing for the concurrent EBA submission queue,
+the client-side rate limiter and shared token refresh.
+
+Test Coverage Areas:
+- Concurrency limit and priority ordering of queued submissions
+- Coalesced status polling with one list_submissions call per interval
+- Status changes pushed to the DeliveryTracker
+- Expiry of submissions watched past their maximum age
+- Paginated submission listing
+- Token bucket rate limiting and single re-authentication
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+import time
+from datetime import datetime, timezone, timedelta
+from unittest.mock import Mock, AsyncMock, MagicMock
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from eba_api_client import (
+    EBAAPIClient, EBAConfig, EBAEnvironment, EBARateLimiter,
+    SubmissionRequest, SubmissionResult, SubmissionStatus, ReportType
+)
+from eba_submission_queue import EBASubmissionQueue
+from delivery_tracker import DeliveryStatus
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def _request(index, priority=2):
+    return SubmissionRequest(
+        submission_id=f"SUB-{index:03d}",
+        report_id=f"RPT-{index:03d}",
+        report_type=ReportType.FINREP,
+        institution_lei='5493001KJTIIGC8Y1R12',
+        reporting_period='2026-09',
+        file_path='/tmp/report.xbrl',
+        priority=priority
+    )
+
+def _fake_client(delay=0.01):
+    client = MagicMock()
+    active = {'now': 0, 'peak': 0, 'order': []}
+
+    async def submit_report(request):
+        active['order'].append(request.submission_id)
+        active['now'] += 1
+        active['peak'] = max(active['peak'], active['now'])
+        await asyncio.sleep(delay)
+        active['now'] -= 1
+        return SubmissionResult(
+            submission_id=request.submission_id,
+            status=SubmissionStatus.PROCESSING,
+            eba_reference=f"EBA-{request.submission_id}",
+            submitted_at=datetime.now(timezone.utc)
+        )
+
+    client.submit_report = AsyncMock(side_effect=submit_report)
+    client.list_submissions = AsyncMock(return_value=[])
+    client._update_submission_statuses = AsyncMock()
+    return client, active
+
+def _config(**overrides):
+    values = dict(
+        environment=EBAEnvironment.SANDBOX, client_id='client', client_secret='secret',
+        private_key_path='key.pem', certificate_path='cert.pem', base_url='', auth_url='',
+        submission_url='', status_url=''
+    )
+    values.update(overrides)
+    return EBAConfig(**values)
+
+class TestEBASubmissionQueue:
+    """Test suite for EBASubmissionQueue"""
+
+    @pytest.mark.asyncio
+    async def test_submissions_run_concurrently_within_limit(self):
+        """Workers run submissions in parallel up to the configured concurrency"""
+        client, active = _fake_client()
+        queue = EBASubmissionQueue(client, concurrency=3, poll_interval=3600)
+        await queue.start()
+        try:
+            results = await queue.submit_many([_request(i) for i in range(10)])
+        finally:
+            await queue.close()
+
+        assert [result.submission_id for result in results] == [f"SUB-{i:03d}" for i in range(10)]
+        assert active['peak'] == 3
+        assert queue.get_metrics()['watched_submissions'] == 10
+
+    @pytest.mark.asyncio
+    async def test_high_priority_sent_first(self):
+        """Lower priority values leave the queue first"""
+        client, active = _fake_client()
+        queue = EBASubmissionQueue(client, concurrency=1, poll_interval=3600)
+        futures = [queue.submit(_request(0, priority=3)), queue.submit(_request(1, priority=1))]
+        await queue.start()
+        try:
+            await asyncio.gather(*futures)
+        finally:
+            await queue.close()
+
+        assert active['order'] == ['SUB-001', 'SUB-000']
+
+    @pytest.mark.asyncio
+    async def test_status_polling_coalesced_and_pushed_to_tracker(self):
+        """One listing call refreshes every watched submission and updates the tracker"""
+        client, _ = _fake_client(delay=0)
+        tracker = Mock()
+        tracker.update_delivery_status = AsyncMock()
+        tracker.confirm_delivery = AsyncMock()
+        queue = EBASubmissionQueue(client, tracker, concurrency=4, poll_interval=3600)
+        await queue.start()
+        try:
+            await queue.submit_many([_request(i) for i in range(3)], ['TRK-0', 'TRK-1', 'TRK-2'])
+            tracker.update_delivery_status.reset_mock()
+
+            client.list_submissions.return_value = [
+                {'submissionId': 'SUB-000', 'ebaReference': 'EBA-SUB-000', 'status': 'COMPLETED'},
+                {'submissionId': 'SUB-001', 'ebaReference': 'EBA-SUB-001', 'status': 'REJECTED',
+                 'errorMessage': 'Validation rule v0123 failed'},
+                {'submissionId': 'SUB-002', 'ebaReference': 'EBA-SUB-002', 'status': 'PROCESSING'}
+            ]
+            changed = await queue.poll_statuses()
+        finally:
+            await queue.close()
+
+        assert changed == 2
+        assert client.list_submissions.await_count == 1
+        client._update_submission_statuses.assert_awaited_once()
+        tracker.confirm_delivery.assert_awaited_once()
+        assert tracker.confirm_delivery.call_args.kwargs['tracking_id'] == 'TRK-0'
+        tracker.update_delivery_status.assert_awaited_once()
+        args = tracker.update_delivery_status.call_args.args
+        assert args[:3] == ('TRK-1', DeliveryStatus.FAILED, 'Validation rule v0123 failed')
+        assert queue.get_metrics()['watched_submissions'] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_watches_expire_and_stop_pinning_window(self):
+        """Submissions never returned by the listing are dropped after the max age"""
+        client, _ = _fake_client(delay=0)
+        queue = EBASubmissionQueue(client, concurrency=1, poll_interval=3600)
+        queue.config['watch_max_age'] = 3600
+        now = datetime.now(timezone.utc)
+        for index, age in enumerate((timedelta(hours=5), timedelta(minutes=10))):
+            queue.watch(SubmissionResult(
+                submission_id=f"SUB-{index:03d}", status=SubmissionStatus.PROCESSING,
+                submitted_at=now - age
+            ))
+
+        await queue.poll_statuses()
+
+        assert queue.get_metrics()['watched_submissions'] == 1
+        assert queue.metrics['watches_expired'] == 1
+        date_from = client.list_submissions.call_args.kwargs['date_from']
+        assert date_from > now - timedelta(hours=1)
+
+class TestEBAClientThrottling:
+    """Test suite for the client rate limiter and shared authentication"""
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_enforces_rate_after_burst(self):
+        """Requests beyond the burst are spaced at the configured rate"""
+        limiter = EBARateLimiter(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            await limiter.acquire()
+        elapsed = time.monotonic() - start
+
+        # Two burst tokens, then four at 50/s
+        assert elapsed >= 0.07
+        assert limiter.total_wait_time > 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_authentication(self):
+        """An expired token is renewed once for all concurrent callers"""
+        client = EBAAPIClient(_config(), hub=Mock())
+        client.token_expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+        async def authenticate():
+            await asyncio.sleep(0.01)
+            client.access_token = 'token'
+            client.token_expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+
+        client._authenticate = AsyncMock(side_effect=authenticate)
+        await asyncio.gather(*(client._ensure_authenticated() for _ in range(10)))
+
+        assert client._authenticate.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_list_submissions_follows_pages(self):
+        """Every page of the listing is fetched and the submissions concatenated"""
+        client = EBAAPIClient(_config(list_page_size=2), hub=Mock())
+        client._ensure_authenticated = AsyncMock()
+        pages = {
+            '1': {'submissions': [{'submissionId': 'SUB-000'}, {'submissionId': 'SUB-001'}], 'totalPages': 2},
+            '2': {'submissions': [{'submissionId': 'SUB-002'}], 'totalPages': 2}
+        }
+        requested = []
+
+        class _Response:
+            status = 200
+
+            def __init__(self, body):
+                self.body = body
+
+            async def json(self):
+                return self.body
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                return False
+
+        def get(url):
+            requested.append(url)
+            page = url.split('page=')[-1].split('&')[0]
+            return _Response(pages[page])
+
+        client.session = Mock(get=get)
+        submissions = await client.list_submissions(date_from=datetime(2026, 10, 1, tzinfo=timezone.utc))
+
+        assert [entry['submissionId'] for entry in submissions] == ['SUB-000', 'SUB-001', 'SUB-002']
+        assert len(requested) == 2
+        assert all('pageSize=2' in url and 'dateFrom=' in url for url in requested)
+
+        # A bare list ends on a short page
+        requested.clear()
+        pages['1'] = [{'submissionId': 'SUB-000'}]
+        assert len(await client.list_submissions()) == 1
+        assert len(requested) == 1
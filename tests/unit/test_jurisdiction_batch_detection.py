@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Batch Customer Jurisdiction Detection
+====================================================
+
+This module provides unit testing for JurisdictionHandler's batch detection
+path: chunked detection, fingerprinting of detection results and the
+staged COPY-and-merge write to customer_jurisdictions.
+
+Test Coverage Areas:
+- Records written with one COPY and one merge per chunk, with the expected columns
+- Unchanged detection results skipped using stored fingerprints
+- Fingerprints independent of detection time and list order
+- Worker pool detection matching inline detection, including failed records
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from unittest.mock import Mock, AsyncMock
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src.jurisdiction_handler import JurisdictionHandler, CUSTOMER_JURISDICTION_COLUMNS
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class _FakeJurisdictionTable:
+    """customer_jurisdictions stand-in evaluating the bulk store statements"""
+
+    def __init__(self):
+        self.rows = {}
+        self.staging = []
+        self.statements = []
+        self.copies = []
+
+    async def fetch(self, query, customer_ids):
+        self.statements.append(query)
+        return [
+            {'customer_id': customer_id, 'detection_fingerprint': self.rows[customer_id]['detection_fingerprint']}
+            for customer_id in customer_ids if customer_id in self.rows
+        ]
+
+    async def execute(self, query, *args):
+        self.statements.append(query)
+        if 'FROM customer_jurisdictions_staging' in query:
+            for row in self.staging:
+                stored = self.rows.get(row['customer_id'])
+                if stored is None or stored['detection_fingerprint'] != row['detection_fingerprint']:
+                    self.rows[row['customer_id']] = row
+        return 'OK'
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copies.append((table, list(records), list(columns)))
+        self.staging.extend(dict(zip(columns, record)) for record in records)
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+        # ON COMMIT DELETE ROWS
+        self.staging = []
+
+    def pool(self):
+        @asynccontextmanager
+        async def acquire():
+            yield self
+        return Mock(acquire=acquire, close=AsyncMock())
+
+def _records():
+    return [
+        {'customer_id': 'CUST-1', 'residence_country': 'DE', 'citizenship': 'DE'},
+        {'customer_id': 'CUST-2', 'residence_country': 'IE', 'business_countries': ['GB', 'DE']},
+        {'customer_id': 'CUST-3', 'nationality': 'FR', 'tax_countries': ['IE']},
+        # A string address cannot be inspected for a country and fails detection
+        {'customer_id': 'CUST-BAD', 'address': 'Unter den Linden 1, Berlin'},
+        {'customer_id': 'CUST-4', 'address': {'country': 'GB'}, 'citizenship': 'GB'}
+    ]
+
+def _handler(table: _FakeJurisdictionTable, workers: int = 0) -> JurisdictionHandler:
+    handler = JurisdictionHandler()
+    handler.detection_workers = workers
+    handler.pg_pool = table.pool()
+    return handler
+
+def _stored(table: _FakeJurisdictionTable):
+    """Stored rows without the detection timestamp"""
+    return {
+        customer_id: {column: value for column, value in row.items() if column != 'detected_at'}
+        for customer_id, row in table.rows.items()
+    }
+
+class TestBatchDetection:
+    """Test suite for detect_customer_jurisdictions_batch"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_copied_and_merged(self):
+        """Each chunk is COPYed into staging with the merge columns, then merged once"""
+        table = _FakeJurisdictionTable()
+        handler = _handler(table)
+
+        stats = await handler.detect_customer_jurisdictions_batch(_records(), batch_size=2)
+
+        assert stats == {'processed': 5, 'changed': 4, 'unchanged': 0, 'failed': 1}
+        assert [copy[0] for copy in table.copies] == ['customer_jurisdictions_staging'] * 3
+        assert all(copy[2] == CUSTOMER_JURISDICTION_COLUMNS for copy in table.copies)
+        merges = [sql for sql in table.statements if 'FROM customer_jurisdictions_staging' in sql]
+        assert len(merges) == 3
+        assert 'ON CONFLICT (customer_id) DO UPDATE' in merges[0]
+        assert 'detection_fingerprint IS DISTINCT FROM EXCLUDED.detection_fingerprint' in merges[0]
+
+        # Record arguments line up with CUSTOMER_JURISDICTION_COLUMNS
+        expected = handler._build_customer_jurisdiction(_records()[0])
+        row = table.rows['CUST-1']
+        assert row['primary_jurisdiction'] == 'DE'
+        assert sorted(row['secondary_jurisdictions']) == sorted(expected.secondary_jurisdictions)
+        assert row['residence_country'] == 'DE'
+        assert row['citizenship_countries'] == ['DE']
+        assert row['confidence_score'] == Decimal(str(round(expected.confidence_score, 4)))
+        assert row['detection_method'] == 'automated_analysis'
+        assert isinstance(row['detected_at'], datetime)
+        assert row['detection_fingerprint'] == handler._jurisdiction_fingerprint(expected)
+        assert 'CUST-BAD' not in table.rows
+        assert handler.resolution_stats['detection_failures'] == 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_results_skipped(self):
+        """A rerun writes nothing; a changed customer is the only row written"""
+        table = _FakeJurisdictionTable()
+        handler = _handler(table)
+        await handler.detect_customer_jurisdictions_batch(_records(), batch_size=10)
+        first_written = dict(table.rows)
+        table.copies.clear()
+        table.statements.clear()
+
+        stats = await handler.detect_customer_jurisdictions_batch(_records(), batch_size=10)
+
+        assert stats == {'processed': 5, 'changed': 0, 'unchanged': 4, 'failed': 1}
+        assert table.copies == []
+        # Only the fingerprint lookup runs
+        assert len(table.statements) == 1 and 'SELECT customer_id, detection_fingerprint' in table.statements[0]
+        assert table.rows == first_written
+        assert handler.resolution_stats['unchanged_skipped'] == 4
+
+        records = _records()
+        records[1]['residence_country'] = 'GB'
+        stats = await handler.detect_customer_jurisdictions_batch(records, batch_size=10)
+
+        assert stats['changed'] == 1 and stats['unchanged'] == 3
+        assert [record[0] for record in table.copies[0][1]] == ['CUST-2']
+        assert table.rows['CUST-2']['primary_jurisdiction'] == 'GB'
+
+    @pytest.mark.asyncio
+    async def test_async_source_and_duplicates(self):
+        """Async record sources are consumed; a customer repeated in a chunk is written once"""
+        table = _FakeJurisdictionTable()
+        handler = _handler(table)
+
+        async def source():
+            for record in _records()[:2] + [{'customer_id': 'CUST-1', 'residence_country': 'IE'}]:
+                yield record
+
+        stats = await handler.detect_customer_jurisdictions_batch(source(), batch_size=10)
+
+        assert stats['processed'] == 3
+        assert [record[0] for record in table.copies[0][1]] == ['CUST-1', 'CUST-2']
+        assert table.rows['CUST-1']['primary_jurisdiction'] == 'IE'
+
+    def test_fingerprint_ignores_detection_time_and_order(self):
+        """Only the detection result feeds the fingerprint"""
+        handler = JurisdictionHandler()
+        detected = handler._build_customer_jurisdiction(_records()[1])
+        fingerprint = handler._jurisdiction_fingerprint(detected)
+
+        assert handler._jurisdiction_fingerprint(
+            replace(detected, detected_at=detected.detected_at + timedelta(days=1))
+        ) == fingerprint
+        assert handler._jurisdiction_fingerprint(replace(
+            detected,
+            secondary_jurisdictions=list(reversed(detected.secondary_jurisdictions)),
+            business_countries=list(reversed(detected.business_countries))
+        )) == fingerprint
+
+        assert handler._jurisdiction_fingerprint(replace(detected, primary_jurisdiction='GB')) != fingerprint
+        assert handler._jurisdiction_fingerprint(
+            replace(detected, confidence_score=detected.confidence_score - 0.1)
+        ) != fingerprint
+        assert handler._jurisdiction_fingerprint(
+            replace(detected, tax_jurisdictions=detected.tax_jurisdictions + ['FR'])
+        ) != fingerprint
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_matches_inline_detection(self):
+        """Detection in worker processes stores the same rows and stats as inline detection"""
+        inline_table, pooled_table = _FakeJurisdictionTable(), _FakeJurisdictionTable()
+        inline = _handler(inline_table, workers=0)
+        pooled = _handler(pooled_table, workers=2)
+        records = _records() * 3 + [
+            {'customer_id': f"CUST-{index}", 'residence_country': code, 'citizenship': 'DE'}
+            for index, code in enumerate(['DE', 'IE', 'GB', 'FR', 'AT'] * 4, start=10)
+        ]
+
+        try:
+            inline_stats = await inline.detect_customer_jurisdictions_batch(records, batch_size=4)
+            pooled_stats = await pooled.detect_customer_jurisdictions_batch(records, batch_size=4)
+            assert pooled._detection_executor is not None
+        finally:
+            await pooled.close()
+
+        assert pooled_stats == inline_stats
+        assert _stored(pooled_table) == _stored(inline_table)
+        assert pooled.resolution_stats['detection_failures'] == inline.resolution_stats['detection_failures'] == 3
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Jurisdiction Rule Index
+==========================================
+
+This module verifies that the jurisdiction → rule-id index used by
+JurisdictionHandler.filter_rules_by_jurisdiction selects exactly the rules
+the previous per-rule applicability predicate selected.
+
+Test Coverage Areas:
+- Index equivalence with the per-rule predicate over all jurisdiction combinations
+- EU rules inherited by member states, and unconfigured jurisdictions
+- Re-indexing when the rule set changes
+- Re-derivation when the jurisdiction hierarchy changes
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import itertools
+from dataclasses import replace
+from datetime import datetime, timezone
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src.jurisdiction_handler import JurisdictionHandler, CustomerJurisdiction
+from src.rule_compiler import ComplianceRule, RegulationType, RuleType
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Rule jurisdictions: supranational, configured national, unconfigured EU member,
+# non-EU configured, and jurisdictions outside the hierarchy entirely
+RULE_JURISDICTIONS = ['EU', 'DE', 'IE', 'FR', 'GB', 'US', 'XX']
+
+# Customer jurisdictions, including ones with no configuration
+CUSTOMER_JURISDICTIONS = ['EU', 'DE', 'IE', 'FR', 'AT', 'GB', 'US', 'CH', 'XX']
+
+def _legacy_is_applicable(handler: JurisdictionHandler, rule: ComplianceRule, jurisdictions):
+    """The per-rule predicate filter_rules_by_jurisdiction used before the index"""
+    rule_jurisdiction = rule.jurisdiction
+
+    if rule_jurisdiction in jurisdictions:
+        return True
+
+    for jurisdiction in jurisdictions:
+        if jurisdiction in handler.jurisdiction_hierarchy:
+            if rule_jurisdiction in handler.jurisdiction_hierarchy[jurisdiction]:
+                return True
+
+    if rule_jurisdiction == 'EU':
+        for jurisdiction in jurisdictions:
+            if jurisdiction in handler.eu_member_states:
+                return True
+
+    return False
+
+def _rule(index: int, jurisdiction: str) -> ComplianceRule:
+    return ComplianceRule(
+        rule_id=f"RULE-{jurisdiction}-{index}",
+        regulation_type=RegulationType.AML,
+        rule_type=RuleType.BOOLEAN,
+        title=f"Rule {index} for {jurisdiction}",
+        description='Transactions must be monitored',
+        conditions=[],
+        json_logic={},
+        confidence_score=0.9,
+        source_obligation_id=f"OBL-{index}",
+        jurisdiction=jurisdiction,
+        effective_date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        version='1.0'
+    )
+
+def _customer(primary: str, secondary=()) -> CustomerJurisdiction:
+    return CustomerJurisdiction(
+        customer_id=f"CUST-{primary}-{'-'.join(secondary)}",
+        primary_jurisdiction=primary,
+        secondary_jurisdictions=list(secondary),
+        residence_country=primary,
+        citizenship_countries=[primary],
+        business_countries=[],
+        tax_jurisdictions=[primary],
+        detected_at=datetime.now(timezone.utc),
+        confidence_score=0.9,
+        detection_method='test'
+    )
+
+def _customers():
+    """Every primary jurisdiction alone and with up to two secondaries"""
+    for primary in CUSTOMER_JURISDICTIONS:
+        others = [code for code in CUSTOMER_JURISDICTIONS if code != primary]
+        yield _customer(primary)
+        for count in (1, 2):
+            for secondary in itertools.combinations(others, count):
+                yield _customer(primary, secondary)
+
+async def _assert_matches_legacy(handler: JurisdictionHandler, rules):
+    for customer in _customers():
+        jurisdictions = [customer.primary_jurisdiction] + customer.secondary_jurisdictions
+        expected = [rule for rule in rules if _legacy_is_applicable(handler, rule, jurisdictions)]
+        actual = await handler.filter_rules_by_jurisdiction(rules, customer)
+        assert actual == expected, customer.customer_id
+
+class TestJurisdictionRuleIndex:
+    """Index-based filtering against the per-rule predicate"""
+
+    @pytest.fixture
+    def handler(self):
+        return JurisdictionHandler()
+
+    @pytest.fixture
+    def rules(self):
+        return [_rule(index, jurisdiction)
+                for index in range(2) for jurisdiction in RULE_JURISDICTIONS]
+
+    @pytest.mark.asyncio
+    async def test_index_matches_per_rule_predicate(self, handler, rules):
+        """Every customer jurisdiction combination selects the same rules, in order"""
+        await _assert_matches_legacy(handler, rules)
+
+    @pytest.mark.asyncio
+    async def test_eu_rules_reach_member_states_only(self, handler, rules):
+        """EU rules apply to EU members, configured or not, but not to GB, CH or US"""
+        eu_rule_ids = {rule.rule_id for rule in rules if rule.jurisdiction == 'EU'}
+
+        for code in ('DE', 'AT', 'FR', 'EU'):
+            applicable = await handler.filter_rules_by_jurisdiction(rules, _customer(code))
+            assert eu_rule_ids <= {rule.rule_id for rule in applicable}, code
+
+        for code in ('GB', 'CH', 'US', 'XX'):
+            applicable = await handler.filter_rules_by_jurisdiction(rules, _customer(code))
+            assert not eu_rule_ids & {rule.rule_id for rule in applicable}, code
+
+        # Unconfigured customer jurisdictions only see their own rules
+        assert [rule.rule_id for rule in await handler.filter_rules_by_jurisdiction(rules, _customer('XX'))] == \
+            ['RULE-XX-0', 'RULE-XX-1']
+
+    @pytest.mark.asyncio
+    async def test_changed_rule_set_reindexed(self, handler, rules):
+        """Adding, removing or moving rules rebuilds the index before filtering"""
+        await handler.filter_rules_by_jurisdiction(rules, _customer('DE'))
+        signature = handler._rule_index_signature
+
+        changed = [rule for rule in rules if rule.jurisdiction != 'DE'] + [_rule(5, 'AT')]
+        changed[0] = replace(changed[0], jurisdiction='IE')
+        await _assert_matches_legacy(handler, changed)
+        assert handler._rule_index_signature != signature
+
+        # Returning to the original set restores the original selection
+        await _assert_matches_legacy(handler, rules)
+
+    @pytest.mark.asyncio
+    async def test_hierarchy_change_rederives_index(self, handler, rules):
+        """A new configured jurisdiction inherits its parents' rules after the hierarchy is rebuilt"""
+        await _assert_matches_legacy(handler, rules)
+        assert not any(rule.jurisdiction == 'GB'
+                       for rule in await handler.filter_rules_by_jurisdiction(rules, _customer('GG')))
+
+        handler.jurisdictions['GG'] = replace(handler.jurisdictions['GB'], code='GG', parent_jurisdictions=['GB'])
+        handler._build_jurisdiction_hierarchy()
+
+        applicable = await handler.filter_rules_by_jurisdiction(rules, _customer('GG'))
+        assert [rule.rule_id for rule in applicable] == ['RULE-GB-0', 'RULE-GB-1']
+        await _assert_matches_legacy(handler, rules)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Metrics Storage Components
+=========================================
+
+This module provides unit testing for the continuous metric rollups and the
+raw-versus-rollup history resolution used by the performance tracker.
+
+Test Coverage Areas:
+- Rollup watermarks: backfill, resumption and chunked minute windows
+- Late-arriving rows re-aggregated into already closed buckets
+- Hourly rollups recomputed from the minute rollups
+- History resolution choice (raw, 1-minute, 1-hour) and explicit override
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, AsyncMock
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from metrics_storage import MetricRollupManager
+from performance_tracker import PerformanceTracker
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+NOW = datetime(2026, 10, 18, 12, 0, 30, tzinfo=timezone.utc)
+
+class _FakeMetricsDatabase:
+    """Evaluates the rollup manager's statements over in-memory rows"""
+
+    def __init__(self):
+        self.raw = []
+        self.rollups = {'performance_metrics_rollup_1m': {}, 'performance_metrics_rollup_1h': {}}
+        self.minute_windows = []
+
+    def add(self, timestamp, value, metric_name='latency'):
+        self.raw.append((metric_name, timestamp, value))
+
+    async def fetchval(self, query):
+        table = query.split('FROM')[1].strip()
+        return max(self.rollups[table], default=(None, None))[1]
+
+    async def execute(self, query, window_start, window_end, *args):
+        if 'INSERT INTO performance_metrics_rollup_1m' in query:
+            self.minute_windows.append((window_start, window_end))
+            source = [
+                (name, timestamp.replace(second=0, microsecond=0), 1, value, value, value)
+                for name, timestamp, value in self.raw
+                if window_start <= timestamp < window_end
+            ]
+            target = self.rollups['performance_metrics_rollup_1m']
+        else:
+            source = [
+                (name, bucket.replace(minute=0), *aggregate)
+                for (name, bucket), aggregate in self.rollups['performance_metrics_rollup_1m'].items()
+                if window_start <= bucket < window_end
+            ]
+            target = self.rollups['performance_metrics_rollup_1h']
+
+        grouped = {}
+        for name, bucket, count, total, low, high in source:
+            previous = grouped.get((name, bucket))
+            grouped[(name, bucket)] = (count, total, low, high) if previous is None else (
+                previous[0] + count, previous[1] + total, min(previous[2], low), max(previous[3], high)
+            )
+        target.update(grouped)
+        return f"INSERT 0 {len(grouped)}"
+
+    def minute(self, bucket, metric_name='latency'):
+        return self.rollups['performance_metrics_rollup_1m'].get((metric_name, bucket))
+
+    def hour(self, bucket, metric_name='latency'):
+        return self.rollups['performance_metrics_rollup_1h'].get((metric_name, bucket))
+
+class TestMetricRollupManager:
+    """Test suite for MetricRollupManager watermarks"""
+
+    @pytest.mark.asyncio
+    async def test_backfill_then_resume_from_watermark(self):
+        """The first run backfills in chunks; later runs resume near the watermark"""
+        database = _FakeMetricsDatabase()
+        manager = MetricRollupManager(lag_seconds=120, late_window_seconds=300,
+                                      backfill_hours=2, chunk_minutes=60)
+
+        await manager.run_once(database, NOW)
+        cutoff = datetime(2026, 10, 18, 11, 58, tzinfo=timezone.utc)
+        assert database.minute_windows == [
+            (datetime(2026, 10, 18, 10, 0, tzinfo=timezone.utc), datetime(2026, 10, 18, 11, 0, tzinfo=timezone.utc)),
+            (datetime(2026, 10, 18, 11, 0, tzinfo=timezone.utc), cutoff)
+        ]
+        assert manager.watermarks['1m'] == cutoff
+
+        database.minute_windows.clear()
+        await manager.run_once(database, NOW + timedelta(minutes=1))
+        assert database.minute_windows == [(cutoff - timedelta(minutes=4), cutoff + timedelta(minutes=1))]
+
+    @pytest.mark.asyncio
+    async def test_watermark_loaded_from_rollup_table(self):
+        """A restarted manager resumes from the newest stored bucket"""
+        database = _FakeMetricsDatabase()
+        stored = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+        database.rollups['performance_metrics_rollup_1m'][('latency', stored)] = (1, 1.0, 1.0, 1.0)
+        manager = MetricRollupManager(lag_seconds=120, late_window_seconds=300, chunk_minutes=60)
+
+        await manager.run_once(database, NOW)
+
+        assert database.minute_windows[0][0] == stored
+        assert database.minute_windows[-1][1] == datetime(2026, 10, 18, 11, 58, tzinfo=timezone.utc)
+
+    @pytest.mark.asyncio
+    async def test_late_rows_reaggregated_into_closed_buckets(self):
+        """Rows flushed after their minute was rolled up still reach both rollups"""
+        database = _FakeMetricsDatabase()
+        manager = MetricRollupManager(lag_seconds=120, late_window_seconds=600, backfill_hours=1)
+        bucket = datetime(2026, 10, 18, 11, 55, tzinfo=timezone.utc)
+        database.add(bucket + timedelta(seconds=5), 10.0)
+
+        await manager.run_once(database, NOW)
+        assert database.minute(bucket) == (1, 10.0, 10.0, 10.0)
+
+        # A requeued write-behind batch lands three minutes after the minute closed
+        database.add(bucket + timedelta(seconds=40), 30.0)
+        await manager.run_once(database, NOW + timedelta(minutes=3))
+
+        assert database.minute(bucket) == (2, 40.0, 10.0, 30.0)
+        assert database.hour(bucket.replace(minute=0)) == (2, 40.0, 10.0, 30.0)
+
+    @pytest.mark.asyncio
+    async def test_rows_later_than_window_not_reaggregated(self):
+        """Only the configured late window is revisited on each run"""
+        database = _FakeMetricsDatabase()
+        manager = MetricRollupManager(lag_seconds=120, late_window_seconds=300, backfill_hours=1)
+        bucket = datetime(2026, 10, 18, 11, 40, tzinfo=timezone.utc)
+
+        await manager.run_once(database, NOW)
+        database.add(bucket + timedelta(seconds=5), 10.0)
+        await manager.run_once(database, NOW + timedelta(minutes=1))
+
+        assert database.minute(bucket) is None
+
+class TestHistoryResolution:
+    """Raw versus rollup history in PerformanceTracker"""
+
+    def _tracker(self, conn):
+        tracker = PerformanceTracker(hub=Mock())
+        tracker.config['raw_history_max_hours'] = 2
+        tracker.config['minute_rollup_max_hours'] = 48
+        acquire = Mock()
+        acquire.__aenter__ = AsyncMock(return_value=conn)
+        acquire.__aexit__ = AsyncMock(return_value=False)
+        tracker.pg_pool = Mock(acquire=Mock(return_value=acquire))
+        tracker.rollup_manager.fetch_history = AsyncMock(return_value=[{'resolution': 'rollup'}])
+        return tracker
+
+    def test_select_history_resolution(self):
+        """Short windows read raw rows, longer ones the minute then hour rollups"""
+        tracker = self._tracker(Mock())
+
+        assert tracker._select_history_resolution(1) == 'raw'
+        assert tracker._select_history_resolution(2) == 'raw'
+        assert tracker._select_history_resolution(3) == '1m'
+        assert tracker._select_history_resolution(48) == '1m'
+        assert tracker._select_history_resolution(24 * 7) == '1h'
+
+    @pytest.mark.asyncio
+    async def test_history_reads_chosen_storage(self):
+        """get_metric_history queries raw rows or the matching rollup table"""
+        conn = Mock(fetch=AsyncMock(return_value=[{'metric_name': 'latency', 'value': '1.0'}]))
+        tracker = self._tracker(conn)
+
+        raw = await tracker.get_metric_history('latency', time_window_hours=1)
+        assert raw == [{'metric_name': 'latency', 'value': '1.0'}]
+        assert 'FROM performance_metrics' in conn.fetch.await_args.args[0]
+        tracker.rollup_manager.fetch_history.assert_not_awaited()
+
+        await tracker.get_metric_history('latency', time_window_hours=24, labels={'service': 'api'})
+        args = tracker.rollup_manager.fetch_history.await_args.args
+        assert args[1] == '1m' and args[2] == 'latency' and args[4] == {'service': 'api'}
+
+        await tracker.get_metric_history('latency', time_window_hours=24 * 30)
+        assert tracker.rollup_manager.fetch_history.await_args.args[1] == '1h'
+
+    @pytest.mark.asyncio
+    async def test_explicit_resolution_overrides_window(self):
+        """An explicit resolution wins over the window-based choice"""
+        conn = Mock(fetch=AsyncMock(return_value=[]))
+        tracker = self._tracker(conn)
+
+        await tracker.get_metric_history('latency', time_window_hours=1, resolution='1h')
+        assert tracker.rollup_manager.fetch_history.await_args.args[1] == '1h'
+
+        await tracker.get_metric_history('latency', time_window_hours=24 * 30, resolution='raw')
+        conn.fetch.assert_awaited_once()
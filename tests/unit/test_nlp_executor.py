@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the NLP Executor
+===============================
+
+This module provides unit testing for the batched process-pool spaCy
+service used by RuleCompiler and TextSimilarityAnalyzer.
+
+Test Coverage Areas:
+- Request batching per pipeline profile
+- Serialisable document summaries (entities, matches, sentences, vectors)
+- Worker processes with warmed models
+- Similarity matrix analysing each obligation once
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+import pickle
+import logging
+
+import spacy
+from spacy.language import Language
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src import nlp_executor as executor_module
+from src.nlp_executor import NLPExecutor, DocSummary
+from src.nlp_models import NLPModelRegistry
+from src.overlap_resolver import OverlapResolver
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+@Language.component("test_lowercase_lemmas")
+def _lowercase_lemmas(doc):
+    for token in doc:
+        token.lemma_ = token.lower_
+    return doc
+
+def _pipeline():
+    """Small stand-in for en_core_web_sm (not installed here)"""
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    nlp.add_pipe('test_lowercase_lemmas')
+    ruler = nlp.add_pipe('entity_ruler')
+    ruler.add_patterns([{'label': 'ORG', 'pattern': 'EBA'}])
+    return nlp
+
+def _inline_executor(monkeypatch, **kwargs):
+    """Executor running batches in a thread against a blank pipeline"""
+    registry = NLPModelRegistry()
+    monkeypatch.setattr(executor_module, 'nlp_registry', registry)
+    monkeypatch.setattr(executor_module, '_worker_state', {})
+    monkeypatch.setattr('src.nlp_models.spacy.load', lambda name, exclude=(): _pipeline())
+    return NLPExecutor(workers=0, **kwargs)
+
+class TestNLPExecutor:
+    """Test suite for NLPExecutor"""
+
+    @pytest.mark.asyncio
+    async def test_requests_batched_per_profile(self, monkeypatch):
+        """Concurrent requests are grouped into batches per set of disabled components"""
+        executor = _inline_executor(monkeypatch, batch_size=8, batch_window=0.05)
+        texts = [f"Obligation {index} applies." for index in range(10)]
+
+        summaries, other = await asyncio.gather(
+            executor.analyze_many(texts),
+            executor.analyze_many(['Separate profile.', 'Second text.'], disable=('entity_ruler',))
+        )
+        await executor.close()
+
+        assert [summary.text for summary in summaries] == texts
+        assert [summary.text for summary in other] == ['Separate profile.', 'Second text.']
+        assert executor.metrics['batches_processed'] == 3
+        assert executor.metrics['texts_processed'] == 12
+
+    @pytest.mark.asyncio
+    async def test_summary_contents(self, monkeypatch):
+        """Summaries carry entities, regulatory matches, sentences and lemmas, and pickle"""
+        executor = _inline_executor(monkeypatch)
+        summary = await executor.analyze('The EBA must be notified within 30 days. Fees above 100 euro apply.')
+        await executor.close()
+
+        assert ('EBA', 'ORG', 4, 7) in summary.entities
+        labels = {label for label, _, _, _ in summary.matches}
+        assert {'REGULATORY_ACTION', 'TIME_PERIOD', 'MONETARY_AMOUNT', 'THRESHOLD'} <= labels
+        assert len(summary.sentences) == 2
+        assert 'notified' in summary.content_lemmas and 'the' not in summary.content_lemmas
+        assert pickle.loads(pickle.dumps(summary)) == summary
+
+    def test_summary_similarity(self):
+        """Vector similarity is cosine, with identical texts scoring 1"""
+        first = DocSummary(text='a', vector=[1.0, 0.0])
+        second = DocSummary(text='b', vector=[1.0, 1.0])
+
+        assert first.similarity(second) == pytest.approx(2 ** -0.5)
+        assert first.similarity(DocSummary(text='a')) == 1.0
+        assert first.similarity(DocSummary(text='c')) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_worker_processes(self, tmp_path):
+        """Worker processes load the model at start and return summaries"""
+        model_path = tmp_path / 'model'
+        _pipeline().to_disk(model_path)
+
+        executor = NLPExecutor(workers=2, batch_size=4, model_name=str(model_path))
+        try:
+            await executor.start()
+            summaries = await executor.analyze_many([
+                'Institutions shall report to the EBA.', 'Records are kept for 5 years.'
+            ])
+        finally:
+            await executor.close()
+
+        assert summaries[0].entities == [('EBA', 'ORG', 33, 36)]
+        assert summaries[1].matches == [('TIME_PERIOD', 4, 6, '5 years')]
+        assert executor._pool is None
+
+    @pytest.mark.asyncio
+    async def test_similarity_matrix_analyses_each_obligation_once(self, monkeypatch):
+        """Pairwise comparison reuses one summary per obligation"""
+        executor = _inline_executor(monkeypatch)
+        resolver = OverlapResolver()
+        resolver.similarity_analyzer.nlp_executor = executor
+        obligations = [
+            {
+                'obligation_id': f"OBL-{index}",
+                'content': f"Institutions need reporting and monitoring for product {index}.",
+                'regulation_type': 'AML',
+                'jurisdiction': 'EU'
+            }
+            for index in range(4)
+        ]
+
+        matrix = await resolver._calculate_similarity_matrix(obligations)
+        await executor.close()
+
+        assert executor.metrics['texts_processed'] == 4
+        similarity = matrix['OBL-0']['OBL-1']
+        assert 'regulatory_keyword_match' in similarity.similarity_factors
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the NLP Model Registry
+=====================================
+
+This module provides unit testing for the process-wide spaCy model registry
+shared by the intelligence agent's NLP components.
+
+Test Coverage Areas:
+- Models loaded once per process and only on first use
+- Per-caller disabled and custom pipeline components
+- Batched processing through nlp.pipe
+- Pre-fork preloading
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import gc
+import logging
+
+import spacy
+from spacy.language import Language
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src import nlp_models
+from src.nlp_models import NLPModelRegistry
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def _mark(doc, name):
+    doc.user_data.setdefault('ran', []).append(name)
+    return doc
+
+@Language.component("test_marker")
+def _marker_component(doc):
+    return _mark(doc, 'test_marker')
+
+@Language.component("test_extra")
+def _extra_component(doc):
+    return _mark(doc, 'test_extra')
+
+class _FakeLoader:
+    """Stands in for spacy.load with a small blank pipeline (en_core_web_sm is not installed)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, name, exclude=()):
+        self.calls.append(name)
+        nlp = spacy.blank('en')
+        nlp.add_pipe('sentencizer')
+        nlp.add_pipe('test_marker')
+        return nlp
+
+def _registry(monkeypatch):
+    loader = _FakeLoader()
+    monkeypatch.setattr(nlp_models.spacy, 'load', loader)
+    return NLPModelRegistry(), loader
+
+class TestNLPModelRegistry:
+    """Test suite for NLPModelRegistry"""
+
+    def test_model_loaded_once_on_first_use(self, monkeypatch):
+        """Caller views load nothing until used, then share one pipeline"""
+        registry, loader = _registry(monkeypatch)
+        first = registry.pipeline()
+        second = registry.pipeline(disable=('test_marker',))
+        assert loader.calls == []
+
+        first('Institutions must verify customer identity.')
+        docs = list(second.pipe(['First obligation.', 'Second obligation.'], batch_size=2))
+
+        assert loader.calls == ['en_core_web_sm']
+        assert len(docs) == 2
+        assert first.nlp is second.nlp
+
+    def test_disabled_components_skipped_per_caller(self, monkeypatch):
+        """A caller's disabled components do not run for it but still run for others"""
+        registry, _ = _registry(monkeypatch)
+        full = registry.pipeline()
+        slim = registry.pipeline(disable=('test_marker',))
+
+        assert full('Reports are due monthly.').user_data['ran'] == ['test_marker']
+        assert 'ran' not in slim('Reports are due monthly.').user_data
+        assert slim.pipe_names == ['sentencizer']
+
+    def test_custom_components_only_for_requesting_callers(self, monkeypatch):
+        """Custom components are added to the shared model but run only where requested"""
+        registry, loader = _registry(monkeypatch)
+        plain = registry.pipeline()
+        extended = registry.pipeline(components=('test_extra',))
+
+        assert extended('Article 5 applies.').user_data['ran'] == ['test_marker', 'test_extra']
+        assert plain('Article 5 applies.').user_data['ran'] == ['test_marker']
+        assert len(loader.calls) == 1
+
+    def test_preload_loads_before_use(self, monkeypatch):
+        """preload() loads models up front and freezes them out of the collector"""
+        registry, loader = _registry(monkeypatch)
+        try:
+            registry.preload(include_nltk=False)
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
+
+        assert registry.loaded_models() == ['en_core_web_sm']
+        registry.pipeline()('Already loaded.')
+        assert len(loader.calls) == 1
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Obligation Repository
+========================================
+
+This module provides unit testing for the batched, version-aware obligation
+loader shared by RuleCompiler and OverlapResolver.
+
+Test Coverage Areas:
+- One query per batch of IDs, in request order, duplicates loaded once
+- Metadata and full-text projections
+- Fresh cache hits and version revalidation without re-sending content
+- Invalidation, including invalidations racing an in-flight query
+- Prefetch for per-obligation compilation and overlap resolution
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src.obligation_repository import ObligationRepository
+from src.rule_compiler import RuleCompiler
+from src.overlap_resolver import (
+    OverlapResolver, OverlapCluster, OverlapType, RegulatoryLevel, ResolutionStrategy
+)
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class _FakeObligationTable:
+    """regulatory_obligations stand-in evaluating the repository's queries"""
+
+    def __init__(self, count=5):
+        self.rows = {
+            f"OBL-{index}": {
+                'obligation_id': f"OBL-{index}",
+                'regulation_type': 'AML',
+                'jurisdiction': 'EU',
+                'title': f"Obligation {index}",
+                'content': f"Institutions must monitor transactions of type {index}.",
+                'obligation_level': 'directive',
+                'confidence_score': 0.9,
+                'effective_date': None,
+                'created_at': datetime(2026, 1, 1, tzinfo=timezone.utc),
+                'version': '1'
+            }
+            for index in range(count)
+        }
+        self.queries = []
+        self.before_fetch = None
+
+    async def fetch(self, query, obligation_ids, versions=None):
+        self.queries.append((query, list(obligation_ids)))
+        if self.before_fetch:
+            self.before_fetch()
+        known = json.loads(versions) if versions else {}
+        results = []
+        for obligation_id in obligation_ids:
+            row = self.rows.get(obligation_id)
+            if row is None:
+                continue
+            result = {key: value for key, value in row.items() if key != 'content'}
+            if 'content' in query:
+                result['content'] = None if known.get(obligation_id) == row['version'] else row['content']
+            results.append(result)
+        return results
+
+    def pool(self):
+        @asynccontextmanager
+        async def acquire():
+            yield self
+        return Mock(acquire=acquire)
+
+class TestObligationRepository:
+    """Test suite for ObligationRepository"""
+
+    @pytest.mark.asyncio
+    async def test_one_query_per_batch(self):
+        """IDs are loaded in batches, deduplicated, in request order"""
+        table = _FakeObligationTable()
+        repository = ObligationRepository(batch_size=2)
+
+        rows = await repository.get_many(
+            table.pool(), ['OBL-3', 'OBL-1', 'OBL-3', 'MISSING', 'OBL-0', 'OBL-4']
+        )
+
+        assert list(rows) == ['OBL-3', 'OBL-1', 'OBL-0', 'OBL-4']
+        assert [ids for _, ids in table.queries] == [['OBL-3', 'OBL-1'], ['MISSING', 'OBL-0'], ['OBL-4']]
+        assert all('obligation_id = ANY($1)' in query for query, _ in table.queries)
+        assert rows['OBL-1']['content'].startswith('Institutions must monitor')
+
+    @pytest.mark.asyncio
+    async def test_metadata_projection(self):
+        """Metadata loads leave the content column out of the query and the rows"""
+        table = _FakeObligationTable()
+        repository = ObligationRepository()
+
+        rows = await repository.get_many(table.pool(), ['OBL-0', 'OBL-1'], include_content=False)
+
+        assert 'content' not in table.queries[0][0]
+        assert 'content' not in rows['OBL-0']
+        assert rows['OBL-0']['obligation_level'] == 'directive'
+
+    @pytest.mark.asyncio
+    async def test_fresh_rows_served_without_query(self):
+        """Prefetched rows are served from cache, in either projection"""
+        table = _FakeObligationTable()
+        repository = ObligationRepository()
+
+        assert await repository.prefetch(table.pool(), ['OBL-0', 'OBL-1']) == 2
+        full = await repository.get(table.pool(), 'OBL-0')
+        metadata = await repository.get_many(table.pool(), ['OBL-0', 'OBL-1'], include_content=False)
+
+        assert len(table.queries) == 1
+        assert full['content'] == table.rows['OBL-0']['content']
+        assert 'content' not in metadata['OBL-1']
+        assert repository.metrics['fresh_hits'] == 3
+
+        full['content'] = 'mutated by caller'
+        assert (await repository.get(table.pool(), 'OBL-0'))['content'] == table.rows['OBL-0']['content']
+
+    @pytest.mark.asyncio
+    async def test_stale_rows_revalidated_by_version(self):
+        """Unchanged versions reuse cached content; changed ones return the new text"""
+        table = _FakeObligationTable()
+        repository = ObligationRepository(fresh_seconds=0)
+        await repository.get_many(table.pool(), ['OBL-0', 'OBL-1'])
+
+        table.rows['OBL-1'].update(content='Amended obligation text.', version='2')
+        rows = await repository.get_many(table.pool(), ['OBL-0', 'OBL-1'])
+
+        assert rows['OBL-0']['content'] == table.rows['OBL-0']['content']
+        assert rows['OBL-1']['content'] == 'Amended obligation text.'
+        assert rows['OBL-1']['version'] == '2'
+        assert repository.metrics['content_reused'] == 1
+        assert len(table.queries) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation(self):
+        """Invalidated rows are reloaded, and rows read during an invalidation are not cached"""
+        table = _FakeObligationTable()
+        repository = ObligationRepository()
+        await repository.prefetch(table.pool(), ['OBL-0'])
+
+        repository.invalidate('OBL-0')
+        table.before_fetch = lambda: repository.invalidate()
+        await repository.get(table.pool(), 'OBL-0')
+        table.before_fetch = None
+        await repository.get(table.pool(), 'OBL-0')
+
+        assert len(table.queries) == 3
+        assert repository.get_metrics()['cached_obligations'] == 1
+
+class TestObligationPrefetch:
+    """Prefetch in RuleCompiler and OverlapResolver"""
+
+    @pytest.mark.asyncio
+    async def test_rule_compiler_prefetch(self, monkeypatch):
+        """Per-obligation retrieval after a prefetch issues no further queries"""
+        monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+        with patch.object(RuleCompiler, '_init_nlp_models'):
+            compiler = RuleCompiler()
+        table = _FakeObligationTable()
+        compiler.pg_pool = table.pool()
+        compiler.obligation_repository = ObligationRepository()
+
+        await compiler.prefetch_obligations(list(table.rows))
+        obligations = [await compiler._retrieve_obligation(obligation_id) for obligation_id in table.rows]
+
+        assert len(table.queries) == 1
+        assert [obligation['obligation_id'] for obligation in obligations] == list(table.rows)
+
+    @pytest.mark.asyncio
+    async def test_resolve_overlaps_loads_clusters_once(self):
+        """Resolving several clusters loads their obligations in one query"""
+        table = _FakeObligationTable(count=6)
+        resolver = OverlapResolver()
+        resolver.pg_pool = table.pool()
+        resolver.obligation_repository = ObligationRepository()
+        resolver._store_merged_obligations = lambda merged: _noop()
+        resolver._update_overlap_clusters = lambda clusters: _noop()
+        # NLTK sentence data is not installed here; one requirement per obligation
+        resolver._extract_requirements = lambda content: [content]
+
+        def cluster(ids, strategy):
+            return OverlapCluster(
+                cluster_id=ids[0], obligation_ids=ids, cluster_type=OverlapType.PARTIAL,
+                primary_obligation_id=ids[0], similarity_matrix={},
+                regulatory_levels={oid: RegulatoryLevel.LEVEL_1 for oid in ids},
+                resolution_strategy=strategy, merged_obligation_id=None,
+                created_at=datetime.now(timezone.utc), resolved_at=None
+            )
+
+        merged = await resolver.resolve_overlaps([
+            cluster(['OBL-0', 'OBL-1'], ResolutionStrategy.MERGE),
+            cluster(['OBL-2', 'OBL-3'], ResolutionStrategy.PRIORITIZE),
+            cluster(['OBL-4', 'OBL-5'], ResolutionStrategy.ESCALATE)
+        ])
+
+        assert len(merged) == 2
+        assert table.queries[0][1] == ['OBL-0', 'OBL-1', 'OBL-2']
+        assert len(table.queries) == 1
+
+async def _noop():
+    return None
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Jurisdiction Conflict Resolution Cache
+=========================================================
+
+This module provides unit testing for the memoized conflict resolutions of
+JurisdictionHandler: a per-process LRU in front of Redis entries shared by
+all workers.
+
+Test Coverage Areas:
+- Lookup order: local LRU, then Redis, then computation
+- Cache keys following rule versions and the jurisdiction set
+- LRU eviction of the local cache
+- Local and shared invalidation, and Redis failures
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+from dataclasses import replace
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src.jurisdiction_handler import JurisdictionHandler, CustomerJurisdiction, RESOLUTION_CACHE_PREFIX
+from src.rule_compiler import ComplianceRule, RegulationType, RuleType
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class _FakeRedis:
+    """In-memory stand-in for the shared async Redis client"""
+
+    def __init__(self):
+        self.data = {}
+        self.get = AsyncMock(side_effect=lambda key: self.data.get(key))
+        self.setex = AsyncMock(side_effect=self._setex)
+        self.delete_matching = AsyncMock(side_effect=self._delete_matching)
+
+    def _setex(self, key, ttl, value):
+        self.data[key] = value
+        return True
+
+    def _delete_matching(self, pattern):
+        prefix = pattern.rstrip('*')
+        matching = [key for key in self.data if key.startswith(prefix)]
+        for key in matching:
+            del self.data[key]
+        return len(matching)
+
+def _rule(rule_id: str, jurisdiction: str, version: str = '1.0') -> ComplianceRule:
+    return ComplianceRule(
+        rule_id=rule_id,
+        regulation_type=RegulationType.AML,
+        rule_type=RuleType.THRESHOLD,
+        title=f"Threshold rule {rule_id}",
+        description='Transactions above the threshold must be reported',
+        conditions=[],
+        json_logic={},
+        confidence_score=0.9,
+        source_obligation_id=f"OBL-{rule_id}",
+        jurisdiction=jurisdiction,
+        effective_date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        version=version
+    )
+
+def _customer(primary: str, secondary, customer_id: str = 'CUST-1') -> CustomerJurisdiction:
+    return CustomerJurisdiction(
+        customer_id=customer_id,
+        primary_jurisdiction=primary,
+        secondary_jurisdictions=list(secondary),
+        residence_country=primary,
+        citizenship_countries=[primary],
+        business_countries=[],
+        tax_jurisdictions=[],
+        detected_at=datetime.now(timezone.utc),
+        confidence_score=0.9,
+        detection_method='test'
+    )
+
+RULES = [_rule('R-EU', 'EU'), _rule('R-DE', 'DE'), _rule('R-IE', 'IE')]
+
+def _handler(redis=None, cache_size: int = 16) -> JurisdictionHandler:
+    handler = JurisdictionHandler()
+    handler.redis_client = redis
+    handler.resolution_cache_size = cache_size
+    handler._compute_resolution = AsyncMock(side_effect=handler._compute_resolution)
+    return handler
+
+class TestResolutionCache:
+    """Test suite for _get_cached_resolution and its invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_lookup_order_local_then_redis_then_compute(self):
+        """A miss is computed and written to both tiers; later lookups stop at the first hit"""
+        redis = _FakeRedis()
+        handler = _handler(redis)
+        customer = _customer('DE', ['EU'])
+        key = handler._resolution_cache_key(customer, RULES)
+
+        computed = await handler._get_cached_resolution(customer, RULES)
+        assert handler._compute_resolution.await_count == 1
+        assert redis.get.await_count == 1
+        redis.setex.assert_awaited_once()
+        assert redis.setex.await_args.args[:2] == (key, handler.resolution_cache_ttl)
+        assert key.startswith(RESOLUTION_CACHE_PREFIX)
+
+        # Local hit: Redis is not consulted
+        assert await handler._get_cached_resolution(customer, RULES) == computed
+        assert redis.get.await_count == 1
+
+        # Another worker with an empty local cache is served from Redis
+        other = _handler(redis)
+        assert await other._get_cached_resolution(customer, RULES) == computed
+        other._compute_resolution.assert_not_awaited()
+        assert key in other._resolution_cache
+
+        assert handler.resolution_stats['resolution_cache_misses'] == 1
+        assert handler.resolution_stats['resolution_cache_hits'] == 1
+        assert other.resolution_stats['resolution_cache_hits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_key_follows_rule_versions(self):
+        """A changed rule version or jurisdiction misses the old entry"""
+        handler = _handler(_FakeRedis())
+        customer = _customer('DE', ['EU'])
+        key = handler._resolution_cache_key(customer, RULES)
+
+        amended = [RULES[0], _rule('R-DE', 'DE', version='2.0'), RULES[2]]
+        moved = [RULES[0], RULES[1], _rule('R-IE', 'GB')]
+        assert handler._resolution_cache_key(customer, amended) != key
+        assert handler._resolution_cache_key(customer, moved) != key
+
+        await handler._get_cached_resolution(customer, RULES)
+        await handler._get_cached_resolution(customer, amended)
+        assert handler._compute_resolution.await_count == 2
+
+    def test_key_ignores_customer_and_secondary_order(self):
+        """Customers with the same jurisdiction set and rules share an entry"""
+        handler = _handler()
+        key = handler._resolution_cache_key(_customer('DE', ['IE', 'EU']), RULES)
+
+        assert handler._resolution_cache_key(_customer('DE', ['EU', 'IE', 'EU'], 'CUST-2'), RULES) == key
+        assert handler._resolution_cache_key(_customer('DE', ['IE', 'EU']), list(reversed(RULES))) == key
+        assert handler._resolution_cache_key(_customer('IE', ['DE', 'EU']), RULES) != key
+        assert handler._resolution_cache_key(_customer('DE', ['EU']), RULES) != key
+
+    @pytest.mark.asyncio
+    async def test_local_cache_evicts_least_recently_used(self):
+        """The local LRU keeps the most recently used resolutions within its size"""
+        redis = _FakeRedis()
+        handler = _handler(redis, cache_size=2)
+        first, second, third = _customer('DE', ['EU']), _customer('IE', ['EU']), _customer('EU', [])
+
+        await handler._get_cached_resolution(first, RULES)
+        await handler._get_cached_resolution(second, RULES)
+        await handler._get_cached_resolution(first, RULES)
+        await handler._get_cached_resolution(third, RULES)
+
+        cached = list(handler._resolution_cache)
+        assert cached == [handler._resolution_cache_key(first, RULES), handler._resolution_cache_key(third, RULES)]
+
+        # The evicted entry comes back from Redis rather than being recomputed
+        lookups = redis.get.await_count
+        await handler._get_cached_resolution(second, RULES)
+        assert redis.get.await_count == lookups + 1
+        assert handler._compute_resolution.await_count == 3
+        assert len(handler._resolution_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation(self):
+        """Local invalidation falls back to Redis; shared invalidation recomputes"""
+        redis = _FakeRedis()
+        redis.data['unrelated'] = 'kept'
+        handler = _handler(redis)
+        customer = _customer('DE', ['EU'])
+        await handler._get_cached_resolution(customer, RULES)
+
+        handler.invalidate_resolution_cache()
+        assert handler._resolution_cache == {}
+        await handler._get_cached_resolution(customer, RULES)
+        assert handler._compute_resolution.await_count == 1
+
+        # Re-indexing the rule set drops local entries
+        handler.index_rules(RULES)
+        assert handler._resolution_cache == {}
+
+        await handler.invalidate_shared_resolution_cache()
+        assert redis.data == {'unrelated': 'kept'}
+        await handler._get_cached_resolution(customer, RULES)
+        assert handler._compute_resolution.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_failures_fall_back_to_compute(self):
+        """Redis errors are logged and the resolution is computed and cached locally"""
+        redis = _FakeRedis()
+        redis.get.side_effect = ConnectionError('redis down')
+        redis.setex.side_effect = ConnectionError('redis down')
+        handler = _handler(redis)
+        customer = _customer('DE', ['EU'])
+
+        resolution = await handler._get_cached_resolution(customer, RULES)
+        assert await handler._get_cached_resolution(customer, RULES) == resolution
+        assert handler._compute_resolution.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_resolution_matches_computed_result(self):
+        """Conflict resolution returns the same rules whether cached or computed"""
+        handler = _handler(_FakeRedis())
+        handler._store_conflict_resolution = AsyncMock()
+        customer = _customer('DE', ['IE', 'EU'])
+
+        first = await handler.resolve_jurisdiction_conflicts(customer, RULES)
+        second = await handler.resolve_jurisdiction_conflicts(replace(customer, customer_id='CUST-2'), RULES)
+
+        assert handler._compute_resolution.await_count == 1
+        assert [rule.rule_id for rule in second['resolved_rules']] == \
+            [rule.rule_id for rule in first['resolved_rules']]
+        assert second['resolution_strategy'] == first['resolution_strategy']
+        assert handler._store_conflict_resolution.await_count == 2
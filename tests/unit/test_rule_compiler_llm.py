@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for RuleCompiler LLM Fan-Out
+=======================================
+
+This module provides unit testing for the concurrent, rate-limited LLM
+calls RuleCompiler makes while generating JSON-Logic for rule candidates.
+
+Test Coverage Areas:
+- Candidate JSON-Logic generated concurrently within the concurrency bound
+- Rule order and fallback JSON-Logic preserved under concurrency
+- Token bucket rate limiting of LLM calls
+- AI extraction overlapping NLP processing
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+import time
+from datetime import datetime, timezone
+from unittest.mock import Mock, AsyncMock, patch
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src.rule_compiler import RuleCompiler, ObligationParseResult, LLMRateLimiter
+from src.nlp_executor import DocSummary
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def _compiler(monkeypatch, concurrency='3', rate='1000', burst='1000'):
+    """RuleCompiler with real LLM admission but without NLP models or an API"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('RULE_COMPILER_LLM_CONCURRENCY', concurrency)
+    monkeypatch.setenv('RULE_COMPILER_LLM_REQUESTS_PER_SECOND', rate)
+    monkeypatch.setenv('RULE_COMPILER_LLM_BURST', burst)
+    with patch.object(RuleCompiler, '_init_nlp_models'):
+        return RuleCompiler()
+
+def _fake_chain(delay=0.05, fail_on=()):
+    chain = Mock()
+    active = {'now': 0, 'peak': 0}
+
+    async def arun(**inputs):
+        active['now'] += 1
+        active['peak'] = max(active['peak'], active['now'])
+        try:
+            await asyncio.sleep(delay)
+            if any(text in inputs.get('requirements', '') for text in fail_on):
+                raise RuntimeError('upstream timeout')
+            return {'==': [{'var': 'customer.verification_status'}, 'verified']}
+        finally:
+            active['now'] -= 1
+
+    chain.arun = AsyncMock(side_effect=arun)
+    return chain, active
+
+def _obligation():
+    return {
+        'obligation_id': 'OBL-001',
+        'regulation_type': 'kyc',
+        'jurisdiction': 'EU',
+        'title': 'Customer Due Diligence',
+        'effective_date': datetime(2026, 1, 1, tzinfo=timezone.utc)
+    }
+
+def _parse_result(count):
+    return ObligationParseResult(
+        obligation_id='OBL-001',
+        extracted_requirements=[],
+        actionable_items=[],
+        rule_candidates=[
+            {'text': f"Identity verification {i} is required", 'regulation_type': 'kyc',
+             'rule_type': 'boolean', 'confidence': 0.7}
+            for i in range(count)
+        ],
+        confidence_score=0.8,
+        parsing_metadata={}
+    )
+
+class TestRuleCompilerLLMFanOut:
+    """Test suite for RuleCompiler concurrent LLM calls"""
+
+    @pytest.mark.asyncio
+    async def test_candidates_generated_concurrently_within_bound(self, monkeypatch):
+        """Eight candidates run three at a time instead of one after another"""
+        compiler = _compiler(monkeypatch)
+        compiler.json_logic_chain, active = _fake_chain(delay=0.05)
+
+        start = time.perf_counter()
+        rules = await compiler._generate_rules(_obligation(), _parse_result(8))
+        elapsed = time.perf_counter() - start
+
+        assert [rule.rule_id for rule in rules] == [f"OBL-001_rule_{i + 1}" for i in range(8)]
+        assert active['peak'] == 3
+        assert elapsed < 8 * 0.05
+
+    @pytest.mark.asyncio
+    async def test_failed_call_falls_back_without_affecting_others(self, monkeypatch):
+        """A failing LLM call yields the simple JSON-Logic for that candidate only"""
+        compiler = _compiler(monkeypatch)
+        compiler.json_logic_chain, _ = _fake_chain(delay=0.01, fail_on=('verification 1 ',))
+
+        rules = await compiler._generate_rules(_obligation(), _parse_result(3))
+
+        assert len(rules) == 3
+        assert rules[1].json_logic == compiler._generate_simple_json_logic(_parse_result(3).rule_candidates[1])
+        assert rules[0].json_logic == {'==': [{'var': 'customer.verification_status'}, 'verified']}
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_spaces_calls_after_burst(self):
+        """Calls beyond the burst wait for tokens at the configured rate"""
+        limiter = LLMRateLimiter(rate=50, burst=2)
+        start = time.perf_counter()
+        waits = [await limiter.acquire() for _ in range(5)]
+        elapsed = time.perf_counter() - start
+
+        assert waits[:2] == [0.0, 0.0]
+        assert elapsed >= 0.055
+        assert sum(waits) > 0
+
+    @pytest.mark.asyncio
+    async def test_extraction_overlaps_nlp(self, monkeypatch):
+        """The extraction LLM call is in flight while the NLP pipeline runs"""
+        compiler = _compiler(monkeypatch)
+        events = []
+
+        async def arun(**inputs):
+            events.append('llm_start')
+            await asyncio.sleep(0.05)
+            events.append('llm_end')
+            return '[]'
+
+        async def analyze(text, disable=()):
+            await asyncio.to_thread(time.sleep, 0.05)
+            events.append('nlp_done')
+            return DocSummary(text=text)
+
+        compiler.extraction_chain = Mock(arun=AsyncMock(side_effect=arun))
+        compiler.nlp_executor = Mock(analyze=AsyncMock(side_effect=analyze))
+
+        await compiler._parse_obligation({**_obligation(), 'content': 'Institutions must verify identity.'})
+
+        assert events.index('llm_start') < events.index('nlp_done')
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for RuleCompiler Rule Storage
+========================================
+
+This module provides unit testing for the set-based rule persistence of
+RuleCompiler._store_rules.
+
+Test Coverage Areas:
+- One multi-row upsert per call, inside a transaction
+- Duplicate rule IDs collapsed before the upsert
+- Redis cache writes sent through one pipeline
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, date, timezone
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src.rule_compiler import RuleCompiler, ComplianceRule, RegulationType, RuleType
+from src.async_redis import AsyncRedisClient
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class _Pipeline:
+    def __init__(self):
+        self.commands = []
+        self.executions = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def setex(self, *args):
+        self.commands.append(args)
+
+    async def execute(self):
+        self.executions += 1
+
+def _compiler(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    with patch.object(RuleCompiler, '_init_nlp_models'):
+        compiler = RuleCompiler()
+
+    conn = Mock()
+    conn.execute = AsyncMock()
+    transactions = []
+
+    @asynccontextmanager
+    async def transaction():
+        transactions.append('begin')
+        yield
+        transactions.append('commit')
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    conn.transaction = transaction
+    compiler.pg_pool = Mock(acquire=acquire)
+    pipeline = _Pipeline()
+    compiler.redis_client = AsyncRedisClient(host='localhost', port=6379)
+    compiler.redis_client.redis = MagicMock()
+    compiler.redis_client.redis.pipeline = Mock(return_value=pipeline)
+    return compiler, conn, transactions, pipeline
+
+def _rule(rule_id, confidence=0.7):
+    return ComplianceRule(
+        rule_id=rule_id,
+        regulation_type=RegulationType.AML,
+        rule_type=RuleType.THRESHOLD,
+        title=f"Rule {rule_id}",
+        description='Transactions above EUR 10,000 require enhanced monitoring',
+        conditions=[],
+        json_logic={'>': [{'var': 'transaction.amount'}, 10000]},
+        confidence_score=confidence,
+        source_obligation_id='OBL-001',
+        jurisdiction='EU',
+        effective_date=date(2026, 1, 1),
+        created_at=datetime.now(timezone.utc),
+        version='1.0'
+    )
+
+class TestRuleStorage:
+    """Test suite for RuleCompiler._store_rules"""
+
+    @pytest.mark.asyncio
+    async def test_single_upsert_and_pipeline(self, monkeypatch):
+        """Twenty rules cost one statement and one pipeline execution"""
+        compiler, conn, transactions, pipeline = _compiler(monkeypatch)
+
+        await compiler._store_rules([_rule(f"OBL-001_rule_{i}") for i in range(20)])
+
+        conn.execute.assert_awaited_once()
+        query, payload = conn.execute.call_args.args
+        assert 'jsonb_to_recordset' in query
+        rows = json.loads(payload)
+        assert len(rows) == 20
+        assert rows[0]['json_logic'] == {'>': [{'var': 'transaction.amount'}, 10000]}
+        assert rows[0]['effective_date'] == '2026-01-01'
+        assert transactions == ['begin', 'commit']
+
+        compiler.redis_client.redis.pipeline.assert_called_once_with(transaction=False)
+        assert pipeline.executions == 1
+        assert [command[0] for command in pipeline.commands] == [f"rule:OBL-001_rule_{i}" for i in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_rule_ids_collapsed(self, monkeypatch):
+        """The last version of a repeated rule ID is the one written"""
+        compiler, conn, _, pipeline = _compiler(monkeypatch)
+
+        await compiler._store_rules([_rule('R1', 0.5), _rule('R2'), _rule('R1', 0.9)])
+
+        rows = json.loads(conn.execute.call_args.args[1])
+        assert [(row['rule_id'], row['confidence_score']) for row in rows] == [('R1', 0.9), ('R2', 0.7)]
+        assert len(pipeline.commands) == 2
+
+    @pytest.mark.asyncio
+    async def test_no_rules_no_round_trips(self, monkeypatch):
+        """Storing an empty rule set touches neither store"""
+        compiler, conn, _, _ = _compiler(monkeypatch)
+
+        await compiler._store_rules([])
+
+        conn.execute.assert_not_awaited()
+        compiler.redis_client.redis.pipeline.assert_not_called()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for RuleCompiler Generation Cache
+============================================
+
+This module provides unit testing for the durable cache that lets
+RuleCompiler skip NLP and LLM work for obligations whose content is
+unchanged.
+
+Test Coverage Areas:
+- Unchanged obligations served from the cache without parsing
+- Cache keys sensitive to content, regulation type, jurisdiction and prompts
+- Forced regeneration bypassing the cache
+- Rules rebuilt for the obligation that hit the cache
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import Mock, AsyncMock, patch
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/intelligence-compliance-agent'))
+
+from src.rule_compiler import (
+    RuleCompiler, ObligationParseResult, ComplianceRule, RuleCondition,
+    ConditionOperator, RegulationType, RuleType
+)
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class _CachePool:
+    """In-memory stand-in for the rule_generation_cache table"""
+
+    def __init__(self):
+        self.entries = {}
+        conn = Mock()
+        conn.fetchval = AsyncMock(side_effect=self._fetchval)
+        conn.execute = AsyncMock(side_effect=self._execute)
+        self.conn = conn
+
+    async def _fetchval(self, query, cache_key):
+        return self.entries.get(cache_key)
+
+    async def _execute(self, query, *args):
+        if 'rule_generation_cache' in query:
+            self.entries[args[0]] = args[5]
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+def _compiler(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    with patch.object(RuleCompiler, '_init_nlp_models'):
+        compiler = RuleCompiler()
+    compiler.pg_pool = _CachePool()
+    compiler._store_rules = AsyncMock()
+    compiler._validate_rules = AsyncMock(side_effect=lambda rules: rules)
+    compiler._parse_obligation = AsyncMock(return_value=ObligationParseResult(
+        obligation_id='OBL-001', extracted_requirements=[], actionable_items=[],
+        rule_candidates=[], confidence_score=0.8, parsing_metadata={}
+    ))
+    compiler._generate_rules = AsyncMock(side_effect=lambda obligation, parse_result: [
+        ComplianceRule(
+            rule_id=f"{obligation['obligation_id']}_rule_2",
+            regulation_type=RegulationType.KYC,
+            rule_type=RuleType.BOOLEAN,
+            title=f"Rule 2 for {obligation['title']}",
+            description='Customer identity verification is required',
+            conditions=[RuleCondition(
+                field='customer.verification_status', operator=ConditionOperator.EQUALS,
+                value='verified', description='Boolean condition'
+            )],
+            json_logic={'==': [{'var': 'customer.verification_status'}, 'verified']},
+            confidence_score=0.7,
+            source_obligation_id=obligation['obligation_id'],
+            jurisdiction=obligation['jurisdiction'],
+            effective_date=obligation['effective_date'],
+            created_at=datetime.now(timezone.utc),
+            version='1.0'
+        )
+    ])
+    return compiler
+
+def _obligation(obligation_id='OBL-001', content='Institutions must verify customer identity.', **overrides):
+    obligation = {
+        'obligation_id': obligation_id,
+        'regulation_type': 'kyc',
+        'jurisdiction': 'EU',
+        'title': f"Customer Due Diligence {obligation_id}",
+        'content': content,
+        'effective_date': datetime(2026, 1, 1, tzinfo=timezone.utc)
+    }
+    obligation.update(overrides)
+    return obligation
+
+class TestRuleGenerationCache:
+    """Test suite for the RuleCompiler generation cache"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_obligation_served_from_cache(self, monkeypatch):
+        """The second compilation skips parsing and generation"""
+        compiler = _compiler(monkeypatch)
+        compiler._retrieve_obligation = AsyncMock(return_value=_obligation())
+
+        first = await compiler.compile_obligation_to_rules('OBL-001')
+        second = await compiler.compile_obligation_to_rules('OBL-001')
+
+        assert compiler._parse_obligation.await_count == 1
+        assert compiler._generate_rules.await_count == 1
+        assert compiler.compilation_stats['cache_hits'] == 1
+        assert [rule.rule_id for rule in second] == [rule.rule_id for rule in first] == ['OBL-001_rule_2']
+        assert second[0].json_logic == first[0].json_logic
+        assert second[0].conditions == first[0].conditions
+        assert compiler._store_rules.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_rebuilt_for_other_obligation(self, monkeypatch):
+        """Identical content under another obligation reuses generation with its own IDs"""
+        compiler = _compiler(monkeypatch)
+        compiler._retrieve_obligation = AsyncMock(side_effect=[_obligation('OBL-001'), _obligation('OBL-002')])
+
+        await compiler.compile_obligation_to_rules('OBL-001')
+        rules = await compiler.compile_obligation_to_rules('OBL-002')
+
+        assert compiler._generate_rules.await_count == 1
+        assert rules[0].rule_id == 'OBL-002_rule_2'
+        assert rules[0].title == 'Rule 2 for Customer Due Diligence OBL-002'
+        assert rules[0].source_obligation_id == 'OBL-002'
+
+    @pytest.mark.asyncio
+    async def test_force_regenerate_bypasses_cache(self, monkeypatch):
+        """Forced regeneration runs the full pipeline and refreshes the entry"""
+        compiler = _compiler(monkeypatch)
+        compiler._retrieve_obligation = AsyncMock(return_value=_obligation())
+
+        await compiler.compile_obligation_to_rules('OBL-001')
+        await compiler.compile_obligation_to_rules('OBL-001', force_regenerate=True)
+
+        assert compiler._generate_rules.await_count == 2
+        assert compiler.compilation_stats['cache_hits'] == 0
+        assert len(compiler.pg_pool.entries) == 1
+
+    def test_cache_key_inputs(self, monkeypatch):
+        """Content, regulation type, jurisdiction and prompts all change the key"""
+        compiler = _compiler(monkeypatch)
+        base = compiler._generation_cache_key(_obligation())
+
+        assert compiler._generation_cache_key(_obligation('OBL-009', title='Other title')) == base
+        assert compiler._generation_cache_key(_obligation(content='Institutions shall verify identity.')) != base
+        assert compiler._generation_cache_key(_obligation(regulation_type='aml')) != base
+        assert compiler._generation_cache_key(_obligation(jurisdiction='DE')) != base
+
+        compiler.generator_version = 'other-prompts'
+        assert compiler._generation_cache_key(_obligation()) != base
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for ReportScheduler Dependency and Resource Admission
+================================================================
+
+This module provides unit testing for the event-driven dispatch of
+ReportScheduler: parked jobs, dependency release and pool admission.
+
+Test Coverage Areas:
+- Jobs with unmet dependencies parked without blocking other jobs
+- Dependents released when their dependency completes
+- Completions racing the dependency check of a dequeued job
+- Jobs parked on a full resource pool admitted when capacity frees
+- Queue depth and wait time metrics
+- Retried jobs queued at their retry time
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+from datetime import datetime, timezone, timedelta
+from unittest.mock import Mock, AsyncMock
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from report_scheduler import JobStatus, Priority, ReportScheduler, ScheduledJob
+from compliance_report_generator import ReportResult, ReportStatus
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def _job(institution_id: str, report_type: str = 'FINREP', dependencies=None,
+         priority: Priority = Priority.MEDIUM) -> ScheduledJob:
+    return ScheduledJob(
+        job_id=f"job-{institution_id}-{report_type}",
+        schedule_id=f"schedule-{institution_id}",
+        report_type=report_type,
+        institution_id=institution_id,
+        reporting_period='2026-Q3',
+        scheduled_time=datetime.now(timezone.utc),
+        priority=priority,
+        dependency_jobs=dependencies or [],
+        metadata={'jurisdiction': 'DE'}
+    )
+
+def _scheduler(executors: int = 2):
+    """Scheduler whose dependency state lives in a set of completed job IDs"""
+    scheduler = ReportScheduler(hub=Mock())
+    scheduler.config['executor_count'] = executors
+    scheduler._update_job_status = AsyncMock()
+    scheduler._publish_job_event = AsyncMock()
+    scheduler._schedule_job_retry = AsyncMock()
+    completed = set()
+
+    async def check_dependencies(job):
+        return all(dependency in completed for dependency in job.dependency_jobs or [])
+
+    scheduler._check_job_dependencies = AsyncMock(side_effect=check_dependencies)
+    return scheduler, completed
+
+class TestSchedulerDispatch:
+    """Test suite for ReportScheduler event-driven dispatch"""
+
+    @pytest.mark.asyncio
+    async def test_waiting_job_does_not_block_others(self):
+        """A job with an unmet dependency is parked while ready jobs run"""
+        scheduler, _ = _scheduler()
+        executed = []
+
+        async def execute(jobs):
+            executed.extend(job.job_id for job in jobs)
+            for job in jobs:
+                await scheduler._release_resources(job)
+
+        scheduler._execute_jobs = AsyncMock(side_effect=execute)
+        waiting = _job('INST1', 'COREP', dependencies=['job-INST0-FINREP'], priority=Priority.HIGH)
+        ready = _job('INST2', 'DORA')
+        await scheduler._enqueue_job(waiting)
+        await scheduler._enqueue_job(ready)
+
+        scheduler.running = True
+        executors = [asyncio.create_task(scheduler._job_executor(index)) for index in range(2)]
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            scheduler.running = False
+            await asyncio.gather(*executors)
+
+        assert executed == ['job-INST2-DORA']
+        assert list(scheduler.waiting_jobs) == ['job-INST1-COREP']
+        assert scheduler._dependents == {'job-INST0-FINREP': {'job-INST1-COREP'}}
+
+    @pytest.mark.asyncio
+    async def test_completion_releases_dependents(self):
+        """Completing a job queues the parked jobs that depended on it"""
+        scheduler, completed = _scheduler()
+        dependency = _job('INST0')
+        dependent = _job('INST1', 'COREP', dependencies=[dependency.job_id, 'schedule-INST9'])
+        scheduler._park_for_dependencies(dependent)
+
+        dependency.started_time = datetime.now(timezone.utc)
+        completed.add(dependency.job_id)
+        await scheduler._complete_job(dependency, ReportResult(
+            report_id='FINREP_2026-Q3_INST0', status=ReportStatus.COMPLETED, file_path='/tmp/r0'
+        ))
+
+        # Still waiting on the second dependency
+        assert scheduler.job_queue.qsize() == 0
+        assert 'job-INST1-COREP' in scheduler.waiting_jobs
+
+        other = _job('INST9')
+        other.started_time = datetime.now(timezone.utc)
+        completed.add(other.schedule_id)
+        await scheduler._complete_job(other, ReportResult(
+            report_id='FINREP_2026-Q3_INST9', status=ReportStatus.COMPLETED, file_path='/tmp/r9'
+        ))
+
+        assert scheduler.job_queue.qsize() == 1
+        assert scheduler.waiting_jobs == {}
+        assert scheduler._dependents == {}
+        assert scheduler.metrics['dependency_releases'] == 1
+
+    @pytest.mark.asyncio
+    async def test_completion_during_dependency_check_not_missed(self):
+        """A dependency completing while a dequeued job is checked still releases it"""
+        scheduler, completed = _scheduler()
+        dependency = _job('INST0')
+        dependent = _job('INST1', 'COREP', dependencies=[dependency.job_id])
+        check_started = asyncio.Event()
+        resume_check = asyncio.Event()
+
+        async def slow_check(job):
+            # The dependency query sees the state before the completion commits
+            result = all(dep in completed for dep in job.dependency_jobs or [])
+            check_started.set()
+            await resume_check.wait()
+            return result
+
+        scheduler._check_job_dependencies = AsyncMock(side_effect=slow_check)
+        admission = asyncio.create_task(scheduler._admit_dependencies(dependent))
+        await check_started.wait()
+
+        # The dependency completes while the executor's check is in flight
+        completed.add(dependency.job_id)
+        scheduler._check_job_dependencies = AsyncMock(return_value=True)
+        dependency.started_time = datetime.now(timezone.utc)
+        await scheduler._complete_job(dependency, ReportResult(
+            report_id='FINREP_2026-Q3_INST0', status=ReportStatus.COMPLETED, file_path='/tmp/r0'
+        ))
+        resume_check.set()
+
+        assert not await admission
+        assert scheduler.job_queue.qsize() == 1
+        assert scheduler.job_queue.get_nowait()[2] is dependent
+        assert scheduler.waiting_jobs == {}
+        assert scheduler._dependents == {}
+
+    @pytest.mark.asyncio
+    async def test_passing_check_runs_job_once(self):
+        """A job whose check passes is unparked and not re-queued by a later completion"""
+        scheduler, completed = _scheduler()
+        dependency = _job('INST0')
+        dependent = _job('INST1', 'COREP', dependencies=[dependency.job_id])
+        completed.add(dependency.job_id)
+
+        assert await scheduler._admit_dependencies(dependent)
+        assert scheduler.waiting_jobs == {}
+        assert scheduler._dependents == {}
+
+        await scheduler._release_dependents(dependency)
+        assert scheduler.job_queue.qsize() == 0
+
+    @pytest.mark.asyncio
+    async def test_full_pool_parks_until_capacity_released(self):
+        """Jobs beyond pool capacity wait parked and are admitted by priority"""
+        scheduler, _ = _scheduler()
+        pool = scheduler.resource_pools['dora']
+        running = [_job(f"RUN{index}", 'DORA') for index in range(pool.max_concurrent_jobs)]
+        for job in running:
+            assert await scheduler._allocate_resources(job)
+
+        low, high = _job('INST1', 'DORA', priority=Priority.LOW), _job('INST2', 'DORA', priority=Priority.CRITICAL)
+        for job in (low, high):
+            assert not await scheduler._allocate_resources(job)
+            scheduler._park_for_resources(job)
+
+        metrics = await scheduler.get_metrics()
+        assert metrics['waiting_on_resources'] == 2
+        assert metrics['resource_pools']['dora']['queue_length'] == 2
+
+        await scheduler._release_resources(running[0])
+
+        assert scheduler.job_queue.qsize() == 1
+        _, _, admitted = scheduler.job_queue.get_nowait()
+        assert admitted is high
+        assert len(scheduler._resource_waiters['dora']) == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_metrics(self):
+        """Dispatch records how long jobs waited in the ready queue"""
+        scheduler, _ = _scheduler()
+
+        async def execute(jobs):
+            for job in jobs:
+                await scheduler._release_resources(job)
+
+        scheduler._execute_jobs = AsyncMock(side_effect=execute)
+        for index in range(3):
+            await scheduler._enqueue_job(_job(f"INST{index}", 'COREP'))
+        await asyncio.sleep(0.02)
+
+        scheduler.running = True
+        executor = asyncio.create_task(scheduler._job_executor())
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            scheduler.running = False
+            await executor
+
+        metrics = await scheduler.get_metrics()
+        assert metrics['jobs_dispatched'] == 3
+        assert metrics['queue_size'] == 0
+        assert metrics['avg_queue_wait_seconds'] >= 0.02
+        assert metrics['max_queue_wait_seconds'] >= metrics['avg_queue_wait_seconds']
+        assert scheduler._enqueued_at == {}
+
+    @pytest.mark.asyncio
+    async def test_retry_queued_at_retry_time(self, monkeypatch):
+        """A retried job is ordered by its retry time, after same-priority jobs due earlier"""
+        scheduler = ReportScheduler(hub=Mock())
+        scheduler._update_job_status = AsyncMock()
+        monkeypatch.setattr(asyncio, 'sleep', AsyncMock())
+        retried = _job('INST1')
+        original_slot = retried.scheduled_time
+        later = _job('INST2')
+        later.scheduled_time = original_slot + timedelta(minutes=5)
+        await scheduler._enqueue_job(later)
+
+        await scheduler._schedule_job_retry(retried)
+
+        assert retried.retry_count == 1
+        assert retried.scheduled_time >= original_slot + timedelta(minutes=30)
+        assert [scheduler.job_queue.get_nowait()[2] for _ in range(2)] == [later, retried]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SFTP Delivery Preparation Pipeline
+=================================================
+
+This module provides unit testing for the single-pass encrypt, sign and
+checksum pipeline SFTPDeliveryService runs before upload.
+
+Test Coverage Areas:
+- AES-256-GCM output decrypts back to the original report
+- Checksum and signature cover the delivered (encrypted) bytes
+- Plain copies when encryption and signatures are disabled
+- Source files read exactly once
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import hashlib
+import json
+import base64
+from unittest.mock import Mock, patch
+import logging
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from sftp_delivery import SFTPDeliveryService, DeliveryRequest, SFTPConfig
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+async def _service(tmp_path):
+    service = SFTPDeliveryService(hub=Mock())
+    service.config['temp_dir'] = str(tmp_path / 'outbound')
+    service.config['key_dir'] = str(tmp_path / 'keys')
+    # Small buffer so multi-buffer reads are exercised
+    service.config['pipeline_buffer_size'] = 4096
+    os.makedirs(service.config['temp_dir'])
+    await service._initialize_crypto_keys()
+    return service
+
+def _request(path, **kwargs):
+    return DeliveryRequest(
+        delivery_id='DEL-001',
+        report_id='RPT-001',
+        file_path=str(path),
+        destination_config=SFTPConfig(hostname='sftp.regulator.eu', username='bank', password='secret'),
+        **kwargs
+    )
+
+class TestDeliveryPipeline:
+    """Test suite for SFTPDeliveryService file preparation"""
+
+    @pytest.mark.asyncio
+    async def test_encrypted_output_checksum_and_signature(self, tmp_path):
+        """One pass produces decryptable output with matching checksum and signature"""
+        service = await _service(tmp_path)
+        report = tmp_path / 'corep.xbrl'
+        content = os.urandom(50_000)
+        report.write_bytes(content)
+
+        prepared = await service._prepare_file_for_delivery(_request(report))
+
+        with open(prepared.path, 'rb') as f:
+            output = f.read()
+        assert prepared.path.endswith('.encrypted')
+        assert prepared.size == len(output) == 12 + len(content) + 16
+        assert prepared.checksum == hashlib.sha256(output).hexdigest()
+        assert AESGCM(service.encryption_key).decrypt(output[:12], output[12:], None) == content
+
+        with open(prepared.signature_path) as f:
+            signature = json.load(f)
+        assert signature['file_hash'] == prepared.checksum
+        service.verification_key.verify(
+            base64.b64decode(signature['signature']),
+            bytes.fromhex(prepared.checksum),
+            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
+            hashes.SHA256()
+        )
+
+    @pytest.mark.asyncio
+    async def test_plain_copy_without_encryption_or_signature(self, tmp_path):
+        """Disabled encryption and signing yields a verbatim copy and no signature file"""
+        service = await _service(tmp_path)
+        report = tmp_path / 'finrep.xbrl'
+        report.write_bytes(b'<xbrli:xbrl/>' * 1000)
+
+        prepared = await service._prepare_file_for_delivery(
+            _request(report, encryption_enabled=False, digital_signature=False)
+        )
+
+        with open(prepared.path, 'rb') as f:
+            assert f.read() == report.read_bytes()
+        assert prepared.checksum == hashlib.sha256(report.read_bytes()).hexdigest()
+        assert prepared.signature_path is None
+
+    @pytest.mark.asyncio
+    async def test_source_read_once(self, tmp_path):
+        """The report is opened once and the output is never re-read"""
+        service = await _service(tmp_path)
+        report = tmp_path / 'corep.xbrl'
+        report.write_bytes(os.urandom(20_000))
+
+        real_open = open
+        opened = []
+
+        def tracking_open(path, mode='r', *args, **kwargs):
+            opened.append((os.path.basename(str(path)), mode))
+            return real_open(path, mode, *args, **kwargs)
+
+        with patch('builtins.open', tracking_open):
+            prepared = await service._prepare_file_for_delivery(_request(report, digital_signature=False))
+
+        reads = [entry for entry in opened if 'r' in entry[1]]
+        assert reads == [('corep.xbrl', 'rb')]
+        assert os.path.exists(prepared.path)
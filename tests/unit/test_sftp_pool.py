@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SFTP Connection Pool
+===================================
+
+This module provides unit testing for the per-endpoint SFTP connection pool
+used by the SFTP delivery service.
+
+Test Coverage Areas:
+- Connection and channel reuse across deliveries to the same endpoint
+- Channel multiplexing and per-endpoint transfer limits
+- Health checks for suspect channels and dropped connections
+- Pipelined block uploads for large files
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+import sftp_pool
+from sftp_pool import SFTPConnectionPool, SFTPPoolConfig
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+KEY = ('sftp.regulator.eu', 22, 'bank')
+CONNECT_KWARGS = {'host': 'sftp.regulator.eu', 'port': 22, 'username': 'bank'}
+
+# max_write_len an OpenSSH server negotiates (256 KiB message limit minus headers)
+WRITE_LIMIT = 255 * 1024
+
+def _fake_connection():
+    conn = MagicMock()
+    conn.closed = False
+    conn.is_closed = Mock(side_effect=lambda: conn.closed)
+    conn.wait_closed = AsyncMock()
+
+    def start_sftp_client():
+        sftp = MagicMock()
+        sftp.put = AsyncMock()
+        sftp.limits = Mock(max_write_len=WRITE_LIMIT)
+        sftp.makedirs = AsyncMock()
+        sftp.realpath = AsyncMock(return_value='/')
+        return sftp
+
+    conn.start_sftp_client = AsyncMock(side_effect=start_sftp_client)
+    return conn
+
+def _config(**overrides):
+    values = dict(max_connections_per_endpoint=2, channels_per_connection=2,
+                  max_transfers_per_endpoint=4, large_file_threshold=1024,
+                  block_size=256, max_requests=16)
+    values.update(overrides)
+    return SFTPPoolConfig(**values)
+
+class TestSFTPConnectionPool:
+    """
+    Test suite for SFTPConnectionPool
+
+    asyncssh.connect is replaced with a factory of fake connections so pool
+    behaviour can be verified without an SSH server.
+    """
+
+    @pytest.mark.asyncio
+    async def test_sequential_deliveries_reuse_channel(self):
+        """Back-to-back deliveries share one connection and one channel"""
+        connect = AsyncMock(side_effect=lambda **kwargs: _fake_connection())
+        with patch.object(sftp_pool.asyncssh, 'connect', connect):
+            pool = SFTPConnectionPool(_config())
+            for _ in range(5):
+                async with pool.session(KEY, CONNECT_KWARGS) as session:
+                    await session.ensure_directory('/inbound')
+
+        assert connect.await_count == 1
+        assert connect.call_args.kwargs['keepalive_interval'] == pool.config.keepalive_interval
+        metrics = pool.get_metrics()['bank@sftp.regulator.eu:22']
+        assert metrics['channels_opened'] == 1
+        assert metrics['channels_reused'] == 4
+        session_sftp = pool.endpoint(KEY, CONNECT_KWARGS)._idle[0].sftp
+        assert session_sftp.makedirs.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_transfers_multiplexed_and_limited(self):
+        """Concurrent deliveries multiplex channels and respect the transfer limit"""
+        connect = AsyncMock(side_effect=lambda **kwargs: _fake_connection())
+        active = {'now': 0, 'peak': 0}
+
+        async def deliver():
+            async with pool.session(KEY, CONNECT_KWARGS):
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+                await asyncio.sleep(0.01)
+                active['now'] -= 1
+
+        with patch.object(sftp_pool.asyncssh, 'connect', connect):
+            pool = SFTPConnectionPool(_config(max_transfers_per_endpoint=3))
+            await asyncio.gather(*(deliver() for _ in range(10)))
+
+        metrics = pool.get_metrics()['bank@sftp.regulator.eu:22']
+        assert active['peak'] == 3
+        assert metrics['channels_opened'] == 3
+        # Two channels per connection: three channels need two connections
+        assert connect.await_count == 2
+        assert metrics['active_transfers'] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_transfer_channel_health_checked(self):
+        """A channel used by a failed transfer is checked and replaced if dead"""
+        connect = AsyncMock(side_effect=lambda **kwargs: _fake_connection())
+        with patch.object(sftp_pool.asyncssh, 'connect', connect):
+            pool = SFTPConnectionPool(_config())
+            with pytest.raises(ConnectionError):
+                async with pool.session(KEY, CONNECT_KWARGS) as session:
+                    session.sftp.realpath = AsyncMock(side_effect=ConnectionError('channel reset'))
+                    raise ConnectionError('channel reset')
+
+            async with pool.session(KEY, CONNECT_KWARGS):
+                pass
+
+        metrics = pool.get_metrics()['bank@sftp.regulator.eu:22']
+        assert metrics['health_check_failures'] == 1
+        assert metrics['channels_opened'] == 2
+
+    @pytest.mark.asyncio
+    async def test_closed_connection_replaced(self):
+        """Channels on a dropped SSH connection are discarded and reconnected"""
+        connections = []
+
+        def connect_factory(**kwargs):
+            connections.append(_fake_connection())
+            return connections[-1]
+
+        with patch.object(sftp_pool.asyncssh, 'connect', AsyncMock(side_effect=connect_factory)):
+            pool = SFTPConnectionPool(_config())
+            async with pool.session(KEY, CONNECT_KWARGS):
+                pass
+            connections[0].closed = True
+            async with pool.session(KEY, CONNECT_KWARGS):
+                pass
+
+        assert len(connections) == 2
+        assert pool.get_metrics()['bank@sftp.regulator.eu:22']['open_connections'] == 1
+
+    @pytest.mark.asyncio
+    async def test_large_files_use_pipelined_blocks(self, tmp_path):
+        """Large files are uploaded with the configured block size and request depth"""
+        small = tmp_path / 'small.xbrl'
+        small.write_bytes(b'x' * 100)
+        large = tmp_path / 'large.xbrl'
+        large.write_bytes(b'x' * 4096)
+
+        with patch.object(sftp_pool.asyncssh, 'connect', AsyncMock(side_effect=lambda **kwargs: _fake_connection())):
+            pool = SFTPConnectionPool(_config())
+            async with pool.session(KEY, CONNECT_KWARGS) as session:
+                await session.put(str(small), '/inbound/small.xbrl')
+                await session.put(str(large), '/inbound/large.xbrl')
+                calls = session.sftp.put.await_args_list
+
+        assert calls[0].kwargs == {}
+        assert calls[1].kwargs == {'block_size': 256, 'max_requests': 16}
+        metrics = pool.get_metrics()['bank@sftp.regulator.eu:22']
+        assert metrics['parallel_uploads'] == 1
+        assert metrics['bytes_uploaded'] == 4196
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('block_size, expected', [(0, WRITE_LIMIT), (256 * 1024, WRITE_LIMIT), (64 * 1024, 64 * 1024)])
+    async def test_block_size_capped_at_server_write_limit(self, tmp_path, block_size, expected):
+        """Blocks never exceed the server's max_write_len; request depth defaults to asyncssh's"""
+        large = tmp_path / 'large.xbrl'
+        large.write_bytes(b'x' * 4096)
+
+        with patch.object(sftp_pool.asyncssh, 'connect', AsyncMock(side_effect=lambda **kwargs: _fake_connection())):
+            pool = SFTPConnectionPool(_config(block_size=block_size, max_requests=0))
+            async with pool.session(KEY, CONNECT_KWARGS) as session:
+                await session.put(str(large), '/inbound/large.xbrl')
+                call = session.sftp.put.await_args
+
+        assert call.kwargs == {'block_size': expected}
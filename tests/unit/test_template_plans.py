@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Compiled Report Template Plans
+=============================================
+
+This module provides unit testing for the immutable plans XBRL, CSV and JSON
+templates compile at load time and reuse for every report.
+
+Test Coverage Areas:
+- Plan cache keyed by template path and version
+- Plan immutability
+- XBRL validation and streaming generation from the plan
+- XBRL output identical to the previous minidom serialisation
+- CSV rule compilation and value coercion
+- JSON schema validation and template pickling for the render pool
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import json
+import pickle
+import dataclasses
+import logging
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+from decimal import Decimal
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from compliance_report_generator import (
+    CSVTemplate, JSONTemplate, XBRLTemplate, clear_template_plan_cache
+)
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+XBRLI = '{http://www.xbrl.org/2003/instance}'
+EBA = '{http://www.eba.europa.eu/xbrl/crr}'
+
+def _finrep_data(**overrides):
+    data = {
+        'institution_name': 'Test Bank AG',
+        'institution_code': 'TESTBANK001',
+        'reporting_period': '2024-Q1',
+        'currency': 'EUR',
+        'total_assets': Decimal('1000000000.00'),
+        'total_liabilities': Decimal('800000000.00'),
+        'total_equity': Decimal('200000000.00')
+    }
+    data.update(overrides)
+    return data
+
+def _minidom_xbrl(template: XBRLTemplate, data) -> str:
+    """The XBRL instance generate_report built with ElementTree and minidom before plans"""
+    root = ET.Element('xbrli:xbrl')
+    for prefix, uri in template.namespaces.items():
+        root.set(f'xmlns:{prefix}', uri)
+    ET.SubElement(root, 'link:schemaRef', {'xlink:type': 'simple', 'xlink:href': template._get_schema_reference()})
+
+    context = ET.SubElement(root, 'xbrli:context', {'id': 'c1'})
+    entity = ET.SubElement(context, 'xbrli:entity')
+    ET.SubElement(entity, 'xbrli:identifier', {'scheme': 'http://www.eba.europa.eu'}).text = data['institution_code']
+    period = ET.SubElement(context, 'xbrli:period')
+    start_date, end_date = template._get_quarter_dates(data['reporting_period'])
+    ET.SubElement(period, 'xbrli:startDate').text = start_date
+    ET.SubElement(period, 'xbrli:endDate').text = end_date
+
+    unit = ET.SubElement(root, 'xbrli:unit', {'id': 'EUR'})
+    ET.SubElement(unit, 'xbrli:measure').text = 'iso4217:EUR'
+
+    for field, value in data.items():
+        concept = XBRLTemplate.concept_mapping.get(field)
+        if concept is None:
+            continue
+        fact = ET.SubElement(root, concept, {'contextRef': 'c1'})
+        if isinstance(value, (int, float)):
+            fact.set('unitRef', 'EUR')
+            fact.set('decimals', '0')
+        fact.text = str(value)
+
+    pretty_xml = minidom.parseString(ET.tostring(root, encoding='unicode')).toprettyxml(indent="  ")
+    return '\n'.join(line for line in pretty_xml.split('\n') if line.strip())
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_template_plan_cache()
+    yield
+    clear_template_plan_cache()
+
+class TestTemplatePlans:
+    """Test suite for compiled template plans"""
+
+    @pytest.mark.asyncio
+    async def test_plan_cached_by_path_and_version(self, tmp_path):
+        """A second template with the same path and version reuses the plan without reloading"""
+        path = tmp_path / 'finrep.xml'
+        path.write_text('<template/>')
+
+        first = XBRLTemplate(str(path), '1.0', '')
+        await first.load_template()
+        path.unlink()
+
+        second = XBRLTemplate(str(path), '1.0', '')
+        await second.load_template()
+        assert second.plan is first.plan
+        assert second.template_root.tag == 'template'
+
+        with pytest.raises(FileNotFoundError):
+            await XBRLTemplate(str(path), '2.0', '').load_template()
+
+    def test_plans_are_immutable(self):
+        """Plans cannot be modified after compilation"""
+        plan = XBRLTemplate('finrep.xml', '1.0', '').compile()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            plan.concepts = {}
+
+    @pytest.mark.asyncio
+    async def test_xbrl_generation_from_plan(self):
+        """Validation accepts NUMERIC (Decimal) values and facts follow the input data"""
+        template = XBRLTemplate('finrep.xml', '1.0', '')
+        data = _finrep_data()
+
+        validation = await template.validate_data(data)
+        assert validation['valid'], validation['errors']
+
+        content = await template.generate_report(data)
+        root = ET.fromstring(content.split('?>', 1)[1])
+        assert root.find(f'{XBRLI}context/{XBRLI}period/{XBRLI}endDate').text == '2024-03-31'
+        assert root.find(f'{XBRLI}unit/{XBRLI}measure').text == 'iso4217:EUR'
+        assert [child.tag for child in root if child.tag.startswith(EBA)] == [
+            f'{EBA}NameOfReportingAgent', f'{EBA}Assets', f'{EBA}Liabilities', f'{EBA}Equity'
+        ]
+        assert root.find(f'{EBA}Assets').get('unitRef') == 'EUR'
+        assert root.find(f'{EBA}NameOfReportingAgent').get('unitRef') is None
+
+    @pytest.mark.asyncio
+    async def test_xbrl_output_matches_minidom(self):
+        """Generated XBRL is byte-identical to the previous minidom output, facts in data order"""
+        template = XBRLTemplate('finrep.xml', '1.0', '')
+        data = {
+            'total_equity': 200000000.0,
+            'institution_name': 'Bank <A> & "B"',
+            'net_income': 1500000.0,
+            'institution_code': 'TESTBANK001',
+            'reporting_period': '2024-Q2',
+            'total_assets': 1000000000,
+            'currency': 'EUR',
+            'total_liabilities': 800000000.0
+        }
+
+        content = await template.generate_report(data)
+
+        assert content == _minidom_xbrl(template, data)
+        assert content.startswith('<?xml version="1.0" ?>\n<xbrli:xbrl')
+
+    @pytest.mark.asyncio
+    async def test_xbrl_validation_errors(self):
+        """Compiled validators report the same errors as before"""
+        template = XBRLTemplate('finrep.xml', '1.0', '')
+        data = _finrep_data(reporting_period='2024-13', total_equity=-1)
+        del data['currency']
+
+        validation = await template.validate_data(data)
+        assert not validation['valid']
+        assert 'Missing required field: currency' in validation['errors']
+        assert 'reporting_period must be in YYYY-MM or YYYY-QQ format' in validation['errors']
+        assert 'total_equity must be a non-negative number' in validation['errors']
+
+    @pytest.mark.asyncio
+    async def test_csv_plan_rules_and_coercion(self, tmp_path):
+        """CSV templates compile mappings and rules once"""
+        path = tmp_path / 'corep.json'
+        path.write_text(json.dumps({
+            'headers': ['Code', 'Assets'],
+            'field_mappings': {'Code': 'institution_code', 'Assets': 'total_assets'},
+            'validation_rules': {
+                'total_assets': {'type': 'number', 'min': 0},
+                'institution_code': {'type': 'string', 'max_length': 5}
+            }
+        }))
+        template = CSVTemplate(str(path), '1.0')
+        await template.load_template()
+
+        assert template.plan.columns == ('institution_code', 'total_assets')
+        validation = await template.validate_data({'institution_code': 'TESTBANK001', 'total_assets': -1.0})
+        assert validation['errors'] == [
+            'total_assets must be >= 0',
+            'institution_code exceeds maximum length of 5'
+        ]
+
+        content = await template.generate_report({'institution_code': 'TB1', 'total_assets': 12.5})
+        assert content.splitlines() == ['Code,Assets', 'TB1,12.50']
+
+        cached = CSVTemplate(str(path), '1.0')
+        await cached.load_template()
+        assert cached.field_mappings == template.field_mappings
+        assert cached.validation_rules == template.validation_rules
+
+    @pytest.mark.asyncio
+    async def test_json_template_validates_and_pickles(self, tmp_path):
+        """JSON templates keep a compiled validator and still pickle for the render pool"""
+        path = tmp_path / 'dora.json'
+        path.write_text(json.dumps({
+            'type': 'object',
+            'required': ['ict_incidents_count'],
+            'properties': {'ict_incidents_count': {'type': 'integer', 'minimum': 0}}
+        }))
+        template = JSONTemplate(str(path), '1.0')
+        await template.load_template()
+
+        assert (await template.validate_data({'ict_incidents_count': 3}))['valid']
+        invalid = await template.validate_data({'ict_incidents_count': -1})
+        assert invalid['errors'] == ['JSON schema validation error: -1 is less than the minimum of 0']
+
+        clone = pickle.loads(pickle.dumps(template))
+        assert not (await clone.validate_data({}))['valid']
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for WriteBehindBuffer Component
+=========================================
+
+This module provides unit testing for the write-behind buffer shared by the
+SLA monitor and performance tracker.
+
+Test Coverage Areas:
+- Size- and time-triggered batched flushing via COPY
+- Multi-row INSERT fallback when COPY is rejected
+- Backpressure and drop accounting when the database is slow
+- Isolation of rows the database rejects, including constraint violations
+- Requeue and bounded retry of failed batches
+- Batched Kafka event publication for written rows only
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import asyncio
+import json
+from unittest.mock import Mock, AsyncMock, MagicMock
+import logging
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+import asyncpg
+from write_behind_buffer import WriteBehindBuffer, WriteBehindConfig
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class _AcquireContext:
+    """Async context manager returned by the fake pool"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, *args):
+        return False
+
+def _make_pool(conn):
+    pool = Mock()
+    pool.acquire = Mock(return_value=_AcquireContext(conn))
+    return pool
+
+def _make_producer():
+    """Kafka producer stand-in recording the values appended to record batches"""
+    appended = []
+    record_batch = Mock()
+    record_batch.append = Mock(side_effect=lambda key, value, timestamp: appended.append(json.loads(value)) or object())
+    producer = Mock()
+    producer.create_batch = Mock(return_value=record_batch)
+    producer.partitions_for = AsyncMock(return_value={0, 1})
+    producer.send_batch = AsyncMock(side_effect=lambda *args, **kwargs: _done_future())
+    producer.appended = appended
+    return producer
+
+def _done_future():
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(None)
+    return future
+
+class TestWriteBehindBuffer:
+    """
+    Test suite for WriteBehindBuffer
+
+    Uses a fake asyncpg pool so flush behaviour can be verified without a
+    running PostgreSQL instance.
+    """
+
+    @pytest.fixture
+    def conn(self):
+        conn = MagicMock()
+        conn.copy_records_to_table = AsyncMock()
+        conn.executemany = AsyncMock()
+        return conn
+
+    @pytest.mark.asyncio
+    async def test_flush_uses_copy_in_batches(self, conn):
+        """Rows are written with COPY in max_batch_size chunks"""
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a', 'b'],
+                                   config=WriteBehindConfig(max_batch_size=3))
+
+        for i in range(7):
+            assert await buffer.add((i, str(i)))
+
+        await buffer.flush()
+
+        assert conn.copy_records_to_table.await_count == 3
+        first_call = conn.copy_records_to_table.await_args_list[0]
+        assert first_call.kwargs['records'] == [(0, '0'), (1, '1'), (2, '2')]
+        assert first_call.kwargs['columns'] == ['a', 'b']
+        assert buffer.metrics['records_flushed'] == 7
+        assert buffer.pending_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_insert_when_copy_rejected(self, conn):
+        """COPY rejection switches the buffer to multi-row INSERT"""
+        conn.copy_records_to_table.side_effect = asyncpg.exceptions.FeatureNotSupportedError('no copy')
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a', 'b'])
+
+        await buffer.add((1, 'x'))
+        await buffer.flush()
+        await buffer.add((2, 'y'))
+        await buffer.flush()
+
+        assert conn.copy_records_to_table.await_count == 1
+        assert conn.executemany.await_count == 2
+        sql = conn.executemany.await_args_list[0].args[0]
+        assert sql == "INSERT INTO metrics (a, b) VALUES ($1, $2)"
+        assert buffer.get_metrics()['copy_enabled'] is False
+
+    @pytest.mark.asyncio
+    async def test_backpressure_drops_when_full(self, conn):
+        """A full buffer drops rows after the backpressure timeout"""
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a'],
+                                   config=WriteBehindConfig(max_pending=2, backpressure_timeout=0.01))
+
+        assert await buffer.add((1,))
+        assert await buffer.add((2,))
+        assert not await buffer.add((3,), {'event': 3})
+
+        assert buffer.metrics['records_dropped'] == 1
+        assert buffer.metrics['backpressure_waits'] == 1
+        assert buffer.pending_count() == 2
+
+    @pytest.mark.asyncio
+    async def test_backpressure_wakes_only_freed_slots(self, conn):
+        """Blocked producers never push the buffer past max_pending"""
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a'],
+                                   config=WriteBehindConfig(max_pending=2, max_batch_size=1,
+                                                            backpressure_timeout=0.05))
+        await buffer.add((1,))
+        await buffer.add((2,))
+
+        producers = [asyncio.create_task(buffer.add((value,))) for value in range(3, 7)]
+        await asyncio.sleep(0)
+        await buffer.flush()
+        await asyncio.sleep(0)
+        assert buffer.pending_count() <= 2
+
+        results = await asyncio.gather(*producers)
+        assert results.count(True) == 2
+        assert buffer.metrics['records_dropped'] == 2
+        assert buffer.pending_count() == 2
+
+    @pytest.mark.asyncio
+    async def test_bad_row_isolated_from_batch(self, conn):
+        """A row the database rejects is split out; the rest of the batch is written"""
+        written = []
+
+        async def copy(table, records, columns):
+            if ('bad',) in records:
+                raise asyncpg.exceptions.DataError('invalid input syntax')
+            written.extend(records)
+
+        async def executemany(sql, rows):
+            raise asyncpg.exceptions.DataError('invalid input syntax')
+
+        conn.copy_records_to_table.side_effect = copy
+        conn.executemany.side_effect = executemany
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a'],
+                                   config=WriteBehindConfig(max_batch_size=8))
+        rows = [(str(i),) for i in range(7)]
+        for row in rows[:5] + [('bad',)] + rows[5:]:
+            await buffer.add(row)
+
+        await buffer.flush()
+
+        assert sorted(written) == rows
+        assert buffer.metrics['records_flushed'] == 7
+        assert buffer.metrics['records_rejected'] == 1
+        assert conn.executemany.await_count == 1
+        assert conn.copy_records_to_table.await_count <= 2 * 3 + 1
+        assert buffer.get_metrics()['copy_enabled'] is True
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_requeued_then_dropped(self, conn):
+        """Failed batches are retried a bounded number of times"""
+        conn.copy_records_to_table.side_effect = ConnectionError('database down')
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a'],
+                                   config=WriteBehindConfig(max_flush_retries=1))
+
+        await buffer.add((1,))
+        await buffer.add((2,))
+
+        await buffer.flush()
+        assert buffer.pending_count() == 2
+        assert list(buffer._records) == [((1,), None), ((2,), None)]
+
+        await buffer.flush()
+        assert buffer.pending_count() == 0
+        assert buffer.metrics['records_dropped'] == 2
+        assert buffer.metrics['flush_failures'] == 2
+
+    @pytest.mark.asyncio
+    async def test_background_flusher_runs_on_interval(self, conn):
+        """The background task flushes without an explicit flush call"""
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a'],
+                                   config=WriteBehindConfig(flush_interval=0.01))
+        await buffer.start()
+        await buffer.add((1,))
+
+        await asyncio.sleep(0.05)
+        await buffer.close()
+
+        assert buffer.metrics['records_flushed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_events_published_in_record_batches(self, conn):
+        """Queued events are packed into producer record batches"""
+        record_batch = Mock()
+        record_batch.append = Mock(return_value=object())
+        producer = Mock()
+        producer.create_batch = Mock(return_value=record_batch)
+        producer.partitions_for = AsyncMock(return_value={0, 1})
+        send_future = asyncio.get_running_loop().create_future()
+        send_future.set_result(None)
+        producer.send_batch = AsyncMock(return_value=send_future)
+
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a'],
+                                   kafka_producer=producer, topic='metrics.topic')
+        for i in range(5):
+            await buffer.add((i,), {'value': i})
+
+        await buffer.flush()
+
+        assert record_batch.append.call_count == 5
+        producer.send_batch.assert_awaited_once()
+        assert producer.send_batch.await_args.args[1] == 'metrics.topic'
+        assert buffer.metrics['events_published'] == 5
+
+    @pytest.mark.asyncio
+    async def test_events_wait_for_failed_batch(self, conn):
+        """Events of a requeued batch are published after it is written; dropped rows' events never are"""
+        conn.copy_records_to_table.side_effect = ConnectionError('database down')
+        producer = _make_producer()
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a'],
+                                   kafka_producer=producer, topic='metrics.topic',
+                                   config=WriteBehindConfig(max_flush_retries=1))
+        await buffer.add((1,), {'value': 1})
+        await buffer.add((2,), {'value': 2})
+
+        await buffer.flush()
+        assert producer.appended == []
+        assert buffer.get_metrics()['pending_events'] == 0
+
+        conn.copy_records_to_table.side_effect = None
+        await buffer.flush()
+        assert producer.appended == [{'value': 1}, {'value': 2}]
+        assert buffer.metrics['events_published'] == 2
+
+        conn.copy_records_to_table.side_effect = ConnectionError('database down')
+        await buffer.add((3,), {'value': 3})
+        await buffer.flush()
+        await buffer.flush()
+        assert buffer.metrics['records_dropped'] == 1
+        assert buffer.metrics['events_dropped'] == 1
+        assert producer.appended == [{'value': 1}, {'value': 2}]
+
+    @pytest.mark.asyncio
+    async def test_constraint_violation_isolated_without_event(self, conn):
+        """A row violating a constraint is rejected alone and its event is not published"""
+        async def copy(table, records, columns):
+            if (-1,) in records:
+                raise asyncpg.exceptions.CheckViolationError('violates check constraint')
+
+        conn.copy_records_to_table.side_effect = copy
+        conn.executemany.side_effect = asyncpg.exceptions.CheckViolationError('violates check constraint')
+        producer = _make_producer()
+        buffer = WriteBehindBuffer('test', _make_pool(conn), 'metrics', ['a'],
+                                   kafka_producer=producer, topic='metrics.topic')
+        for value in (1, -1, 2, 3):
+            await buffer.add((value,), {'value': value})
+
+        await buffer.flush()
+
+        assert buffer.metrics['records_flushed'] == 3
+        assert buffer.metrics['records_rejected'] == 1
+        assert buffer.metrics['events_dropped'] == 1
+        assert producer.appended == [{'value': 1}, {'value': 2}, {'value': 3}]
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for XBRL Stream Writer
+=================================
+
+This module provides unit testing for the streaming XBRL writer and its use
+by the COREP and FINREP generators.
+
+Test Coverage Areas:
+- Pretty output compatibility with the former ElementTree + minidom layout
+- Escaping of text and attribute values
+- Compact (non-pretty) output
+- Streaming COREP/FINREP reports straight to a file
+
+Rule Compliance:
+- Rule 1: No stubs - Complete production-grade test implementation
+- Rule 12: Automated testing - Comprehensive unit test coverage
+- Rule 17: Code documentation - Extensive test documentation
+"""
+
+import pytest
+import io
+import logging
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+
+# Import the component under test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../python-agents/decision-orchestration-agent/src'))
+
+from xbrl_writer import XBRLStreamWriter
+from corep_generator import COREPGenerator, COREPData, COREPTemplate
+from finrep_generator import FINREPGenerator, FINREPData, FINREPTemplate
+
+# Configure test logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+def _minidom_pretty(root: ET.Element) -> str:
+    """The serialisation the generators used before the streaming writer"""
+    pretty_xml = minidom.parseString(ET.tostring(root, encoding='unicode')).toprettyxml(indent="  ")
+    lines = [line for line in pretty_xml.split('\n') if line.strip()]
+    lines[0] = '<?xml version="1.0" encoding="UTF-8"?>'
+    return '\n'.join(lines)
+
+def _sample_tree() -> ET.Element:
+    root = ET.Element('xbrli:xbrl')
+    root.set('xmlns:xbrli', 'http://www.xbrl.org/2003/instance')
+    root.set('xmlns:corep', 'http://www.eba.europa.eu/xbrl/crr/dict/dom/corep')
+    context = ET.SubElement(root, 'xbrli:context', {'id': 'c1'})
+    entity = ET.SubElement(context, 'xbrli:entity')
+    identifier = ET.SubElement(entity, 'xbrli:identifier', {'scheme': 'http://example.com/?a=1&b="2"'})
+    identifier.text = 'BANK <&> "A"'
+    ET.SubElement(root, 'corep:Empty', {'contextRef': 'c1'})
+    fact = ET.SubElement(root, 'corep:TotalOwnFunds', {'contextRef': 'c1', 'decimals': '0'})
+    fact.text = '1000'
+    return root
+
+def _corep_data() -> COREPData:
+    return COREPData(
+        institution_code='TEST001',
+        reporting_period='2024-Q3',
+        currency='EUR',
+        consolidation_basis='Individual',
+        large_exposures_number=3,
+        large_exposures_amount=450000000.0
+    )
+
+class TestXBRLStreamWriter:
+    """Test suite for XBRLStreamWriter"""
+
+    def test_pretty_output_matches_minidom_layout(self):
+        """Streaming a tree reproduces the previous pretty-printed document"""
+        root = _sample_tree()
+        buffer = io.StringIO()
+        writer = XBRLStreamWriter(buffer)
+        buffer.write('<?xml version="1.0" encoding="UTF-8"?>')
+        writer.write_element(root)
+
+        assert buffer.getvalue() == _minidom_pretty(root)
+
+    def test_compact_output_round_trips(self):
+        """Compact output has no layout whitespace and parses to the same content"""
+        buffer = io.StringIO()
+        writer = XBRLStreamWriter(buffer, pretty=False)
+        writer.start_document('xbrli:xbrl', {'xbrli': 'http://www.xbrl.org/2003/instance',
+                                             'link': 'http://www.xbrl.org/2003/linkbase',
+                                             'xlink': 'http://www.w3.org/1999/xlink'},
+                               'http://example.com/schema.xsd')
+        writer.context('c1', 'http://www.eba.europa.eu', 'BANK&CO', {'instant': '2024-12-31'})
+        writer.unit('EUR', 'iso4217:EUR')
+        writer.fact('xbrli:Amount', '42', 'c1', unit_ref='EUR', decimals='0')
+        writer.end_document()
+
+        document = buffer.getvalue()
+        assert '\n' not in document
+        assert writer.facts_written == 1
+
+        parsed = ET.fromstring(document.split('?>', 1)[1])
+        identifier = parsed.find('.//{http://www.xbrl.org/2003/instance}identifier')
+        assert identifier.text == 'BANK&CO'
+        assert parsed.find('{http://www.xbrl.org/2003/instance}Amount').get('unitRef') == 'EUR'
+
+    @pytest.mark.asyncio
+    async def test_corep_report_streams_to_file(self, tmp_path):
+        """COREP reports can be written straight to a file"""
+        generator = COREPGenerator()
+        path = tmp_path / 'c_24_00.xbrl'
+        with open(path, 'w', encoding='utf-8') as output:
+            facts = await generator.write_corep_report(_corep_data(), COREPTemplate.C_24_00, output)
+
+        content = path.read_text(encoding='utf-8')
+        assert facts == 2
+        assert content == await generator.generate_corep_report(_corep_data(), COREPTemplate.C_24_00)
+        assert content.startswith('<?xml version="1.0" encoding="UTF-8"?>\n<xbrli:xbrl')
+        assert '  <corep:NumberOfLargeExposures contextRef="c1" decimals="0">3</corep:NumberOfLargeExposures>' in content
+
+    @pytest.mark.asyncio
+    async def test_finrep_compact_report(self):
+        """FINREP reports support compact output"""
+        data = FINREPData(
+            institution_code='TEST001',
+            reporting_period='2024',
+            currency='EUR',
+            consolidation_basis='Individual',
+            total_assets=1000000000.0,
+            total_liabilities=800000000.0,
+            total_equity=200000000.0
+        )
+        content = await FINREPGenerator().generate_finrep_report(data, FINREPTemplate.F_18_00, pretty=False)
+
+        parsed = ET.fromstring(content.split('?>', 1)[1])
+        ns = {'finrep': 'http://www.eba.europa.eu/xbrl/crr/dict/dom/finrep',
+              'xbrli': 'http://www.xbrl.org/2003/instance'}
+        assert parsed.find('.//xbrli:instant', ns).text == '2024-12-31'
+        assert parsed.find('finrep:ExposuresDomesticCountry', ns).text == '650000000'